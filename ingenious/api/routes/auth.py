@@ -1,18 +1,18 @@
-import secrets
 from typing import Annotated, Any, Dict
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel
 
+from ingenious.auth.basic import verify_basic_credentials
 from ingenious.auth.jwt import (
     create_access_token,
     create_refresh_token,
     get_username_from_token,
     verify_token,
 )
+from ingenious.config import get_config
 from ingenious.core.structured_logging import get_logger
-from ingenious.services.dependencies import get_config
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -47,23 +47,12 @@ async def login(login_data: LoginRequest) -> TokenResponse:
         )
 
     # Validate credentials using the same logic as basic auth
-    current_username_bytes = login_data.username.encode("utf8")
-    correct_username_bytes = config.web_configuration.authentication.username.encode(
-        "utf-8"
-    )
-    is_correct_username = secrets.compare_digest(
-        current_username_bytes, correct_username_bytes
-    )
-
-    current_password_bytes = login_data.password.encode("utf8")
-    correct_password_bytes = config.web_configuration.authentication.password.encode(
-        "utf-8"
-    )
-    is_correct_password = secrets.compare_digest(
-        current_password_bytes, correct_password_bytes
-    )
-
-    if not (is_correct_username and is_correct_password):
+    if not verify_basic_credentials(
+        login_data.username,
+        login_data.password,
+        config.web_configuration.authentication.username,
+        config.web_configuration.authentication.password,
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
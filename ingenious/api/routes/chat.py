@@ -1,19 +1,39 @@
-from typing import AsyncIterator
+from typing import AsyncIterator, Callable, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from typing_extensions import Annotated
 
-import ingenious.utils.namespace_utils as ns_utils
+from ingenious.config.main_settings import IngeniousSettings
+from ingenious.core import metrics, timing
 from ingenious.core.structured_logging import get_logger
 from ingenious.errors.content_filter_error import ContentFilterError
 from ingenious.errors.token_limit_exceeded_error import TokenLimitExceededError
 from ingenious.models.chat import ChatRequest, ChatResponse, StreamingChatResponse
 from ingenious.models.http_error import HTTPError
+from ingenious.services.admission_control import (
+    AdmissionController,
+    AdmissionRejectedError,
+)
+from ingenious.services.chat_batch import (
+    BatchTooLargeError,
+    parse_chat_batch,
+    run_chat_batch,
+)
 from ingenious.services.chat_service import ChatService
 from ingenious.services.fastapi_dependencies import (
+    get_chat_admission,
+    get_chat_idempotency,
     get_chat_service,
+    get_chat_service_factory,
     get_conditional_security,
+    get_config,
+)
+from ingenious.services.idempotency import (
+    IdempotencyConflictError,
+    IdempotencyCoordinator,
+    request_fingerprint,
 )
 
 logger = get_logger(__name__)
@@ -28,30 +48,83 @@ parent_dir = os.path.abspath(
 sys.path.append(parent_dir)
 
 
+def _admission_user(chat_request: ChatRequest, username: str) -> Optional[str]:
+    """
+    Identify the caller for per-user limits, or None when unknown.
+
+    Authenticated callers are limited by their username. ``user_id`` is set by
+    the client, so it only tells anonymous callers apart.
+    """
+    if username and username != "anonymous":
+        return username
+    return chat_request.user_id or None
+
+
+def _admission_http_error(e: AdmissionRejectedError) -> HTTPException:
+    return HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
+
+
+def _with_timings(chat_response: ChatResponse) -> ChatResponse:
+    """Attach this request's stage timings when the settings ask for them."""
+    timings = timing.response_timings()
+    if timings is not None:
+        chat_response.timings = timings
+    return chat_response
+
+
 @router.post(
     "/chat",
     responses={
         400: {"model": HTTPError, "description": "Bad Request"},
         406: {"model": HTTPError, "description": "Not Acceptable"},
         413: {"model": HTTPError, "description": "Payload Too Large"},
+        422: {"model": HTTPError, "description": "Idempotency-Key Reused"},
+        429: {"model": HTTPError, "description": "Too Many Requests"},
+        503: {"model": HTTPError, "description": "Service Unavailable"},
     },
 )
 async def chat(
     chat_request: ChatRequest,
+    response: Response,
     chat_service: Annotated[ChatService, Depends(get_chat_service)],
     username: Annotated[str, Depends(get_conditional_security)],
+    admission: Annotated[AdmissionController, Depends(get_chat_admission)],
+    idempotency: Annotated[
+        Optional[IdempotencyCoordinator], Depends(get_chat_idempotency)
+    ],
+    idempotency_key: Annotated[Optional[str], Header(alias="Idempotency-Key")] = None,
 ) -> ChatResponse:
     try:
+        admission_user = _admission_user(chat_request, username)
+        # Fingerprint the request as sent, before defaults are filled in
+        fingerprint = request_fingerprint(username, chat_request.model_dump_json())
+
         # Set user_id to "unspecified_user" if not provided
         if not chat_request.user_id:
             chat_request.user_id = "unspecified_user"
 
-        ns_utils.print_namespace_modules(
-            "ingenious.services.chat_services.multi_agent.conversation_flows"
-        )
         if not chat_request.conversation_flow:
             raise ValueError(f"conversation_flow not set {chat_request}")
-        return await chat_service.get_chat_response(chat_request)
+
+        async def run_chat() -> ChatResponse:
+            async with admission.admit(admission_user, chat_request.conversation_flow):
+                return await chat_service.get_chat_response(chat_request)
+
+        if idempotency is None or idempotency_key is None:
+            return _with_timings(await run_chat())
+
+        idempotency.validate_key(idempotency_key)
+        # Keys are scoped to the caller so they cannot replay each other's responses
+        chat_response, replayed = await idempotency.execute(
+            f"{username}:{idempotency_key}", fingerprint, ChatResponse, run_chat
+        )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        return _with_timings(chat_response)
+    except AdmissionRejectedError as e:
+        raise _admission_http_error(e)
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except ValueError as e:
         logger.error(
             "Chat request validation error",
@@ -94,24 +167,33 @@ async def chat(
         400: {"model": HTTPError, "description": "Bad Request"},
         406: {"model": HTTPError, "description": "Not Acceptable"},
         413: {"model": HTTPError, "description": "Payload Too Large"},
+        429: {"model": HTTPError, "description": "Too Many Requests"},
+        503: {"model": HTTPError, "description": "Service Unavailable"},
     },
 )
 async def chat_stream(
     chat_request: ChatRequest,
     chat_service: Annotated[ChatService, Depends(get_chat_service)],
     username: Annotated[str, Depends(get_conditional_security)],
+    admission: Annotated[AdmissionController, Depends(get_chat_admission)],
 ) -> StreamingResponse:
     """Stream chat responses in real-time using Server-Sent Events (SSE)."""
 
+    # Admit before the response starts so shed requests get a real 429/503
+    try:
+        ticket = await admission.acquire(
+            _admission_user(chat_request, username), chat_request.conversation_flow
+        )
+    except AdmissionRejectedError as e:
+        raise _admission_http_error(e)
+
     async def generate_stream() -> AsyncIterator[str]:
+        metrics.stream_opened("chat_stream")
         try:
             # Set user_id to "unspecified_user" if not provided
             if not chat_request.user_id:
                 chat_request.user_id = "unspecified_user"
 
-            ns_utils.print_namespace_modules(
-                "ingenious.services.chat_services.multi_agent.conversation_flows"
-            )
             if not chat_request.conversation_flow:
                 raise ValueError(f"conversation_flow not set {chat_request}")
 
@@ -124,7 +206,9 @@ async def chat_stream(
                 yield f"data: {streaming_response.model_dump_json()}\n\n"
 
             # Send completion event
-            completion_response = StreamingChatResponse(event="done")
+            completion_response = StreamingChatResponse(
+                event="done", timings=timing.response_timings()
+            )
             yield f"data: {completion_response.model_dump_json()}\n\n"
 
         except ValueError as e:
@@ -173,8 +257,14 @@ async def chat_stream(
             error_response = StreamingChatResponse(event="error", error=str(e))
             yield f"data: {error_response.model_dump_json()}\n\n"
 
+        finally:
+            metrics.stream_closed("chat_stream")
+            ticket.release()
+
     return StreamingResponse(
         generate_stream(),
+        # Also release if the client disconnects before the stream starts
+        background=BackgroundTask(ticket.release),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache",
@@ -182,3 +272,67 @@ async def chat_stream(
             "X-Accel-Buffering": "no",  # Disable nginx buffering
         },
     )
+
+
+@router.post(
+    "/chat/batch",
+    responses={
+        400: {"model": HTTPError, "description": "Bad Request"},
+        413: {"model": HTTPError, "description": "Payload Too Large"},
+    },
+)
+async def chat_batch(
+    request: Request,
+    create_service: Annotated[
+        Callable[[str], ChatService], Depends(get_chat_service_factory)
+    ],
+    username: Annotated[str, Depends(get_conditional_security)],
+    admission: Annotated[AdmissionController, Depends(get_chat_admission)],
+    config: Annotated[IngeniousSettings, Depends(get_config)],
+    concurrency: Annotated[Optional[int], Query(ge=1)] = None,
+) -> StreamingResponse:
+    """
+    Run many chat requests in one call.
+
+    The body is a JSON array of chat requests, or one request per line with
+    ``Content-Type: application/x-ndjson``. Items run with at most
+    ``concurrency`` in flight (capped by the configured maximum), and results
+    are streamed back as NDJSON in completion order: one line per item with its
+    ``index`` in the batch, then a summary line with token and latency totals.
+    """
+    batch_settings = config.web_configuration.batch
+    try:
+        items = parse_chat_batch(
+            await request.body(),
+            request.headers.get("content-type", "application/json"),
+            batch_settings.max_items,
+        )
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    limit = min(
+        concurrency or batch_settings.default_concurrency,
+        batch_settings.max_concurrency,
+    )
+    logger.info(
+        "Chat batch started", items=len(items), concurrency=limit, user=username
+    )
+
+    async def generate_results() -> AsyncIterator[str]:
+        results = run_chat_batch(
+            items,
+            create_service,
+            limit,
+            admission,
+            username if username != "anonymous" else None,
+        )
+        async for result in results:
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(
+        generate_results(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
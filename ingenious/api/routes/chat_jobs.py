@@ -0,0 +1,156 @@
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing_extensions import Annotated
+
+from ingenious.core import metrics
+from ingenious.core.structured_logging import get_logger
+from ingenious.models.chat import ChatRequest
+from ingenious.models.chat_job import ChatJob, ChatJobEvent
+from ingenious.models.http_error import HTTPError
+from ingenious.services.chat_jobs import TERMINAL_EVENTS, ChatJobService
+from ingenious.services.fastapi_dependencies import (
+    get_chat_jobs,
+    get_conditional_security,
+)
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+# Comment line sent on idle SSE streams so proxies keep the connection open
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+async def _get_job_or_404(jobs: ChatJobService, job_id: str, username: str) -> ChatJob:
+    job = await jobs.get(job_id, username)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Chat job {job_id} not found")
+    return job
+
+
+@router.post(
+    "/chat/jobs",
+    status_code=202,
+    responses={400: {"model": HTTPError, "description": "Bad Request"}},
+)
+async def submit_chat_job(
+    chat_request: ChatRequest,
+    jobs: Annotated[ChatJobService, Depends(get_chat_jobs)],
+    username: Annotated[str, Depends(get_conditional_security)],
+) -> ChatJob:
+    """Queue a chat request to run in the background and return its job."""
+    if not chat_request.conversation_flow:
+        raise HTTPException(
+            status_code=400, detail=f"conversation_flow not set {chat_request}"
+        )
+    return await jobs.submit(username, chat_request)
+
+
+@router.get(
+    "/chat/jobs/{job_id}",
+    responses={404: {"model": HTTPError, "description": "Not Found"}},
+)
+async def get_chat_job(
+    job_id: str,
+    jobs: Annotated[ChatJobService, Depends(get_chat_jobs)],
+    username: Annotated[str, Depends(get_conditional_security)],
+) -> ChatJob:
+    """Get a job's status, and its result once finished."""
+    return await _get_job_or_404(jobs, job_id, username)
+
+
+@router.delete(
+    "/chat/jobs/{job_id}",
+    responses={404: {"model": HTTPError, "description": "Not Found"}},
+)
+async def cancel_chat_job(
+    job_id: str,
+    jobs: Annotated[ChatJobService, Depends(get_chat_jobs)],
+    username: Annotated[str, Depends(get_conditional_security)],
+) -> ChatJob:
+    """Cancel a job. Running jobs stop shortly after; finished jobs are unchanged."""
+    job = await jobs.cancel(job_id, username)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Chat job {job_id} not found")
+    return job
+
+
+@router.get(
+    "/chat/jobs/{job_id}/events",
+    responses={404: {"model": HTTPError, "description": "Not Found"}},
+)
+async def get_chat_job_events(
+    job_id: str,
+    jobs: Annotated[ChatJobService, Depends(get_chat_jobs)],
+    username: Annotated[str, Depends(get_conditional_security)],
+    after: Annotated[int, Query(ge=0)] = 0,
+) -> List[ChatJobEvent]:
+    """List a job's progress events, optionally only those after an event id."""
+    await _get_job_or_404(jobs, job_id, username)
+    return await jobs.events(job_id, after)
+
+
+@router.get(
+    "/chat/jobs/{job_id}/stream",
+    responses={404: {"model": HTTPError, "description": "Not Found"}},
+)
+async def stream_chat_job_events(
+    job_id: str,
+    jobs: Annotated[ChatJobService, Depends(get_chat_jobs)],
+    username: Annotated[str, Depends(get_conditional_security)],
+    last_event_id: Annotated[Optional[str], Header(alias="Last-Event-ID")] = None,
+) -> StreamingResponse:
+    """
+    Follow a job's progress events over Server-Sent Events.
+
+    The stream ends after the job's final event, or once the job has finished
+    or been deleted and no events are left. Reconnecting clients resume from
+    the ``Last-Event-ID`` header.
+    """
+    await _get_job_or_404(jobs, job_id, username)
+    try:
+        after = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    poll_interval = jobs.settings.poll_interval_seconds
+
+    async def generate_events() -> AsyncIterator[str]:
+        cursor = after
+        last_sent = time.monotonic()
+        metrics.stream_opened("chat_job_events")
+        try:
+            while True:
+                # Read the job first: once it has finished, every event it will
+                # ever have is already recorded
+                job = await jobs.get(job_id)
+                events = await jobs.events(job_id, cursor)
+                for event in events:
+                    cursor = event.event_id
+                    last_sent = time.monotonic()
+                    yield (
+                        f"id: {event.event_id}\n"
+                        f"event: {event.event}\n"
+                        f"data: {event.model_dump_json()}\n\n"
+                    )
+                    if event.event in TERMINAL_EVENTS:
+                        return
+                if events:
+                    continue
+                if job is None or job.status.is_finished:
+                    # Deleted, or finished with its events all sent
+                    return
+                if time.monotonic() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                    last_sent = time.monotonic()
+                    yield ": keep-alive\n\n"
+                await asyncio.sleep(poll_interval)
+        finally:
+            metrics.stream_closed("chat_job_events")
+
+    return StreamingResponse(
+        generate_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
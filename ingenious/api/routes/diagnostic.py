@@ -1,3 +1,4 @@
+import asyncio
 import time
 from datetime import datetime
 from pathlib import Path
@@ -7,10 +8,12 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from typing_extensions import Annotated
 
 import ingenious.dependencies as igen_deps
+from ingenious.config.snapshot import changed_sections, get_settings, reload_settings
 from ingenious.core.structured_logging import get_logger
 from ingenious.models.http_error import HTTPError
+from ingenious.services.flow_registry import get_flow_registry
+from ingenious.services.warmup import get_warmup_state
 from ingenious.utils.namespace_utils import (
-    discover_workflows,
     get_workflow_metadata,
     normalize_workflow_name,
 )
@@ -44,8 +47,9 @@ async def workflow_status(
         # Normalize workflow name to handle both hyphenated and underscored formats
         normalized_workflow_name = normalize_workflow_name(workflow_name)
 
-        # Discover available workflows dynamically
-        available_workflows = discover_workflows()
+        # Workflows come from the startup snapshot rather than a package walk
+        snapshot = await asyncio.to_thread(get_flow_registry().refresh_if_changed)
+        available_workflows = list(snapshot.workflows)
 
         # Check against normalized name
         if normalized_workflow_name not in available_workflows:
@@ -168,8 +172,8 @@ async def list_workflows(
     Dynamically discovers workflows from all namespaces.
     """
     try:
-        # Dynamically discover all available workflows
-        discovered_workflows = discover_workflows()
+        snapshot = await asyncio.to_thread(get_flow_registry().refresh_if_changed)
+        discovered_workflows = list(snapshot.workflows)
 
         workflow_statuses = []
         for workflow in discovered_workflows:
@@ -212,6 +216,104 @@ async def list_workflows(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/flows",
+    responses={
+        200: {"model": dict, "description": "Registered conversation flows"},
+    },
+)
+async def list_flows(
+    request: Request,
+    auth_user: Annotated[str, Depends(igen_deps.get_auth_user)],
+) -> Dict[str, Any]:
+    """
+    List the conversation flows resolved by the flow registry, with the calling
+    convention and streaming support recorded for each.
+    """
+    return get_flow_registry().describe()
+
+
+@router.get(
+    "/namespaces",
+    responses={
+        200: {"model": dict, "description": "Namespace discovery snapshot"},
+    },
+)
+async def namespace_snapshot(
+    request: Request,
+    auth_user: Annotated[str, Depends(igen_deps.get_auth_user)],
+) -> Dict[str, Any]:
+    """
+    Show the flow modules found in each namespace when the registry was built.
+
+    The snapshot is computed at startup and refreshed only by
+    ``POST /flows/reload`` or when a flows directory changes on disk.
+    """
+    snapshot = await asyncio.to_thread(get_flow_registry().refresh_if_changed)
+    return snapshot.as_dict()
+
+
+@router.post(
+    "/flows/reload",
+    responses={
+        200: {"model": dict, "description": "Reloaded conversation flows"},
+        403: {"model": HTTPError, "description": "Caller is not an admin user"},
+        500: {"model": HTTPError, "description": "Reload failed"},
+    },
+)
+async def reload_flows(
+    request: Request,
+    auth_user: Annotated[str, Depends(igen_deps.get_admin_user)],
+) -> Dict[str, Any]:
+    """
+    Rediscover conversation flows so newly deployed extension flows are served
+    without restarting the process. Only users in
+    ``authentication.admin_users`` may call it.
+    """
+    try:
+        registry = get_flow_registry()
+        await asyncio.to_thread(registry.reload)
+        logger.info("Conversation flows reloaded", user=auth_user)
+        return registry.describe()
+    except Exception as e:
+        logger.error("Error reloading flows", error=str(e), exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/config/reload",
+    responses={
+        200: {"model": dict, "description": "Top-level settings that changed"},
+        403: {"model": HTTPError, "description": "Caller is not an admin user"},
+        422: {"model": HTTPError, "description": "New settings are invalid"},
+    },
+)
+async def reload_config(
+    request: Request,
+    auth_user: Annotated[str, Depends(igen_deps.get_admin_user)],
+) -> Dict[str, Any]:
+    """
+    Reload settings from the environment and ``.env`` without restarting.
+    Only users in ``authentication.admin_users`` may call it.
+
+    Invalid settings are rejected and the current ones stay in place. With
+    several workers only the worker that answers is reloaded; send SIGHUP to
+    the main ``ingen serve`` process to restart them all instead.
+    """
+    old = get_settings()
+    try:
+        new = await asyncio.to_thread(reload_settings)
+    except Exception:
+        # Validation messages can echo secret values, so they stay in the log
+        raise HTTPException(
+            status_code=422,
+            detail="New settings failed to load; see the server log",
+        )
+    changed = changed_sections(old, new)
+    logger.info("Settings reloaded", user=auth_user, changed_sections=changed)
+    return {"changed_sections": changed}
+
+
 @router.api_route(
     "/diagnostic",
     methods=["GET", "OPTIONS"],
@@ -262,6 +364,45 @@ async def diagnostic(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/health/live",
+    responses={200: {"model": dict, "description": "The process is serving"}},
+)
+async def liveness() -> Dict[str, Any]:
+    """
+    Liveness probe: the worker process is up and its event loop answers.
+
+    Does not check configuration or dependencies, so a slow database or model
+    endpoint does not get a healthy worker restarted.
+    """
+    return {"status": "alive"}
+
+
+@router.get(
+    "/health/ready",
+    responses={
+        200: {"model": dict, "description": "The worker is warmed up"},
+        503: {"model": HTTPError, "description": "Warm-up has not finished"},
+    },
+)
+async def readiness() -> Dict[str, Any]:
+    """
+    Readiness probe: the worker has finished its startup warm-up.
+
+    Load balancers should route to a worker only once this returns 200.
+    Warm-up steps that failed are listed but do not hold readiness back.
+    """
+    state = get_warmup_state()
+    body = {
+        "status": "ready" if state.ready else "warming_up",
+        # Step errors can name hosts and paths, so they only go to the logs
+        "warmup": state.as_dict(details=False),
+    }
+    if not state.ready:
+        raise HTTPException(status_code=503, detail=body)
+    return body
+
+
 @router.get(
     "/health",
     responses={
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response
+
+from ingenious.core import metrics
+
+router = APIRouter()
+
+
+@router.get("", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """
+    Prometheus scrape endpoint.
+
+    Unauthenticated like ``/api/v1/health``; restrict it at the network edge
+    if metric labels (route templates, flow and model names) are sensitive.
+    """
+    body, content_type = metrics.render_latest()
+    return Response(body, media_type=content_type)
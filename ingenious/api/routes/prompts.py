@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import HTTPBasicCredentials
@@ -9,6 +9,7 @@ from typing_extensions import Annotated
 import ingenious.dependencies as igen_deps
 from ingenious.core.structured_logging import get_logger
 from ingenious.files.files_repository import FileStorage
+from ingenious.services.template_registry import get_template_registry
 from ingenious.utils.namespace_utils import discover_workflows, normalize_workflow_name
 
 logger = get_logger(__name__)
@@ -20,7 +21,7 @@ class UpdatePromptRequest(BaseModel):
 
 
 @router.get("/revisions/list")
-def list_revisions(
+async def list_revisions(
     request: Request,
     credentials: Annotated[
         HTTPBasicCredentials, Depends(igen_deps.get_conditional_security)
@@ -32,39 +33,21 @@ def list_revisions(
     """
     try:
         # Get the base templates/prompts path
-        base_template_path = asyncio.run(fs.get_prompt_template_path())
+        base_template_path = await fs.get_prompt_template_path()
 
-        # List all directories in the templates/prompts folder
-        revisions_raw = asyncio.run(fs.list_files(file_path=base_template_path))
-
-        # Filter to find directories (these would be the revision IDs)
-        # For Azure Blob Storage, we need to look for folder prefixes
+        # Revision IDs are the first folder of each template below templates/prompts
         revision_ids = set()
-        # Handle string response from list_files (newline-separated)
-        items_list = revisions_raw.split("\n") if revisions_raw else []
-        for item in items_list:
-            if not item:
-                continue
-            # Extract revision ID from the path
-            # For Azure, items are full paths like "templates/prompts/submission-over-criteria-v1/file.jinja"
-            # For local, items are filenames directly
-            if "/" in item:
-                path_parts = item.split("/")
-                if len(path_parts) >= 4:  # templates/prompts/revision_id/filename
-                    revision_ids.add(path_parts[2])
+        async for entry in fs.iter_files(base_template_path, recursive=True):
+            if "/" in entry.name:
+                revision_ids.add(entry.name.split("/", 1)[0])
 
         # If no revisions found via path parsing, try to discover from workflows
         if not revision_ids:
-            workflows = discover_workflows()
-            for workflow in workflows:
+            registry = get_template_registry()
+            for workflow in await asyncio.to_thread(discover_workflows):
                 # Check if this workflow has prompts
-                workflow_path = asyncio.run(fs.get_prompt_template_path(workflow))
-                try:
-                    workflow_files = asyncio.run(fs.list_files(file_path=workflow_path))
-                    if workflow_files:
-                        revision_ids.add(workflow)
-                except Exception:
-                    pass
+                if await registry.resolve_revision(fs, workflow) == workflow:
+                    revision_ids.add(workflow)
 
         return {
             "revisions": sorted(list(revision_ids)),
@@ -77,7 +60,7 @@ def list_revisions(
 
 
 @router.get("/workflows/list")
-def list_workflows_for_prompts(
+async def list_workflows_for_prompts(
     request: Request,
     credentials: Annotated[
         HTTPBasicCredentials, Depends(igen_deps.get_conditional_security)
@@ -88,48 +71,35 @@ def list_workflows_for_prompts(
     List all available workflows that have prompt templates.
     """
     try:
-        workflows = discover_workflows()
+        workflows = await asyncio.to_thread(discover_workflows)
+        registry = get_template_registry()
         workflows_with_prompts = []
 
         for workflow in workflows:
-            # Try both underscore and hyphenated formats
-            workflow_variants = [workflow]
-            if "_" in workflow:
-                workflow_variants.append(workflow.replace("_", "-"))
-            elif "-" in workflow:
-                workflow_variants.append(workflow.replace("-", "_"))
-
-            found_prompts = False
-            for variant in workflow_variants:
+            prompt_files: List[str] = []
+            # Resolves both underscore and hyphenated folder names
+            revision_id = await registry.resolve_revision(fs, workflow)
+            if revision_id is not None:
                 try:
-                    # Check if this workflow has prompts
-                    workflow_path = asyncio.run(fs.get_prompt_template_path(variant))
-                    workflow_files = asyncio.run(fs.list_files(file_path=workflow_path))
-                    if workflow_files:
-                        prompt_files = [
-                            f for f in workflow_files if f.endswith((".md", ".jinja"))
-                        ]
-                        if prompt_files:
-                            workflows_with_prompts.append(
-                                {
-                                    "workflow": workflow,
-                                    "revision_id": variant,
-                                    "prompt_count": len(prompt_files),
-                                    "prompt_files": prompt_files,
-                                }
-                            )
-                            found_prompts = True
-                            break
+                    prompt_files = await _list_prompt_files(fs, revision_id)
                 except Exception as e:
                     logger.debug(
                         "Error checking workflow",
-                        workflow_variant=variant,
+                        workflow_variant=revision_id,
                         error=str(e),
                     )
-                    continue
 
-            # If we couldn't find prompts, still include the workflow
-            if not found_prompts:
+            if prompt_files:
+                workflows_with_prompts.append(
+                    {
+                        "workflow": workflow,
+                        "revision_id": revision_id,
+                        "prompt_count": len(prompt_files),
+                        "prompt_files": prompt_files,
+                    }
+                )
+            else:
+                # If we couldn't find prompts, still include the workflow
                 workflows_with_prompts.append(
                     {
                         "workflow": workflow,
@@ -151,7 +121,7 @@ def list_workflows_for_prompts(
 
 
 @router.get("/prompts/list/{revision_id}")
-def list_prompts_enhanced(
+async def list_prompts_enhanced(
     revision_id: str,
     request: Request,
     credentials: Annotated[
@@ -171,39 +141,14 @@ def list_prompts_enhanced(
         if revision_id != normalized_revision_id:
             revision_ids_to_try.append(revision_id.replace("_", "-"))
 
-        files = []
-        successful_revision_id = None
-
-        for rid in revision_ids_to_try:
-            try:
-                prompt_template_folder = asyncio.run(
-                    fs.get_prompt_template_path(revision_id=rid)
-                )
-                files_raw = asyncio.run(fs.list_files(file_path=prompt_template_folder))
-
-                # Filter to get only template files
-                potential_files = []
-                # Handle string response from list_files (newline-separated)
-                file_list = files_raw.split("\n") if files_raw else []
-                for f in file_list:
-                    if f and f.endswith((".md", ".jinja")):
-                        # For Azure Blob Storage, extract just the filename
-                        if "/" in f:
-                            filename = f.split("/")[-1]
-                        else:
-                            filename = f
-                        potential_files.append(filename)
-
-                if potential_files:
-                    files = sorted(potential_files)
-                    successful_revision_id = rid
-                    break
-
-            except Exception as e:
-                logger.debug(
-                    "Failed to list prompts for revision", revision_id=rid, error=str(e)
-                )
-                continue
+        successful_revision_id = await get_template_registry().resolve_revision(
+            fs, revision_id
+        )
+        files = (
+            await _list_prompt_files(fs, successful_revision_id)
+            if successful_revision_id is not None
+            else []
+        )
 
         if not files and not successful_revision_id:
             # Return empty result with helpful information
@@ -236,7 +181,7 @@ def list_prompts_enhanced(
 
 
 @router.get("/prompts/view/{revision_id}/{filename}")
-def view(
+async def view(
     revision_id: str,
     filename: str,
     request: Request,
@@ -245,12 +190,8 @@ def view(
     ],
     fs: FileStorage = Depends(igen_deps.get_file_storage_revisions),
 ) -> str:
-    prompt_template_folder = asyncio.run(
-        fs.get_prompt_template_path(revision_id=revision_id)
-    )
-    content = asyncio.run(
-        fs.read_file(file_name=filename, file_path=prompt_template_folder)
-    )
+    prompt_template_folder = await _resolve_template_folder(fs, revision_id)
+    content = await fs.read_file(file_name=filename, file_path=prompt_template_folder)
     return content
 
 
@@ -265,13 +206,24 @@ async def update(
     ],
     fs: FileStorage = Depends(igen_deps.get_file_storage_revisions),
 ) -> Dict[str, str]:
-    prompt_template_folder = await fs.get_prompt_template_path(revision_id=revision_id)
+    registry = get_template_registry()
+    resolved_revision_id = await registry.resolve_revision(fs, revision_id)
+    target_revision_id = resolved_revision_id or revision_id
+    prompt_template_folder = await fs.get_prompt_template_path(
+        revision_id=target_revision_id
+    )
     try:
-        await fs.write_file(
+        # Replace the file atomically so concurrent chat requests never read a
+        # partially written template
+        await fs.write_file_atomic(
             contents=update_request.content,
             file_name=filename,
             file_path=prompt_template_folder,
         )
+        registry.invalidate(revision_id=target_revision_id, file_name=filename)
+        if resolved_revision_id is None:
+            # A new revision folder may now exist under this name
+            registry.invalidate(revision_id=revision_id, file_name=filename)
         return {"message": "File updated successfully"}
     except Exception as e:
         logger.error(
@@ -282,3 +234,21 @@ async def update(
             exc_info=True,
         )
         raise HTTPException(status_code=500, detail="Failed to update file")
+
+
+async def _resolve_template_folder(fs: FileStorage, revision_id: str) -> str:
+    """Template folder for a revision, using the cached resolved spelling if any."""
+    resolved = await get_template_registry().resolve_revision(fs, revision_id)
+    return await fs.get_prompt_template_path(revision_id=resolved or revision_id)
+
+
+async def _list_prompt_files(fs: FileStorage, revision_id: str) -> List[str]:
+    """Sorted names of the prompt templates stored for a revision."""
+    prompt_template_folder = await fs.get_prompt_template_path(revision_id=revision_id)
+    return sorted(
+        [
+            entry.name
+            async for entry in fs.iter_files(prompt_template_folder)
+            if entry.name.endswith((".md", ".jinja"))
+        ]
+    )
@@ -0,0 +1,52 @@
+"""
+Constant-time HTTP Basic credential checks.
+
+Supplied and configured credentials are compared as fixed-length HMAC digests,
+so the comparison takes the same time regardless of where the values differ or
+how long they are, and both the username and password are always checked.
+The digests of the configured credentials are computed once and reused.
+"""
+
+import base64
+import hashlib
+import hmac
+import secrets
+from functools import lru_cache
+from typing import Tuple
+
+# Per-process key so digests are not comparable across processes
+_DIGEST_KEY = secrets.token_bytes(32)
+
+
+def _digest(value: str) -> bytes:
+    return hmac.new(_DIGEST_KEY, value.encode("utf-8"), hashlib.sha256).digest()
+
+
+@lru_cache(maxsize=8)
+def _expected_digests(username: str, password: str) -> Tuple[bytes, bytes]:
+    return _digest(username), _digest(password)
+
+
+def verify_basic_credentials(
+    username: str, password: str, expected_username: str, expected_password: str
+) -> bool:
+    """Check supplied credentials against the configured ones in constant time."""
+    expected_user, expected_pass = _expected_digests(
+        expected_username, expected_password
+    )
+    is_correct_username = hmac.compare_digest(_digest(username), expected_user)
+    is_correct_password = hmac.compare_digest(_digest(password), expected_pass)
+    # Bitwise and so both comparisons always run
+    return is_correct_username & is_correct_password
+
+
+def parse_basic_auth_header(auth_header: str) -> Tuple[str, str]:
+    """
+    Split a ``Basic`` Authorization header into username and password.
+
+    Raises:
+        ValueError: If the header is not valid base64 ``username:password``
+    """
+    credentials_str = base64.b64decode(auth_header[6:]).decode("utf-8")
+    username, password = credentials_str.split(":", 1)
+    return username, password
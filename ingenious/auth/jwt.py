@@ -1,11 +1,13 @@
 import os
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, MutableMapping, Optional
 
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
+from jose import jwt
 from passlib.context import CryptContext
 
+from ingenious.auth.token_verifier import TokenVerifier, VerifiedTokenCache
 from ingenious.core.structured_logging import get_logger
 
 logger = get_logger(__name__)
@@ -19,8 +21,27 @@ REFRESH_TOKEN_EXPIRE_DAYS = int(
     os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS") or "7"
 )  # 7 days
 
+# Optional local JWKS file with RS256/ES256 keys from an identity provider
+JWKS_FILE = os.getenv("JWT_JWKS_FILE") or None
+ISSUER = os.getenv("JWT_ISSUER") or None
+AUDIENCE = os.getenv("JWT_AUDIENCE") or None
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE") or "1024")
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_token_verifier = TokenVerifier(
+    secret_key=SECRET_KEY,
+    jwks_path=JWKS_FILE,
+    issuer=ISSUER,
+    audience=AUDIENCE,
+    cache=VerifiedTokenCache(max_entries=TOKEN_CACHE_SIZE),
+)
+
+
+def get_token_verifier() -> TokenVerifier:
+    """Get the process-wide token verifier."""
+    return _token_verifier
+
 
 def create_access_token(
     data: Dict[str, Any], expires_delta: Optional[timedelta] = None
@@ -48,42 +69,7 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
 
 def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
     """Verify and decode a JWT token"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-
-        # Check if token type matches expected type
-        if payload.get("type") != token_type:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Invalid token type. Expected {token_type}",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        # Check if token has expired
-        exp = payload.get("exp")
-        if exp is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token missing expiration",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        if datetime.utcnow().timestamp() > exp:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has expired",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        return dict(payload)
-
-    except JWTError as e:
-        logger.debug("JWT verification failed", error=str(e), token_type=token_type)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return _token_verifier.verify(token, token_type)
 
 
 def get_username_from_token(token: str) -> str:
@@ -99,6 +85,40 @@ def get_username_from_token(token: str) -> str:
     return str(username)
 
 
+# Key in the ASGI scope "state" holding the bearer token verified for a request
+BEARER_IDENTITY_STATE_KEY = "bearer_identity"
+
+
+@dataclass(frozen=True)
+class BearerIdentity:
+    """Outcome of verifying a request's bearer token."""
+
+    token: str
+    username: Optional[str]
+    error: Optional[HTTPException] = None
+
+
+def get_username_from_request_token(scope: MutableMapping[str, Any], token: str) -> str:
+    """
+    Extract the username from a bearer token, verifying it at most once per request.
+
+    The result is stored in the request scope state, so the request-context
+    middleware and the auth dependencies share a single decode.
+    """
+    state = scope.setdefault("state", {})
+    identity = state.get(BEARER_IDENTITY_STATE_KEY)
+    if identity is None or identity.token != token:
+        try:
+            identity = BearerIdentity(token, get_username_from_token(token))
+        except HTTPException as e:
+            identity = BearerIdentity(token, None, e)
+        state[BEARER_IDENTITY_STATE_KEY] = identity
+
+    if identity.error is not None:
+        raise identity.error
+    return str(identity.username)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return bool(pwd_context.verify(plain_password, hashed_password))
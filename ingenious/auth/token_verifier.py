@@ -0,0 +1,291 @@
+"""
+JWT verification with a verified-claims cache and JWKS key rotation.
+
+Tokens are accepted when signed either with the shared HS256 secret used by
+``ingenious.auth.jwt`` or with an RS256/ES256 key published in a local JWKS
+file (typically synced from an identity provider). The JWKS file is re-read
+when its modification time changes, so rotating keys only requires replacing
+the file.
+
+Verified claims are cached by SHA-256 of the token until the token expires (or
+``max_ttl`` elapses), so repeated requests with the same bearer token skip the
+signature check.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from jose import JWTError, jwk, jwt
+
+from ingenious.core import metrics
+from ingenious.core.structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+SYMMETRIC_ALGORITHMS = ("HS256",)
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+# Key type each asymmetric algorithm must be paired with
+_KEY_TYPES = {"RS256": "RSA", "ES256": "EC"}
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+@dataclass(frozen=True)
+class CachedClaims:
+    """Claims of a verified token and when the cache entry stops being valid."""
+
+    claims: Dict[str, Any]
+    expires_at: float
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified token claims keyed by token hash.
+
+    Entries are dropped once the token's ``exp`` passes or after ``max_ttl``
+    seconds, whichever is sooner, so revoked signing keys stop being honoured
+    within ``max_ttl``.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_ttl: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, CachedClaims]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                metrics.record_cache("jwt_claims", hit=False)
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                metrics.record_cache("jwt_claims", hit=False)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.record_cache("jwt_claims", hit=True)
+            return entry.claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self.key(token)
+        expires_at = min(float(claims["exp"]), time.time() + self.max_ttl)
+        with self._lock:
+            self._entries[key] = CachedClaims(claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters for diagnostics."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class JWKSKeyStore:
+    """
+    Public keys from a local JWKS file, reloaded when the file changes.
+
+    The file is stat-ed at most every ``refresh_interval`` seconds, and
+    immediately when a token references an unknown ``kid`` so freshly rotated
+    keys are picked up on first use.
+    """
+
+    def __init__(self, path: str, refresh_interval: float = 30.0) -> None:
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._keys: Dict[str, Tuple[str, Any]] = {}
+        self._mtime_ns: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.on_rotate: Optional[Any] = None
+
+    def _load(self) -> None:
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError:
+            logger.warning("JWKS file not found", path=self.path)
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+
+        try:
+            keys = self._read_keys()
+        except (ValueError, OSError, AttributeError, TypeError) as e:
+            # Malformed or half-written: keep the current keys and retry the
+            # file at the next check
+            logger.warning(
+                "Could not read JWKS file, keeping current keys",
+                path=self.path,
+                error=str(e),
+            )
+            return
+
+        removed = set(self._keys) - set(keys)
+        self._keys = keys
+        self._mtime_ns = mtime_ns
+        logger.info("JWKS keys loaded", path=self.path, kids=sorted(keys))
+        if removed and self.on_rotate is not None:
+            self.on_rotate(removed)
+
+    def _read_keys(self) -> Dict[str, Tuple[str, Any]]:
+        with open(self.path, encoding="utf-8") as f:
+            jwks = json.load(f)
+
+        keys: Dict[str, Tuple[str, Any]] = {}
+        for entry in jwks.get("keys", []):
+            kid = entry.get("kid")
+            alg = entry.get("alg") or (
+                "RS256" if entry.get("kty") == "RSA" else "ES256"
+            )
+            if not kid or alg not in ASYMMETRIC_ALGORITHMS:
+                continue
+            if entry.get("kty") != _KEY_TYPES[alg]:
+                continue
+            try:
+                keys[kid] = (alg, jwk.construct(entry, alg))
+            except Exception as e:
+                logger.warning("Skipping invalid JWKS key", kid=kid, error=str(e))
+        return keys
+
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            self._load()
+
+    def get(self, kid: str, alg: str) -> Any:
+        """
+        Return the verification key for ``kid``, which must be registered for ``alg``.
+
+        Raises:
+            HTTPException: If no matching key exists after a reload check
+        """
+        self.refresh()
+        if kid not in self._keys:
+            self.refresh(force=True)
+        entry = self._keys.get(kid)
+        if entry is None or entry[0] != alg:
+            raise _unauthorized("Could not validate credentials")
+        return entry[1]
+
+    def kids(self) -> Iterable[str]:
+        return sorted(self._keys)
+
+
+class TokenVerifier:
+    """
+    Verify JWTs signed with the shared secret or a JWKS key, caching the claims.
+
+    Args:
+        secret_key: HS256 secret for tokens issued by this service
+        jwks_path: Optional JWKS file with RS256/ES256 public keys
+        issuer: Required ``iss`` claim for asymmetric tokens, if set
+        audience: Required ``aud`` claim for asymmetric tokens, if set
+        cache: Claims cache (a default-sized one is created when omitted)
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        jwks_path: Optional[str] = None,
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None,
+        cache: Optional[VerifiedTokenCache] = None,
+    ) -> None:
+        self.secret_key = secret_key
+        self.issuer = issuer
+        self.audience = audience
+        self.cache = cache if cache is not None else VerifiedTokenCache()
+        self.key_store = JWKSKeyStore(jwks_path) if jwks_path else None
+        if self.key_store is not None:
+            # Tokens signed by a retired key must not outlive it in the cache
+            self.key_store.on_rotate = lambda removed: self.cache.clear()
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        header = jwt.get_unverified_header(token)
+        alg = header.get("alg")
+
+        if alg in SYMMETRIC_ALGORITHMS:
+            return dict(jwt.decode(token, self.secret_key, algorithms=[alg]))
+
+        if alg in ASYMMETRIC_ALGORITHMS and self.key_store is not None:
+            key = self.key_store.get(str(header.get("kid", "")), alg)
+            claims = dict(
+                jwt.decode(
+                    token,
+                    key,
+                    algorithms=[alg],
+                    audience=self.audience,
+                    issuer=self.issuer,
+                    options={"verify_aud": self.audience is not None},
+                )
+            )
+            # Identity provider access tokens carry no "type" claim
+            claims.setdefault("type", "access")
+            return claims
+
+        raise JWTError(f"Unsupported token algorithm: {alg}")
+
+    def verify(self, token: str, token_type: str = "access") -> Dict[str, Any]:
+        """
+        Verify and decode a JWT token.
+
+        Raises:
+            HTTPException: 401 if the token is invalid, expired or of another type
+        """
+        payload = self.cache.get(token)
+        if payload is None:
+            try:
+                payload = self._decode(token)
+            except JWTError as e:
+                logger.debug(
+                    "JWT verification failed", error=str(e), token_type=token_type
+                )
+                raise _unauthorized("Could not validate credentials")
+
+            # Check if token has expired
+            exp = payload.get("exp")
+            if exp is None:
+                raise _unauthorized("Token missing expiration")
+            if time.time() > float(exp):
+                raise _unauthorized("Token has expired")
+
+            self.cache.put(token, payload)
+
+        # Check if token type matches expected type
+        if payload.get("type") != token_type:
+            raise _unauthorized(f"Invalid token type. Expected {token_type}")
+
+        return dict(payload)
@@ -37,6 +37,9 @@ Common Commands:
 Data Processing:
   dataprep, document-processing
 
+Performance:
+  loadtest, profile-startup
+
 Get help for any command with: ingen <command> --help
     """.strip(),
 )
@@ -62,6 +65,7 @@ registry = get_registry(console)
 # Import command modules to register them with the app
 from . import (
     help_commands,
+    profile_commands,
     project_commands,
     server_commands,
     test_commands,
@@ -74,6 +78,7 @@ project_commands.register_commands(app, console)
 test_commands.register_commands(app, console)
 workflow_commands.register_commands(app, console)
 help_commands.register_commands(app, console)
+profile_commands.register_commands(app, console)
 
 # Discover additional commands
 registry.discover_commands(
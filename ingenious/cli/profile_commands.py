@@ -0,0 +1,118 @@
+"""
+Startup profiling CLI commands for Insight Ingenious.
+
+This module contains the command that reports where CLI and API startup
+time goes.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import typer
+from rich.console import Console
+from typing_extensions import Annotated
+
+
+def register_commands(app: typer.Typer, console: Console) -> None:
+    """Register profiling commands with the typer app."""
+
+    @app.command(
+        name="profile-startup", help="Profile import and startup time of the API"
+    )
+    def profile_startup(
+        module: Annotated[
+            str,
+            typer.Option("--module", "-m", help="Module whose import is profiled"),
+        ] = "ingenious.main",
+        top: Annotated[
+            int, typer.Option("--top", help="Number of slowest modules to show")
+        ] = 15,
+        imports_only: Annotated[
+            bool,
+            typer.Option(
+                "--imports-only", help="Skip starting the app, only profile imports"
+            ),
+        ] = False,
+        as_json: Annotated[
+            bool, typer.Option("--json", help="Print the report as JSON")
+        ] = False,
+        budget: Annotated[
+            Optional[float],
+            typer.Option(
+                "--budget",
+                help="Exit with status 1 if the import takes longer (seconds)",
+            ),
+        ] = None,
+    ) -> None:
+        """
+        ⏱️ Show where startup time goes.
+
+        Imports the module in a fresh interpreter under `python -X importtime`
+        and lists the slowest packages and modules, then starts the API in a
+        fresh interpreter and times each startup phase.
+
+        Examples:
+          ingen profile-startup                          # Profile the API
+          ingen profile-startup -m ingenious.cli.main    # Profile the CLI
+          ingen profile-startup --imports-only --budget 2
+        """
+        import json
+
+        from rich.table import Table
+
+        from ingenious.core import startup_profile
+
+        try:
+            imports = startup_profile.profile_imports(module)
+        except RuntimeError as e:
+            console.print(f"[error]{e}[/error]")
+            raise typer.Exit(1)
+        startup = None if imports_only else startup_profile.profile_startup()
+
+        if as_json:
+            console.print_json(
+                json.dumps(
+                    {
+                        "module": module,
+                        "import_seconds": imports.total_seconds,
+                        "packages_ms": {
+                            name: us / 1000
+                            for name, us in list(imports.by_package().items())[:top]
+                        },
+                        "startup": startup,
+                    }
+                )
+            )
+        else:
+            console.print(
+                f"[info]Imported {module} in {imports.total_seconds:.2f}s "
+                f"({len(imports.modules)} modules)[/info]"
+            )
+            packages = Table("Package", "Self (ms)", title="Slowest packages")
+            for name, us in list(imports.by_package().items())[:top]:
+                packages.add_row(name, f"{us / 1000:.1f}")
+            console.print(packages)
+
+            modules = Table("Module", "Cumulative (ms)", title="Slowest modules")
+            for timing in imports.slowest_modules(top):
+                modules.add_row(timing.module, f"{timing.cumulative_us / 1000:.1f}")
+            console.print(modules)
+
+            if startup is not None:
+                phases = Table("Phase", "Time (ms)", title="API startup")
+                for name, seconds in startup["phases"].items():
+                    phases.add_row(name, f"{seconds * 1000:.1f}")
+                phases.add_row("total (process)", f"{startup['total'] * 1000:.1f}")
+                console.print(phases)
+                if "error" in startup:
+                    console.print(
+                        f"[warning]Startup stopped early: {startup['error']}[/warning]"
+                    )
+
+        if budget is not None and imports.total_seconds > budget:
+            console.print(
+                f"[error]Import took {imports.total_seconds:.2f}s, "
+                f"over the {budget:.2f}s budget[/error]"
+            )
+            raise typer.Exit(1)
@@ -68,6 +68,15 @@ def register_commands(app: typer.Typer, console: Console) -> None:
                 "--no-prompt-tuner", help="Disable the prompt tuner interface"
             ),
         ] = False,
+        workers: Annotated[
+            Optional[int],
+            typer.Option(
+                "--workers",
+                "-w",
+                min=1,
+                help="Number of worker processes (default: INGENIOUS_WEB_CONFIGURATION__SERVER__WORKERS or 1)",
+            ),
+        ] = None,
     ) -> None:
         """
         🚀 Start the Insight Ingenious API server with web interface.
@@ -96,6 +105,10 @@ def register_commands(app: typer.Typer, console: Console) -> None:
             -H "Content-Type: application/json" \\
             -d '{{"user_prompt": "Hello", "conversation_flow": "classification-agent"}}'
 
+        MULTIPLE WORKERS:
+          ingen serve --workers 4 runs four processes behind one port. Send
+          SIGHUP to the main process to restart workers gracefully.
+
         For detailed configuration: ingen workflows --help
         """
         return run_rest_api_server(
@@ -103,6 +116,7 @@ def register_commands(app: typer.Typer, console: Console) -> None:
             profile_dir=profile,
             host=host,
             port=port,
+            workers=workers,
         )
 
     # Keep old command for backward compatibility
@@ -128,6 +142,14 @@ def register_commands(app: typer.Typer, console: Console) -> None:
             int,
             typer.Argument(help="The port to run the server on. Default is 80."),
         ] = 80,
+        workers: Annotated[
+            Optional[int],
+            typer.Option(
+                "--workers",
+                min=1,
+                help="Number of worker processes. Default comes from the configuration.",
+            ),
+        ] = None,
     ) -> None:
         """
         Run a FastAPI server that presents your agent workflows via REST endpoints.
@@ -204,7 +226,8 @@ def register_commands(app: typer.Typer, console: Console) -> None:
                 del os.environ["INGENIOUS_PROFILE_PATH"]
         import ingenious.config.config as ingen_config
 
-        config = ingen_config.get_config()
+        # Copy so the CLI overrides below leave the shared snapshot untouched
+        config = ingen_config.get_config().model_copy(deep=True)
 
         # Note: prompt tuner functionality has been removed
 
@@ -218,6 +241,9 @@ def register_commands(app: typer.Typer, console: Console) -> None:
             config.web_configuration.port = port
         # Otherwise, let the configuration system use INGENIOUS_WEB_CONFIGURATION__PORT
 
+        if workers is not None:
+            config.web_configuration.server.workers = workers
+
         # We need to clean this up and probably separate overall system config from fast api, eg. set the config here in cli and then pass it to FastAgentAPI
         # As soon as we import FastAgentAPI, config will be loaded hence to ensure that the environment variables above are loaded first we need to import FastAgentAPI after setting the environment variables
         from ingenious.main import FastAgentAPI
@@ -267,6 +293,16 @@ def register_commands(app: typer.Typer, console: Console) -> None:
             "ingenious.services.chat_services.multi_agent.conversation_flows"
         )
 
+        if config.web_configuration.server.workers > 1:
+            from ingenious.main.workers import run_workers
+
+            run_workers(
+                config,
+                host=config.web_configuration.ip_address,
+                port=config.web_configuration.port,
+            )
+            return
+
         fast_agent_api = FastAgentAPI(config)
 
         # Access the FastAPI app instance
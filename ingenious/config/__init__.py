@@ -6,7 +6,8 @@ maintaining backward compatibility while exposing a clean interface.
 
 Public API:
     - IngeniousSettings: Main configuration class
-    - get_config(): Get configuration instance
+    - get_config(): Get the process-wide settings snapshot
+    - reload_settings() / on_settings_change(): Reload settings and react to changes
     - Various configuration model classes for type hints
 """
 
@@ -15,24 +16,50 @@ from .main_settings import IngeniousSettings
 from .models import (
     AzureSearchSettings,
     AzureSqlSettings,
+    ChatAdmissionSettings,
+    ChatBatchSettings,
     ChatHistorySettings,
+    ChatJobSettings,
     ChatServiceSettings,
+    CompressionSettings,
     FileStorageContainerSettings,
     FileStorageSettings,
+    IdempotencySettings,
     LocalSqlSettings,
     LoggingSettings,
+    MetricsSettings,
     ModelSettings,
     ReceiverSettings,
+    ServerProcessSettings,
+    StageTimingSettings,
     ToolServiceSettings,
+    TracingSettings,
+    WarmupSettings,
     WebAuthenticationSettings,
     WebSettings,
 )
+from .snapshot import (
+    changed_sections,
+    get_settings,
+    load_settings,
+    on_settings_change,
+    reload_settings,
+    remove_settings_listener,
+    reset_settings,
+)
 
 __all__ = [
     # Main settings class
     "IngeniousSettings",
     # Factory functions
     "get_config",
+    "get_settings",
+    "load_settings",
+    "reload_settings",
+    "reset_settings",
+    "on_settings_change",
+    "remove_settings_listener",
+    "changed_sections",
     "load_from_env_file",
     "create_minimal_config",
     # Configuration models
@@ -41,10 +68,20 @@ __all__ = [
     "ChatServiceSettings",
     "ToolServiceSettings",
     "LoggingSettings",
+    "TracingSettings",
     "AzureSearchSettings",
     "AzureSqlSettings",
     "WebAuthenticationSettings",
     "WebSettings",
+    "ChatAdmissionSettings",
+    "IdempotencySettings",
+    "ChatBatchSettings",
+    "ChatJobSettings",
+    "CompressionSettings",
+    "ServerProcessSettings",
+    "MetricsSettings",
+    "StageTimingSettings",
+    "WarmupSettings",
     "LocalSqlSettings",
     "FileStorageContainerSettings",
     "FileStorageSettings",
@@ -54,13 +91,11 @@ __all__ = [
 
 def get_config(project_path: str = "") -> IngeniousSettings:
     """
-    Get configuration using pydantic-settings system.
+    Get the process-wide settings snapshot.
 
-    This function provides configuration management that:
-    - Automatically loads environment variables
-    - Supports .env files
-    - Provides validation with helpful error messages
-    - Uses nested configuration models
+    The settings are loaded from the environment and ``.env`` files and
+    validated on the first call; later calls return the same object until
+    ``reload_settings()`` replaces it.
 
     Args:
         project_path: Optional project path (for backward compatibility)
@@ -68,14 +103,4 @@ def get_config(project_path: str = "") -> IngeniousSettings:
     Returns:
         IngeniousSettings: The loaded and validated configuration
     """
-    from ingenious.core.structured_logging import get_logger
-
-    logger = get_logger(__name__)
-
-    try:
-        settings = IngeniousSettings()
-        settings.validate_configuration()
-        return settings
-    except Exception as e:
-        logger.error(f"Failed to load configuration: {e}")
-        raise
+    return get_settings()
@@ -1,9 +1,7 @@
 import os
 
-from azure.identity import DefaultAzureCredential
-from azure.keyvault.secrets import SecretClient
-
 from ingenious.config import IngeniousSettings
+from ingenious.config.snapshot import get_settings
 from ingenious.core.structured_logging import get_logger
 
 logger = get_logger(__name__)
@@ -12,6 +10,10 @@ logger = get_logger(__name__)
 def get_kv_secret(secretName: str) -> str:
     # check if the key vault name is set in the environment variables
     if "KEY_VAULT_NAME" in os.environ:
+        # The Azure SDKs are slow to import, so only load them when used
+        from azure.identity import DefaultAzureCredential
+        from azure.keyvault.secrets import SecretClient
+
         keyVaultName = os.environ["KEY_VAULT_NAME"]
         KVUri = f"https://{keyVaultName}.vault.azure.net"
         credential = DefaultAzureCredential()
@@ -24,13 +26,11 @@ def get_kv_secret(secretName: str) -> str:
 
 def get_config(project_path: str = "") -> IngeniousSettings:
     """
-    Get configuration using pydantic-settings system.
+    Get the process-wide settings snapshot.
 
-    This function provides configuration management that:
-    - Automatically loads environment variables
-    - Supports .env files
-    - Provides validation with helpful error messages
-    - Uses nested configuration models
+    The settings are loaded from the environment and ``.env`` files and
+    validated on the first call; later calls return the same object until
+    ``ingenious.config.reload_settings()`` replaces it.
 
     Args:
         project_path: Optional project path (for backward compatibility)
@@ -38,10 +38,4 @@ def get_config(project_path: str = "") -> IngeniousSettings:
     Returns:
         IngeniousSettings: The loaded and validated configuration
     """
-    try:
-        settings = IngeniousSettings()
-        settings.validate_configuration()
-        return settings
-    except Exception as e:
-        logger.error(f"Failed to load configuration: {e}")
-        raise
+    return get_settings()
@@ -23,6 +23,7 @@ from .models import (
     ModelSettings,
     ReceiverSettings,
     ToolServiceSettings,
+    TracingSettings,
     WebSettings,
 )
 from .validators import validate_configuration, validate_models_not_empty
@@ -66,6 +67,11 @@ class IngeniousSettings(BaseSettings):
         description="Application logging configuration",
     )
 
+    tracing: TracingSettings = Field(
+        default_factory=lambda: TracingSettings(),
+        description="OpenTelemetry tracing configuration",
+    )
+
     tool_service: ToolServiceSettings = Field(
         default_factory=lambda: ToolServiceSettings(),
         description="External tool service configuration",
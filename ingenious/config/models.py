@@ -5,6 +5,8 @@ This module contains all the BaseModel classes that define
 the structure and validation for different configuration sections.
 """
 
+from typing import Dict, List
+
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -86,6 +88,22 @@ class ChatServiceSettings(BaseModel):
         "multi_agent",
         description="Chat service type: 'multi_agent' for agent workflows",
     )
+    max_parallel_agents: int = Field(
+        4,
+        description="Agents of one request that may call the model at the same time",
+    )
+    agent_timeout_seconds: float = Field(
+        120.0,
+        description="Time allowed for one agent's model calls before it is skipped",
+    )
+
+    @field_validator("max_parallel_agents")
+    @classmethod
+    def validate_max_parallel_agents(cls, v: int) -> int:
+        """Validate that at least one agent can run."""
+        if v < 1:
+            raise ValueError("max_parallel_agents must be at least 1")
+        return v
 
 
 class ToolServiceSettings(BaseModel):
@@ -112,6 +130,20 @@ class LoggingSettings(BaseModel):
         "info",
         description="Application logger level: 'debug', 'info', 'warning', 'error'",
     )
+    json_output: bool = Field(
+        False, description="Write JSON log lines instead of console formatting"
+    )
+    async_sink: bool = Field(
+        True, description="Write log lines from a background thread"
+    )
+    metrics_interval_seconds: float = Field(
+        5.0,
+        description="How often process memory/CPU is sampled for log lines (0 = off)",
+    )
+    sample_rates: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Fraction of each named debug/info log event to keep",
+    )
 
     @field_validator("root_log_level", "log_level")
     @classmethod
@@ -123,6 +155,45 @@ class LoggingSettings(BaseModel):
         return v.lower()
 
 
+class TracingSettings(BaseModel):
+    """Configuration for OpenTelemetry tracing.
+
+    Off by default. When enabled, spans are recorded for API requests, flow
+    dispatch, agent model calls, tool calls, chat history queries and file
+    storage operations. Requires the ``opentelemetry-sdk`` package (``tracing``
+    extra); the OTLP exporter also needs ``opentelemetry-exporter-otlp``.
+    """
+
+    enable: bool = Field(False, description="Record and export trace spans")
+    service_name: str = Field(
+        "ingenious", description="service.name resource attribute on every span"
+    )
+    exporter: str = Field(
+        "otlp", description="Span exporter: 'otlp', 'console' or 'memory'"
+    )
+    otlp_endpoint: str = Field(
+        "",
+        description="OTLP gRPC endpoint (empty = OTEL_EXPORTER_OTLP_ENDPOINT or the SDK default)",
+    )
+    sample_ratio: float = Field(
+        1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of new traces to record; incoming traceparent decisions are kept",
+    )
+
+    @field_validator("exporter")
+    @classmethod
+    def validate_exporter(cls, v: str) -> str:
+        """Validate the exporter name."""
+        valid_exporters = {"otlp", "console", "memory"}
+        if v.lower() not in valid_exporters:
+            raise ValueError(
+                f"Tracing exporter must be one of: {', '.join(sorted(valid_exporters))}"
+            )
+        return v.lower()
+
+
 class AzureSearchSettings(BaseModel):
     """Configuration for Azure Cognitive Search integration.
 
@@ -158,6 +229,295 @@ class WebAuthenticationSettings(BaseModel):
     type: str = Field(
         "basic", description="Authentication type: 'basic' for HTTP basic auth"
     )
+    admin_users: List[str] = Field(
+        default_factory=list,
+        description="Users allowed to call admin endpoints; none when empty",
+    )
+
+
+class ChatAdmissionSettings(BaseModel):
+    """Admission control for chat endpoints.
+
+    Limits how many chat requests a worker runs at once so a slow LLM backend
+    produces fast 429/503 responses instead of an unbounded pile-up of requests
+    holding connections and memory.
+    """
+
+    enable: bool = Field(True, description="Enable admission control for chat")
+    max_concurrent: int = Field(
+        64, description="Maximum chat requests running at once per worker"
+    )
+    max_queue: int = Field(
+        128, description="Maximum requests waiting for a slot before rejecting"
+    )
+    queue_timeout_seconds: float = Field(
+        10.0, description="Longest a request waits for a slot before a 503"
+    )
+    per_user_limit: int = Field(
+        8, description="Maximum concurrent chat requests per user (0 = unlimited)"
+    )
+    per_flow_limit: int = Field(
+        0,
+        description="Maximum concurrent requests per conversation flow (0 = unlimited)",
+    )
+    retry_after_seconds: int = Field(
+        1, description="Minimum Retry-After value sent with rejections"
+    )
+    adaptive: bool = Field(
+        False,
+        description="Shrink the concurrency limit when latency exceeds the target",
+    )
+    target_latency_seconds: float = Field(
+        30.0, description="Latency above which the adaptive limit is reduced"
+    )
+    min_concurrent: int = Field(
+        4, description="Lower bound for the adaptive concurrency limit"
+    )
+
+    @field_validator("max_concurrent", "min_concurrent")
+    @classmethod
+    def validate_positive(cls, v: int) -> int:
+        """Validate that concurrency limits are positive."""
+        if v < 1:
+            raise ValueError("Concurrency limits must be at least 1")
+        return v
+
+
+class IdempotencySettings(BaseModel):
+    """Idempotency-Key handling for chat submissions.
+
+    Retries carrying the same ``Idempotency-Key`` attach to the in-flight
+    execution or replay the stored response instead of re-running the flow.
+    """
+
+    enable: bool = Field(True, description="Honour Idempotency-Key on chat requests")
+    store_type: str = Field(
+        "memory",
+        description="Where responses are kept: 'memory' (per worker) or 'sqlite'",
+    )
+    database_path: str = Field(
+        "./tmp/idempotency.db", description="SQLite file used when store_type is sqlite"
+    )
+    ttl_seconds: int = Field(
+        86400, description="How long a stored response can be replayed"
+    )
+    pending_ttl_seconds: float = Field(
+        600,
+        description="How long a request in progress holds its key against other workers",
+    )
+    poll_interval_seconds: float = Field(
+        0.5,
+        description="How often a worker waiting on another worker's request checks for its response",
+    )
+    max_entries: int = Field(
+        10000, description="Maximum responses kept by the in-memory store"
+    )
+
+    @field_validator("store_type")
+    @classmethod
+    def validate_store_type(cls, v: str) -> str:
+        """Validate the idempotency store type."""
+        v = v.lower()
+        if v not in ("memory", "sqlite"):
+            raise ValueError("store_type must be 'memory' or 'sqlite'")
+        return v
+
+
+class ChatBatchSettings(BaseModel):
+    """Limits for the batch chat endpoint."""
+
+    max_items: int = Field(1000, description="Maximum chat requests in one batch")
+    max_concurrency: int = Field(
+        16, description="Upper bound for items of one batch run at the same time"
+    )
+    default_concurrency: int = Field(
+        4, description="Items run at the same time when the client does not say"
+    )
+
+    @field_validator("max_items", "max_concurrency", "default_concurrency")
+    @classmethod
+    def validate_positive(cls, v: int) -> int:
+        """Validate that batch limits are positive."""
+        if v < 1:
+            raise ValueError("Batch limits must be at least 1")
+        return v
+
+
+class ChatJobSettings(BaseModel):
+    """Background job queue for long-running chat flows.
+
+    Jobs are kept in a local SQLite database so queued and interrupted jobs
+    survive worker restarts; no external broker is needed.
+    """
+
+    enable: bool = Field(True, description="Enable the /chat/jobs endpoints")
+    database_path: str = Field(
+        "./tmp/chat_jobs.db", description="SQLite file holding the job queue"
+    )
+    workers: int = Field(2, description="Jobs run at the same time per worker process")
+    poll_interval_seconds: float = Field(
+        0.5, description="How often idle job workers check the queue"
+    )
+    lease_seconds: float = Field(
+        60.0,
+        description="A running job whose worker stops renewing it for this long is retried",
+    )
+    max_attempts: int = Field(
+        3, description="Attempts before an interrupted job is marked failed"
+    )
+    retention_seconds: int = Field(
+        86400, description="How long finished jobs and their events are kept"
+    )
+
+    @field_validator("workers", "max_attempts")
+    @classmethod
+    def validate_positive(cls, v: int) -> int:
+        """Validate that worker and attempt counts are positive."""
+        if v < 1:
+            raise ValueError("Job worker and attempt counts must be at least 1")
+        return v
+
+
+class CompressionSettings(BaseModel):
+    """Response compression negotiated from ``Accept-Encoding``.
+
+    Buffered responses are compressed once they reach ``minimum_size`` bytes.
+    Streaming responses are flushed after every chunk, so SSE frames are not
+    held back by the compressor.
+    """
+
+    enable: bool = Field(
+        True, description="Compress responses for clients that accept it"
+    )
+    minimum_size: int = Field(
+        1024, description="Smallest response body, in bytes, worth compressing"
+    )
+    encodings: List[str] = Field(
+        default_factory=lambda: ["zstd", "br", "gzip"],
+        description="Encodings in order of preference; zstd and br need their optional packages",
+    )
+    gzip_level: int = Field(6, description="gzip compression level (1-9)")
+    brotli_quality: int = Field(4, description="Brotli quality (0-11)")
+    zstd_level: int = Field(3, description="Zstandard compression level (1-22)")
+    compress_streams: bool = Field(
+        True, description="Compress streaming responses such as /chat/stream"
+    )
+
+    @field_validator("encodings")
+    @classmethod
+    def validate_encodings(cls, v: List[str]) -> List[str]:
+        """Validate the compression encodings."""
+        v = [encoding.lower() for encoding in v]
+        unknown = set(v) - {"zstd", "br", "gzip"}
+        if unknown:
+            raise ValueError(f"Unsupported encodings: {sorted(unknown)}")
+        return v
+
+
+class ServerProcessSettings(BaseModel):
+    """Process model for ``ingen serve``.
+
+    With more than one worker the app and flow registry are validated in the
+    parent once, then each worker process builds its own app. Caches that are
+    per process are listed in the configuration guide.
+    """
+
+    workers: int = Field(1, description="Number of server worker processes")
+    max_requests: int = Field(
+        0,
+        description="Restart a worker after this many requests (0 = never)",
+    )
+    graceful_shutdown_seconds: int = Field(
+        30, description="Time allowed for in-flight requests when a worker stops"
+    )
+
+    @field_validator("workers")
+    @classmethod
+    def validate_workers(cls, v: int) -> int:
+        """Validate that at least one worker runs."""
+        if v < 1:
+            raise ValueError("Server worker count must be at least 1")
+        return v
+
+
+class MetricsSettings(BaseModel):
+    """Prometheus metrics exposed for scraping.
+
+    Needs the ``prometheus-client`` package; without it nothing is recorded.
+    With several workers, values from every worker are aggregated through
+    ``PROMETHEUS_MULTIPROC_DIR``.
+    """
+
+    enable: bool = Field(True, description="Record metrics and serve them")
+    path: str = Field("/metrics", description="Path of the scrape endpoint")
+
+
+class StageTimingSettings(BaseModel):
+    """Per-stage request timing (auth, history load, model calls, tools, ...).
+
+    Stage durations always feed the ``ingenious_request_stage_duration_seconds``
+    histogram while enabled. Returning them to clients is opt-in, since they
+    reveal how a flow is put together.
+    """
+
+    enable: bool = Field(True, description="Time request stages")
+    server_timing_header: bool = Field(
+        False, description="Add a Server-Timing header to responses"
+    )
+    response_field: bool = Field(
+        False,
+        description="Include stage timings in chat responses and the stream's done event",
+    )
+
+
+class WarmupSettings(BaseModel):
+    """Warm-up run by each worker once the app has started.
+
+    Loads what the first requests would otherwise pay for on the request
+    path: tokenizers, the chat history schema and connection pool, model
+    clients and retrieval indexes. ``/api/v1/health/ready`` answers 503
+    until it has finished, while ``/api/v1/health/live`` only reports that
+    the process is up.
+    """
+
+    enable: bool = Field(True, description="Warm up caches and clients at startup")
+    wait: bool = Field(
+        False,
+        description="Finish warm-up before accepting requests instead of in the background",
+    )
+    steps: List[str] = Field(
+        default_factory=lambda: [
+            "tokenizers",
+            "chat_history",
+            "llm_clients",
+            "retrieval",
+        ],
+        description="Warm-up steps to run, in order",
+    )
+    step_timeout_seconds: float = Field(
+        30.0, description="Time allowed for each warm-up step"
+    )
+    synthetic_requests: bool = Field(
+        False,
+        description="Send one chat request through each flow; this calls the model",
+    )
+    synthetic_flows: List[str] = Field(
+        default_factory=list,
+        description="Flows that get a synthetic request; empty means every loaded flow",
+    )
+    synthetic_prompt: str = Field(
+        "Hello", description="User prompt of the synthetic requests"
+    )
+
+    @field_validator("steps")
+    @classmethod
+    def validate_steps(cls, v: List[str]) -> List[str]:
+        """Validate the warm-up step names."""
+        v = [step.lower() for step in v]
+        unknown = set(v) - {"tokenizers", "chat_history", "llm_clients", "retrieval"}
+        if unknown:
+            raise ValueError(f"Unknown warm-up steps: {sorted(unknown)}")
+        return v
 
 
 class WebSettings(BaseModel):
@@ -188,6 +548,15 @@ class WebSettings(BaseModel):
         50, description="Delay between streaming chunks in milliseconds"
     )
     authentication: WebAuthenticationSettings = WebAuthenticationSettings()
+    admission: ChatAdmissionSettings = ChatAdmissionSettings()
+    idempotency: IdempotencySettings = IdempotencySettings()
+    batch: ChatBatchSettings = ChatBatchSettings()
+    jobs: ChatJobSettings = ChatJobSettings()
+    compression: CompressionSettings = CompressionSettings()
+    server: ServerProcessSettings = ServerProcessSettings()
+    metrics: MetricsSettings = MetricsSettings()
+    timing: StageTimingSettings = StageTimingSettings()
+    warmup: WarmupSettings = WarmupSettings()
 
     @field_validator("port")
     @classmethod
@@ -247,6 +616,44 @@ class FileStorageContainerSettings(BaseModel):
         "default_credential",
         description="Authentication method for Azure: 'default_credential', 'msi', etc.",
     )
+    max_concurrency: int = Field(
+        4,
+        description="Parallel connections used for a single blob transfer (Azure only)",
+    )
+    bulk_concurrency: int = Field(
+        8, description="Maximum files transferred at once by read_many/write_many"
+    )
+    max_single_put_size: int = Field(
+        8 * 1024 * 1024,
+        description="Largest upload in bytes sent as a single request (Azure only)",
+    )
+    max_block_size: int = Field(
+        4 * 1024 * 1024,
+        description="Block size in bytes for chunked uploads (Azure only)",
+    )
+    max_single_get_size: int = Field(
+        4 * 1024 * 1024,
+        description="Size in bytes of the first download request (Azure only)",
+    )
+    max_chunk_get_size: int = Field(
+        4 * 1024 * 1024,
+        description="Chunk size in bytes for subsequent download requests (Azure only)",
+    )
+
+    @field_validator(
+        "max_concurrency",
+        "bulk_concurrency",
+        "max_single_put_size",
+        "max_block_size",
+        "max_single_get_size",
+        "max_chunk_get_size",
+    )
+    @classmethod
+    def validate_positive(cls, v: int) -> int:
+        """Validate transfer tuning values are positive."""
+        if v < 1:
+            raise ValueError("Transfer settings must be positive integers")
+        return v
 
 
 class FileStorageSettings(BaseModel):
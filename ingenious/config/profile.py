@@ -5,8 +5,6 @@ from pathlib import Path
 from typing import Any, Optional
 
 import yaml
-from azure.identity import DefaultAzureCredential
-from azure.keyvault.secrets import SecretClient
 from pydantic import ValidationError
 
 from ingenious.models import profile as profile_models
@@ -230,6 +228,10 @@ def get_kv_secret(secretName: str) -> str:
     except KeyError:
         raise ValueError("KEY_VAULT_NAME environment variable not set")
 
+    # The Azure SDKs are slow to import, so only load them when used
+    from azure.identity import DefaultAzureCredential
+    from azure.keyvault.secrets import SecretClient
+
     KVUri = f"https://{keyVaultName}.vault.azure.net"
     credential = DefaultAzureCredential()
     client = SecretClient(vault_url=KVUri, credential=credential)
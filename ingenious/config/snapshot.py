@@ -0,0 +1,117 @@
+"""
+Process-wide settings snapshot.
+
+Building ``IngeniousSettings`` reads the environment and ``.env`` and runs
+every validator, so it is done once: the first ``get_settings()`` call (in
+the server, during startup) loads and validates the settings, and later
+calls return that same object. The snapshot is shared by every request and
+thread, so treat it as read-only; copy it with ``model_copy(deep=True)``
+before changing values.
+
+``reload_settings()`` builds and validates a fresh snapshot, swaps it in and
+calls the listeners registered with ``on_settings_change`` with the old and
+new settings, so caches built from the settings can drop what is stale. If
+the new settings do not validate, the current snapshot stays in place.
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+from ingenious.core.structured_logging import get_logger
+
+from .main_settings import IngeniousSettings
+
+logger = get_logger(__name__)
+
+SettingsListener = Callable[[IngeniousSettings, IngeniousSettings], None]
+
+_settings: Optional[IngeniousSettings] = None
+_lock = threading.Lock()
+_listeners: List[SettingsListener] = []
+
+
+def load_settings() -> IngeniousSettings:
+    """Build and validate settings from the environment, bypassing the snapshot."""
+    try:
+        settings = IngeniousSettings()
+        settings.validate_configuration()
+        return settings
+    except Exception as e:
+        logger.error(f"Failed to load configuration: {e}")
+        raise
+
+
+def get_settings() -> IngeniousSettings:
+    """Return the settings snapshot, loading it on first use."""
+    global _settings
+    settings = _settings
+    if settings is not None:
+        return settings
+    with _lock:
+        settings = _settings
+        if settings is None:
+            settings = _settings = load_settings()
+        return settings
+
+
+def reload_settings() -> IngeniousSettings:
+    """
+    Load and validate fresh settings, then swap them in and notify listeners.
+
+    Raises:
+        Exception: If the new settings fail to load; the snapshot is unchanged
+    """
+    global _settings
+    with _lock:
+        new = load_settings()
+        old, _settings = _settings, new
+        listeners = list(_listeners)
+
+    changed = changed_sections(old, new) if old is not None else []
+    logger.info("Settings reloaded", changed_sections=changed)
+    if old is not None and changed:
+        for listener in listeners:
+            try:
+                listener(old, new)
+            except Exception as e:
+                logger.warning(
+                    "Settings change listener failed",
+                    listener=getattr(listener, "__qualname__", repr(listener)),
+                    error=str(e),
+                )
+    return new
+
+
+def changed_sections(old: IngeniousSettings, new: IngeniousSettings) -> List[str]:
+    """Names of the top-level settings that differ between two snapshots."""
+    return [
+        name
+        for name in type(new).model_fields
+        if getattr(old, name, None) != getattr(new, name, None)
+    ]
+
+
+def on_settings_change(listener: SettingsListener) -> SettingsListener:
+    """
+    Call ``listener(old, new)`` after each reload that changes the settings.
+
+    Listeners run on the thread that reloaded and should only drop or swap
+    cached state. Returns the listener, so this can be used as a decorator.
+    """
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+    return listener
+
+
+def remove_settings_listener(listener: SettingsListener) -> None:
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def reset_settings() -> None:
+    """Forget the snapshot so the next access loads it again (for tests)."""
+    global _settings
+    with _lock:
+        _settings = None
@@ -0,0 +1,81 @@
+"""
+Live progress events from the agents of a multi-agent flow.
+
+A streaming request runs its flow inside an ``AgentEventStream``. The routed
+agents in ``ingenious.models.ag_agents`` publish to the stream of the request
+they run for: when an agent starts, each token it generates, the tools it
+calls and the answer it passes on. ``/chat/stream`` sends these to the client
+as chunks while the flow runs, so the client sees the first agent's tokens
+instead of waiting for the last agent to finish.
+
+Like the LLM usage tracker, the stream is found through a context variable,
+so an agent runtime started inside the flow publishes to the right request
+however many requests run at once. Outside a stream ``publish`` does
+nothing and agents make ordinary, non-streaming model calls.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Coroutine, Optional, TypeVar
+
+from ingenious.models.chat import ChatResponseChunk
+
+T = TypeVar("T")
+
+AGENT_START = "agent_start"
+AGENT_DELTA = "agent_delta"
+TOOL_CALL = "tool_call"
+AGENT_COMPLETE = "agent_complete"
+
+_current_stream: ContextVar[Optional["AgentEventStream"]] = ContextVar(
+    "ingenious_agent_event_stream", default=None
+)
+
+
+class AgentEventStream:
+    """Agent events of one request, read in the order they were published."""
+
+    def __init__(self, thread_id: Optional[str]) -> None:
+        self.thread_id = thread_id
+        self._queue: "asyncio.Queue[Optional[ChatResponseChunk]]" = asyncio.Queue()
+
+    def publish(self, chunk_type: str, agent_name: str, **fields: Any) -> None:
+        self._queue.put_nowait(
+            ChatResponseChunk(
+                thread_id=self.thread_id,
+                message_id=None,
+                chunk_type=chunk_type,
+                agent_name=agent_name,
+                **fields,
+            )
+        )
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> "asyncio.Task[T]":
+        """Run ``coro`` as a task that publishes here; the stream ends with it."""
+        token = _current_stream.set(self)
+        try:
+            # The task copies the context now, with this stream set
+            task = asyncio.create_task(coro)
+        finally:
+            _current_stream.reset(token)
+        task.add_done_callback(lambda _: self._queue.put_nowait(None))
+        return task
+
+    async def __aiter__(self) -> AsyncIterator[ChatResponseChunk]:
+        while True:
+            chunk = await self._queue.get()
+            if chunk is None:
+                return
+            yield chunk
+
+
+def streaming() -> bool:
+    """Whether the calling agent runs for a streaming request."""
+    return _current_stream.get() is not None
+
+
+def publish(chunk_type: str, agent_name: str, **fields: Any) -> None:
+    """Publish an agent event to the current request's stream, if it has one."""
+    stream = _current_stream.get()
+    if stream is not None:
+        stream.publish(chunk_type, agent_name, **fields)
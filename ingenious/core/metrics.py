@@ -0,0 +1,279 @@
+"""
+Prometheus metrics for requests, flows, stages, model calls, pools, caches and streams.
+
+Metrics are recorded with ``prometheus_client`` when it is installed and
+``web_configuration.metrics.enable`` is on (the default). Each ``record_*``
+helper is a flag check followed by a counter increment or histogram
+observation, cheap enough to leave on in production. Without the package,
+every helper returns immediately.
+
+Under ``ingen serve --workers N`` each worker writes its values to files in
+``PROMETHEUS_MULTIPROC_DIR`` and ``/metrics`` aggregates them, so a scrape
+routed to any worker sees the totals for all of them. The directory is set
+up by ``prepare_multiprocess_dir`` before the workers start. In that mode the
+per-process ``process_*`` collectors are not exported.
+
+Labels are kept to bounded sets: route templates rather than raw paths,
+registered flow names, and configured model names.
+"""
+
+import glob
+import os
+import tempfile
+import time
+from typing import Any, Iterator, Optional, Tuple
+
+from ingenious.core.structured_logging import get_logger
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Request latency from a health check to a multi-agent chat
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Single model calls and whole flows, which can run for minutes
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120, 300)
+# Request stages, from an in-memory lookup to a multi-minute model call
+STAGE_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_enabled = METRICS_AVAILABLE
+
+if METRICS_AVAILABLE:
+    HTTP_REQUESTS = Counter(
+        "ingenious_http_requests_total",
+        "HTTP requests by route template, method and status code",
+        ["method", "route", "status"],
+    )
+    HTTP_REQUEST_SECONDS = Histogram(
+        "ingenious_http_request_duration_seconds",
+        "Time from request arrival to the last response byte",
+        ["method", "route"],
+        buckets=HTTP_BUCKETS,
+    )
+    FLOW_REQUESTS = Counter(
+        "ingenious_flow_requests_total",
+        "Conversation flow runs by outcome (success or error)",
+        ["flow", "mode", "outcome"],
+    )
+    FLOW_SECONDS = Histogram(
+        "ingenious_flow_duration_seconds",
+        "Conversation flow run time, including chat history reads and writes",
+        ["flow", "mode"],
+        buckets=LLM_BUCKETS,
+    )
+    LLM_REQUESTS = Counter(
+        "ingenious_llm_requests_total",
+        "Model calls by model/deployment and outcome",
+        ["model", "outcome"],
+    )
+    LLM_SECONDS = Histogram(
+        "ingenious_llm_request_duration_seconds",
+        "Model call latency (to the last chunk for streamed calls)",
+        ["model"],
+        buckets=LLM_BUCKETS,
+    )
+    LLM_TOKENS = Counter(
+        "ingenious_llm_tokens_total",
+        "Tokens reported by the model, by type (input or output)",
+        ["model", "type"],
+    )
+    STAGE_SECONDS = Histogram(
+        "ingenious_request_stage_duration_seconds",
+        "Time spent in each request stage (auth, history_load, llm, tool, ...)",
+        ["stage"],
+        buckets=STAGE_BUCKETS,
+    )
+    ACTIVE_STREAMS = Gauge(
+        "ingenious_active_streams",
+        "Streaming responses currently open",
+        ["endpoint"],
+        multiprocess_mode="livesum",
+    )
+    DB_POOL_SIZE = Gauge(
+        "ingenious_db_pool_size",
+        "Configured connections per database pool",
+        ["pool"],
+        multiprocess_mode="livesum",
+    )
+    DB_POOL_IN_USE = Gauge(
+        "ingenious_db_pool_connections_in_use",
+        "Connections currently checked out of a database pool",
+        ["pool"],
+        multiprocess_mode="livesum",
+    )
+    CACHE_REQUESTS = Counter(
+        "ingenious_cache_requests_total",
+        "Cache lookups by cache and result (hit or miss)",
+        ["cache", "result"],
+    )
+    EXTRACTION_DOCUMENTS = Counter(
+        "ingenious_extraction_documents_total",
+        "Documents run through document extraction",
+        ["engine"],
+    )
+    EXTRACTION_ELEMENTS = Counter(
+        "ingenious_extraction_elements_total",
+        "Elements produced by document extraction",
+        ["engine"],
+    )
+    EXTRACTION_SECONDS = Counter(
+        "ingenious_extraction_seconds_total",
+        "Time spent producing extracted elements",
+        ["engine"],
+    )
+
+
+def configure_metrics(settings: Any) -> bool:
+    """Apply ``MetricsSettings``; returns whether metrics are being recorded."""
+    global _enabled
+    _enabled = METRICS_AVAILABLE and settings.enable
+    if settings.enable and not METRICS_AVAILABLE:
+        logger.warning(
+            "Metrics are enabled but prometheus-client is not installed",
+            operation="metrics_setup",
+        )
+    return _enabled
+
+
+def is_enabled() -> bool:
+    """Whether metrics are currently being recorded."""
+    return _enabled
+
+
+def is_multiprocess() -> bool:
+    """Whether values are shared through ``PROMETHEUS_MULTIPROC_DIR``."""
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def prepare_multiprocess_dir() -> Optional[str]:
+    """
+    Point worker processes at an empty multiprocess directory.
+
+    Must run in the parent before workers start: ``prometheus_client`` picks
+    its storage when it is first imported. An explicitly configured directory
+    is reused after deleting files left by a previous run.
+    """
+    if not METRICS_AVAILABLE:
+        return None
+    path = os.environ.get(MULTIPROC_DIR_ENV)
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for stale in glob.glob(os.path.join(path, "*.db")):
+            os.remove(stale)
+    else:
+        path = tempfile.mkdtemp(prefix="ingenious-metrics-")
+        os.environ[MULTIPROC_DIR_ENV] = path
+    return path
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges (open streams, pool usage) on shutdown."""
+    if METRICS_AVAILABLE and is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())  # type: ignore[no-untyped-call]
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, and its content type."""
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def record_request(method: str, route: str, status: int, seconds: float) -> None:
+    if not _enabled:
+        return
+    HTTP_REQUESTS.labels(method, route, str(status)).inc()
+    HTTP_REQUEST_SECONDS.labels(method, route).observe(seconds)
+
+
+def record_flow(flow: str, mode: str, success: bool, seconds: float) -> None:
+    if not _enabled:
+        return
+    FLOW_REQUESTS.labels(flow, mode, "success" if success else "error").inc()
+    FLOW_SECONDS.labels(flow, mode).observe(seconds)
+
+
+def record_model_call(
+    model: str, success: bool, seconds: float, usage: Optional[Any] = None
+) -> None:
+    """Record one model call; ``usage`` is autogen's ``RequestUsage``, if any."""
+    if not _enabled:
+        return
+    model = model or "unknown"
+    LLM_REQUESTS.labels(model, "success" if success else "error").inc()
+    LLM_SECONDS.labels(model).observe(seconds)
+    if usage is not None:
+        LLM_TOKENS.labels(model, "input").inc(usage.prompt_tokens)
+        LLM_TOKENS.labels(model, "output").inc(usage.completion_tokens)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    if _enabled:
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    if not _enabled:
+        return
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def stream_opened(endpoint: str) -> None:
+    if _enabled:
+        ACTIVE_STREAMS.labels(endpoint).inc()
+
+
+def stream_closed(endpoint: str) -> None:
+    if _enabled:
+        ACTIVE_STREAMS.labels(endpoint).dec()
+
+
+def set_pool_size(pool: str, size: int) -> None:
+    if _enabled:
+        DB_POOL_SIZE.labels(pool).set(size)
+
+
+def pool_checkout(pool: str, delta: int) -> None:
+    """Adjust the in-use count of ``pool`` by ``delta`` (+1 out, -1 back)."""
+    if _enabled:
+        DB_POOL_IN_USE.labels(pool).inc(delta)
+
+
+def count_extraction(engine: str, elements: Iterator[Any]) -> Iterator[Any]:
+    """Pass ``elements`` through, counting them and the time spent producing them."""
+    if not _enabled:
+        yield from elements
+        return
+    EXTRACTION_DOCUMENTS.labels(engine).inc()
+    produced = EXTRACTION_ELEMENTS.labels(engine)
+    spent = EXTRACTION_SECONDS.labels(engine)
+    iterator = iter(elements)
+    while True:
+        start = time.perf_counter()
+        try:
+            element = next(iterator)
+        except StopIteration:
+            spent.inc(time.perf_counter() - start)
+            return
+        spent.inc(time.perf_counter() - start)
+        produced.inc()
+        yield element
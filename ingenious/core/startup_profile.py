@@ -0,0 +1,196 @@
+"""
+Startup-time profiling for the CLI and API.
+
+``profile_imports`` imports a module in a fresh interpreter under
+``python -X importtime`` and returns the self and cumulative time of every
+module it pulled in, so slow dependencies can be found and deferred.
+``profile_startup`` runs this module in a fresh interpreter to time the
+phases of starting the API: importing the app, loading settings, building
+the FastAPI app and running the lifespan startup (flow registry, prompt
+templates, chat jobs).
+
+Both run in a subprocess because modules that are already imported cost
+nothing, which would hide exactly what is being measured.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+_MARKER = "ingenious-importtime-start"
+
+
+@dataclass
+class ImportTiming:
+    """One line of ``-X importtime`` output, times in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+@dataclass
+class ImportProfile:
+    """Modules imported by ``target`` and the wall time the import took."""
+
+    target: str
+    total_seconds: float
+    modules: List[ImportTiming] = field(default_factory=list)
+
+    def slowest_modules(self, top: int = 15) -> List[ImportTiming]:
+        """Modules with the highest cumulative import time."""
+        return sorted(self.modules, key=lambda m: m.cumulative_us, reverse=True)[:top]
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time per top-level package in microseconds, slowest first."""
+        totals: Dict[str, int] = {}
+        for timing in self.modules:
+            totals[timing.package] = totals.get(timing.package, 0) + timing.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def imported(self, package: str) -> bool:
+        return any(
+            m.module == package or m.module.startswith(package + ".")
+            for m in self.modules
+        )
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse ``-X importtime`` lines from stderr.
+
+    Lines look like ``import time:       250 |        300 |   package.module``
+    where the module name is indented two spaces per nesting level.
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # the header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        timings.append(ImportTiming(stripped, self_us, cumulative_us, depth))
+    return timings
+
+
+def profile_imports(module: str, python: Optional[str] = None) -> ImportProfile:
+    """
+    Import ``module`` in a fresh interpreter and profile what it imports.
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    # Interpreter startup (site, encodings) is not part of the module's cost,
+    # so only lines written after the marker are kept
+    code = (
+        "import sys, time\n"
+        f"sys.stderr.write({_MARKER!r} + '\\n')\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"Importing {module} failed: {result.stderr.strip().splitlines()[-1:]}"
+        )
+    stderr = result.stderr.split(_MARKER, 1)[-1]
+    total = float(result.stdout.strip().splitlines()[-1])
+    return ImportProfile(module, total, parse_importtime(stderr))
+
+
+def profile_startup(python: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Time each phase of starting the API in a fresh interpreter.
+
+    Returns a dict with ``phases`` (seconds per phase, in order), ``total``
+    (wall time of the whole process) and ``error`` if startup failed part way.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "startup.json")
+        start = time.perf_counter()
+        result = subprocess.run(
+            [python or sys.executable, "-m", __name__, out],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        total = time.perf_counter() - start
+        if not os.path.exists(out):
+            raise RuntimeError(
+                f"Startup profile failed: {result.stderr.strip().splitlines()[-1:]}"
+            )
+        with open(out) as f:
+            report: Dict[str, Any] = json.load(f)
+    report["total"] = total
+    return report
+
+
+def _run_startup() -> Dict[str, Any]:
+    """Go through API startup in this process, timing each phase."""
+    import asyncio
+
+    phases: Dict[str, float] = {}
+    report: Dict[str, Any] = {"phases": phases}
+
+    def timed(name: str, start: float) -> None:
+        phases[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from ingenious.main.app_factory import FastAgentAPI
+
+    timed("import_app", start)
+
+    try:
+        start = time.perf_counter()
+        from ingenious.config import get_config
+
+        config = get_config()
+        timed("settings", start)
+
+        start = time.perf_counter()
+        api = FastAgentAPI(config)
+        timed("create_app", start)
+
+        async def lifespan() -> None:
+            async with api.app.router.lifespan_context(api.app):
+                pass
+
+        asyncio.run(lifespan())
+        phases.update(
+            (name, seconds)
+            for name, seconds in api.startup_phases.items()
+            if name != "configure_app"
+        )
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    return report
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("INGENIOUS_WORKING_DIR", os.getcwd())
+    startup_report = _run_startup()
+    with open(sys.argv[1], "w") as f:
+        json.dump(startup_report, f)
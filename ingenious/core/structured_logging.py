@@ -1,13 +1,26 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+import threading
 import time
 import uuid
 from contextvars import ContextVar
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Mapping, Optional
 
 import structlog
 from structlog.types import EventDict, Processor
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Context variables for request tracking
 request_id_ctx: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 user_id_ctx: ContextVar[Optional[str]] = ContextVar("user_id", default=None)
@@ -47,26 +60,169 @@ def add_logger_name(logger: Any, method_name: str, event_dict: EventDict) -> Eve
     return event_dict
 
 
+class ProcessMetricsSampler:
+    """
+    Samples process memory and CPU on a background thread.
+
+    Log lines read the latest snapshot instead of querying the OS themselves,
+    so the cost of ``psutil`` is paid once per interval, not once per line.
+    """
+
+    def __init__(self, interval: float = 5.0) -> None:
+        self.interval = interval
+        self.snapshot: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        try:
+            import psutil
+
+            self._process: Any = psutil.Process()
+        except Exception:
+            self._process = None
+
+    def sample(self) -> Dict[str, float]:
+        """Read the current metrics and publish them as the new snapshot."""
+        if self._process is None:
+            return self.snapshot
+        try:
+            self.snapshot = {
+                "memory_mb": round(self._process.memory_info().rss / 1024 / 1024, 2),
+                "cpu_percent": self._process.cpu_percent(),
+            }
+        except Exception:
+            pass
+        return self.snapshot
+
+    def start(self) -> "ProcessMetricsSampler":
+        """Take a first sample, then keep sampling every ``interval`` seconds."""
+        self.sample()
+        if self._process is not None and self.interval > 0:
+            self._thread = threading.Thread(
+                target=self._run, name="log-metrics-sampler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def is_current(self) -> bool:
+        """False in a forked child, where the sampling thread does not exist."""
+        return self._pid == os.getpid()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+_metrics_sampler: Optional[ProcessMetricsSampler] = None
+_metrics_interval = 5.0
+
+
+def get_metrics_sampler() -> ProcessMetricsSampler:
+    """Process-wide metrics sampler, started on first use."""
+    global _metrics_sampler
+    if _metrics_sampler is None or not _metrics_sampler.is_current:
+        _metrics_sampler = ProcessMetricsSampler(_metrics_interval).start()
+    return _metrics_sampler
+
+
 def add_performance_metrics(
     logger: Any, method_name: str, event_dict: EventDict
 ) -> EventDict:
-    """Add basic performance metrics if available."""
-    # Add memory usage if psutil is available
-    try:
-        import psutil
-
-        process = psutil.Process()
-        event_dict["memory_mb"] = round(process.memory_info().rss / 1024 / 1024, 2)
-        event_dict["cpu_percent"] = process.cpu_percent()
-    except (ImportError, Exception):
-        # Skip if psutil not available or fails
-        pass
+    """Add memory and CPU from the latest background sample, if psutil is available."""
+    event_dict.update(get_metrics_sampler().snapshot)
+    return event_dict
+
+
+class LazyValue:
+    """A log value computed only if the event is actually rendered."""
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+
+def lazy(func: Callable[..., Any], *args: Any, **kwargs: Any) -> LazyValue:
+    """
+    Defer an expensive log value until the event passes level filtering.
+
+    Example:
+        logger.debug("Agent transcript", transcript=lazy(json.dumps, messages))
+    """
+    return LazyValue(func, *args, **kwargs)
 
+
+def render_lazy_values(
+    logger: Any, method_name: str, event_dict: EventDict
+) -> EventDict:
+    """Resolve ``lazy`` values. Filtered-out events never reach this processor."""
+    for key, value in event_dict.items():
+        if isinstance(value, LazyValue):
+            try:
+                event_dict[key] = value.func(*value.args, **value.kwargs)
+            except Exception as e:
+                event_dict[key] = f"<lazy value failed: {e}>"
     return event_dict
 
 
+class EventSampler:
+    """
+    Keep only a fraction of chosen high-volume events.
+
+    ``rates`` maps an event message to the fraction of its occurrences to keep.
+    Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        self.rates = dict(rates)
+        self._random = random.random
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: EventDict
+    ) -> EventDict:
+        rate = self.rates.get(event_dict.get("event"))  # type: ignore[arg-type]
+        if (
+            rate is not None
+            and method_name in ("debug", "info")
+            and self._random() >= rate
+        ):
+            raise structlog.DropEvent
+        if rate is not None and rate < 1:
+            event_dict["sample_rate"] = rate
+        return event_dict
+
+
+def _orjson_dumps(obj: Any, default: Callable[[Any], Any]) -> str:
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def shutdown_structured_logging() -> None:
+    """Flush and stop the background log writer, if one is running."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(shutdown_structured_logging)
+
+
 def setup_structured_logging(
-    log_level: str = "INFO", json_output: bool = True, include_stdlib: bool = True
+    log_level: str = "INFO",
+    json_output: bool = True,
+    include_stdlib: bool = True,
+    async_sink: bool = False,
+    metrics_interval: float = 5.0,
+    sample_rates: Optional[Mapping[str, float]] = None,
 ) -> None:
     """
     Configure structured logging with structlog.
@@ -75,19 +231,41 @@ def setup_structured_logging(
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_output: Whether to output JSON format (True) or colored console format (False)
         include_stdlib: Whether to configure stdlib logging integration
+        async_sink: Write log lines from a background thread instead of the caller
+        metrics_interval: Seconds between process metric samples; 0 disables them
+        sample_rates: Fraction of each named debug/info event to keep
     """
+    global _metrics_interval, _metrics_sampler
+    _metrics_interval = metrics_interval
+    if _metrics_sampler is not None:
+        _metrics_sampler.stop()
+        _metrics_sampler = None
+
     # Configure processors
-    processors: list[Processor] = [
-        add_correlation_id,
-        add_timestamp,
-        add_logger_name,
-        add_performance_metrics,
-        structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.dev.set_exc_info,
-    ]
-
-    if json_output:
+    processors: list[Processor] = []
+    if sample_rates:
+        processors.append(EventSampler(sample_rates))
+    processors.extend(
+        [
+            add_correlation_id,
+            add_timestamp,
+            add_logger_name,
+            render_lazy_values,
+        ]
+    )
+    if metrics_interval > 0:
+        processors.append(add_performance_metrics)
+    processors.extend(
+        [
+            structlog.processors.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.dev.set_exc_info,
+        ]
+    )
+
+    if json_output and ORJSON_AVAILABLE:
+        processors.append(structlog.processors.JSONRenderer(serializer=_orjson_dumps))
+    elif json_output:
         processors.append(structlog.processors.JSONRenderer())
     else:
         processors.extend(
@@ -109,7 +287,7 @@ def setup_structured_logging(
 
     if include_stdlib:
         # Configure stdlib logging to work with structlog
-        handler = logging.StreamHandler(sys.stdout)
+        handler: logging.Handler = logging.StreamHandler(sys.stdout)
         if json_output:
             handler.setFormatter(logging.Formatter("%(message)s"))
         else:
@@ -119,12 +297,33 @@ def setup_structured_logging(
                 )
             )
 
+        global _queue_listener
+        shutdown_structured_logging()
+        if async_sink:
+            # Callers only enqueue the record; formatting and the write to
+            # stdout happen on the listener thread.
+            log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+            _queue_listener = logging.handlers.QueueListener(log_queue, handler)
+            _queue_listener.start()
+            handler = _DeferredQueueHandler(log_queue)
+
         root_logger = logging.getLogger()
         root_logger.handlers.clear()
         root_logger.addHandler(handler)
         root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
 
 
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks hold frames that must not cross threads; render now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 def get_logger(name: str) -> structlog.BoundLogger:
     """Get a structured logger instance."""
     return structlog.get_logger(name)  # type: ignore
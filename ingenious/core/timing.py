@@ -0,0 +1,183 @@
+"""
+Per-stage timing of chat requests.
+
+Code marks a stage with ``timing.stage("history_load")`` (or the ``timed``
+decorator). While timing is enabled, each stage's duration is observed in
+the ``ingenious_request_stage_duration_seconds`` histogram and, inside a
+request, appended to that request's ``RequestTimings``. From there it can be
+returned as a ``Server-Timing`` header or in the response's ``timings`` field.
+
+Stage names are a small fixed set (``STAGES``) so they can be histogram
+labels. The per-call detail, such as the model or tool name, is kept only on
+the request's own entries.
+
+Stages can overlap: agents that run concurrently record their model calls
+side by side, so per-stage totals may add up to more than the request took.
+"""
+
+import contextlib
+import functools
+import inspect
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple, TypeVar
+
+from ingenious.core import metrics
+from ingenious.models.chat import StageTiming
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+STAGES = (
+    "auth",
+    "flow_resolution",
+    "history_load",
+    "memory",
+    "template_load",
+    "retrieval",
+    "llm",
+    "tool",
+    "persistence",
+)
+
+_enabled = True
+_response_field = False
+_NOOP_STAGE: ContextManager[Any] = contextlib.nullcontext()
+
+# (stage, start offset, duration, detail), times in seconds
+Entry = Tuple[str, float, float, Optional[str]]
+
+
+class RequestTimings:
+    """Stage timings gathered while serving one request."""
+
+    __slots__ = ("started", "entries")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        # list.append is atomic, so stages finishing on worker threads are safe
+        self.entries: List[Entry] = []
+
+    def as_list(self) -> List[StageTiming]:
+        """Entries in start order, in milliseconds, for the response body."""
+        return [
+            StageTiming(
+                stage=stage,
+                start_ms=round(offset * 1000, 2),
+                duration_ms=round(duration * 1000, 2),
+                detail=detail,
+            )
+            for stage, offset, duration, detail in sorted(
+                self.entries, key=lambda entry: entry[1]
+            )
+        ]
+
+    def server_timing(self, total_seconds: Optional[float] = None) -> str:
+        """``Server-Timing`` header value with one total per stage."""
+        totals: Dict[str, List[float]] = {}
+        for stage, _, duration, _ in self.entries:
+            totals.setdefault(stage, []).append(duration)
+        parts = []
+        for stage, durations in totals.items():
+            part = f"{stage};dur={sum(durations) * 1000:.1f}"
+            if len(durations) > 1:
+                part += f';desc="{len(durations)} calls"'
+            parts.append(part)
+        if total_seconds is not None:
+            parts.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "ingenious_request_timings", default=None
+)
+
+
+def configure_timing(settings: Any) -> bool:
+    """Apply ``StageTimingSettings``; returns whether stages are timed."""
+    global _enabled, _response_field
+    _enabled = bool(settings.enable)
+    _response_field = _enabled and bool(settings.response_field)
+    return _enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def start_request() -> Optional[Token[Optional[RequestTimings]]]:
+    """Begin collecting stage timings for the current request."""
+    if not _enabled:
+        return None
+    return _current.set(RequestTimings())
+
+
+def end_request(token: Optional[Token[Optional[RequestTimings]]]) -> None:
+    if token is not None:
+        _current.reset(token)
+
+
+def current() -> Optional[RequestTimings]:
+    """Timings of the request being served, if any are being collected."""
+    return _current.get()
+
+
+def response_timings() -> Optional[List[StageTiming]]:
+    """This request's timings so far, if responses are configured to carry them."""
+    timings = _current.get()
+    if not _response_field or timings is None:
+        return None
+    return timings.as_list()
+
+
+def record(stage: str, start: float, end: float, detail: Optional[str] = None) -> None:
+    """Record a stage measured with ``time.perf_counter()`` by the caller."""
+    if not _enabled:
+        return
+    metrics.record_stage(stage, end - start)
+    timings = _current.get()
+    if timings is not None:
+        timings.entries.append((stage, start - timings.started, end - start, detail))
+
+
+class _Stage:
+    __slots__ = ("stage", "detail", "start")
+
+    def __init__(self, stage: str, detail: Optional[str]) -> None:
+        self.stage = stage
+        self.detail = detail
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        record(self.stage, self.start, time.perf_counter(), self.detail)
+
+
+def stage(name: str, detail: Optional[str] = None) -> ContextManager[Any]:
+    """Context manager timing ``name``; a shared no-op while timing is off."""
+    if not _enabled:
+        return _NOOP_STAGE
+    return _Stage(name, detail)
+
+
+def timed(name: str, detail: Optional[str] = None) -> Callable[[F], F]:
+    """Decorate a function or coroutine function to time each call as ``name``."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with stage(name, detail):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with stage(name, detail):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,353 @@
+"""
+OpenTelemetry tracing for requests, flows, agents, tools and storage.
+
+Tracing is off unless ``tracing.enable`` is set. While it is off, ``span()``
+returns one shared ``nullcontext`` and ``traced()`` wrappers call straight
+through, so instrumented code pays a global lookup per call and nothing else.
+
+The tracer provider is kept in this module instead of being installed as the
+global OpenTelemetry provider, which lets tests swap in an in-memory exporter
+and tear it down again. Code that creates its own spans from the provider,
+such as autogen's ``SingleThreadedAgentRuntime``, receives it explicitly
+through ``runtime_tracer_provider()``.
+
+Span context lives in ``contextvars``: ``asyncio`` tasks and
+``asyncio.to_thread`` carry it automatically, while work handed to a
+``ThreadPoolExecutor`` must be wrapped with ``context_propagating()``.
+"""
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Dict,
+    Mapping,
+    Optional,
+    TypeVar,
+)
+
+from ingenious.core import metrics, timing
+from ingenious.core.structured_logging import get_logger
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+        SpanExporter,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+    from opentelemetry.trace import (
+        SpanKind,
+        Status,
+        StatusCode,
+        Tracer,
+        get_current_span,
+    )
+    from opentelemetry.trace.propagation.tracecontext import (
+        TraceContextTextMapPropagator,
+    )
+
+    TRACING_AVAILABLE = True
+except ImportError:
+    TRACING_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_NOOP_SPAN: ContextManager[Any] = contextlib.nullcontext()
+
+_tracer: Optional["Tracer"] = None
+_provider: Optional["TracerProvider"] = None
+
+
+def is_enabled() -> bool:
+    """Whether spans are currently being recorded."""
+    return _tracer is not None
+
+
+def setup_tracing(settings: Any) -> bool:
+    """
+    Configure tracing from ``TracingSettings``.
+
+    Returns True when tracing was enabled. A missing SDK or exporter package
+    is logged and leaves tracing off rather than failing startup.
+    """
+    if not settings.enable:
+        return False
+    if not TRACING_AVAILABLE:
+        logger.warning(
+            "Tracing is enabled but opentelemetry-sdk is not installed",
+            operation="tracing_setup",
+        )
+        return False
+
+    if settings.exporter == "memory":
+        exporter: "SpanExporter" = InMemorySpanExporter()
+    elif settings.exporter == "console":
+        exporter = ConsoleSpanExporter()
+    else:
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning(
+                "OTLP exporter requested but opentelemetry-exporter-otlp is not installed",
+                operation="tracing_setup",
+            )
+            return False
+        exporter = OTLPSpanExporter(endpoint=settings.otlp_endpoint or None)
+
+    _install(
+        exporter,
+        service_name=settings.service_name,
+        sample_ratio=settings.sample_ratio,
+        batch=settings.exporter == "otlp",
+    )
+    logger.info(
+        "Tracing enabled",
+        exporter=settings.exporter,
+        service_name=settings.service_name,
+        sample_ratio=settings.sample_ratio,
+        operation="tracing_setup",
+    )
+    return True
+
+
+def enable_in_memory_tracing(
+    service_name: str = "ingenious-test",
+) -> "InMemorySpanExporter":
+    """Record every span synchronously into a new in-memory exporter (tests)."""
+    exporter = InMemorySpanExporter()
+    _install(exporter, service_name=service_name, sample_ratio=1.0, batch=False)
+    return exporter
+
+
+def disable_tracing() -> None:
+    """Flush and shut down the active provider and return to the no-op path."""
+    global _tracer, _provider
+    provider, _provider, _tracer = _provider, None, None
+    if provider is not None:
+        provider.shutdown()
+
+
+def _install(
+    exporter: "SpanExporter", service_name: str, sample_ratio: float, batch: bool
+) -> None:
+    global _tracer, _provider
+    disable_tracing()
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBasedTraceIdRatio(sample_ratio),
+    )
+    processor = BatchSpanProcessor(exporter) if batch else SimpleSpanProcessor(exporter)
+    provider.add_span_processor(processor)
+    _provider = provider
+    _tracer = provider.get_tracer("ingenious")
+
+
+def runtime_tracer_provider() -> Optional["TracerProvider"]:
+    """Provider to pass to ``SingleThreadedAgentRuntime(tracer_provider=...)``."""
+    return _provider
+
+
+def _attributes(attributes: Mapping[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetry rejects None; anything that is not a primitive is stringified
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+def span(name: str, **attributes: Any) -> ContextManager[Any]:
+    """
+    Context manager recording ``name`` as a child of the current span.
+
+    Yields the span, or None when tracing is off. Exceptions are recorded on
+    the span and re-raised.
+    """
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes=_attributes(attributes))
+
+
+def server_span(
+    name: str, headers: Mapping[str, str], **attributes: Any
+) -> ContextManager[Any]:
+    """Span for an incoming request, continuing the caller's ``traceparent``."""
+    if _tracer is None:
+        return _NOOP_SPAN
+    parent = TraceContextTextMapPropagator().extract(headers)
+    return _tracer.start_as_current_span(
+        name,
+        context=parent,
+        kind=SpanKind.SERVER,
+        attributes=_attributes(attributes),
+    )
+
+
+def set_attributes(**attributes: Any) -> None:
+    """Add attributes to the current span, if one is recording."""
+    if _tracer is None:
+        return
+    get_current_span().set_attributes(_attributes(attributes))
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable[[F], F]:
+    """
+    Decorate a function or coroutine function to run inside a span.
+
+    The span is named ``name`` or the function's qualified name. The wrapper
+    keeps the wrapped signature, so decorated functions can still be handed
+    to autogen's ``FunctionTool``.
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def context_propagating(func: F) -> F:
+    """
+    Bind ``func`` to a copy of the current context for another thread.
+
+    ``ThreadPoolExecutor.submit`` does not carry context variables, so spans
+    started in the worker would otherwise be orphaned. Wrap once per submit:
+    a copied context can only be entered by one thread at a time.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return context.run(func, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _record_usage(current: Any, result: Any) -> None:
+    usage = getattr(result, "usage", None)
+    if usage is not None:
+        current.set_attribute("gen_ai.usage.input_tokens", usage.prompt_tokens)
+        current.set_attribute("gen_ai.usage.output_tokens", usage.completion_tokens)
+    finish_reason = getattr(result, "finish_reason", None)
+    if finish_reason:
+        current.set_attribute("gen_ai.response.finish_reasons", [str(finish_reason)])
+
+
+def instrument_model_client(client: Any, model: str = "", agent_name: str = "") -> Any:
+    """
+    Record a span and metrics per ``create``/``create_stream`` call on a model client.
+
+    Spans follow the OpenTelemetry GenAI conventions: ``chat <model>`` with
+    ``gen_ai.request.model``, ``gen_ai.agent.name`` and the prompt/completion
+    token counts from the result's usage. Latency, outcome and token counts
+    also go to the Prometheus metrics and the request's ``llm`` stage timing,
+    which are recorded whether or not tracing is on. The client is patched in
+    place and returned, so it can wrap the constructor call.
+    """
+    create = client.create
+    create_stream = client.create_stream
+    attributes = {
+        "gen_ai.operation.name": "chat",
+        "gen_ai.system": "openai",
+        "gen_ai.request.model": model,
+        "gen_ai.agent.name": agent_name or None,
+    }
+    span_name = f"chat {model}".strip()
+
+    @functools.wraps(create)
+    async def instrumented_create(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        result = None
+        try:
+            if _tracer is None:
+                result = await create(*args, **kwargs)
+                return result
+            with _tracer.start_as_current_span(
+                span_name, kind=SpanKind.CLIENT, attributes=_attributes(attributes)
+            ) as current:
+                result = await create(*args, **kwargs)
+                _record_usage(current, result)
+                return result
+        finally:
+            end = time.perf_counter()
+            timing.record("llm", start, end, model or None)
+            metrics.record_model_call(
+                model, result is not None, end - start, getattr(result, "usage", None)
+            )
+
+    @functools.wraps(create_stream)
+    async def instrumented_create_stream(
+        *args: Any, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        start = time.perf_counter()
+        # Not made current: the generator may resume in another context, and
+        # nothing runs inside the stream that would need it as a parent
+        current = (
+            _tracer.start_span(
+                span_name, kind=SpanKind.CLIENT, attributes=_attributes(attributes)
+            )
+            if _tracer is not None
+            else None
+        )
+        result = None
+        try:
+            async for item in create_stream(*args, **kwargs):
+                if not isinstance(item, str):
+                    # The final item is the CreateResult with usage
+                    result = item
+                    if current is not None:
+                        _record_usage(current, item)
+                yield item
+        except BaseException as exc:
+            if current is not None:
+                current.record_exception(exc)
+                current.set_status(Status(StatusCode.ERROR, str(exc)))
+            raise
+        finally:
+            if current is not None:
+                current.end()
+            end = time.perf_counter()
+            timing.record("llm", start, end, model or None)
+            metrics.record_model_call(
+                model, result is not None, end - start, getattr(result, "usage", None)
+            )
+
+    client.create = instrumented_create
+    client.create_stream = instrumented_create_stream
+    return client
@@ -1,3 +1,4 @@
+import hashlib
 import json
 from typing import Any, Dict, List, Optional
 
@@ -73,6 +74,11 @@ class azuresql_ChatHistoryRepository(BaseSQLRepository):
                     logger.error("All connection attempts failed")
                     raise
 
+    def _schema_key(self) -> Optional[str]:
+        # Hashed so the key does not keep another copy of the credentials
+        digest = hashlib.sha256(str(self.connection_string).encode()).hexdigest()
+        return f"azuresql:{digest}"
+
     def _execute_sql(
         self, sql: str, params: list[Any] | None = None, expect_results: bool = True
     ) -> Any:
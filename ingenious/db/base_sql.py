@@ -2,7 +2,7 @@ import json
 import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, List
+from typing import Any, List, Optional, Set
 from uuid import UUID
 
 from ingenious.config.settings import IngeniousSettings
@@ -10,6 +10,11 @@ from ingenious.db.chat_history_repository import IChatHistoryRepository
 from ingenious.db.query_builder import QueryBuilder
 from ingenious.models.message import Message
 
+# Databases whose tables were already created by this process. Repositories
+# are built per request, so this keeps the CREATE TABLE statements off the
+# request path after the first one (or the startup warm-up).
+_created_schemas: Set[str] = set()
+
 
 class BaseSQLRepository(IChatHistoryRepository, ABC):
     """Abstract base class for SQL-based chat history repositories.
@@ -36,8 +41,15 @@ class BaseSQLRepository(IChatHistoryRepository, ABC):
         """Execute SQL with database-specific connection handling."""
         pass
 
+    def _schema_key(self) -> Optional[str]:
+        """Identify the database the tables are created in, or None to always create them."""
+        return None
+
     def _create_tables(self) -> None:
-        """Create all required tables using QueryBuilder."""
+        """Create all required tables using QueryBuilder, once per database."""
+        if self._schema_key() in _created_schemas:
+            return
+
         table_queries = [
             self.query_builder.create_chat_history_table(),
             self.query_builder.create_chat_history_summary_table(),
@@ -51,6 +63,10 @@ class BaseSQLRepository(IChatHistoryRepository, ABC):
         for query in table_queries:
             self._execute_sql(query, expect_results=False)
 
+        key = self._schema_key()
+        if key is not None:
+            _created_schemas.add(key)
+
     async def add_message(self, message: Message) -> str:
         """Add a message to the chat history."""
         message.message_id = str(uuid.uuid4())
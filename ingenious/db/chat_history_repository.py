@@ -14,6 +14,7 @@ from typing import (
 from uuid import UUID
 
 from ingenious.config.settings import IngeniousSettings
+from ingenious.core import timing, tracing
 from ingenious.core.structured_logging import get_logger
 from ingenious.models.database_client import DatabaseClientType
 from ingenious.models.message import Message
@@ -259,6 +260,7 @@ class ChatHistoryRepository:
 
         self.repository = repository_class(config=config)
 
+    @tracing.traced("chat_history.update_thread")
     async def update_thread(
         self,
         thread_id: str,
@@ -276,51 +278,67 @@ class ChatHistoryRepository:
             )
         )
 
+    @tracing.traced("chat_history.add_user")
     async def add_user(self, identifier: str) -> IChatHistoryRepository.User:
         return cast(
             IChatHistoryRepository.User, await self.repository.add_user(identifier)
         )
 
+    @tracing.traced("chat_history.add_step")
     async def add_step(self, step_dict: IChatHistoryRepository.StepDict) -> str:
         return str(await self.repository.add_step(step_dict))
 
+    @tracing.traced("chat_history.get_user")
     async def get_user(self, identifier: str) -> IChatHistoryRepository.User | None:
         return cast(
             IChatHistoryRepository.User | None,
             await self.repository.get_user(identifier),
         )
 
+    @tracing.traced("chat_history.add_message")
+    @timing.timed("persistence")
     async def add_message(self, message: Message) -> str:
         return str(await self.repository.add_message(message))
 
+    @tracing.traced("chat_history.add_memory")
+    @timing.timed("persistence")
     async def add_memory(self, memory: Message) -> str:
         return str(await self.repository.add_memory(memory))
 
+    @tracing.traced("chat_history.get_message")
     async def get_message(self, message_id: str, thread_id: str) -> Message | None:
         return cast(
             Message | None, await self.repository.get_message(message_id, thread_id)
         )
 
+    @tracing.traced("chat_history.get_memory")
     async def get_memory(self, message_id: str, thread_id: str) -> Message | None:
         return cast(
             Message | None, await self.repository.get_memory(message_id, thread_id)
         )
 
+    @tracing.traced("chat_history.update_memory")
+    @timing.timed("persistence")
     async def update_memory(self) -> None:
         await self.repository.update_memory()
         return None
 
+    @tracing.traced("chat_history.get_thread_messages")
+    @timing.timed("history_load")
     async def get_thread_messages(self, thread_id: str) -> Optional[List[Message]]:
         return cast(
             Optional[List[Message]],
             await self.repository.get_thread_messages(thread_id),
         )
 
+    @tracing.traced("chat_history.get_thread_memory")
+    @timing.timed("history_load")
     async def get_thread_memory(self, thread_id: str) -> Optional[List[Message]]:
         return cast(
             Optional[List[Message]], await self.repository.get_thread_memory(thread_id)
         )
 
+    @tracing.traced("chat_history.get_threads_for_user")
     async def get_threads_for_user(
         self, identifier: str, thread_id: Optional[str]
     ) -> Optional[List[IChatHistoryRepository.ThreadDict]]:
@@ -329,6 +347,7 @@ class ChatHistoryRepository:
             await self.repository.get_threads_for_user(identifier, thread_id),
         )
 
+    @tracing.traced("chat_history.update_message_feedback")
     async def update_message_feedback(
         self, message_id: str, thread_id: str, positive_feedback: bool | None
     ) -> None:
@@ -337,6 +356,7 @@ class ChatHistoryRepository:
         )
         return None
 
+    @tracing.traced("chat_history.update_memory_feedback")
     async def update_memory_feedback(
         self, message_id: str, thread_id: str, positive_feedback: bool | None
     ) -> None:
@@ -345,6 +365,7 @@ class ChatHistoryRepository:
         )
         return None
 
+    @tracing.traced("chat_history.update_message_content_filter_results")
     async def update_message_content_filter_results(
         self, message_id: str, thread_id: str, content_filter_results: dict[str, object]
     ) -> None:
@@ -353,6 +374,7 @@ class ChatHistoryRepository:
         )
         return None
 
+    @tracing.traced("chat_history.update_memory_content_filter_results")
     async def update_memory_content_filter_results(
         self, message_id: str, thread_id: str, content_filter_results: dict[str, object]
     ) -> None:
@@ -361,13 +383,16 @@ class ChatHistoryRepository:
         )
         return None
 
+    @tracing.traced("chat_history.delete_thread")
     async def delete_thread(self, thread_id: str) -> None:
         await self.repository.delete_thread(thread_id)
         return None
 
+    @tracing.traced("chat_history.delete_thread_memory")
     async def delete_thread_memory(self, thread_id: str) -> None:
         await self.repository.delete_thread_memory(thread_id)
         return None
 
+    @tracing.traced("chat_history.delete_user_memory")
     async def delete_user_memory(self, user_id: str) -> None:
         await self.repository.delete_user_memory(user_id)
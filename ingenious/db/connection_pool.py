@@ -4,12 +4,14 @@ import time
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from queue import Empty, Queue
-from typing import Any, Iterator, Protocol
-
-import pyodbc
+from typing import TYPE_CHECKING, Any, Iterator, Protocol
 
+from ingenious.core import metrics
 from ingenious.core.structured_logging import get_logger
 
+if TYPE_CHECKING:
+    import pyodbc
+
 logger = get_logger(__name__)
 
 
@@ -84,13 +86,16 @@ class AzureSQLConnectionFactory(ConnectionFactory):
     def __init__(self, connection_string: str) -> None:
         self.connection_string = connection_string
 
-    def create_connection(self) -> pyodbc.Connection:
+    def create_connection(self) -> "pyodbc.Connection":
         """Create a new Azure SQL connection."""
+        # pyodbc needs the system ODBC driver, so only load it for Azure SQL
+        import pyodbc
+
         conn = pyodbc.connect(self.connection_string)
         conn.autocommit = True
         return conn
 
-    def is_connection_healthy(self, conn: pyodbc.Connection) -> bool:
+    def is_connection_healthy(self, conn: "pyodbc.Connection") -> bool:
         """Check if an Azure SQL connection is healthy."""
         try:
             cursor = conn.cursor()
@@ -119,6 +124,11 @@ class ConnectionPool:
         self._pool: Queue[Any] = Queue(maxsize=pool_size)
         self._lock = threading.Lock()
         self._created_connections = 0
+        # Metrics label: "sqlite" or "azuresql"
+        self.name = (
+            type(connection_factory).__name__.replace("ConnectionFactory", "").lower()
+        )
+        metrics.set_pool_size(self.name, pool_size)
 
         # Pre-populate the pool
         self._initialize_pool()
@@ -164,8 +174,12 @@ class ConnectionPool:
 
                 # Check if connection is healthy
                 if conn and self.connection_factory.is_connection_healthy(conn):
+                    metrics.pool_checkout(self.name, 1)
                     try:
-                        yield conn
+                        try:
+                            yield conn
+                        finally:
+                            metrics.pool_checkout(self.name, -1)
                         # Return connection to pool if still healthy
                         if self.connection_factory.is_connection_healthy(conn):
                             self._pool.put_nowait(conn)
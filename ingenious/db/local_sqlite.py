@@ -0,0 +1,51 @@
+"""
+Per-thread SQLite connections for small local stores.
+
+Used by stores that run their queries through ``asyncio.to_thread``: each
+thread of the default executor gets its own connection, opened on first use
+with the same WAL settings as ``SQLiteConnectionFactory``. This module does not
+import ``ingenious.db.connection_pool``, which requires pyodbc.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+
+class ThreadLocalSQLite:
+    """Lazily opened SQLite connection per thread for one database file."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                timeout=30.0,
+                isolation_level=None,  # autocommit mode
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every connection opened so far."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -58,6 +58,12 @@ class sqlite_ChatHistoryRepository(BaseSQLRepository):
         """Connection already initialized in __init__ via connection pool."""
         pass
 
+    def _schema_key(self) -> Optional[str]:
+        # A deleted database file gets its tables created again
+        if not os.path.exists(self.db_path):
+            return None
+        return f"sqlite:{os.path.abspath(self.db_path)}"
+
     def _execute_sql(
         self, sql: str, params: list[Any] | None = None, expect_results: bool = True
     ) -> Any:
@@ -9,7 +9,6 @@ This module remains for backward compatibility but will be removed in a future v
 """
 
 import os
-import secrets
 import warnings
 from typing import Optional
 
@@ -18,7 +17,11 @@ from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials, HTTPBearer
 from typing_extensions import Annotated
 
-from ingenious.auth.jwt import get_username_from_token
+from ingenious.auth.basic import parse_basic_auth_header, verify_basic_credentials
+from ingenious.auth.jwt import (
+    get_username_from_request_token,
+    get_username_from_token,
+)
 from ingenious.config.config import get_config as _get_config
 from ingenious.config.profile import Profiles
 from ingenious.config.settings import IngeniousSettings
@@ -47,7 +50,7 @@ bearer_security = HTTPBearer()
 
 
 def get_config() -> IngeniousSettings:
-    """Get config dynamically to ensure environment variables are loaded"""
+    """Get the process-wide settings snapshot"""
     return _get_config()
 
 
@@ -118,21 +121,12 @@ def get_security_service(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    current_username_bytes = credentials.username.encode("utf8")
-    correct_username_bytes = config.web_configuration.authentication.username.encode(
-        "utf-8"
-    )
-    is_correct_username = secrets.compare_digest(
-        current_username_bytes, correct_username_bytes
-    )
-    current_password_bytes = credentials.password.encode("utf8")
-    correct_password_bytes = config.web_configuration.authentication.password.encode(
-        "utf-8"
-    )
-    is_correct_password = secrets.compare_digest(
-        current_password_bytes, correct_password_bytes
-    )
-    if not (is_correct_username and is_correct_password):
+    if not verify_basic_credentials(
+        credentials.username,
+        credentials.password,
+        config.web_configuration.authentication.username,
+        config.web_configuration.authentication.password,
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -161,21 +155,12 @@ def get_security_service_optional(
             headers={"WWW-Authenticate": "Basic"},
         )
 
-    current_username_bytes = credentials.username.encode("utf8")
-    correct_username_bytes = config.web_configuration.authentication.username.encode(
-        "utf-8"
-    )
-    is_correct_username = secrets.compare_digest(
-        current_username_bytes, correct_username_bytes
-    )
-    current_password_bytes = credentials.password.encode("utf8")
-    correct_password_bytes = config.web_configuration.authentication.password.encode(
-        "utf-8"
-    )
-    is_correct_password = secrets.compare_digest(
-        current_password_bytes, correct_password_bytes
-    )
-    if not (is_correct_username and is_correct_password):
+    if not verify_basic_credentials(
+        credentials.username,
+        credentials.password,
+        config.web_configuration.authentication.username,
+        config.web_configuration.authentication.password,
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -216,9 +201,8 @@ async def sync_templates() -> None:
         fs = FileStorage(config)
         working_dir = os.getcwd()
         template_path = os.path.join(working_dir, "ingenious", "templates")
-        template_files = await fs.list_files(file_path=template_path)
-        for file in template_files:
-            file_name = os.path.basename(file)
+        async for entry in fs.iter_files(template_path):
+            file_name = entry.name
             file_contents = await fs.read_file(
                 file_name=file_name, file_path=template_path
             )
@@ -259,7 +243,7 @@ def get_auth_user(request: Request) -> str:
     if auth_header.startswith("Bearer "):
         token = auth_header[7:]  # Remove "Bearer " prefix
         try:
-            username = get_username_from_token(token)
+            username = get_username_from_request_token(request.scope, token)
             return username
         except HTTPException:
             # JWT validation failed, continue to basic auth fallback
@@ -267,11 +251,8 @@ def get_auth_user(request: Request) -> str:
 
     # Fall back to Basic Auth
     if auth_header.startswith("Basic "):
-        import base64
-
         try:
-            credentials_str = base64.b64decode(auth_header[6:]).decode("utf-8")
-            username, password = credentials_str.split(":", 1)
+            username, password = parse_basic_auth_header(auth_header)
         except (ValueError, UnicodeDecodeError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -280,23 +261,12 @@ def get_auth_user(request: Request) -> str:
             )
 
         # Validate credentials
-        current_username_bytes = username.encode("utf8")
-        correct_username_bytes = (
-            config.web_configuration.authentication.username.encode("utf-8")
-        )
-        is_correct_username = secrets.compare_digest(
-            current_username_bytes, correct_username_bytes
-        )
-
-        current_password_bytes = password.encode("utf8")
-        correct_password_bytes = (
-            config.web_configuration.authentication.password.encode("utf-8")
-        )
-        is_correct_password = secrets.compare_digest(
-            current_password_bytes, correct_password_bytes
-        )
-
-        if not (is_correct_username and is_correct_password):
+        if not verify_basic_credentials(
+            username,
+            password,
+            config.web_configuration.authentication.username,
+            config.web_configuration.authentication.password,
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -313,6 +283,17 @@ def get_auth_user(request: Request) -> str:
     )
 
 
+def get_admin_user(auth_user: Annotated[str, Depends(get_auth_user)]) -> str:
+    """Get authenticated user, who must be listed in ``authentication.admin_users``"""
+    admin_users = get_config().web_configuration.authentication.admin_users
+    if auth_user not in admin_users:
+        logger.warning("Admin endpoint refused", user=auth_user)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
+        )
+    return auth_user
+
+
 def get_conditional_security(request: Request) -> str:
     """Get authenticated user - wrapper around get_auth_user for compatibility"""
     return get_auth_user(request)
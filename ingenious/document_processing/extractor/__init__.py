@@ -71,6 +71,7 @@ from functools import lru_cache
 from importlib import import_module
 from typing import Iterable
 
+from ingenious.core import metrics
 from ingenious.core.structured_logging import get_logger
 from ingenious.errors.processing import (
     ErrorCode,
@@ -213,7 +214,7 @@ def extract(src: Src, *, engine: str = "pymupdf") -> Iterable[Element]:
     >>> len(elements)
     42
     """
-    return _load(engine).extract(src)
+    return metrics.count_extraction(engine, _load(engine).extract(src))
 
 
 __all__ = [
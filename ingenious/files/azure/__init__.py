@@ -1,14 +1,29 @@
+import asyncio
+import hashlib
+import weakref
 from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
-from azure.identity import (
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.identity.aio import (
     ClientSecretCredential,
     DefaultAzureCredential,
     ManagedIdentityCredential,
 )
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob.aio import BlobServiceClient
 
 from ingenious.core.structured_logging import get_logger
-from ingenious.files.files_repository import IFileStorage
+from ingenious.files.files_repository import FileEntry, IFileStorage
 from ingenious.models.config import (
     AuthenticationMethod as file_storage_AuthenticationMethod,
 )
@@ -16,6 +31,55 @@ from ingenious.models.config import Config, FileStorageContainer
 
 logger = get_logger(__name__)
 
+ClientKey = Tuple[Any, ...]
+
+# Async clients hold an aiohttp session that is bound to the event loop it was
+# created on, so clients are shared per loop rather than globally.
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, BlobServiceClient]]" = weakref.WeakKeyDictionary()
+
+
+def _get_shared_client(
+    key: ClientKey, factory: Callable[[], BlobServiceClient]
+) -> BlobServiceClient:
+    """Return the client for ``key`` on the running loop, creating it once."""
+    loop = asyncio.get_running_loop()
+    clients = _shared_clients.get(loop)
+    if clients is None:
+        clients = {}
+        _shared_clients[loop] = clients
+    client = clients.get(key)
+    if client is None:
+        client = factory()
+        clients[key] = client
+    return client
+
+
+# Credentials this module creates; the clients using them do not close them
+_OWNED_CREDENTIAL_TYPES = (
+    ClientSecretCredential,
+    DefaultAzureCredential,
+    ManagedIdentityCredential,
+)
+
+
+async def close_shared_clients() -> None:
+    """
+    Close every shared blob client created on the running event loop, along
+    with the Azure AD credential it was created with.
+    """
+    clients = _shared_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        try:
+            await client.close()  # type: ignore[no-untyped-call]
+        except Exception as e:
+            logger.warning("Failed to close blob service client", error=str(e))
+        credential = getattr(client, "credential", None)
+        if isinstance(credential, _OWNED_CREDENTIAL_TYPES):
+            try:
+                await credential.close()
+            except Exception as e:
+                logger.warning("Failed to close Azure credential", error=str(e))
+
 
 class azure_FileStorageRepository(IFileStorage):
     def __init__(self, config: Config, fs_config: FileStorageContainer):
@@ -27,47 +91,111 @@ class azure_FileStorageRepository(IFileStorage):
         self.container_name = fs_config.container_name
         self.authentication_method = fs_config.authentication_method
 
+        # Transfer tuning - older config models do not define these fields
+        self.max_concurrency: int = getattr(fs_config, "max_concurrency", 4)
+        self.bulk_concurrency: int = getattr(fs_config, "bulk_concurrency", 8)
+        self.transfer_settings: Dict[str, int] = {
+            "max_single_put_size": getattr(
+                fs_config, "max_single_put_size", 8 * 1024 * 1024
+            ),
+            "max_block_size": getattr(fs_config, "max_block_size", 4 * 1024 * 1024),
+            "max_single_get_size": getattr(
+                fs_config, "max_single_get_size", 4 * 1024 * 1024
+            ),
+            "max_chunk_get_size": getattr(
+                fs_config, "max_chunk_get_size", 4 * 1024 * 1024
+            ),
+        }
+
         # Check if token is actually a connection string
         if self.token and "DefaultEndpointsProtocol" in self.token:
-            # Use connection string authentication
-            self.blob_service_client = BlobServiceClient.from_connection_string(
-                self.token
+            self._auth_mode = "connection_string"
+        elif self.authentication_method in (
+            file_storage_AuthenticationMethod.TOKEN,
+            file_storage_AuthenticationMethod.CLIENT_ID_AND_SECRET,
+            file_storage_AuthenticationMethod.MSI,
+            file_storage_AuthenticationMethod.DEFAULT_CREDENTIAL,
+        ):
+            self._auth_mode = str(
+                file_storage_AuthenticationMethod(self.authentication_method).value
             )
-        elif self.authentication_method == file_storage_AuthenticationMethod.TOKEN:
-            self.blob_service_client = BlobServiceClient(
-                account_url=self.url, credential=self.token
+        else:
+            # If no authentication method matched, raise an error
+            raise ValueError(
+                f"Invalid authentication configuration. Token provided: {bool(self.token)}, "
+                f"Authentication method: {self.authentication_method}"
+            )
+
+        self._client_key: ClientKey = (
+            self._auth_mode,
+            self.url,
+            self.client_id,
+            hashlib.sha256((self.token or "").encode("utf-8")).hexdigest(),
+            tuple(sorted(self.transfer_settings.items())),
+        )
+
+    def _create_blob_service_client(self) -> BlobServiceClient:
+        """Create an async blob service client for the configured authentication."""
+        if self._auth_mode == "connection_string":
+            return BlobServiceClient.from_connection_string(
+                self.token, credential=None, **self.transfer_settings
             )
+
+        credential: Any
+        if self._auth_mode == file_storage_AuthenticationMethod.TOKEN.value:
+            credential = self.token
         elif (
-            self.authentication_method
-            == file_storage_AuthenticationMethod.CLIENT_ID_AND_SECRET
+            self._auth_mode
+            == file_storage_AuthenticationMethod.CLIENT_ID_AND_SECRET.value
         ):
-            cred = ClientSecretCredential(
+            credential = ClientSecretCredential(
                 tenant_id="",  # TODO: Add proper tenant_id from config
                 client_id=self.client_id,
                 client_secret=self.token,
             )
-            self.blob_service_client = BlobServiceClient(
-                account_url=self.url, credential=cred
-            )
-        elif self.authentication_method == file_storage_AuthenticationMethod.MSI:
-            self.blob_service_client = BlobServiceClient(
-                account_url=self.url,
-                credential=ManagedIdentityCredential(client_id=self.client_id),
-            )
-            print("======")
-            print(self.client_id, self.url)
-        elif (
-            self.authentication_method
-            == file_storage_AuthenticationMethod.DEFAULT_CREDENTIAL
-        ):
-            self.blob_service_client = BlobServiceClient(
-                account_url=self.url, credential=DefaultAzureCredential()
-            )
+        elif self._auth_mode == file_storage_AuthenticationMethod.MSI.value:
+            credential = ManagedIdentityCredential(client_id=self.client_id)
         else:
-            # If no authentication method matched, raise an error
-            raise ValueError(
-                f"Invalid authentication configuration. Token provided: {bool(self.token)}, "
-                f"Authentication method: {self.authentication_method}"
+            credential = DefaultAzureCredential()
+
+        return BlobServiceClient(
+            account_url=self.url, credential=credential, **self.transfer_settings
+        )
+
+    @property
+    def blob_service_client(self) -> BlobServiceClient:
+        """The shared async client for this storage account on the running loop."""
+        return _get_shared_client(self._client_key, self._create_blob_service_client)
+
+    def _get_blob_path(self, file_name: str, file_path: str) -> str:
+        return (
+            Path(self.fs_config.path) / Path(file_path) / Path(file_name)
+        ).as_posix()
+
+    async def _upload(self, blob_path: str, data: Any, length: Optional[int]) -> None:
+        container_client = self.blob_service_client.get_container_client(
+            self.container_name
+        )
+        try:
+            await container_client.upload_blob(
+                blob_path,
+                data,
+                length=length,
+                overwrite=True,
+                max_concurrency=self.max_concurrency,
+            )
+        except ResourceNotFoundError:
+            # Create the container on first write, then retry once
+            try:
+                await container_client.create_container()
+            except ResourceExistsError:
+                pass
+            await container_client.upload_blob(
+                blob_path,
+                data,
+                length=length,
+                overwrite=True,
+                max_concurrency=self.max_concurrency,
             )
 
     async def write_file(self, contents: str, file_name: str, file_path: str) -> str:
@@ -82,29 +210,44 @@ class azure_FileStorageRepository(IFileStorage):
         Example:
             await write_file("Hello, World!", "example.txt", "path/to/directory")
         """
+        path = self._get_blob_path(file_name, file_path)
         try:
-            path = Path(self.fs_config.path) / Path(file_path) / Path(file_name)
-            # Create the container if it does not exist
-            container_client = self.blob_service_client.get_container_client(
-                self.container_name
+            data = contents.encode("utf-8")
+            await self._upload(path, data, length=len(data))
+        except Exception as e:
+            logger.error(
+                f"Failed to upload {path} to container {self.container_name}: {e}"
             )
-            if not container_client.container_name:
-                container_client.create_container()
+            raise
+        return path
 
-            # Create a blob client
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name, blob=str(path)
-            )
+    async def write_file_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        file_name: str,
+        file_path: str,
+        length: Optional[int] = None,
+    ) -> str:
+        """
+        Upload a stream of byte chunks without buffering the whole blob.
 
-            # Upload the data
-            blob_client.upload_blob(contents, overwrite=True)
-            # print(f"Successfully uploaded {path} to container {self.container_name}.")
+        The SDK splits the stream into blocks of ``max_block_size`` and uploads up to
+        ``max_concurrency`` blocks in parallel.
+
+        :param chunks: Async iterable producing the blob contents.
+        :param file_name: Name of the blob (file) to write.
+        :param file_path: Path of the blob (file) to write.
+        :param length: Total size in bytes, if known.
+        """
+        path = self._get_blob_path(file_name, file_path)
+        try:
+            await self._upload(path, chunks, length=length)
         except Exception as e:
             logger.error(
                 f"Failed to upload {path} to container {self.container_name}: {e}"
             )
             raise
-        return str(path)
+        return path
 
     async def read_file(self, file_name: str, file_path: str) -> str:
         """
@@ -113,27 +256,84 @@ class azure_FileStorageRepository(IFileStorage):
         :param file_name: Name of the blob (file) to read.
         :param file_path: Path of the blob (file) to read.
         """
-
+        path = self._get_blob_path(file_name, file_path)
         try:
-            path = Path(self.fs_config.path) / Path(file_path) / Path(file_name)
-            print(path)
-            # Create a blob client
             blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name, blob=str(path)
+                container=self.container_name, blob=path
             )
 
             # encoding param is necessary for readall() to return str, otherwise it returns bytes
-            downloader = blob_client.download_blob(max_concurrency=1, encoding="UTF-8")
-            data = downloader.readall()
+            downloader = await blob_client.download_blob(
+                max_concurrency=self.max_concurrency, encoding="UTF-8"
+            )
+            return str(await downloader.readall())
+        except Exception as e:
+            logger.error(
+                f"Failed to download {path} from container {self.container_name}: {e}"
+            )
+            raise
 
-            # print(f"Successfully downloaded {path} from container {self.container_name}.")
-            return data
+    async def read_file_stream(
+        self, file_name: str, file_path: str
+    ) -> AsyncIterator[bytes]:
+        """
+        Download a blob as a stream of byte chunks of ``max_chunk_get_size``.
+
+        :param file_name: Name of the blob (file) to read.
+        :param file_path: Path of the blob (file) to read.
+        """
+        path = self._get_blob_path(file_name, file_path)
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=path
+            )
+            downloader = await blob_client.download_blob(
+                max_concurrency=self.max_concurrency
+            )
+            async for chunk in downloader.chunks():
+                yield chunk
         except Exception as e:
             logger.error(
                 f"Failed to download {path} from container {self.container_name}: {e}"
             )
             raise
 
+    async def read_many(
+        self,
+        file_names: Iterable[str],
+        file_path: str,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Download several blobs from the same path concurrently.
+
+        :param file_names: Names of the blobs (files) to read.
+        :param file_path: Path of the blobs (files) to read.
+        :param max_concurrency: Maximum simultaneous downloads (defaults to bulk_concurrency).
+        :return: Mapping of file name to contents.
+        """
+        return await super().read_many(
+            file_names, file_path, max_concurrency or self.bulk_concurrency
+        )
+
+    async def write_many(
+        self,
+        files: Mapping[str, str],
+        file_path: str,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Upload several blobs to the same path concurrently.
+
+        :param files: Mapping of file name to contents.
+        :param file_path: Path of the blobs (files) to write.
+        :param max_concurrency: Maximum simultaneous uploads (defaults to bulk_concurrency).
+        :return: Mapping of file name to blob path.
+        """
+        return await super().write_many(
+            files, file_path, max_concurrency or self.bulk_concurrency
+        )
+
     async def delete_file(self, file_name: str, file_path: str) -> str:
         """
         Delete a blob from Azure Blob Storage.
@@ -141,23 +341,18 @@ class azure_FileStorageRepository(IFileStorage):
         :param file_name: Name of the blob (file) to delete.
         :param file_path: Path of the blob (file) to delete.
         """
-
+        path = self._get_blob_path(file_name, file_path)
         try:
-            path = Path(self.fs_config.path) / Path(file_path) / Path(file_name)
-            # Create a blob client
             blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name, blob=str(path)
+                container=self.container_name, blob=path
             )
-
-            # Delete the blob
-            blob_client.delete_blob()
-            # print(f"Successfully deleted {path} from container {self.container_name}.")
+            await blob_client.delete_blob()
         except Exception as e:
             logger.error(
                 f"Failed to delete {path} from container {self.container_name}: {e}"
             )
             raise
-        return str(path)
+        return path
 
     async def list_files(self, file_path: str) -> str:
         """
@@ -165,21 +360,16 @@ class azure_FileStorageRepository(IFileStorage):
 
         :param file_path: Path within the storage container to list blobs from.
         """
-        blobs = []
+        # Ensure the path is in the correct format for Azure
+        prefix = (Path(self.fs_config.path) / Path(file_path)).as_posix()
         try:
-            path = Path(self.fs_config.path) / Path(file_path)
-            prefix = str(path).replace(
-                "\\", "/"
-            )  # Ensure the path is in the correct format for Azure
-            # List blobs in the container with the specified prefix
             container_client = self.blob_service_client.get_container_client(
                 self.container_name
             )
             blobs = [
                 blob.name
-                for blob in container_client.list_blobs(name_starts_with=prefix)
+                async for blob in container_client.list_blobs(name_starts_with=prefix)
             ]
-            # print(f"Blobs in container {self.container_name} with prefix {prefix}: {blobs}")
             return "\n".join(blobs)
         except Exception as e:
             logger.error(
@@ -187,31 +377,86 @@ class azure_FileStorageRepository(IFileStorage):
             )
             raise
 
+    async def iter_files(
+        self, file_path: str, recursive: bool = False
+    ) -> AsyncIterator[FileEntry]:
+        """
+        Stream metadata for the blobs under a path, one listing page at a time.
+
+        :param file_path: Path within the storage container to list blobs from.
+        :param recursive: Include blobs in virtual subdirectories.
+        """
+        prefix = (Path(self.fs_config.path) / Path(file_path)).as_posix() + "/"
+        try:
+            container_client = self.blob_service_client.get_container_client(
+                self.container_name
+            )
+            if recursive:
+                blobs = container_client.list_blobs(name_starts_with=prefix)
+            else:
+                blobs = container_client.walk_blobs(
+                    name_starts_with=prefix, delimiter="/"
+                )
+            async for blob in blobs:
+                # walk_blobs yields virtual directories as prefixes ending in "/"
+                if blob.name.endswith("/"):
+                    continue
+                yield FileEntry(
+                    name=blob.name[len(prefix) :],
+                    path=blob.name,
+                    size=blob.size,
+                    modified=blob.last_modified,
+                    etag=str(blob.etag) if blob.etag else None,
+                )
+        except Exception as e:
+            logger.error(
+                f"Failed to list blobs in container {self.container_name} with prefix {prefix}: {e}"
+            )
+            raise
+
     async def check_if_file_exists(self, file_path: str, file_name: str) -> bool:
         """
         Check if a blob exists in an Azure Blob container.
 
-        :param container_name: Name of the Azure Blob container.
-        :param blob_name: Name of the blob (file) to check.
-        :param connection_string: Connection string to Azure Storage account.
+        :param file_path: Path of the blob (file) to check.
+        :param file_name: Name of the blob (file) to check.
         :return: True if the blob exists, False otherwise.
         """
-
+        path = self._get_blob_path(file_name, file_path)
         try:
-            path = Path(self.fs_config.path) / Path(file_path) / Path(file_name)
-            # Create a blob client
             blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name, blob=str(path)
+                container=self.container_name, blob=path
             )
-            exists = blob_client.exists()
-            # print(f"Blob {path} exists in container {self.container_name}: {exists}")
-            return exists
+            return bool(await blob_client.exists())
         except Exception as e:
             logger.error(
                 f"Failed to check if blob {path} exists in container {self.container_name}: {e}"
             )
             raise
 
+    async def get_file_version(self, file_name: str, file_path: str) -> Optional[str]:
+        """
+        Get the ETag of a blob without downloading it.
+
+        :param file_name: Name of the blob (file).
+        :param file_path: Path of the blob (file).
+        :return: The blob ETag, or None if the blob does not exist.
+        """
+        path = self._get_blob_path(file_name, file_path)
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=path
+            )
+            properties = await blob_client.get_blob_properties()
+            return str(properties.etag)
+        except ResourceNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(
+                f"Failed to get properties of {path} in container {self.container_name}: {e}"
+            )
+            raise
+
     async def get_base_path(self) -> str:
         """
         Get the base path of the Azure Blob container.
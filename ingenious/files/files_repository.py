@@ -1,12 +1,51 @@
+import ast
+import asyncio
 import importlib
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Union
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
 
 from ingenious.config.main_settings import IngeniousSettings
+from ingenious.core import tracing
 from ingenious.models.config import Config, FileStorageContainer
 
 
+@dataclass(frozen=True)
+class FileEntry:
+    """Metadata for a single file returned by ``IFileStorage.iter_files``."""
+
+    name: str  # relative to the listed path, "/" separated
+    path: str  # full path within the storage backend
+    size: Optional[int] = None
+    modified: Optional[datetime] = None
+    etag: Optional[str] = None  # changes whenever the file contents change
+
+
+def _parse_file_listing(listing: str) -> List[str]:
+    """Turn the string returned by ``list_files`` into file paths."""
+    if not listing:
+        return []
+    if listing.startswith("["):
+        try:
+            return [str(name) for name in ast.literal_eval(listing)]
+        except (ValueError, SyntaxError):
+            return []
+    if listing.startswith("Failed to list"):
+        return []
+    return [line for line in listing.split("\n") if line]
+
+
 class IFileStorage(ABC):
     def __init__(
         self, config: Union[Config, IngeniousSettings], fs_config: FileStorageContainer
@@ -44,6 +83,101 @@ class IFileStorage(ABC):
         """returns the base path of the file storage"""
         pass
 
+    async def get_file_version(self, file_name: str, file_path: str) -> Optional[str]:
+        """returns a token that changes whenever the file changes, or None if unknown"""
+        return None
+
+    async def write_file_atomic(
+        self, contents: str, file_name: str, file_path: str
+    ) -> str:
+        """writes a file so readers see either the old or the new contents, never a mix"""
+        return await self.write_file(contents, file_name, file_path)
+
+    async def iter_files(
+        self, file_path: str, recursive: bool = False
+    ) -> AsyncIterator[FileEntry]:
+        """streams metadata for the files under a path"""
+        # Fallback for backends that only implement list_files
+        prefix = f"{Path(file_path).as_posix().strip('/')}/"
+        for item in _parse_file_listing(await self.list_files(file_path)):
+            # Listings may hold full paths; name entries relative to file_path
+            _, found, name = f"/{item}".partition(f"/{prefix}")
+            if not found:
+                name = item
+            if "/" in name and not recursive:
+                continue
+            yield FileEntry(name=name, path=str(Path(file_path) / name))
+
+    async def list_file_entries(
+        self, file_path: str, recursive: bool = False
+    ) -> List[FileEntry]:
+        """lists metadata for the files under a path"""
+        return [entry async for entry in self.iter_files(file_path, recursive)]
+
+    def _bulk_concurrency(self, max_concurrency: Optional[int] = None) -> int:
+        if max_concurrency:
+            return max_concurrency
+        return int(getattr(self.fs_config, "bulk_concurrency", 8) or 8)
+
+    async def read_many(
+        self,
+        file_names: Iterable[str],
+        file_path: str,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """reads several files from the same path concurrently, keyed by file name"""
+        semaphore = asyncio.Semaphore(self._bulk_concurrency(max_concurrency))
+        names = list(dict.fromkeys(file_names))
+
+        async def _read(file_name: str) -> str:
+            async with semaphore:
+                return await self.read_file(file_name=file_name, file_path=file_path)
+
+        contents = await asyncio.gather(*(_read(name) for name in names))
+        return dict(zip(names, contents))
+
+    async def write_many(
+        self,
+        files: Mapping[str, str],
+        file_path: str,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """writes several files to the same path concurrently, keyed by file name"""
+        semaphore = asyncio.Semaphore(self._bulk_concurrency(max_concurrency))
+
+        async def _write(file_name: str, contents: str) -> str:
+            async with semaphore:
+                return await self.write_file(
+                    contents=contents, file_name=file_name, file_path=file_path
+                )
+
+        results = await asyncio.gather(
+            *(_write(name, contents) for name, contents in files.items())
+        )
+        return dict(zip(files.keys(), results))
+
+    async def read_file_stream(
+        self, file_name: str, file_path: str
+    ) -> AsyncIterator[bytes]:
+        """reads a file as a stream of byte chunks"""
+        contents = await self.read_file(file_name=file_name, file_path=file_path)
+        yield contents.encode("utf-8")
+
+    async def write_file_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        file_name: str,
+        file_path: str,
+        length: Optional[int] = None,
+    ) -> str:
+        """writes a stream of byte chunks to a file"""
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer.extend(chunk)
+        return await self.write_file(
+            contents=buffer.decode("utf-8"), file_name=file_name, file_path=file_path
+        )
+
 
 class FileStorage:
     def __init__(
@@ -76,26 +210,91 @@ class FileStorage:
                 f"Unsupported File Storage client type: {module_name}.{class_name}"
             ) from e
 
+    @tracing.traced("file_storage.write_file")
     async def write_file(self, contents: str, file_name: str, file_path: str) -> str:
         return await self.repository.write_file(
             contents=contents, file_name=file_name, file_path=file_path
         )
 
+    @tracing.traced("file_storage.write_file_atomic")
+    async def write_file_atomic(
+        self, contents: str, file_name: str, file_path: str
+    ) -> str:
+        return await self.repository.write_file_atomic(
+            contents=contents, file_name=file_name, file_path=file_path
+        )
+
     async def get_base_path(self) -> str:
         return await self.repository.get_base_path()
 
+    @tracing.traced("file_storage.read_file")
     async def read_file(self, file_name: str, file_path: str) -> str:
         return await self.repository.read_file(file_name, file_path)
 
+    @tracing.traced("file_storage.delete_file")
     async def delete_file(self, file_name: str, file_path: str) -> str:
         return await self.repository.delete_file(file_name, file_path)
 
+    @tracing.traced("file_storage.list_files")
     async def list_files(self, file_path: str) -> str:
         return await self.repository.list_files(file_path)
 
+    @tracing.traced("file_storage.check_if_file_exists")
     async def check_if_file_exists(self, file_path: str, file_name: str) -> bool:
         return await self.repository.check_if_file_exists(file_path, file_name)
 
+    @tracing.traced("file_storage.get_file_version")
+    async def get_file_version(self, file_name: str, file_path: str) -> Optional[str]:
+        return await self.repository.get_file_version(file_name, file_path)
+
+    def iter_files(
+        self, file_path: str, recursive: bool = False
+    ) -> AsyncIterator[FileEntry]:
+        return self.repository.iter_files(file_path, recursive=recursive)
+
+    @tracing.traced("file_storage.list_file_entries")
+    async def list_file_entries(
+        self, file_path: str, recursive: bool = False
+    ) -> List[FileEntry]:
+        return await self.repository.list_file_entries(file_path, recursive=recursive)
+
+    @tracing.traced("file_storage.read_many")
+    async def read_many(
+        self,
+        file_names: Iterable[str],
+        file_path: str,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, str]:
+        return await self.repository.read_many(
+            file_names, file_path, max_concurrency=max_concurrency
+        )
+
+    @tracing.traced("file_storage.write_many")
+    async def write_many(
+        self,
+        files: Mapping[str, str],
+        file_path: str,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, str]:
+        return await self.repository.write_many(
+            files, file_path, max_concurrency=max_concurrency
+        )
+
+    def read_file_stream(self, file_name: str, file_path: str) -> AsyncIterator[bytes]:
+        return self.repository.read_file_stream(file_name, file_path)
+
+    @tracing.traced("file_storage.write_file_stream")
+    async def write_file_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        file_name: str,
+        file_path: str,
+        length: Optional[int] = None,
+    ) -> str:
+        return await self.repository.write_file_stream(
+            chunks, file_name, file_path, length=length
+        )
+
     async def get_prompt_template_path(self, revision_id: str | None = None) -> str:
         if revision_id:
             template_path = str(Path("templates") / Path("prompts") / Path(revision_id))
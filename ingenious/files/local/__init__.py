@@ -1,10 +1,50 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import AsyncIterator, Generator, Iterator, List, Optional
 
 import aiofiles  # type: ignore
 
-from ingenious.files.files_repository import IFileStorage
+from ingenious.files.files_repository import FileEntry, IFileStorage
 from ingenious.models.config import Config, FileStorageContainer
 
+# Number of directory entries stat'ed per worker-thread hop when streaming listings
+SCAN_BATCH_SIZE = 256
+
+
+def _version_token(stat: os.stat_result) -> str:
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _scan_files(
+    root: Path, recursive: bool, relative_to: str = ""
+) -> Generator[FileEntry, None, None]:
+    with os.scandir(root) as it:
+        for entry in it:
+            name = f"{relative_to}{entry.name}"
+            if entry.is_file():
+                stat = entry.stat()
+                yield FileEntry(
+                    name=name,
+                    path=entry.path,
+                    size=stat.st_size,
+                    modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                    etag=_version_token(stat),
+                )
+            elif recursive and entry.is_dir():
+                yield from _scan_files(Path(entry.path), recursive, f"{name}/")
+
+
+def _next_batch(entries: Iterator[FileEntry]) -> List[FileEntry]:
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= SCAN_BATCH_SIZE:
+            break
+    return batch
+
 
 class local_FileStorageRepository(IFileStorage):
     def __init__(self, config: Config, fs_config: FileStorageContainer):
@@ -32,6 +72,38 @@ class local_FileStorageRepository(IFileStorage):
             print(error_msg)
             return error_msg
 
+    async def write_file_atomic(
+        self, contents: str, file_name: str, file_path: str
+    ) -> str:
+        """
+        Write data to a local file via a temporary file and an atomic rename.
+
+        Concurrent readers see either the previous or the new contents. Unlike
+        write_file, failures are raised rather than returned.
+
+        :param contents: Data to write to the file.
+        :param file_name: Name of the file to create or replace.
+        :param file_path: Path to the file.
+        """
+        path = Path(self.fs_config.path) / Path(file_path) / Path(file_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        try:
+            # mkstemp creates the file as 0600, keep the existing permissions instead
+            os.chmod(tmp_name, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+            async with aiofiles.open(tmp_name, "w") as f:
+                await f.write(contents)
+                await f.flush()
+                await asyncio.to_thread(os.fsync, f.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return f"Successfully wrote {path}"
+
     async def read_file(self, file_name: str, file_path: str) -> str:
         """
         Read data from a local file.
@@ -101,6 +173,47 @@ class local_FileStorageRepository(IFileStorage):
             print(f"Failed to check if {file_name} exists in {path}: {e}")
             return False
 
+    async def get_file_version(self, file_name: str, file_path: str) -> Optional[str]:
+        """
+        Get a version token for a local file based on its modification time and size.
+
+        :param file_name: Name of the file.
+        :param file_path: Path to the file.
+        :return: Version token, or None if the file does not exist.
+        """
+        path = Path(self.fs_config.path) / Path(file_path) / Path(file_name)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return _version_token(stat)
+
+    async def iter_files(
+        self, file_path: str, recursive: bool = False
+    ) -> AsyncIterator[FileEntry]:
+        """
+        Stream metadata for the files in a local directory.
+
+        Directory scanning runs in a worker thread in batches so large directories
+        do not block the event loop.
+
+        :param file_path: Path to the directory.
+        :param recursive: Include files in subdirectories.
+        """
+        root = Path(self.fs_config.path) / Path(file_path)
+        if not root.is_dir():
+            return
+        entries = _scan_files(root, recursive)
+        try:
+            while True:
+                batch = await asyncio.to_thread(_next_batch, entries)
+                if not batch:
+                    break
+                for entry in batch:
+                    yield entry
+        finally:
+            entries.close()
+
     async def get_base_path(self) -> str:
         """
         Get the base path of the local file storage.
@@ -1,12 +1,9 @@
 import asyncio
 import json
-import logging
 import random
 from typing import Annotated, List
 
-import jsonpickle
 from autogen_core import (
-    EVENT_LOGGER_NAME,
     SingleThreadedAgentRuntime,
     TopicId,
     TypeSubscription,
@@ -14,21 +11,25 @@ from autogen_core import (
 from autogen_core.tools import FunctionTool
 
 # Custom class import from ingenious_extensions
+from ingenious.core import tracing
 from ingenious.ingenious_extensions_template.models.agent import ProjectAgents
 from ingenious.ingenious_extensions_template.models.bikes import RootModel
 from ingenious.models.ag_agents import (
     RelayAgent,
     RoutedAssistantAgent,
     RoutedResponseOutputAgent,
+    get_model_client,
 )
 from ingenious.models.agent import (
     AgentChat,
     AgentMessage,
     LLMUsageTracker,
+    track_llm_usage,
 )
 from ingenious.models.chat import ChatRequest, ChatResponse
 from ingenious.models.message import Message as ChatHistoryMessage
 from ingenious.services.chat_services.multi_agent.service import IConversationFlow
+from ingenious.utils import serialization
 
 
 class ConversationFlow(IConversationFlow):
@@ -75,10 +76,7 @@ class ConversationFlow(IConversationFlow):
         revision_id = message["revision_id"]
         identifier = message["identifier"]
 
-        # Instantiate the logger and handler
-        logger = logging.getLogger(EVENT_LOGGER_NAME)
-        logger.setLevel(logging.INFO)
-
+        # Instantiate the handler that collects this request's model calls
         llm_logger = LLMUsageTracker(
             agents=agents,
             config=self._config,
@@ -88,7 +86,7 @@ class ConversationFlow(IConversationFlow):
             event_type="default",
         )
 
-        logger.handlers = [llm_logger]
+        track_llm_usage(llm_logger)
 
         # Note you can access llm models from the configuration array
         # llm_config = self.Get_Models()[0]
@@ -97,15 +95,41 @@ class ConversationFlow(IConversationFlow):
 
         # Now add your system prompts to your agents from the prompt templates
         # Modify this if you want to modify the pattern used to correlate the agent name to the prompt template
-        for agent in agents.get_agents():
-            template_name = f"{agent.agent_name}_prompt.jinja"
-            agent.system_prompt = await self.Get_Template(
-                file_name=template_name, revision_id=revision_id
-            )
+        # The templates and the chat history are loaded concurrently
+        hist_itr, *prompts = await asyncio.gather(
+            # Optionally inject the chat history into the conversation flow so that you can avoid duplicate responses
+            self._chat_service.chat_history_repository.get_thread_messages(
+                thread_id=chat_request.thread_id
+            ),
+            *[
+                self.Get_Template(
+                    file_name=f"{agent.agent_name}_prompt.jinja",
+                    revision_id=revision_id,
+                )
+                for agent in agents.get_agents()
+            ],
+        )
+        for agent, prompt in zip(agents.get_agents(), prompts):
+            agent.system_prompt = prompt
+
+        hist_join = [""]
+        for h in hist_itr:
+            if h.role == "output":
+                hist_join.append(h.content)
+        hist_str = "# Chat History \n\n" + '``` json\n\n " ' + json.dumps(hist_join)
+
+        # Agents share one model client per model, run at most
+        # max_parallel_agents model calls at once and give up after
+        # agent_timeout_seconds
+        chat_service_settings = self._config.chat_service
+        semaphore = asyncio.Semaphore(chat_service_settings.max_parallel_agents)
+        agent_timeout = chat_service_settings.agent_timeout_seconds
 
         # Now construct your autogen conversation pattern the way you want
         # In this sample I'll first define my topic agents
-        runtime = SingleThreadedAgentRuntime()
+        runtime = SingleThreadedAgentRuntime(
+            tracer_provider=tracing.runtime_tracer_provider()
+        )
 
         async def get_bike_price(
             ticker: str, date: Annotated[str, "Date in YYYY/MM/DD"]
@@ -131,6 +155,9 @@ class ConversationFlow(IConversationFlow):
                     data_identifier=identifier,
                     next_agent_topic=next_agent_topic,
                     tools=tools,
+                    model_client=get_model_client(agent.model),
+                    timeout=agent_timeout,
+                    semaphore=semaphore,
                 ),
             )
             await runtime.add_subscription(
@@ -157,22 +184,14 @@ class ConversationFlow(IConversationFlow):
                 data_identifier=identifier,
                 next_agent_topic="summary",
                 number_of_messages_before_next_agent=2,
+                # The summary sees the analyses in the same order every time
+                message_order=["customer_sentiment_agent", "fiscal_analysis_agent"],
             ),
         )
         await runtime.add_subscription(
             TypeSubscription(topic_type="user_proxy", agent_type=user_proxy.type)
         )
 
-        # Optionally inject the chat history into the conversation flow so that you can avoid duplicate responses
-        hist_itr = await self._chat_service.chat_history_repository.get_thread_messages(
-            thread_id=chat_request.thread_id
-        )
-        hist_join = [""]
-        for h in hist_itr:
-            if h.role == "output":
-                hist_join.append(h.content)
-        hist_str = "# Chat History \n\n" + '``` json\n\n " ' + json.dumps(hist_join)
-
         async def register_output_agent(agent_name: str, next_agent_topic: str = None):
             agent = agents.get_agent_by_name(agent_name=agent_name)
             summary = await RoutedResponseOutputAgent.register(
@@ -183,6 +202,9 @@ class ConversationFlow(IConversationFlow):
                     data_identifier=identifier,
                     next_agent_topic=next_agent_topic,
                     additional_data=hist_str,
+                    model_client=get_model_client(agent.model),
+                    timeout=agent_timeout,
+                    semaphore=semaphore,
                 ),
             )
             await runtime.add_subscription(
@@ -216,6 +238,10 @@ class ConversationFlow(IConversationFlow):
 
         await runtime.stop_when_idle()
 
+        # The agents ran concurrently, so take their chats in agent order
+        # rather than in the order their model calls finished
+        agent_chats = llm_logger.get_agent_chats()
+
         # If you want to use the prompt tuner you need to write the responses to a file with the method provided in the logger
         await llm_logger.write_llm_responses_to_file(
             file_prefixes=[str(chat_request.user_id)]
@@ -225,17 +251,20 @@ class ConversationFlow(IConversationFlow):
         chat_response = ChatResponse(
             thread_id=chat_request.thread_id,
             message_id=identifier,
-            agent_response=jsonpickle.encode(
-                unpicklable=False, value=llm_logger._queue
-            ),
+            agent_response=serialization.dumps(agent_chats),
             token_count=llm_logger.prompt_tokens,
             max_token_count=0,
             memory_summary="",
         )
 
+        # A summary that timed out has no model call in the queue, but its
+        # chat still holds the timeout note
         summary_response: AgentChat = next(
-            chat for chat in llm_logger._queue if chat.chat_name == "summary"
-        )
+            (chat for chat in agent_chats if chat.chat_name == "summary"),
+            None,
+        ) or next(iter(agents.get_agent_by_name("summary").agent_chats[-1:]), None)
+        if summary_response is None or summary_response.chat_response is None:
+            raise RuntimeError("bike-insights workflow produced no summary response")
 
         message: ChatHistoryMessage = ChatHistoryMessage(
             user_id=chat_request.user_id,
@@ -0,0 +1,39 @@
+"""
+Offline load testing for Insight Ingenious.
+
+- ``mock_llm``: an OpenAI-compatible model server with configurable latency,
+  token rate, streaming, tool calls and 429 injection.
+- ``scenarios``: YAML workloads that drive ``/api/v1/chat`` and
+  ``/api/v1/chat/stream``; bundled files cover the built-in flows.
+- ``runner`` and ``report``: run scenarios, report throughput and
+  p50/p95/p99 latency and time to first token, and compare against a baseline.
+
+Run from the command line with ``ingen loadtest mock-llm`` and
+``ingen loadtest run``.
+"""
+
+from ingenious.loadtest.mock_llm import MockLLMSettings, create_mock_llm_app
+from ingenious.loadtest.report import (
+    LoadTestReport,
+    Regression,
+    ScenarioReport,
+    compare,
+    summarize,
+)
+from ingenious.loadtest.runner import run_scenario, run_scenarios
+from ingenious.loadtest.scenarios import Scenario, ScenarioFile, load_scenario_file
+
+__all__ = [
+    "LoadTestReport",
+    "MockLLMSettings",
+    "Regression",
+    "Scenario",
+    "ScenarioFile",
+    "ScenarioReport",
+    "compare",
+    "create_mock_llm_app",
+    "load_scenario_file",
+    "run_scenario",
+    "run_scenarios",
+    "summarize",
+]
@@ -0,0 +1,200 @@
+"""
+``ingen loadtest`` commands: run the mock model server and drive scenarios.
+
+Typical offline run, with the API's models pointed at the mock::
+
+    ingen loadtest mock-llm --port 8999 &
+    INGENIOUS_MODELS__0__BASE_URL=http://127.0.0.1:8999 \\
+    INGENIOUS_MODELS__0__API_KEY=mock ingen serve --port 8000 &
+    ingen loadtest run builtin-flows --base-url http://127.0.0.1:8000 \\
+        --output run.json --baseline baseline.json
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+if TYPE_CHECKING:
+    from ingenious.loadtest.report import LoadTestReport
+
+loadtest_app: typer.Typer = typer.Typer(
+    no_args_is_help=True,
+    help="Offline load testing against a mock OpenAI-compatible model server.",
+)
+
+console = Console()
+
+
+def _parse_headers(values: Optional[List[str]]) -> Dict[str, str]:
+    headers = {}
+    for value in values or []:
+        name, sep, content = value.partition(":")
+        if not sep:
+            raise typer.BadParameter(f"Expected 'Name: value', got {value!r}")
+        headers[name.strip()] = content.strip()
+    return headers
+
+
+@loadtest_app.command("mock-llm")
+def mock_llm(
+    host: Annotated[str, typer.Option(help="Host to bind")] = "127.0.0.1",
+    port: Annotated[int, typer.Option(help="Port to bind")] = 8999,
+    scenarios: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Scenario file (or bundled name) whose mock_llm section to use"
+        ),
+    ] = None,
+    latency: Annotated[
+        Optional[float], typer.Option(help="Seconds to first token")
+    ] = None,
+    tokens_per_second: Annotated[
+        Optional[float], typer.Option(help="Generation rate after the first token")
+    ] = None,
+    completion_tokens: Annotated[
+        Optional[int], typer.Option(help="Tokens per text response")
+    ] = None,
+    tool_call_rate: Annotated[
+        Optional[float],
+        typer.Option(help="Share of tool-enabled requests answered with a tool call"),
+    ] = None,
+    rate_limit_rate: Annotated[
+        Optional[float], typer.Option(help="Share of requests answered with 429")
+    ] = None,
+    seed: Annotated[Optional[int], typer.Option(help="Random seed")] = None,
+) -> None:
+    """Serve OpenAI-compatible chat completions with configurable pacing and faults."""
+    import uvicorn
+
+    from ingenious.loadtest.mock_llm import MockLLMSettings, create_mock_llm_app
+    from ingenious.loadtest.scenarios import load_scenario_file
+
+    settings = (
+        load_scenario_file(scenarios).mock_llm if scenarios else MockLLMSettings()
+    )
+    overrides = {
+        "latency_seconds": latency,
+        "tokens_per_second": tokens_per_second,
+        "completion_tokens": completion_tokens,
+        "tool_call_rate": tool_call_rate,
+        "rate_limit_rate": rate_limit_rate,
+        "seed": seed,
+    }
+    settings = MockLLMSettings.model_validate(
+        {
+            **settings.model_dump(),
+            **{key: value for key, value in overrides.items() if value is not None},
+        }
+    )
+    console.print(
+        f"[cyan]Mock LLM on http://{host}:{port}[/cyan] {settings.model_dump()}"
+    )
+    uvicorn.run(
+        create_mock_llm_app(settings), host=host, port=port, log_level="warning"
+    )
+
+
+@loadtest_app.command("run")
+def run(
+    scenario_file: Annotated[
+        str,
+        typer.Argument(help="Scenario file, or a bundled name such as builtin-flows"),
+    ],
+    base_url: Annotated[
+        str, typer.Option(help="Base URL of the API under test")
+    ] = "http://127.0.0.1:80",
+    scenario: Annotated[
+        Optional[List[str]],
+        typer.Option("--scenario", "-s", help="Only run these scenarios"),
+    ] = None,
+    header: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--header",
+            "-H",
+            help="Extra request header, e.g. 'Authorization: Bearer <token>'",
+        ),
+    ] = None,
+    output: Annotated[
+        Optional[str], typer.Option(help="Write the report as JSON to this path")
+    ] = None,
+    baseline: Annotated[
+        Optional[str], typer.Option(help="Compare against a previously saved report")
+    ] = None,
+    tolerance: Annotated[
+        float,
+        typer.Option(
+            help="Allowed relative change before a metric counts as a regression"
+        ),
+    ] = 0.1,
+) -> None:
+    """Run scenarios, print throughput and latency percentiles, and check for regressions."""
+    from ingenious.loadtest.report import LoadTestReport, compare, summarize
+    from ingenious.loadtest.runner import run_scenarios
+    from ingenious.loadtest.scenarios import load_scenario_file
+
+    selected = load_scenario_file(scenario_file).select(scenario)
+    results = asyncio.run(
+        run_scenarios(base_url, selected, headers=_parse_headers(header))
+    )
+    report = LoadTestReport(
+        base_url=base_url, scenarios=[summarize(result) for result in results]
+    )
+    print_report(report)
+
+    if output:
+        report.save(output)
+        console.print(f"Report written to {output}")
+
+    if baseline:
+        regressions = compare(report, LoadTestReport.load(baseline), tolerance)
+        if regressions:
+            table = Table("Scenario", "Metric", "Baseline", "Current", "Change")
+            for regression in regressions:
+                table.add_row(
+                    regression.scenario,
+                    regression.metric,
+                    f"{regression.baseline:g}",
+                    f"{regression.current:g}",
+                    f"{regression.change:+.1%}",
+                )
+            console.print("[bold red]Regressions against baseline[/bold red]")
+            console.print(table)
+            raise typer.Exit(code=1)
+        console.print(f"[green]No regressions against {baseline}[/green]")
+
+
+def print_report(report: LoadTestReport) -> None:
+    table = Table(
+        "Scenario",
+        "Requests",
+        "Errors",
+        "Req/s",
+        "p50 ms",
+        "p95 ms",
+        "p99 ms",
+        "TTFT p50",
+        "TTFT p95",
+        title=f"Load test against {report.base_url}",
+    )
+    for s in report.scenarios:
+        latency = s.latency
+        ttft = s.ttft
+        table.add_row(
+            s.name,
+            str(s.requests),
+            f"{s.errors} ({s.error_rate:.1%})",
+            f"{s.throughput_rps:.2f}",
+            f"{latency.p50_ms:.0f}" if latency else "-",
+            f"{latency.p95_ms:.0f}" if latency else "-",
+            f"{latency.p99_ms:.0f}" if latency else "-",
+            f"{ttft.p50_ms:.0f}" if ttft else "-",
+            f"{ttft.p95_ms:.0f}" if ttft else "-",
+        )
+    console.print(table)
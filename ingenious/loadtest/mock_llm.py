@@ -0,0 +1,248 @@
+"""
+OpenAI-compatible mock chat completions server for offline load tests.
+
+Answers ``/openai/deployments/{deployment}/chat/completions`` (the Azure
+OpenAI path the agents call) and ``/v1/chat/completions`` with generated
+text, paced by ``MockLLMSettings``: a time to first token, then a steady
+token rate. Requests that offer tools get a tool call at ``tool_call_rate``,
+and ``rate_limit_rate`` of all requests are answered with 429 and a
+``Retry-After`` header, as a throttled deployment would.
+
+Behaviour is deterministic for a given ``seed``: the n-th request received
+always gets the same latency, text and 429/tool-call decision, so two runs
+of a scenario put the same load on the server under test.
+"""
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+VOCABULARY = (
+    "store sales bikes units revenue margin stock review rating customers "
+    "delivery trend quarter increase decrease forecast inventory analysis "
+    "the a of and in with for on to is was were"
+).split()
+
+# Placeholder values for required tool arguments, by JSON schema type
+_ARGUMENT_VALUES: Dict[str, Any] = {
+    "string": "mock",
+    "integer": 1,
+    "number": 1.0,
+    "boolean": True,
+    "array": [],
+    "object": {},
+}
+
+
+class MockLLMSettings(BaseModel):
+    """Pacing and fault injection for the mock model server."""
+
+    latency_seconds: float = Field(
+        0.5, ge=0, description="Time to first token for every response"
+    )
+    latency_jitter: float = Field(
+        0.0, ge=0, le=1, description="Random +/- fraction applied to the latency"
+    )
+    tokens_per_second: float = Field(
+        50.0, gt=0, description="Generation rate after the first token"
+    )
+    completion_tokens: int = Field(
+        80, ge=1, description="Tokens generated per text response"
+    )
+    stream_chunk_tokens: int = Field(4, ge=1, description="Tokens per streamed chunk")
+    tool_call_rate: float = Field(
+        0.0,
+        ge=0,
+        le=1,
+        description="Share of requests offering tools that get a tool call back",
+    )
+    rate_limit_rate: float = Field(
+        0.0, ge=0, le=1, description="Share of requests answered with 429"
+    )
+    retry_after_seconds: float = Field(
+        1.0, ge=0, description="Retry-After sent with injected 429s"
+    )
+    seed: int = Field(0, description="Seed for latency, text and fault decisions")
+
+
+class MockLLMStats(BaseModel):
+    """Counts of what the mock has served, exposed at ``/stats``."""
+
+    requests: int = 0
+    streamed: int = 0
+    rate_limited: int = 0
+    tool_calls: int = 0
+    completion_tokens: int = 0
+
+
+def _tool_call(rng: random.Random, tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    function = rng.choice(tools).get("function", {})
+    schema = function.get("parameters") or {}
+    properties = schema.get("properties", {})
+    arguments = {
+        name: _ARGUMENT_VALUES.get(properties.get(name, {}).get("type"), "mock")
+        for name in schema.get("required", [])
+    }
+    return {
+        "id": f"call_{rng.getrandbits(48):012x}",
+        "type": "function",
+        "function": {
+            "name": function.get("name", ""),
+            "arguments": json.dumps(arguments),
+        },
+    }
+
+
+def _prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    # Roughly four characters per token, which is close enough for pacing
+    return max(1, len(json.dumps(messages)) // 4)
+
+
+def create_mock_llm_app(settings: Optional[MockLLMSettings] = None) -> FastAPI:
+    """Build the mock server app; its counters are on ``app.state.stats``."""
+    settings = settings or MockLLMSettings()
+    app = FastAPI(title="Ingenious mock LLM", docs_url=None, redoc_url=None)
+    stats = MockLLMStats()
+    app.state.settings = settings
+    app.state.stats = stats
+
+    def next_rng() -> random.Random:
+        stats.requests += 1
+        return random.Random(settings.seed * 1_000_003 + stats.requests)
+
+    async def complete(request: Request, model: str) -> Any:
+        body = await request.json()
+        rng = next_rng()
+
+        if rng.random() < settings.rate_limit_rate:
+            stats.rate_limited += 1
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "error": {
+                        "code": "429",
+                        "type": "rate_limit_exceeded",
+                        "message": "Mock rate limit. Please retry after the delay.",
+                    }
+                },
+                headers={
+                    "Retry-After": str(settings.retry_after_seconds),
+                    "Retry-After-Ms": str(int(settings.retry_after_seconds * 1000)),
+                },
+            )
+
+        messages = body.get("messages", [])
+        tools = body.get("tools") or []
+        answering_tool = bool(messages) and messages[-1].get("role") == "tool"
+        tool_call = None
+        if tools and not answering_tool and rng.random() < settings.tool_call_rate:
+            tool_call = _tool_call(rng, tools)
+            stats.tool_calls += 1
+            completion_tokens = 20
+        else:
+            completion_tokens = settings.completion_tokens
+        stats.completion_tokens += completion_tokens
+
+        latency = settings.latency_seconds * (
+            1 + settings.latency_jitter * rng.uniform(-1, 1)
+        )
+        words = [rng.choice(VOCABULARY) for _ in range(completion_tokens)]
+        usage = {
+            "prompt_tokens": _prompt_tokens(messages),
+            "completion_tokens": completion_tokens,
+            "total_tokens": _prompt_tokens(messages) + completion_tokens,
+        }
+        base = {
+            "id": f"chatcmpl-{uuid.UUID(int=rng.getrandbits(128)).hex}",
+            "created": int(time.time()),
+            "model": body.get("model") or model,
+        }
+
+        if body.get("stream"):
+            stats.streamed += 1
+            include_usage = bool(
+                (body.get("stream_options") or {}).get("include_usage")
+            )
+            return StreamingResponse(
+                _stream(
+                    settings, base, latency, words, tool_call, usage, include_usage
+                ),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(latency + completion_tokens / settings.tokens_per_second)
+        message: Dict[str, Any] = {"role": "assistant", "content": None}
+        if tool_call is not None:
+            message["tool_calls"] = [tool_call]
+        else:
+            message["content"] = " ".join(words)
+        return {
+            **base,
+            "object": "chat.completion",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if tool_call else "stop",
+                }
+            ],
+            "usage": usage,
+        }
+
+    @app.post("/openai/deployments/{deployment}/chat/completions")
+    async def azure_chat_completions(deployment: str, request: Request) -> Any:
+        return await complete(request, deployment)
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request) -> Any:
+        return await complete(request, "mock")
+
+    @app.get("/stats")
+    async def get_stats() -> MockLLMStats:
+        return stats
+
+    return app
+
+
+async def _stream(
+    settings: MockLLMSettings,
+    base: Dict[str, Any],
+    latency: float,
+    words: List[str],
+    tool_call: Optional[Dict[str, Any]],
+    usage: Dict[str, int],
+    include_usage: bool,
+) -> AsyncIterator[str]:
+    def chunk(choices: List[Dict[str, Any]], **extra: Any) -> str:
+        payload = {**base, "object": "chat.completion.chunk", "choices": choices}
+        return f"data: {json.dumps({**payload, **extra})}\n\n"
+
+    await asyncio.sleep(latency)
+    if tool_call is not None:
+        delta = {"role": "assistant", "tool_calls": [{"index": 0, **tool_call}]}
+        yield chunk([{"index": 0, "delta": delta, "finish_reason": None}])
+        finish_reason = "tool_calls"
+    else:
+        size = settings.stream_chunk_tokens
+        for i in range(0, len(words), size):
+            if i:
+                await asyncio.sleep(size / settings.tokens_per_second)
+            text = " ".join(words[i : i + size]) + " "
+            delta = (
+                {"role": "assistant", "content": text} if i == 0 else {"content": text}
+            )
+            yield chunk([{"index": 0, "delta": delta, "finish_reason": None}])
+        finish_reason = "stop"
+
+    yield chunk([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+    if include_usage:
+        yield chunk([], usage=usage)
+    yield "data: [DONE]\n\n"
@@ -0,0 +1,173 @@
+"""
+Load-test reports and comparison against a stored baseline.
+
+Reports are JSON so a run can be saved with ``--output`` and later passed
+back as ``--baseline``. ``compare`` flags a regression when a latency
+percentile or time to first token grows, or throughput drops, by more than
+the tolerance, or when the error rate rises by more than a point.
+"""
+
+import statistics
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from ingenious.loadtest.runner import ScenarioResult
+
+# Absolute increase in error rate that counts as a regression
+ERROR_RATE_TOLERANCE = 0.01
+
+
+class LatencySummary(BaseModel):
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+
+
+class ScenarioReport(BaseModel):
+    name: str
+    endpoint: str
+    conversation_flow: str
+    requests: int
+    errors: int
+    error_rate: float
+    status_counts: Dict[str, int]
+    wall_seconds: float
+    throughput_rps: float
+    latency: Optional[LatencySummary] = None
+    ttft: Optional[LatencySummary] = None
+
+
+class LoadTestReport(BaseModel):
+    created_at: str = Field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+    base_url: str = ""
+    scenarios: List[ScenarioReport] = Field(default_factory=list)
+
+    def scenario(self, name: str) -> Optional[ScenarioReport]:
+        return next((s for s in self.scenarios if s.name == name), None)
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(self.model_dump_json(indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LoadTestReport":
+        return cls.model_validate_json(Path(path).read_text(encoding="utf-8"))
+
+
+class Regression(BaseModel):
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change, or the absolute change for error rates."""
+        if self.metric == "error_rate" or not self.baseline:
+            return self.current - self.baseline
+        return self.current / self.baseline - 1
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def summarize_latencies(values: List[float]) -> Optional[LatencySummary]:
+    if not values:
+        return None
+    ms = [value * 1000 for value in values]
+    return LatencySummary(
+        p50_ms=round(percentile(ms, 50), 2),
+        p95_ms=round(percentile(ms, 95), 2),
+        p99_ms=round(percentile(ms, 99), 2),
+        mean_ms=round(statistics.fmean(ms), 2),
+        max_ms=round(max(ms), 2),
+    )
+
+
+def summarize(result: ScenarioResult) -> ScenarioReport:
+    """
+    Summarise one scenario run.
+
+    Latency and time-to-first-token percentiles cover successful requests
+    only, so a burst of fast 429s does not make a run look quicker.
+    Throughput counts successful requests per second of wall time.
+    """
+    samples = result.samples
+    ok = [sample for sample in samples if sample.ok]
+    status_counts: Dict[str, int] = {}
+    for sample in samples:
+        status_counts[str(sample.status)] = status_counts.get(str(sample.status), 0) + 1
+    return ScenarioReport(
+        name=result.scenario.name,
+        endpoint=result.scenario.endpoint,
+        conversation_flow=result.scenario.conversation_flow,
+        requests=len(samples),
+        errors=len(samples) - len(ok),
+        error_rate=round((len(samples) - len(ok)) / len(samples), 4)
+        if samples
+        else 0.0,
+        status_counts=status_counts,
+        wall_seconds=round(result.wall_seconds, 3),
+        throughput_rps=round(len(ok) / result.wall_seconds, 3)
+        if result.wall_seconds
+        else 0.0,
+        latency=summarize_latencies([sample.latency_seconds for sample in ok]),
+        ttft=summarize_latencies(
+            [sample.ttft_seconds for sample in ok if sample.ttft_seconds is not None]
+        ),
+    )
+
+
+def compare(
+    report: LoadTestReport, baseline: LoadTestReport, tolerance: float = 0.1
+) -> List[Regression]:
+    """Regressions in ``report`` against ``baseline``, by scenario name."""
+    regressions: List[Regression] = []
+    for current in report.scenarios:
+        previous = baseline.scenario(current.name)
+        if previous is None:
+            continue
+
+        def check(
+            metric: str, before: float, after: float, higher_is_worse: bool
+        ) -> None:
+            if higher_is_worse:
+                worse = after > before * (1 + tolerance)
+            else:
+                worse = after < before * (1 - tolerance)
+            if worse:
+                regressions.append(
+                    Regression(
+                        scenario=current.name,
+                        metric=metric,
+                        baseline=before,
+                        current=after,
+                    )
+                )
+
+        check("throughput_rps", previous.throughput_rps, current.throughput_rps, False)
+        for name in ("latency", "ttft"):
+            before, after = getattr(previous, name), getattr(current, name)
+            if before is None or after is None:
+                continue
+            for key in ("p50_ms", "p95_ms", "p99_ms"):
+                check(f"{name}.{key}", getattr(before, key), getattr(after, key), True)
+        if current.error_rate > previous.error_rate + ERROR_RATE_TOLERANCE:
+            regressions.append(
+                Regression(
+                    scenario=current.name,
+                    metric="error_rate",
+                    baseline=previous.error_rate,
+                    current=current.error_rate,
+                )
+            )
+    return regressions
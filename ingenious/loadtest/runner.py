@@ -0,0 +1,133 @@
+"""
+Drive load-test scenarios against a running Insight Ingenious API.
+
+Each scenario keeps ``concurrency`` requests in flight until ``requests``
+have completed. For ``/chat`` the latency of the whole response is
+recorded; for ``/chat/stream`` also the time to the first data event,
+which is what a user waiting on a streamed answer notices.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from ingenious.loadtest.scenarios import Scenario
+
+ENDPOINT_PATHS = {"chat": "/api/v1/chat", "stream": "/api/v1/chat/stream"}
+
+
+@dataclass
+class RequestSample:
+    status: int
+    latency_seconds: float
+    ttft_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 and self.error is None
+
+
+@dataclass
+class ScenarioResult:
+    scenario: Scenario
+    samples: List[RequestSample] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+
+def _payload(scenario: Scenario, index: int) -> Dict[str, Any]:
+    return {
+        "user_prompt": scenario.prompts[index % len(scenario.prompts)],
+        "conversation_flow": scenario.conversation_flow,
+        "user_id": f"loadtest-user-{index % scenario.users}",
+    }
+
+
+async def _post_chat(
+    client: httpx.AsyncClient, scenario: Scenario, payload: Dict[str, Any]
+) -> RequestSample:
+    start = time.perf_counter()
+    response = await client.post(
+        ENDPOINT_PATHS["chat"], json=payload, timeout=scenario.timeout_seconds
+    )
+    latency = time.perf_counter() - start
+    error = None if response.status_code == 200 else response.text[:200]
+    return RequestSample(response.status_code, latency, error=error)
+
+
+async def _post_stream(
+    client: httpx.AsyncClient, scenario: Scenario, payload: Dict[str, Any]
+) -> RequestSample:
+    start = time.perf_counter()
+    ttft = None
+    error = None
+    async with client.stream(
+        "POST",
+        ENDPOINT_PATHS["stream"],
+        json=payload,
+        timeout=scenario.timeout_seconds,
+    ) as response:
+        if response.status_code != 200:
+            body = await response.aread()
+            return RequestSample(
+                response.status_code,
+                time.perf_counter() - start,
+                error=body.decode(errors="replace")[:200],
+            )
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[len("data: ") :])
+            if event.get("event") == "data" and ttft is None:
+                ttft = time.perf_counter() - start
+            elif event.get("event") == "error":
+                error = event.get("error") or "stream error"
+    return RequestSample(200, time.perf_counter() - start, ttft, error)
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario) -> ScenarioResult:
+    """Run one scenario; transport errors are recorded as status 0."""
+    send = _post_stream if scenario.endpoint == "stream" else _post_chat
+    result = ScenarioResult(scenario)
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < scenario.requests:
+            index = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                sample = await send(client, scenario, _payload(scenario, index))
+            except httpx.HTTPError as e:
+                sample = RequestSample(
+                    0, time.perf_counter() - start, error=f"{type(e).__name__}: {e}"
+                )
+            result.samples.append(sample)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(worker() for _ in range(min(scenario.concurrency, scenario.requests)))
+    )
+    result.wall_seconds = time.perf_counter() - start
+    return result
+
+
+async def run_scenarios(
+    base_url: str,
+    scenarios: List[Scenario],
+    headers: Optional[Dict[str, str]] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> List[ScenarioResult]:
+    """Run scenarios one after another against ``base_url``."""
+    limits = httpx.Limits(
+        max_connections=max(scenario.concurrency for scenario in scenarios)
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, headers=headers, limits=limits, transport=transport
+    ) as client:
+        return [await run_scenario(client, scenario) for scenario in scenarios]
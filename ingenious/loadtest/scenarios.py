@@ -0,0 +1,76 @@
+"""
+Load-test scenario files.
+
+A scenario file is YAML (or JSON) with an optional ``mock_llm`` section, the
+settings the mock model server should run with, and a list of scenarios::
+
+    mock_llm:
+      latency_seconds: 0.5
+      tokens_per_second: 50
+    scenarios:
+      - name: classification-chat
+        endpoint: chat
+        conversation_flow: classification-agent
+        prompts: ["Great product, slow delivery"]
+        requests: 100
+        concurrency: 10
+
+Bundled files for the built-in flows live in ``ingenious/loadtest/scenario_files``.
+"""
+
+from pathlib import Path
+from typing import List, Literal, Optional, Union
+
+import yaml
+from pydantic import BaseModel, Field
+
+from ingenious.loadtest.mock_llm import MockLLMSettings
+
+BUNDLED_SCENARIOS_DIR = Path(__file__).parent / "scenario_files"
+
+
+class Scenario(BaseModel):
+    """One workload: a flow driven through one chat endpoint."""
+
+    name: str
+    endpoint: Literal["chat", "stream"] = Field(
+        "chat", description="chat for /api/v1/chat, stream for /api/v1/chat/stream"
+    )
+    conversation_flow: str
+    prompts: List[str] = Field(..., min_length=1, description="Used round-robin")
+    requests: int = Field(50, ge=1)
+    concurrency: int = Field(5, ge=1, description="Requests in flight at once")
+    users: int = Field(1, ge=1, description="Distinct user_id values, round-robin")
+    timeout_seconds: float = Field(300.0, gt=0)
+
+
+class ScenarioFile(BaseModel):
+    mock_llm: MockLLMSettings = MockLLMSettings()
+    scenarios: List[Scenario] = Field(..., min_length=1)
+
+    def select(self, names: Optional[List[str]] = None) -> List[Scenario]:
+        """Scenarios with the given names, or all of them."""
+        if not names:
+            return list(self.scenarios)
+        unknown = set(names) - {scenario.name for scenario in self.scenarios}
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        return [scenario for scenario in self.scenarios if scenario.name in names]
+
+
+def resolve_scenario_path(path: Union[str, Path]) -> Path:
+    """A path as given, or the name of a bundled file such as ``builtin-flows``."""
+    candidate = Path(path)
+    if candidate.exists():
+        return candidate
+    for suffix in (".yml", ".yaml", ".json"):
+        bundled = BUNDLED_SCENARIOS_DIR / f"{path}{suffix}"
+        if bundled.exists():
+            return bundled
+    raise FileNotFoundError(f"Scenario file not found: {path}")
+
+
+def load_scenario_file(path: Union[str, Path]) -> ScenarioFile:
+    """Load and validate a scenario file (JSON is valid YAML)."""
+    with open(resolve_scenario_path(path), encoding="utf-8") as f:
+        return ScenarioFile.model_validate(yaml.safe_load(f))
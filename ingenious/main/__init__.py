@@ -6,6 +6,7 @@ for creating and configuring the Ingenious application.
 """
 
 from .app_factory import FastAgentAPI, create_app
+from .compression import CompressionMiddleware
 from .exception_handlers import ExceptionHandlers
 from .middleware import RequestContextMiddleware
 from .routing import RouteManager
@@ -13,6 +14,7 @@ from .routing import RouteManager
 __all__ = [
     "FastAgentAPI",
     "create_app",
+    "CompressionMiddleware",
     "ExceptionHandlers",
     "RequestContextMiddleware",
     "RouteManager",
@@ -5,13 +5,29 @@ This module contains the factory function for creating and configuring
 the FastAPI application with all necessary middleware, routes, and services.
 """
 
+import asyncio
 import os
-from typing import TYPE_CHECKING
+import signal
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
+from ingenious.config.snapshot import (
+    on_settings_change,
+    reload_settings,
+    remove_settings_listener,
+)
+from ingenious.core import metrics, timing, tracing
+from ingenious.core.structured_logging import get_logger, setup_structured_logging
+from ingenious.utils.serialization import JSON_RESPONSE_CLASS
+
+from .compression import CompressionMiddleware
 from .exception_handlers import ExceptionHandlers
 from .middleware import RequestContextMiddleware
 from .routing import RouteManager
@@ -19,21 +35,192 @@ from .routing import RouteManager
 if TYPE_CHECKING:
     from ingenious.config import IngeniousSettings
 
+logger = get_logger(__name__)
+
 
 class FastAgentAPI:
     """FastAPI application wrapper with initialization and configuration."""
 
     def __init__(self, config: "IngeniousSettings"):
         self.config = config
-        self.app = self._create_app()
-        self._configure_app()
+        # Seconds spent in each startup phase, reported by `ingen profile-startup`
+        self.startup_phases: Dict[str, float] = {}
+        self._warmup_task: Optional["asyncio.Task[Any]"] = None
+        with self._phase("configure_app"):
+            self.app = self._create_app()
+            self._configure_app()
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_phases[name] = time.perf_counter() - start
 
     def _create_app(self) -> FastAPI:
         """Create the FastAPI application instance."""
-        return FastAPI(title="FastAgent API", version="1.0.0")
+        return FastAPI(
+            title="FastAgent API",
+            version="1.0.0",
+            lifespan=self._lifespan,
+            default_response_class=JSON_RESPONSE_CLASS,
+        )
+
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Run startup tasks before serving requests."""
+        with self._phase("flow_registry"):
+            await self._load_flow_registry()
+        with self._phase("prompt_templates"):
+            await self._precompile_templates()
+        with self._phase("chat_jobs"):
+            await self._start_chat_jobs()
+        with self._phase("warmup"):
+            await self._start_warmup()
+        self._watch_settings()
+        logger.info(
+            "Startup complete",
+            phases_ms={
+                name: round(seconds * 1000, 1)
+                for name, seconds in self.startup_phases.items()
+            },
+        )
+        try:
+            yield
+        finally:
+            self._unwatch_settings()
+            await self._stop_warmup()
+            await self._stop_chat_jobs()
+            await self._close_shared_clients()
+            if self._tracing_enabled:
+                # Flush spans still waiting in the batch processor
+                tracing.disable_tracing()
+            metrics.mark_process_dead()
+
+    async def _load_flow_registry(self) -> None:
+        """Import and validate every conversation flow once, before the first chat."""
+        from ingenious.services.flow_registry import get_flow_registry
+
+        try:
+            await asyncio.to_thread(get_flow_registry().load)
+        except Exception as e:
+            logger.warning("Conversation flow registry load failed", error=str(e))
+
+    async def _precompile_templates(self) -> None:
+        """Compile prompt templates so the first requests hit a warm cache."""
+        from ingenious.files.files_repository import FileStorage
+        from ingenious.services.template_registry import get_template_registry
+
+        try:
+            compiled = await get_template_registry().precompile_revisions(
+                FileStorage(self.config)
+            )
+            logger.info("Prompt templates precompiled", revisions=compiled)
+        except Exception as e:
+            logger.warning("Prompt template precompilation failed", error=str(e))
+
+    async def _start_chat_jobs(self) -> None:
+        """Start the background workers that run queued chat jobs."""
+        settings = self.config.web_configuration.jobs
+        if not settings.enable:
+            return
+        from ingenious.services.chat_jobs import get_chat_job_service
+        from ingenious.services.fastapi_dependencies import (
+            create_chat_service_factory,
+        )
+
+        try:
+            await get_chat_job_service(settings).start(
+                create_chat_service_factory(self.config)
+            )
+        except Exception as e:
+            logger.warning("Chat job workers failed to start", error=str(e))
+
+    async def _start_warmup(self) -> None:
+        """Warm caches and clients; in the background unless configured to wait."""
+        from ingenious.services import warmup
+
+        state = warmup.get_warmup_state()
+        if not self.config.web_configuration.warmup.enable:
+            state.start()
+            state.finish()
+            return
+        if self.config.web_configuration.warmup.wait:
+            await warmup.run_warmup(self.config)
+        else:
+            self._warmup_task = asyncio.create_task(warmup.run_warmup(self.config))
+
+    async def _stop_warmup(self) -> None:
+        """Cancel a warm-up still running at shutdown."""
+        task = self._warmup_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _stop_chat_jobs(self) -> None:
+        """Stop job workers, returning running jobs to the queue."""
+        from ingenious.services.chat_jobs import stop_chat_job_service
+
+        await stop_chat_job_service()
+
+    async def _close_shared_clients(self) -> None:
+        """Close the clients requests shared on this event loop."""
+        # Only modules that were imported can hold clients; importing them here
+        # would load their SDKs at shutdown for nothing
+        azure_files = sys.modules.get("ingenious.files.azure")
+        if azure_files is not None:
+            await azure_files.close_shared_clients()
+        ag_agents = sys.modules.get("ingenious.models.ag_agents")
+        if ag_agents is not None:
+            await ag_agents.close_model_clients()
+
+    def _watch_settings(self) -> None:
+        """Apply reloaded settings, and reload them on SIGHUP when serving directly."""
+        on_settings_change(self._apply_settings)
+        self._reload_on_sighup = False
+        # Signal handlers can only be installed from the main thread
+        if hasattr(signal, "SIGHUP") and (
+            threading.current_thread() is threading.main_thread()
+        ):
+            try:
+                asyncio.get_running_loop().add_signal_handler(
+                    signal.SIGHUP, self._reload_settings
+                )
+                self._reload_on_sighup = True
+            except (NotImplementedError, RuntimeError, ValueError) as e:
+                logger.debug("SIGHUP settings reload unavailable", error=str(e))
+
+    def _unwatch_settings(self) -> None:
+        remove_settings_listener(self._apply_settings)
+        if self._reload_on_sighup:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+
+    def _reload_settings(self) -> None:
+        """Reload settings, keeping the current ones if the new ones are invalid."""
+        try:
+            reload_settings()
+        except Exception as e:
+            logger.error(
+                "Settings reload failed, keeping current settings", error=str(e)
+            )
+
+    def _apply_settings(
+        self, old: "IngeniousSettings", new: "IngeniousSettings"
+    ) -> None:
+        """Re-apply the settings that are read per request rather than at startup."""
+        metrics.configure_metrics(new.web_configuration.metrics)
+        timing.configure_timing(new.web_configuration.timing)
 
     def _configure_app(self) -> None:
         """Configure the FastAPI application with middleware, routes, and services."""
+        self._setup_logging()
+        self._setup_tracing()
+        self._setup_metrics()
+        self._setup_timing()
         self._setup_dependency_injection()
         self._setup_working_directory()
         self._setup_middleware()
@@ -42,6 +229,29 @@ class FastAgentAPI:
         self._setup_optional_services()
         self._setup_root_redirect()
 
+    def _setup_logging(self) -> None:
+        """Configure the structured logging pipeline from settings."""
+        settings = self.config.logging
+        setup_structured_logging(
+            log_level=settings.log_level,
+            json_output=settings.json_output,
+            async_sink=settings.async_sink,
+            metrics_interval=settings.metrics_interval_seconds,
+            sample_rates=settings.sample_rates,
+        )
+
+    def _setup_tracing(self) -> None:
+        """Configure OpenTelemetry tracing from settings (off by default)."""
+        self._tracing_enabled = tracing.setup_tracing(self.config.tracing)
+
+    def _setup_metrics(self) -> None:
+        """Turn Prometheus metric recording on or off from settings."""
+        metrics.configure_metrics(self.config.web_configuration.metrics)
+
+    def _setup_timing(self) -> None:
+        """Turn per-stage request timing on or off from settings."""
+        timing.configure_timing(self.config.web_configuration.timing)
+
     def _setup_dependency_injection(self) -> None:
         """Initialize dependency injection - no longer needed with FastAPI DI."""
         # FastAPI handles dependency injection natively
@@ -53,8 +263,16 @@ class FastAgentAPI:
 
     def _setup_middleware(self) -> None:
         """Configure middleware stack."""
+        # Compression sits innermost so request timing includes encoding
+        compression = self.config.web_configuration.compression
+        if compression.enable:
+            self.app.add_middleware(CompressionMiddleware, settings=compression)
+
         # Add request context middleware first
-        self.app.add_middleware(RequestContextMiddleware)
+        self.app.add_middleware(
+            RequestContextMiddleware,
+            server_timing=self.config.web_configuration.timing.server_timing_header,
+        )
 
         # Add CORS middleware
         origins = [
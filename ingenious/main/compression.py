@@ -0,0 +1,285 @@
+"""
+Response compression middleware.
+
+Negotiates zstd, Brotli or gzip from the request's ``Accept-Encoding`` header.
+gzip uses the standard library. Brotli and Zstandard are used when the
+``brotli`` and ``zstandard`` packages are installed and are skipped otherwise.
+
+Buffered responses smaller than ``minimum_size`` are sent as they are.
+Streaming responses (SSE chat streams, NDJSON batches) are compressed chunk by
+chunk with a flush after each chunk, so every frame reaches the client as soon
+as the app sends it instead of waiting in the compressor's buffer.
+
+Every response with a compressible content type carries
+``Vary: Accept-Encoding``, compressed or not, so a shared cache never serves
+one client's encoding to another.
+"""
+
+import zlib
+from typing import Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ingenious.config.models import CompressionSettings
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Content types worth compressing; everything else (images, archives, already
+# encoded files) is passed through.
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+
+class StreamEncoder(Protocol):
+    """Incremental compressor for one response body."""
+
+    def compress(self, data: bytes, flush: bool) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out = self._compressor.compress(data)
+        if flush:
+            out += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return out
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out: bytes = self._compressor.process(data)
+        if flush:
+            out += self._compressor.flush()
+        return out
+
+    def finish(self) -> bytes:
+        out: bytes = self._compressor.finish()
+        return out
+
+
+class ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out: bytes = self._compressor.compress(data)
+        if flush:
+            out += self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return out
+
+    def finish(self) -> bytes:
+        out: bytes = self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+        return out
+
+
+def available_encoders(
+    settings: CompressionSettings,
+) -> Dict[str, Callable[[], StreamEncoder]]:
+    """Encoder factories for the configured encodings that can be used here."""
+    factories: Dict[str, Callable[[], StreamEncoder]] = {}
+    for encoding in settings.encodings:
+        if encoding == "gzip":
+            factories["gzip"] = lambda: GzipEncoder(settings.gzip_level)
+        elif encoding == "br" and BROTLI_AVAILABLE:
+            factories["br"] = lambda: BrotliEncoder(settings.brotli_quality)
+        elif encoding == "zstd" and ZSTD_AVAILABLE:
+            factories["zstd"] = lambda: ZstdEncoder(settings.zstd_level)
+    return factories
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an ``Accept-Encoding`` header to its q-value."""
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def select_encoding(header: str, preferred: Sequence[str]) -> Optional[str]:
+    """
+    Pick the first of ``preferred`` the client accepts.
+
+    Codings with ``q=0`` are refused; ``*`` matches any coding not listed.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    candidates: List[Tuple[float, int, str]] = []
+    for rank, encoding in enumerate(preferred):
+        quality = accepted.get(encoding, wildcard)
+        if quality > 0:
+            candidates.append((-quality, rank, encoding))
+    return min(candidates)[2] if candidates else None
+
+
+def _is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+def _vary_on_accept_encoding(send: Send) -> Send:
+    """Wrap ``send`` to mark compressible responses as varying by encoding."""
+
+    async def send_with_vary(message: Message) -> None:
+        if message["type"] == "http.response.start" and _is_compressible(
+            Headers(raw=message["headers"])
+        ):
+            message = {**message, "headers": list(message["headers"])}
+            MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+        await send(message)
+
+    return send_with_vary
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best encoding the client accepts.
+
+    Plain ASGI, like ``RequestContextMiddleware``: it sees every body chunk
+    as the app sends it, which is what makes per-chunk flushing possible.
+    """
+
+    def __init__(self, app: ASGIApp, settings: CompressionSettings) -> None:
+        self.app = app
+        self.settings = settings
+        self.encoders = available_encoders(settings)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encoders:
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = select_encoding(accept_encoding, list(self.encoders))
+        if encoding is None:
+            await self.app(scope, receive, _vary_on_accept_encoding(send))
+            return
+        responder = _CompressionResponder(
+            send, encoding, self.encoders[encoding], self.settings
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request state: decides on the first body chunk, then encodes."""
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        make_encoder: Callable[[], StreamEncoder],
+        settings: CompressionSettings,
+    ) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._make_encoder = make_encoder
+        self._settings = settings
+        self._start: Message = {}
+        self._encoder: Optional[StreamEncoder] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self._start = {**message, "headers": list(message.get("headers", []))}
+            compressible = _is_compressible(Headers(raw=message["headers"]))
+            if compressible:
+                # Also sent when the body turns out too small to compress
+                MutableHeaders(raw=self._start["headers"]).add_vary_header(
+                    "Accept-Encoding"
+                )
+            self._passthrough = message["status"] in (204, 304) or not compressible
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send_start()
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self._encoder is None:
+            if not self._should_compress(body, more_body):
+                self._passthrough = True
+                await self._send_start()
+                await self._send(message)
+                return
+            self._encoder = self._make_encoder()
+            headers = MutableHeaders(raw=self._start["headers"])
+            headers["Content-Encoding"] = self._encoding
+            if not more_body:
+                data = self._encoder.compress(body, flush=False)
+                data += self._encoder.finish()
+                headers["Content-Length"] = str(len(data))
+                await self._send_start()
+                await self._send({"type": "http.response.body", "body": data})
+                return
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self._send_start()
+
+        if more_body:
+            data = self._encoder.compress(body, flush=True)
+            if data:
+                await self._send(
+                    {"type": "http.response.body", "body": data, "more_body": True}
+                )
+        else:
+            data = self._encoder.compress(body, flush=False) + self._encoder.finish()
+            await self._send({"type": "http.response.body", "body": data})
+
+    def _should_compress(self, body: bytes, more_body: bool) -> bool:
+        if not more_body:
+            return len(body) >= self._settings.minimum_size
+        if not self._settings.compress_streams:
+            return False
+        content_length = Headers(raw=self._start["headers"]).get("content-length")
+        return (
+            content_length is None or int(content_length) >= self._settings.minimum_size
+        )
+
+    async def _send_start(self) -> None:
+        if self._start:
+            start, self._start = self._start, {}
+            await self._send(start)
@@ -6,12 +6,13 @@ request context, logging, and other cross-cutting concerns.
 """
 
 import time
-from typing import Awaitable, Callable, Optional
+from typing import Any, MutableMapping, Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import URL, Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from ingenious.core import metrics, timing, tracing
 from ingenious.core.structured_logging import (
     clear_request_context,
     get_logger,
@@ -21,32 +22,55 @@ from ingenious.core.structured_logging import (
 logger = get_logger(__name__)
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    """Middleware to set request context for structured logging and tracing."""
+def _route_template(scope: Scope) -> str:
+    """The matched route's path template, so metrics are not labelled per ID."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        start_time = time.time()
 
-        # Extract user info from request if available
-        user_id = None
-        session_id = None
-        client_ip = None
-        user_agent = None
+class RequestContextMiddleware:
+    """
+    Middleware to set request context for structured logging and tracing.
+
+    Implemented as plain ASGI rather than ``BaseHTTPMiddleware`` so response
+    bodies, including ``/chat/stream`` chunks, are passed straight through to
+    the server without an intermediate task and memory stream. Timing covers
+    the span from the request arriving to the final body chunk being sent.
+
+    Per-stage timings are collected for the request; with ``server_timing``
+    the stages finished before the response starts are sent as a
+    ``Server-Timing`` header. For streams that is only the stages before the
+    first chunk.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        timings_token = timing.start_request()
+        headers = Headers(scope=scope)
 
         # Get client information
-        client_ip = request.client.host if request.client else None
-        user_agent = request.headers.get("User-Agent")
+        client = scope.get("client")
+        client_ip = client[0] if client else None
+        user_agent = headers.get("User-Agent")
 
         # Extract session ID from custom header or cookies
-        session_id = request.headers.get("X-Session-ID") or request.cookies.get(
-            "session_id"
-        )
+        session_id = headers.get("X-Session-ID")
+        if session_id is None and "cookie" in headers:
+            session_id = cookie_parser(headers["cookie"]).get("session_id")
 
         # Try to get user info from Authorization header
-        auth_header = request.headers.get("Authorization")
-        user_id = self._extract_user_from_auth_header(auth_header)
+        with timing.stage("auth"):
+            user_id = self._extract_user_from_auth_header(
+                scope, headers.get("Authorization")
+            )
 
         # Set request context with correlation ID
         request_id = set_request_context(
@@ -54,14 +78,17 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             session_id=session_id,
         )
 
+        method = scope["method"]
+        url = str(URL(scope=scope))
+
         # Log request start
         logger.info(
             "Request started",
             request_id=request_id,
-            method=request.method,
-            url=str(request.url),
-            path=request.url.path,
-            query_params=str(request.query_params),
+            method=method,
+            url=url,
+            path=scope["path"],
+            query_params=scope.get("query_string", b"").decode("latin-1"),
             user_id=user_id,
             session_id=session_id,
             client_ip=client_ip,
@@ -69,39 +96,82 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             operation="request_start",
         )
 
-        # Process request and add timing
-        try:
-            response = await call_next(request)
-            processing_time = time.time() - start_time
+        status_code: Optional[int] = None
+        response_started_at: Optional[float] = None
+        completed = False
+        request_span: Any = None
+
+        async def send_with_context(message: Message) -> None:
+            nonlocal status_code, response_started_at, completed
+
+            if message["type"] == "http.response.start":
+                response_started_at = time.perf_counter()
+                status_code = message["status"]
+                if request_span is not None:
+                    request_span.set_attribute("http.response.status_code", status_code)
+
+                # Add tracing headers to response
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Request-ID"] = request_id
+                response_headers["X-Processing-Time"] = (
+                    f"{response_started_at - start_time:.3f}s"
+                )
+                timings = timing.current()
+                if self.server_timing and timings is not None:
+                    response_headers["Server-Timing"] = timings.server_timing(
+                        response_started_at - start_time
+                    )
+
+            await send(message)
+
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                completed = True
+                finished_at = time.perf_counter()
+                metrics.record_request(
+                    method,
+                    _route_template(scope),
+                    status_code or 0,
+                    finished_at - start_time,
+                )
+
+                # Log request completion
+                logger.info(
+                    "Request completed",
+                    request_id=request_id,
+                    method=method,
+                    url=url,
+                    status_code=status_code,
+                    processing_time_seconds=finished_at - start_time,
+                    response_start_seconds=(response_started_at or finished_at)
+                    - start_time,
+                    user_id=user_id,
+                    operation="request_complete",
+                )
 
-            # Log request completion
-            logger.info(
-                "Request completed",
-                request_id=request_id,
-                method=request.method,
-                url=str(request.url),
-                status_code=response.status_code,
-                processing_time_seconds=processing_time,
-                user_id=user_id,
-                operation="request_complete",
-            )
-
-            # Add tracing headers to response
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Processing-Time"] = f"{processing_time:.3f}s"
-
-            return response
+        try:
+            with tracing.server_span(
+                f"{method} {scope['path']}",
+                headers,
+                **{
+                    "http.request.method": method,
+                    "url.path": scope["path"],
+                    "client.address": client_ip,
+                    "user_agent.original": user_agent,
+                    "ingenious.request_id": request_id,
+                },
+            ) as request_span:
+                await self.app(scope, receive, send_with_context)
 
         except Exception as exc:
-            processing_time = time.time() - start_time
-
             # Log request failure
             logger.error(
                 "Request failed",
                 request_id=request_id,
-                method=request.method,
-                url=str(request.url),
-                processing_time_seconds=processing_time,
+                method=method,
+                url=url,
+                processing_time_seconds=time.perf_counter() - start_time,
                 error_type=type(exc).__name__,
                 error_message=str(exc),
                 user_id=user_id,
@@ -112,29 +182,51 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             raise exc
 
         finally:
+            if not completed:
+                # Failed before responding (500) or stopped mid-body
+                metrics.record_request(
+                    method,
+                    _route_template(scope),
+                    status_code or 500,
+                    time.perf_counter() - start_time,
+                )
+            if response_started_at is not None and not completed:
+                # The client went away or the app stopped mid-body
+                logger.info(
+                    "Request ended before response completed",
+                    request_id=request_id,
+                    method=method,
+                    url=url,
+                    status_code=status_code,
+                    processing_time_seconds=time.perf_counter() - start_time,
+                    user_id=user_id,
+                    operation="request_incomplete",
+                )
+
             # Clear context after request
             clear_request_context()
+            timing.end_request(timings_token)
 
     def _extract_user_from_auth_header(
-        self, auth_header: Optional[str]
+        self, scope: MutableMapping[str, Any], auth_header: Optional[str]
     ) -> Optional[str]:
         """Extract user ID from Authorization header."""
         if auth_header and auth_header.startswith("Bearer "):
             try:
-                from ingenious.auth.jwt import get_username_from_token
+                from ingenious.auth.jwt import get_username_from_request_token
 
                 token = auth_header[7:]  # Remove "Bearer " prefix
-                return get_username_from_token(token)
+                # Verified once and kept in the scope for the auth dependencies
+                return get_username_from_request_token(scope, token)
             except Exception:
                 # Token validation failed, use fallback
                 return "unauthenticated"
         elif auth_header and auth_header.startswith("Basic "):
             # For basic auth, extract username without validating
             try:
-                import base64
+                from ingenious.auth.basic import parse_basic_auth_header
 
-                credentials_str = base64.b64decode(auth_header[6:]).decode("utf-8")
-                username, _ = credentials_str.split(":", 1)
+                username, _ = parse_basic_auth_header(auth_header)
                 return username
             except Exception:
                 return "unauthenticated"
@@ -9,10 +9,13 @@ from typing import TYPE_CHECKING
 
 from ingenious.api.routes import auth as auth_route
 from ingenious.api.routes import chat as chat_route
+from ingenious.api.routes import chat_jobs as chat_jobs_route
 from ingenious.api.routes import conversation as conversation_route
 from ingenious.api.routes import diagnostic as diagnostic_route
 from ingenious.api.routes import message_feedback as message_feedback_route
+from ingenious.api.routes import metrics as metrics_route
 from ingenious.api.routes import prompts as prompts_route
+from ingenious.core import metrics
 from ingenious.models.api_routes import IApiRoutes
 from ingenious.utils.imports import (
     import_class_with_fallback,
@@ -35,6 +38,7 @@ class RouteManager:
             auth_route.router, prefix="/api/v1/auth", tags=["Authentication"]
         )
         app.include_router(chat_route.router, prefix="/api/v1", tags=["Chat"])
+        app.include_router(chat_jobs_route.router, prefix="/api/v1", tags=["Chat Jobs"])
         app.include_router(
             conversation_route.router, prefix="/api/v1", tags=["Conversations"]
         )
@@ -46,6 +50,16 @@ class RouteManager:
             message_feedback_route.router, prefix="/api/v1", tags=["Message Feedback"]
         )
 
+    @staticmethod
+    def register_metrics_route(app: "FastAPI", config: "IngeniousSettings") -> None:
+        """Serve Prometheus metrics at the configured path, if enabled."""
+        if not metrics.is_enabled():
+            return
+        settings = config.web_configuration.metrics
+        app.include_router(
+            metrics_route.router, prefix=settings.path.rstrip("/"), tags=["Metrics"]
+        )
+
     @staticmethod
     def register_custom_routes(app: "FastAPI", config: "IngeniousSettings") -> None:
         """Register custom routes from ingenious extensions."""
@@ -63,4 +77,5 @@ class RouteManager:
     def register_all_routes(cls, app: "FastAPI", config: "IngeniousSettings") -> None:
         """Register all routes (built-in and custom) with the FastAPI app."""
         cls.register_builtin_routes(app)
+        cls.register_metrics_route(app, config)
         cls.register_custom_routes(app, config)
@@ -0,0 +1,120 @@
+"""
+Multi-process serving for ``ingen serve``.
+
+Uvicorn starts worker processes with ``spawn``, so each worker imports the app
+from ``WORKER_APP_FACTORY`` and builds it from the inherited environment. The
+parent preloads the conversation flow registry first: broken flows and bad
+configuration are reported once, before any worker starts, and the workers
+import from a warm bytecode cache.
+
+Each worker has its own event loop and its own in-process state. Most of it is
+safe to keep per worker:
+
+- admission control limits apply per worker;
+- the JWT claims, template and flow registry caches are rebuilt independently
+  and hold no state that other workers need;
+- chat jobs live in SQLite, so job workers in every process share one queue.
+
+The in-memory idempotency store is not: a retry routed to another worker would
+run the flow again. ``prepare_worker_environment`` switches it to the SQLite
+store unless a store type was chosen explicitly. Prometheus metrics are shared
+through files in ``PROMETHEUS_MULTIPROC_DIR``, prepared before workers start.
+"""
+
+import os
+from typing import TYPE_CHECKING, Dict
+
+import uvicorn
+from fastapi import FastAPI
+
+from ingenious.core import metrics
+from ingenious.core.structured_logging import get_logger
+
+if TYPE_CHECKING:
+    from ingenious.config import IngeniousSettings
+
+logger = get_logger(__name__)
+
+WORKER_APP_FACTORY = "ingenious.main.workers:create_worker_app"
+
+_IDEMPOTENCY_STORE_ENV = "INGENIOUS_WEB_CONFIGURATION__IDEMPOTENCY__STORE_TYPE"
+
+
+def create_worker_app() -> FastAPI:
+    """Build the app inside a worker process from the inherited environment."""
+    import ingenious.config.config as ingen_config
+    from ingenious.main.app_factory import create_app
+
+    return create_app(ingen_config.get_config())
+
+
+def prepare_worker_environment(config: "IngeniousSettings") -> Dict[str, str]:
+    """
+    Set environment overrides that keep shared caches coherent across workers.
+
+    Workers inherit the parent's environment, so overrides made here apply to
+    every worker's configuration.
+
+    Returns:
+        The environment variables that were changed
+    """
+    changes: Dict[str, str] = {}
+    idempotency = config.web_configuration.idempotency
+    if (
+        idempotency.enable
+        and idempotency.store_type == "memory"
+        and _IDEMPOTENCY_STORE_ENV not in os.environ
+    ):
+        changes[_IDEMPOTENCY_STORE_ENV] = "sqlite"
+    elif idempotency.enable and idempotency.store_type == "memory":
+        logger.warning(
+            "In-memory idempotency store is per worker; retries may run twice",
+            workers=config.web_configuration.server.workers,
+        )
+    os.environ.update(changes)
+    return changes
+
+
+def preload(config: "IngeniousSettings") -> int:
+    """
+    Import and validate the conversation flows in the parent process.
+
+    Returns:
+        The number of flows that loaded
+    """
+    from ingenious.services.flow_registry import get_flow_registry
+
+    registry = get_flow_registry()
+    flows = registry.load()
+    for flow_name, error in registry.errors().items():
+        logger.warning("Conversation flow failed to load", flow=flow_name, error=error)
+    return len(flows)
+
+
+def run_workers(config: "IngeniousSettings", host: str, port: int) -> None:
+    """Serve the app from several worker processes under uvicorn's supervisor."""
+    server = config.web_configuration.server
+    changes = prepare_worker_environment(config)
+    metrics_dir = (
+        metrics.prepare_multiprocess_dir()
+        if config.web_configuration.metrics.enable
+        else None
+    )
+    flow_count = preload(config)
+    logger.info(
+        "Starting server workers",
+        workers=server.workers,
+        flows=flow_count,
+        environment_overrides=sorted(changes),
+        metrics_dir=metrics_dir,
+        operation="server_startup",
+    )
+    uvicorn.run(
+        WORKER_APP_FACTORY,
+        factory=True,
+        host=host,
+        port=port,
+        workers=server.workers,
+        limit_max_requests=server.max_requests or None,
+        timeout_graceful_shutdown=server.graceful_shutdown_seconds,
+    )
@@ -1,13 +1,37 @@
 import asyncio
+import contextlib
+import threading
+import weakref
 from abc import ABC
-from typing import List
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.base import Response
-from autogen_agentchat.messages import TextMessage
-from autogen_core import MessageContext, RoutedAgent, TopicId, message_handler
+from autogen_agentchat.messages import (
+    ModelClientStreamingChunkEvent,
+    TextMessage,
+    ToolCallRequestEvent,
+)
+from autogen_core import (
+    FunctionCall,
+    MessageContext,
+    RoutedAgent,
+    TopicId,
+    message_handler,
+)
 from autogen_core.models import (
     AssistantMessage,
+    CreateResult,
     FunctionExecutionResultMessage,
     LLMMessage,
     SystemMessage,
@@ -15,29 +39,202 @@ from autogen_core.models import (
 )
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
+from ingenious.config.snapshot import on_settings_change
+from ingenious.core import agent_events, tracing
+from ingenious.core.structured_logging import get_logger
 from ingenious.models.agent import (
     Agent,
     AgentChat,
     AgentMessage,
 )
 
+logger = get_logger(__name__)
+
+# Model clients shared by agents, per event loop since their HTTP connections
+# belong to the loop that opened them
+_ClientKey = Tuple[str, str, str, str, str]
+_LoopClients = Dict[_ClientKey, AzureOpenAIChatCompletionClient]
+_model_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = (
+    weakref.WeakKeyDictionary()
+)
+_model_clients_lock = threading.Lock()
+
+
+def _azure_config(model: Any) -> Dict[str, Any]:
+    """Map model config parameters to AzureOpenAIChatCompletionClient parameters."""
+    return {
+        "model": model.model,
+        "api_key": model.api_key,
+        "azure_endpoint": model.base_url,
+        "azure_deployment": model.deployment or model.model,
+        "api_version": model.api_version,
+    }
+
+
+def get_model_client(model: Any) -> AzureOpenAIChatCompletionClient:
+    """
+    Model client for ``model`` shared by every agent and request on this loop.
+
+    Building a client sets up its HTTP connection pool and TLS context, so
+    sharing one avoids that per agent and keeps connections to the endpoint
+    open between requests. Outside a running loop a new client is returned.
+    """
+    config = _azure_config(model)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return AzureOpenAIChatCompletionClient(**config)
+    key: _ClientKey = (
+        config["model"],
+        str(config["azure_endpoint"]),
+        config["azure_deployment"],
+        str(config["api_version"]),
+        str(config["api_key"]),
+    )
+    with _model_clients_lock:
+        clients = _model_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = AzureOpenAIChatCompletionClient(**config)
+        return client
+
+
+# Tasks closing dropped clients, referenced until they finish
+_closing_tasks: "set[asyncio.Task[None]]" = set()
+
+
+async def _close_clients(
+    clients: Sequence[AzureOpenAIChatCompletionClient], delay: float = 0
+) -> None:
+    """Close ``clients`` after ``delay`` seconds, or when the loop shuts down."""
+    try:
+        await asyncio.sleep(delay)
+    finally:
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning("Failed to close model client", error=str(e))
+
+
+def _schedule_close(
+    clients: Sequence[AzureOpenAIChatCompletionClient], delay: float
+) -> None:
+    task = asyncio.create_task(_close_clients(clients, delay))
+    _closing_tasks.add(task)
+    task.add_done_callback(_closing_tasks.discard)
+
+
+@on_settings_change
+def _drop_model_clients(old: Any, new: Any) -> None:
+    """
+    Build new clients after a reload.
+
+    Calls in flight keep their old clients, which are closed on their own loop
+    once an agent's model calls would have timed out.
+    """
+    if old.models == new.models:
+        return
+    with _model_clients_lock:
+        dropped = list(_model_clients.items())
+        _model_clients.clear()
+    for loop, clients in dropped:
+        try:
+            loop.call_soon_threadsafe(
+                _schedule_close,
+                list(clients.values()),
+                new.chat_service.agent_timeout_seconds,
+            )
+        except RuntimeError:
+            # The loop is closed, and its connections with it
+            pass
+
+
+async def close_model_clients() -> None:
+    """Close the model clients shared on the running loop, e.g. at shutdown."""
+    with _model_clients_lock:
+        clients = _model_clients.pop(asyncio.get_running_loop(), {})
+    await _close_clients(list(clients.values()))
+
+
+# Azure OpenAI accepts stream_options from this API version on
+_STREAM_USAGE_API_VERSION = "2024-09-01"
+
+
+class _AgentModelClient:
+    """One agent's view of a shared client, so each agent is instrumented on its own."""
+
+    def __init__(
+        self, client: AzureOpenAIChatCompletionClient, api_version: str
+    ) -> None:
+        self._client = client
+        self._stream_usage = api_version >= _STREAM_USAGE_API_VERSION
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def create_stream(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        # Without usage in the stream, streamed calls would count no tokens
+        if self._stream_usage:
+            extra_create_args = dict(kwargs.get("extra_create_args") or {})
+            extra_create_args.setdefault("stream_options", {"include_usage": True})
+            kwargs["extra_create_args"] = extra_create_args
+        return self._client.create_stream(*args, **kwargs)
+
+
+def _agent_model_client(agent: Agent, model_client: Optional[Any]) -> Any:
+    if model_client is None:
+        model_client = AzureOpenAIChatCompletionClient(**_azure_config(agent.model))
+    client = _AgentModelClient(model_client, str(agent.model.api_version or ""))
+    return tracing.instrument_model_client(
+        client, model=agent.model.model, agent_name=agent.agent_name
+    )
+
+
+def _tool_calls(calls: List[FunctionCall]) -> List[Dict[str, str]]:
+    return [{"name": call.name, "arguments": call.arguments} for call in calls]
+
+
+def _concurrency_limit(
+    semaphore: Optional[asyncio.Semaphore],
+) -> AsyncContextManager[Any]:
+    return semaphore if semaphore is not None else contextlib.nullcontext()
+
+
+def _timed_out_message(agent: Agent, timeout: Optional[float]) -> str:
+    logger.warning("Agent timed out", agent=agent.agent_name, timeout_seconds=timeout)
+    return f"{agent.agent_display_name} did not respond within {timeout:g} seconds."
+
 
 class RoutedAssistantAgent(RoutedAgent, ABC):
+    """
+    Agent that answers each message with a model call, running any tool calls.
+
+    Pass ``model_client`` (see ``get_model_client``) to share a client instead
+    of building one per agent. ``semaphore`` limits how many agents call the
+    model at once, and after ``timeout`` seconds the agent gives up and passes
+    on a note that it did not respond, so agents waiting for it still run.
+
+    For a streaming request (see ``ingenious.core.agent_events``) the model
+    output is streamed, and the agent publishes its start, tokens, tool calls
+    and answer as it goes.
+    """
+
     def __init__(
-        self, agent: Agent, data_identifier: str, next_agent_topic: str = None, tools=[]
+        self,
+        agent: Agent,
+        data_identifier: str,
+        next_agent_topic: str = None,
+        tools=[],
+        model_client: Optional[Any] = None,
+        timeout: Optional[float] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
     ) -> None:
         super().__init__(agent.agent_name)
 
-        # Map model config parameters to AzureOpenAIChatCompletionClient parameters
-        azure_config = {
-            "model": agent.model.model,
-            "api_key": agent.model.api_key,
-            "azure_endpoint": agent.model.base_url,
-            "azure_deployment": agent.model.deployment or agent.model.model,
-            "api_version": agent.model.api_version,
-        }
-
-        self._model_client = AzureOpenAIChatCompletionClient(**azure_config)
+        self._model_client = _agent_model_client(agent, model_client)
         assistant_agent = AssistantAgent(
             name=agent.agent_name,
             system_message=agent.system_prompt,
@@ -50,6 +247,8 @@ class RoutedAssistantAgent(RoutedAgent, ABC):
         self._next_agent_topic = next_agent_topic
         self._tools = tools
         self._system_messages = [SystemMessage(content=agent.system_prompt)]
+        self._timeout = timeout
+        self._semaphore = semaphore
 
     @message_handler
     async def handle_my_message_type(
@@ -70,59 +269,87 @@ class RoutedAssistantAgent(RoutedAgent, ABC):
         # if self._next_agent_topic:
         #     await self.publish_my_message(agent_chat)
 
+        try:
+            async with _concurrency_limit(self._semaphore):
+                agent_events.publish(agent_events.AGENT_START, self._agent.agent_name)
+                content = await asyncio.wait_for(
+                    self._respond(message.content, ctx), timeout=self._timeout
+                )
+        except asyncio.TimeoutError:
+            content = _timed_out_message(self._agent, self._timeout)
+        agent_chat.chat_response = Response(
+            chat_message=TextMessage(content=content, source="user")
+        )
+        agent_events.publish(
+            agent_events.AGENT_COMPLETE, self._agent.agent_name, content=content
+        )
+
+        if self._next_agent_topic:
+            await self.publish_my_message(agent_chat)
+
+    async def _respond(self, content: str, ctx: MessageContext) -> str:
+        """Run the chat completion, and the tool calls it asks for."""
         # Create a session of messages.
         session: List[LLMMessage] = self._system_messages + [
-            UserMessage(content=message.content, source="user")
+            UserMessage(content=content, source="user")
         ]
-        execute_tool_calls = True
 
         # Run the chat completion with the tools.
-        create_result = await self._model_client.create(
-            messages=session,
-            tools=self._tools,
-            cancellation_token=ctx.cancellation_token,
-        )
+        create_result = await self._create(session, ctx, tools=self._tools)
 
         # If there are no tool calls, return the result.
         if isinstance(create_result.content, str):
-            agent_chat.chat_response = Response(
-                chat_message=TextMessage(content=create_result.content, source="user")
-            )
-            execute_tool_calls = False
+            return create_result.content
 
-        if execute_tool_calls:
-            # Add the first model create result to the session.
-            session.append(
-                AssistantMessage(content=create_result.content, source="assistant")
-            )
+        agent_events.publish(
+            agent_events.TOOL_CALL,
+            self._agent.agent_name,
+            tool_calls=_tool_calls(create_result.content),
+        )
 
-            # Execute the tool calls.
-            results = await asyncio.gather(
-                *[
-                    self._agent.execute_tool_call(
-                        call, ctx.cancellation_token, tools=self._tools
-                    )
-                    for call in create_result.content
-                ]
-            )
+        # Add the first model create result to the session.
+        session.append(
+            AssistantMessage(content=create_result.content, source="assistant")
+        )
 
-            # Add the function execution results to the session.
-            session.append(FunctionExecutionResultMessage(content=results))
+        # Execute the tool calls.
+        results = await asyncio.gather(
+            *[
+                self._agent.execute_tool_call(
+                    call, ctx.cancellation_token, tools=self._tools
+                )
+                for call in create_result.content
+            ]
+        )
 
-            # Run the chat completion again to reflect on the history and function execution results.
-            create_result = await self._model_client.create(
-                messages=session,
-                cancellation_token=ctx.cancellation_token,
-            )
-            assert isinstance(create_result.content, str)
+        # Add the function execution results to the session.
+        session.append(FunctionExecutionResultMessage(content=results))
 
-            # Return the result as a message.
-            agent_chat.chat_response = Response(
-                chat_message=TextMessage(content=create_result.content, source="user")
-            )
+        # Run the chat completion again to reflect on the history and function execution results.
+        create_result = await self._create(session, ctx)
+        assert isinstance(create_result.content, str)
+        return create_result.content
 
-        if self._next_agent_topic:
-            await self.publish_my_message(agent_chat)
+    async def _create(
+        self, session: List[LLMMessage], ctx: MessageContext, tools: List[Any] = []
+    ) -> CreateResult:
+        """Call the model, streaming its tokens when the request is streamed."""
+        if not agent_events.streaming():
+            return await self._model_client.create(
+                messages=session, tools=tools, cancellation_token=ctx.cancellation_token
+            )
+        result = None
+        async for item in self._model_client.create_stream(
+            messages=session, tools=tools, cancellation_token=ctx.cancellation_token
+        ):
+            if isinstance(item, str):
+                agent_events.publish(
+                    agent_events.AGENT_DELTA, self._agent.agent_name, content=item
+                )
+            else:
+                result = item
+        assert result is not None
+        return result
 
     async def publish_my_message(self, agent_chat: AgentChat) -> None:
         """
@@ -136,6 +363,14 @@ class RoutedAssistantAgent(RoutedAgent, ABC):
 
 
 class RelayAgent(RoutedAgent):
+    """
+    Collects messages from several agents and forwards them together.
+
+    Messages are joined in arrival order, or with ``message_order`` in the
+    order of those sender types, so the next agent sees the same input however
+    the senders' model calls happened to finish.
+    """
+
     _response_count: int = 0
     _agent: Agent
     _agent_message: AgentMessage
@@ -147,10 +382,13 @@ class RelayAgent(RoutedAgent):
         data_identifier: str,
         next_agent_topic: str,
         number_of_messages_before_next_agent: int,
+        message_order: Optional[Sequence[str]] = None,
     ) -> None:
         super().__init__("UserProxyAgent")
         self._agent = agent
         self._agent_messages: List[str] = []
+        self._senders: List[str] = []
+        self._message_order = list(message_order or [])
         self._data_identifier = data_identifier
         self._next_agent_topic = next_agent_topic
         self._number_of_messages_before_next_agent = (
@@ -164,6 +402,7 @@ class RelayAgent(RoutedAgent):
         self._response_count += 1
         content = "## " + ctx.sender.type + "\n" + message.content
         self._agent_messages.append(content)
+        self._senders.append(ctx.sender.type)
         self._agent.add_agent_chat(
             content=content, identifier=self._data_identifier, ctx=ctx
         )
@@ -171,42 +410,63 @@ class RelayAgent(RoutedAgent):
 
         if self._response_count >= self._number_of_messages_before_next_agent:
             await self.publish_message(
-                AgentMessage(content="\n\n".join(self._agent_messages)),
+                AgentMessage(content="\n\n".join(self._ordered_messages())),
                 topic_id=TopicId(self._next_agent_topic, source=self.id.key),
             )
 
+    def _ordered_messages(self) -> List[str]:
+        if not self._message_order:
+            return self._agent_messages
+
+        def rank(sender: str) -> int:
+            if sender in self._message_order:
+                return self._message_order.index(sender)
+            return len(self._message_order)
+
+        # Stable, so senders outside the order keep their arrival order
+        ordered = sorted(
+            zip(self._senders, self._agent_messages), key=lambda m: rank(m[0])
+        )
+        return [content for _, content in ordered]
+
 
 class RoutedResponseOutputAgent(RoutedAgent, ABC):
+    """
+    Agent that answers with an ``AssistantAgent``, adding ``additional_data``.
+
+    ``model_client``, ``timeout`` and ``semaphore`` work as for
+    ``RoutedAssistantAgent``, and so do the events of a streaming request.
+    """
+
     def __init__(
         self,
         agent: Agent,
         data_identifier: str,
         next_agent_topic: str = None,
         additional_data: str = "",
+        model_client: Optional[Any] = None,
+        timeout: Optional[float] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
     ) -> None:
         super().__init__(agent.agent_name)
         self._next_agent_topic = next_agent_topic
 
-        # Map model config parameters to AzureOpenAIChatCompletionClient parameters
-        azure_config = {
-            "model": agent.model.model,
-            "api_key": agent.model.api_key,
-            "azure_endpoint": agent.model.base_url,
-            "azure_deployment": agent.model.deployment or agent.model.model,
-            "api_version": agent.model.api_version,
-        }
-
-        model_client = AzureOpenAIChatCompletionClient(**azure_config)
+        model_client = _agent_model_client(agent, model_client)
+        # The runtime creates agents inside the request that uses them
+        self._streaming = agent_events.streaming()
         assistant_agent = AssistantAgent(
             name=agent.agent_name,
             system_message=agent.system_prompt,
             description="I am an AI assistant that helps with research.",
             model_client=model_client,
+            model_client_stream=self._streaming,
         )
         self._delegate = assistant_agent
         self._agent: Agent = agent
         self._data_identifier = data_identifier
         self._additional_data = additional_data
+        self._timeout = timeout
+        self._semaphore = semaphore
 
     @message_handler
     async def handle_my_message_type(
@@ -219,14 +479,56 @@ class RoutedResponseOutputAgent(RoutedAgent, ABC):
         agent_chat = self._agent.add_agent_chat(
             content=content, identifier=self._data_identifier, ctx=ctx
         )
-        agent_chat.chat_response = await self._delegate.on_messages(
-            messages=[TextMessage(content=content, source=ctx.topic_id.source)],
-            cancellation_token=ctx.cancellation_token,
+        try:
+            async with _concurrency_limit(self._semaphore):
+                agent_events.publish(agent_events.AGENT_START, self._agent.agent_name)
+                agent_chat.chat_response = await asyncio.wait_for(
+                    self._respond(content, ctx), timeout=self._timeout
+                )
+        except asyncio.TimeoutError:
+            agent_chat.chat_response = Response(
+                chat_message=TextMessage(
+                    content=_timed_out_message(self._agent, self._timeout),
+                    source="user",
+                )
+            )
+        agent_events.publish(
+            agent_events.AGENT_COMPLETE,
+            self._agent.agent_name,
+            content=agent_chat.chat_response.chat_message.content,
         )
 
         if self._next_agent_topic:
             await self.publish_my_message(agent_chat)
 
+    async def _respond(self, content: str, ctx: MessageContext) -> Response:
+        """Get the assistant's response, publishing its tokens when streamed."""
+        messages = [TextMessage(content=content, source=ctx.topic_id.source)]
+        if not self._streaming:
+            return await self._delegate.on_messages(
+                messages=messages, cancellation_token=ctx.cancellation_token
+            )
+        response = None
+        async for item in self._delegate.on_messages_stream(
+            messages=messages, cancellation_token=ctx.cancellation_token
+        ):
+            if isinstance(item, ModelClientStreamingChunkEvent):
+                agent_events.publish(
+                    agent_events.AGENT_DELTA,
+                    self._agent.agent_name,
+                    content=item.content,
+                )
+            elif isinstance(item, ToolCallRequestEvent):
+                agent_events.publish(
+                    agent_events.TOOL_CALL,
+                    self._agent.agent_name,
+                    tool_calls=_tool_calls(item.content),
+                )
+            elif isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
     async def publish_my_message(self, agent_chat: AgentChat) -> None:
         """
         Publishes the response to the next agent.
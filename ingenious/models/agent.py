@@ -2,24 +2,27 @@ import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any, List, Optional, Type
 
 from autogen_agentchat.base import Response
 from autogen_agentchat.messages import TextMessage
 from autogen_core import (
+    EVENT_LOGGER_NAME,
     CancellationToken,
     FunctionCall,
     MessageContext,
     SingleThreadedAgentRuntime,
     TypeSubscription,
 )
-from autogen_core.logging import LLMCallEvent
+from autogen_core.logging import LLMCallEvent, LLMStreamEndEvent
 from autogen_core.models import FunctionExecutionResult
 from autogen_core.tools import Tool
 from pydantic import BaseModel
 
 from ingenious.config import settings as ig_config
+from ingenious.core import timing, tracing
 from ingenious.db.chat_history_repository import ChatHistoryRepository
 from ingenious.files.files_repository import FileStorage
 from ingenious.models.config import Config, ModelConfig
@@ -195,7 +198,14 @@ class Agent(BaseModel):
         # Run the tool and capture the result.
         try:
             arguments = json.loads(call.arguments)
-            result = await tool.run_json(arguments, cancellation_token)
+            with (
+                tracing.span(
+                    f"execute_tool {call.name}",
+                    **{"gen_ai.tool.name": call.name, "gen_ai.tool.call.id": call.id},
+                ),
+                timing.stage("tool", call.name),
+            ):
+                result = await tool.run_json(arguments, cancellation_token)
             return FunctionExecutionResult(
                 call_id=call.id,
                 name=call.name,
@@ -312,6 +322,22 @@ class LLMUsageTracker(logging.Handler):
         self._prompt_tokens = 0
         self._completion_tokens = 0
 
+    def get_agent_chats(self) -> List[AgentChat]:
+        """
+        The chats recorded so far, in the order the agents are defined.
+
+        Agents that run concurrently finish their model calls in any order;
+        each agent's own chats keep the order they were recorded in.
+        """
+        agent_order = {
+            agent.agent_name: index
+            for index, agent in enumerate(self._agents.get_agents())
+        }
+        return sorted(
+            self._queue,
+            key=lambda chat: agent_order.get(chat.target_agent_name, len(agent_order)),
+        )
+
     async def write_llm_responses_to_file(self, file_prefixes: List[str] = []) -> None:
         for agent_chat in self._queue:
             agent = self._agents.get_agent_by_name(agent_chat.target_agent_name)
@@ -444,11 +470,73 @@ class LLMUsageTracker(logging.Handler):
                     if add_chat:
                         self._queue.append(chat)
 
+            elif isinstance(record.msg, LLMStreamEndEvent):
+                # A streamed call only logs its result; the agent chat already
+                # holds the prompt it was sent
+                stream_end: LLMStreamEndEvent = record.msg
+                agent_id = stream_end.kwargs.get("agent_id")
+                if not agent_id:
+                    return
+                agent_name, source_name = agent_id.split("/")[:2]
+
+                self._prompt_tokens += stream_end.prompt_tokens
+                self._completion_tokens += stream_end.completion_tokens
+
+                try:
+                    agent = self._agents.get_agent_by_name(agent_name)
+                except (AttributeError, ValueError):
+                    return
+                content = stream_end.kwargs["response"].get("content")
+                chat = agent.get_agent_chat_by_source(source=source_name)
+                chat.prompt_tokens = stream_end.prompt_tokens
+                chat.completion_tokens = stream_end.completion_tokens
+                chat.end_time = datetime.now().timestamp()
+                # A list of tool calls is followed by another call with the answer
+                if isinstance(content, str):
+                    chat.chat_response = Response(
+                        chat_message=TextMessage(content=content, source=source_name)
+                    )
+                    self._queue.append(chat)
+
         except Exception as e:
             print(f"Failed to emit log record :{e}")
             self.handleError(record)
 
 
+_active_tracker: ContextVar[Optional[LLMUsageTracker]] = ContextVar(
+    "ingenious_llm_usage_tracker", default=None
+)
+
+
+class _LLMUsageDispatcher(logging.Handler):
+    """Passes autogen events to the tracker of the request that logged them."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        tracker = _active_tracker.get()
+        if tracker is not None:
+            tracker.emit(record)
+
+
+_dispatcher = _LLMUsageDispatcher()
+
+
+def track_llm_usage(tracker: LLMUsageTracker) -> None:
+    """
+    Send autogen's LLM events from this task, and tasks it starts, to ``tracker``.
+
+    The event logger is process-wide. Replacing its handlers with one
+    request's tracker sent the model calls of every concurrent request to
+    the last request to start, so a single handler looks up the tracker of
+    the calling request instead. Call it before starting the agent runtime,
+    whose tasks inherit the request's context.
+    """
+    event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+    event_logger.setLevel(logging.INFO)
+    if event_logger.handlers != [_dispatcher]:
+        event_logger.handlers = [_dispatcher]
+    _active_tracker.set(tracker)
+
+
 class IProjectAgents(ABC):
     def __init__(self) -> None:
         pass
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -17,6 +17,15 @@ class IChatRequest(BaseModel):
     stream: Optional[bool] = False
 
 
+class StageTiming(BaseModel):
+    """Time spent in one stage of a request, relative to its arrival."""
+
+    stage: str  # "auth", "history_load", "llm", "tool", "persistence", ...
+    start_ms: float
+    duration_ms: float
+    detail: Optional[str] = None  # e.g. the model or tool name
+
+
 class IChatResponse(BaseModel):
     thread_id: Optional[str]
     message_id: Optional[str]
@@ -27,6 +36,8 @@ class IChatResponse(BaseModel):
     topic: Optional[str] = None
     memory_summary: Optional[str] = None
     event_type: Optional[str] = None
+    # Only set when web_configuration.timing.response_field is on
+    timings: Optional[List[StageTiming]] = None
 
 
 class ChatRequest(IChatRequest):
@@ -37,6 +48,30 @@ class ChatResponse(IChatResponse):
     pass
 
 
+class ChatBatchItemResult(BaseModel):
+    """Outcome of one request in a batch, streamed as soon as it finishes."""
+
+    index: int
+    status: str  # "ok" or "error"
+    response: Optional[ChatResponse] = None
+    status_code: int = 200
+    error: Optional[str] = None
+    latency_seconds: float = 0.0
+
+
+class ChatBatchSummary(BaseModel):
+    """Totals for a batch, streamed after the last item."""
+
+    items: int
+    succeeded: int
+    failed: int
+    concurrency: int
+    total_token_count: int
+    total_latency_seconds: float
+    max_latency_seconds: float
+    wall_seconds: float
+
+
 class Action(BaseModel):
     name: str
     description: Optional[str] = None
@@ -57,10 +92,13 @@ class Product(BaseModel):
 class ChatResponseChunk(BaseModel):
     thread_id: Optional[str]
     message_id: Optional[str]
+    # Agent events: "agent_start", "agent_delta", "tool_call", "agent_complete"
     chunk_type: (
         str  # "content", "token_count", "memory_summary", "followup_questions", "final"
     )
     content: Optional[str] = None
+    agent_name: Optional[str] = None  # set on agent events
+    tool_calls: Optional[list[dict[str, str]]] = None  # name and JSON arguments
     token_count: Optional[int] = None
     max_token_count: Optional[int] = None
     topic: Optional[str] = None
@@ -76,3 +114,4 @@ class StreamingChatResponse(BaseModel):
     event: str  # "data", "error", "done"
     data: Optional[ChatResponseChunk] = None
     error: Optional[str] = None
+    timings: Optional[List[StageTiming]] = None  # on "done", when enabled
@@ -0,0 +1,44 @@
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from ingenious.models.chat import ChatResponse
+
+
+class ChatJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (
+            ChatJobStatus.SUCCEEDED,
+            ChatJobStatus.FAILED,
+            ChatJobStatus.CANCELLED,
+        )
+
+
+class ChatJob(BaseModel):
+    job_id: str
+    status: ChatJobStatus
+    conversation_flow: str
+    thread_id: Optional[str] = None
+    attempts: int = 0
+    cancel_requested: bool = False
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[ChatResponse] = None
+    error: Optional[str] = None
+
+
+class ChatJobEvent(BaseModel):
+    event_id: int
+    job_id: str
+    event: str
+    created_at: float
+    data: Dict[str, Any] = {}
@@ -0,0 +1,310 @@
+"""
+Admission control and load shedding for chat endpoints.
+
+Each worker admits at most ``max_concurrent`` chat requests at once. Further
+requests wait in a bounded FIFO queue for up to ``queue_timeout_seconds`` and
+are rejected with 503 when the queue is full or the deadline passes. A single
+user holding more than ``per_user_limit`` requests (queued or running) is
+rejected with 429, and a conversation flow over ``per_flow_limit`` with 503.
+Rejections carry a ``Retry-After`` estimate so clients back off instead of
+retrying immediately.
+
+With ``adaptive`` enabled the concurrency limit follows observed latency:
+once per window of completed requests the limit shrinks by 10% while the
+latency average is above ``target_latency_seconds`` and grows by one while it
+is below, staying between ``min_concurrent`` and ``max_concurrent``.
+
+All state is per process and only touched from the event loop, so no locking
+is needed.
+"""
+
+import asyncio
+import math
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from ingenious.config.main_settings import IngeniousSettings
+from ingenious.config.models import ChatAdmissionSettings
+from ingenious.config.snapshot import on_settings_change
+from ingenious.core.structured_logging import get_logger
+from ingenious.utils.namespace_utils import normalize_workflow_name
+
+logger = get_logger(__name__)
+
+# Weight of the newest sample in the latency moving average
+_LATENCY_ALPHA = 0.2
+# Multiplicative decrease applied when latency is above target
+_DECREASE_FACTOR = 0.9
+_MAX_RETRY_AFTER_SECONDS = 60
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(self.retry_after)}
+
+
+class AdmissionTicket:
+    """A held admission slot; ``release`` must be called once the work is done."""
+
+    __slots__ = ("_controller", "user", "flow", "admitted_at", "_released")
+
+    def __init__(
+        self,
+        controller: Optional["AdmissionController"],
+        user: Optional[str],
+        flow: Optional[str],
+    ) -> None:
+        self._controller = controller
+        self.user = user
+        self.flow = flow
+        self.admitted_at = time.monotonic()
+        self._released = controller is None
+
+    def release(self) -> None:
+        """Return the slot to the controller. Safe to call more than once."""
+        if self._released:
+            return
+        self._released = True
+        assert self._controller is not None
+        self._controller._release(self, time.monotonic() - self.admitted_at)
+
+
+class AdmissionController:
+    """
+    Per-worker concurrency limiter with a bounded wait queue.
+
+    Args:
+        settings: Limits and queue configuration
+    """
+
+    def __init__(self, settings: ChatAdmissionSettings) -> None:
+        self.settings = settings
+        self.limit = settings.max_concurrent
+        self.in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._per_user: Dict[str, int] = defaultdict(int)
+        self._per_flow: Dict[str, int] = defaultdict(int)
+        self._latency_ewma: Optional[float] = None
+        self._completed_in_window = 0
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Estimate in whole seconds when a rejected client should retry."""
+        estimate = 0.0
+        if self._latency_ewma is not None:
+            # Time for the queue ahead of a new request to drain
+            estimate = self._latency_ewma * (self.queued + 1) / max(self.limit, 1)
+        seconds = max(self.settings.retry_after_seconds, math.ceil(estimate))
+        return min(seconds, _MAX_RETRY_AFTER_SECONDS)
+
+    def _reject(self, reason: str, status_code: int, message: str) -> None:
+        self.counters[f"rejected_{reason}"] += 1
+        retry_after = self.retry_after()
+        logger.warning(
+            "Chat request shed",
+            reason=reason,
+            status_code=status_code,
+            in_flight=self.in_flight,
+            queued=self.queued,
+            limit=self.limit,
+            retry_after=retry_after,
+        )
+        raise AdmissionRejectedError(message, status_code, retry_after)
+
+    async def acquire(
+        self, user: Optional[str] = None, flow: Optional[str] = None
+    ) -> AdmissionTicket:
+        """
+        Wait for a slot and return a ticket holding it.
+
+        ``user`` and ``flow`` select the per-user and per-flow limits; pass
+        ``None`` when the caller cannot be identified to skip that limit.
+        Flow names are normalized as the flow registry does, so every
+        spelling of a flow shares its limit.
+
+        Raises:
+            AdmissionRejectedError: 429 when the user is over its limit, 503
+                when the flow is over its limit, the queue is full or the
+                queue deadline passes
+        """
+        settings = self.settings
+        if flow is not None:
+            flow = normalize_workflow_name(flow)
+        if not settings.enable:
+            return AdmissionTicket(None, user, flow)
+
+        if (
+            user is not None
+            and settings.per_user_limit
+            and self._per_user[user] >= settings.per_user_limit
+        ):
+            self._reject("user", 429, "Too many concurrent requests for this user")
+        if (
+            flow is not None
+            and settings.per_flow_limit
+            and self._per_flow[flow] >= settings.per_flow_limit
+        ):
+            self._reject("flow", 503, "Conversation flow is at capacity")
+
+        # Queued requests count towards the user and flow limits too
+        self._hold(user, flow, 1)
+        try:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+            elif len(self._waiters) >= settings.max_queue:
+                self._reject("queue_full", 503, "Server is at capacity")
+            else:
+                await self._wait_for_slot()
+        except BaseException:
+            self._hold(user, flow, -1)
+            raise
+
+        self.counters["admitted"] += 1
+        return AdmissionTicket(self, user, flow)
+
+    async def _wait_for_slot(self) -> None:
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters["queued"] += 1
+        try:
+            await asyncio.wait({waiter}, timeout=self.settings.queue_timeout_seconds)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the caller went away
+                self._release_slot()
+            else:
+                self._discard_waiter(waiter)
+            raise
+
+        if not waiter.done():
+            self._discard_waiter(waiter)
+            self._reject("timeout", 503, "Timed out waiting for capacity")
+
+    def _discard_waiter(self, waiter: "asyncio.Future[None]") -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        waiter.cancel()
+
+    def _hold(self, user: Optional[str], flow: Optional[str], delta: int) -> None:
+        for key, counts in ((user, self._per_user), (flow, self._per_flow)):
+            if key is None:
+                continue
+            counts[key] += delta
+            if counts[key] <= 0:
+                del counts[key]
+
+    def _release(self, ticket: AdmissionTicket, latency: float) -> None:
+        self._hold(ticket.user, ticket.flow, -1)
+        self._record_latency(latency)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        # Hand the slot straight to the next waiter unless the limit shrank
+        if self.in_flight <= self.limit:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _record_latency(self, latency: float) -> None:
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+        else:
+            self._latency_ewma += _LATENCY_ALPHA * (latency - self._latency_ewma)
+
+        settings = self.settings
+        if not settings.adaptive:
+            return
+
+        # Adjust at most once per window of ``limit`` completions
+        self._completed_in_window += 1
+        if self._completed_in_window < self.limit:
+            return
+        self._completed_in_window = 0
+
+        previous = self.limit
+        if self._latency_ewma > settings.target_latency_seconds:
+            self.limit = max(
+                settings.min_concurrent, int(self.limit * _DECREASE_FACTOR)
+            )
+        elif self.limit < settings.max_concurrent:
+            self.limit += 1
+            self._wake_waiters()
+
+        if self.limit != previous:
+            logger.info(
+                "Adjusted chat concurrency limit",
+                previous_limit=previous,
+                limit=self.limit,
+                latency_ewma_seconds=self._latency_ewma,
+            )
+
+    @asynccontextmanager
+    async def admit(
+        self, user: Optional[str] = None, flow: Optional[str] = None
+    ) -> AsyncIterator[AdmissionTicket]:
+        """Hold a slot for the duration of the ``async with`` block."""
+        ticket = await self.acquire(user, flow)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current load and counters for diagnostics."""
+        return {
+            "enabled": self.settings.enable,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "latency_ewma_seconds": self._latency_ewma,
+            "counters": dict(self.counters),
+        }
+
+
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller(
+    settings: Optional[ChatAdmissionSettings] = None,
+) -> AdmissionController:
+    """Get the worker's admission controller, creating it on first use."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(
+            settings if settings is not None else ChatAdmissionSettings()
+        )
+    return _admission_controller
+
+
+@on_settings_change
+def _reset_on_settings_change(old: IngeniousSettings, new: IngeniousSettings) -> None:
+    # Requests already admitted release their permits to the old controller
+    global _admission_controller
+    if old.web_configuration.admission != new.web_configuration.admission:
+        _admission_controller = None
@@ -5,7 +5,6 @@ This module provides FastAPI dependency injection functions
 for authentication and authorization services.
 """
 
-import secrets
 from typing import Optional
 
 from dependency_injector.wiring import Provide, inject
@@ -18,7 +17,11 @@ from fastapi.security import (
 )
 from typing_extensions import Annotated
 
-from ingenious.auth.jwt import get_username_from_token
+from ingenious.auth.basic import parse_basic_auth_header, verify_basic_credentials
+from ingenious.auth.jwt import (
+    get_username_from_request_token,
+    get_username_from_token,
+)
 from ingenious.config.main_settings import IngeniousSettings
 from ingenious.core.structured_logging import get_logger
 from ingenious.services.container import Container
@@ -106,7 +109,7 @@ def get_auth_user(
     if auth_header.startswith("Bearer "):
         token = auth_header[7:]
         try:
-            username = get_username_from_token(token)
+            username = get_username_from_request_token(request.scope, token)
             return username
         except HTTPException:
             pass
@@ -132,21 +135,12 @@ def _validate_basic_auth_credentials(
     credentials: HTTPBasicCredentials, config: IngeniousSettings
 ) -> str:
     """Validate basic auth credentials against configuration."""
-    current_username_bytes = credentials.username.encode("utf8")
-    correct_username_bytes = config.web_configuration.authentication.username.encode(
-        "utf-8"
-    )
-    is_correct_username = secrets.compare_digest(
-        current_username_bytes, correct_username_bytes
-    )
-    current_password_bytes = credentials.password.encode("utf8")
-    correct_password_bytes = config.web_configuration.authentication.password.encode(
-        "utf-8"
-    )
-    is_correct_password = secrets.compare_digest(
-        current_password_bytes, correct_password_bytes
-    )
-    if not (is_correct_username and is_correct_password):
+    if not verify_basic_credentials(
+        credentials.username,
+        credentials.password,
+        config.web_configuration.authentication.username,
+        config.web_configuration.authentication.password,
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -157,11 +151,8 @@ def _validate_basic_auth_credentials(
 
 def _handle_basic_auth_header(auth_header: str, config: IngeniousSettings) -> str:
     """Handle Basic Auth header parsing and validation."""
-    import base64
-
     try:
-        credentials_str = base64.b64decode(auth_header[6:]).decode("utf-8")
-        username, password = credentials_str.split(":", 1)
+        username, password = parse_basic_auth_header(auth_header)
     except (ValueError, UnicodeDecodeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -170,23 +161,12 @@ def _handle_basic_auth_header(auth_header: str, config: IngeniousSettings) -> st
         )
 
     # Validate credentials
-    current_username_bytes = username.encode("utf8")
-    correct_username_bytes = config.web_configuration.authentication.username.encode(
-        "utf-8"
-    )
-    is_correct_username = secrets.compare_digest(
-        current_username_bytes, correct_username_bytes
-    )
-
-    current_password_bytes = password.encode("utf8")
-    correct_password_bytes = config.web_configuration.authentication.password.encode(
-        "utf-8"
-    )
-    is_correct_password = secrets.compare_digest(
-        current_password_bytes, correct_password_bytes
-    )
-
-    if not (is_correct_username and is_correct_password):
+    if not verify_basic_credentials(
+        username,
+        password,
+        config.web_configuration.authentication.username,
+        config.web_configuration.authentication.password,
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
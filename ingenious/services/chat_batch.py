@@ -0,0 +1,223 @@
+"""
+Batch execution of chat requests.
+
+A batch is parsed once, then its items run through the normal chat service with
+at most ``concurrency`` items in flight. Results are yielded in completion
+order, each tagged with the item's index in the batch, followed by a summary
+with token and latency totals. A failing item produces an error result and does
+not stop the rest of the batch.
+"""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Callable, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from ingenious.core.structured_logging import get_logger
+from ingenious.errors.content_filter_error import ContentFilterError
+from ingenious.errors.token_limit_exceeded_error import TokenLimitExceededError
+from ingenious.models.chat import (
+    ChatBatchItemResult,
+    ChatBatchSummary,
+    ChatRequest,
+)
+from ingenious.services.admission_control import (
+    AdmissionController,
+    AdmissionRejectedError,
+)
+from ingenious.services.chat_service import ChatService
+
+logger = get_logger(__name__)
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl")
+
+# An item is either a parsed request or the error that prevented parsing it
+BatchItem = Union[ChatRequest, ChatBatchItemResult]
+
+
+class BatchTooLargeError(ValueError):
+    """Raised when a batch has more items than allowed."""
+
+
+def _invalid_item(index: int, error: str) -> ChatBatchItemResult:
+    return ChatBatchItemResult(
+        index=index, status="error", status_code=422, error=error
+    )
+
+
+def _parse_item(index: int, value: object) -> BatchItem:
+    try:
+        return ChatRequest.model_validate(value)
+    except ValidationError as e:
+        return _invalid_item(index, str(e))
+
+
+def parse_chat_batch(body: bytes, content_type: str, max_items: int) -> List[BatchItem]:
+    """
+    Parse a JSON array or NDJSON body into chat requests.
+
+    Items that are not valid ``ChatRequest``s are returned as error results so
+    the rest of the batch can still run.
+
+    Raises:
+        ValueError: If the body is not a JSON array or NDJSON, or is empty
+        BatchTooLargeError: If the batch has more than ``max_items`` items
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    values: List[object] = []
+    items: List[BatchItem] = []
+
+    if media_type in NDJSON_CONTENT_TYPES:
+        for line in body.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                values.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                # Keep the index so results still line up with input lines
+                values.append(_invalid_item(len(values), f"Invalid JSON: {e}"))
+    else:
+        try:
+            parsed = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Batch body is not valid JSON: {e}")
+        if not isinstance(parsed, list):
+            raise ValueError("Batch body must be a JSON array of chat requests")
+        values = parsed
+
+    if not values:
+        raise ValueError("Batch contains no chat requests")
+    if len(values) > max_items:
+        raise BatchTooLargeError(
+            f"Batch has {len(values)} items; the limit is {max_items}"
+        )
+
+    for index, value in enumerate(values):
+        if isinstance(value, ChatBatchItemResult):
+            items.append(value)
+        else:
+            items.append(_parse_item(index, value))
+    return items
+
+
+def chat_error_status(e: Exception) -> Tuple[int, str]:
+    """Map a chat failure to the status code and message /chat would return."""
+    if isinstance(e, AdmissionRejectedError):
+        return e.status_code, str(e)
+    if isinstance(e, ValueError):
+        return 400, str(e)
+    if isinstance(e, ContentFilterError):
+        return 406, ContentFilterError.DEFAULT_MESSAGE
+    if isinstance(e, TokenLimitExceededError):
+        return 413, TokenLimitExceededError.DEFAULT_MESSAGE
+    return 500, str(e)
+
+
+async def _run_item(
+    index: int,
+    chat_request: ChatRequest,
+    create_service: Callable[[str], ChatService],
+    admission: Optional[AdmissionController],
+    user: Optional[str],
+) -> ChatBatchItemResult:
+    start = time.perf_counter()
+    # As on /chat, only anonymous items are told apart by their user_id
+    admission_user = user or chat_request.user_id or None
+    try:
+        if not chat_request.user_id:
+            chat_request.user_id = "unspecified_user"
+        if not chat_request.conversation_flow:
+            raise ValueError(f"conversation_flow not set {chat_request}")
+
+        # A service per item: flow services keep per-flow state on the instance
+        chat_service = create_service(chat_request.conversation_flow)
+        if admission is None:
+            response = await chat_service.get_chat_response(chat_request)
+        else:
+            async with admission.admit(admission_user, chat_request.conversation_flow):
+                response = await chat_service.get_chat_response(chat_request)
+        return ChatBatchItemResult(
+            index=index,
+            status="ok",
+            response=response,
+            latency_seconds=time.perf_counter() - start,
+        )
+    except Exception as e:
+        status_code, error = chat_error_status(e)
+        if status_code == 500:
+            logger.error("Batch item failed", index=index, error=error, exc_info=True)
+        return ChatBatchItemResult(
+            index=index,
+            status="error",
+            status_code=status_code,
+            error=error,
+            latency_seconds=time.perf_counter() - start,
+        )
+
+
+async def run_chat_batch(
+    items: List[BatchItem],
+    create_service: Callable[[str], ChatService],
+    concurrency: int,
+    admission: Optional[AdmissionController] = None,
+    user: Optional[str] = None,
+) -> AsyncIterator[Union[ChatBatchItemResult, ChatBatchSummary]]:
+    """
+    Run batch items with bounded concurrency, yielding results as they finish.
+
+    Items are admitted under ``user``, the authenticated caller, so a batch
+    counts against the same per-user limit as the caller's other chats. Items
+    of anonymous batches are limited by their own ``user_id``.
+
+    The final value yielded is a ``ChatBatchSummary``. Closing the iterator
+    early cancels the items still running.
+    """
+    start = time.perf_counter()
+    results: "asyncio.Queue[ChatBatchItemResult]" = asyncio.Queue()
+    pending = iter(list(enumerate(items)))
+
+    async def worker() -> None:
+        for index, item in pending:
+            if isinstance(item, ChatBatchItemResult):
+                await results.put(item)
+            else:
+                await results.put(
+                    await _run_item(index, item, create_service, admission, user)
+                )
+
+    workers = [
+        asyncio.create_task(worker()) for _ in range(min(concurrency, len(items)))
+    ]
+    succeeded = failed = total_tokens = 0
+    total_latency = max_latency = 0.0
+    try:
+        for _ in range(len(items)):
+            result = await results.get()
+            if result.status == "ok":
+                succeeded += 1
+                if result.response is not None:
+                    total_tokens += result.response.token_count or 0
+            else:
+                failed += 1
+            total_latency += result.latency_seconds
+            max_latency = max(max_latency, result.latency_seconds)
+            yield result
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    summary = ChatBatchSummary(
+        items=len(items),
+        succeeded=succeeded,
+        failed=failed,
+        concurrency=len(workers),
+        total_token_count=total_tokens,
+        total_latency_seconds=total_latency,
+        max_latency_seconds=max_latency,
+        wall_seconds=time.perf_counter() - start,
+    )
+    logger.info("Chat batch completed", **summary.model_dump())
+    yield summary
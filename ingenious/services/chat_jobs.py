@@ -0,0 +1,697 @@
+"""
+Background jobs for long-running chat flows.
+
+A chat request submitted as a job is written to a local SQLite queue and
+picked up by a pool of asyncio workers running in each server process, so the
+HTTP call returns immediately with a job id. Progress is recorded as an ordered
+list of events per job, which clients poll or follow over SSE until the job
+finishes. Besides the job's own status changes, the events include what the
+flow's agents publish while it runs (see ``ingenious.core.agent_events``).
+
+The queue is durable: a worker holds a lease on each running job and renews it
+while the flow runs. Jobs whose lease lapses (the process died or was
+restarted) are picked up again, up to ``max_attempts``. Cancellation is
+recorded in the database and honoured by whichever worker holds the job.
+Finished jobs and their events are deleted after ``retention_seconds``.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ingenious.config.models import ChatJobSettings
+from ingenious.core.agent_events import AgentEventStream
+from ingenious.core.structured_logging import get_logger
+from ingenious.db.local_sqlite import ThreadLocalSQLite
+from ingenious.models.chat import ChatRequest, ChatResponse
+from ingenious.models.chat_job import ChatJob, ChatJobEvent, ChatJobStatus
+from ingenious.services.chat_batch import chat_error_status
+from ingenious.services.chat_service import ChatService
+from ingenious.utils import serialization
+
+logger = get_logger(__name__)
+
+# Events after which no more events are recorded for a job
+TERMINAL_EVENTS = frozenset(
+    status.value for status in ChatJobStatus if status.is_finished
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS chat_jobs (
+        job_id TEXT PRIMARY KEY,
+        user TEXT,
+        status TEXT NOT NULL,
+        conversation_flow TEXT NOT NULL,
+        request_json TEXT NOT NULL,
+        result_json TEXT,
+        error TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        cancel_requested INTEGER NOT NULL DEFAULT 0,
+        lease_owner TEXT,
+        lease_expires_at REAL,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_chat_jobs_status ON chat_jobs (status, created_at)",
+    """
+    CREATE TABLE IF NOT EXISTS chat_job_events (
+        event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id TEXT NOT NULL,
+        event TEXT NOT NULL,
+        data_json TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_chat_job_events_job ON chat_job_events (job_id, event_id)",
+)
+
+
+class ChatJobStore:
+    """
+    SQLite job queue and event log.
+
+    Methods are synchronous; ``ChatJobService`` runs them in worker threads.
+    State changes that must be atomic across processes run inside
+    ``BEGIN IMMEDIATE`` transactions.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._db = ThreadLocalSQLite(db_path)
+        conn = self._db.connection()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _transaction(self) -> sqlite3.Connection:
+        conn = self._db.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    @staticmethod
+    def _add_event(
+        conn: sqlite3.Connection, job_id: str, event: str, data: Dict[str, Any]
+    ) -> int:
+        cursor = conn.execute(
+            "INSERT INTO chat_job_events (job_id, event, data_json, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (job_id, event, serialization.dumps(data), time.time()),
+        )
+        return int(cursor.lastrowid or 0)
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> ChatJob:
+        request = json.loads(row["request_json"])
+        return ChatJob(
+            job_id=row["job_id"],
+            status=ChatJobStatus(row["status"]),
+            conversation_flow=row["conversation_flow"],
+            thread_id=request.get("thread_id"),
+            attempts=row["attempts"],
+            cancel_requested=bool(row["cancel_requested"]),
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            result=ChatResponse.model_validate_json(row["result_json"])
+            if row["result_json"]
+            else None,
+            error=row["error"],
+        )
+
+    def submit(self, user: Optional[str], chat_request: ChatRequest) -> ChatJob:
+        job_id = str(uuid.uuid4())
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "INSERT INTO chat_jobs (job_id, user, status, conversation_flow, "
+                "request_json, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    user,
+                    ChatJobStatus.QUEUED.value,
+                    chat_request.conversation_flow,
+                    chat_request.model_dump_json(),
+                    time.time(),
+                ),
+            )
+            self._add_event(conn, job_id, ChatJobStatus.QUEUED.value, {})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str, user: Optional[str] = None) -> Optional[ChatJob]:
+        """Return the job, or None if it does not exist or belongs to another user."""
+        row = (
+            self._db.connection()
+            .execute("SELECT * FROM chat_jobs WHERE job_id = ?", (job_id,))
+            .fetchone()
+        )
+        if row is None or (user is not None and row["user"] != user):
+            return None
+        return self._row_to_job(row)
+
+    def claim(
+        self, owner: str, lease_seconds: float, max_attempts: int
+    ) -> Optional[Tuple[str, ChatRequest, int]]:
+        """
+        Lease the oldest runnable job to ``owner``.
+
+        Runnable jobs are queued ones and running ones whose lease has lapsed.
+        Lapsed jobs that are out of attempts, or were cancelled, are finished
+        instead of being retried.
+
+        Returns:
+            ``(job_id, chat_request, attempt)`` or None when the queue is empty
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            lapsed = conn.execute(
+                "SELECT job_id, attempts, cancel_requested FROM chat_jobs "
+                "WHERE status = ? AND lease_expires_at < ?",
+                (ChatJobStatus.RUNNING.value, now),
+            ).fetchall()
+            for row in lapsed:
+                if row["cancel_requested"]:
+                    status, error = ChatJobStatus.CANCELLED, None
+                elif row["attempts"] >= max_attempts:
+                    status = ChatJobStatus.FAILED
+                    error = f"Job interrupted {row['attempts']} times"
+                else:
+                    continue
+                conn.execute(
+                    "UPDATE chat_jobs SET status = ?, error = ?, finished_at = ?, "
+                    "lease_owner = NULL, lease_expires_at = NULL WHERE job_id = ?",
+                    (status.value, error, now, row["job_id"]),
+                )
+                self._add_event(
+                    conn, row["job_id"], status.value, {"error": error} if error else {}
+                )
+
+            row = conn.execute(
+                "SELECT job_id, request_json, attempts FROM chat_jobs "
+                "WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (ChatJobStatus.QUEUED.value, ChatJobStatus.RUNNING.value, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            attempt = row["attempts"] + 1
+            conn.execute(
+                "UPDATE chat_jobs SET status = ?, attempts = ?, lease_owner = ?, "
+                "lease_expires_at = ?, started_at = COALESCE(started_at, ?) "
+                "WHERE job_id = ?",
+                (
+                    ChatJobStatus.RUNNING.value,
+                    attempt,
+                    owner,
+                    now + lease_seconds,
+                    now,
+                    row["job_id"],
+                ),
+            )
+            self._add_event(
+                conn, row["job_id"], "started", {"attempt": attempt, "worker": owner}
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return (
+            row["job_id"],
+            ChatRequest.model_validate_json(row["request_json"]),
+            attempt,
+        )
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> Optional[bool]:
+        """
+        Extend ``owner``'s lease on a running job.
+
+        Returns:
+            Whether cancellation was requested, or None if the lease was lost
+        """
+        conn = self._db.connection()
+        cursor = conn.execute(
+            "UPDATE chat_jobs SET lease_expires_at = ? "
+            "WHERE job_id = ? AND lease_owner = ? AND status = ?",
+            (time.time() + lease_seconds, job_id, owner, ChatJobStatus.RUNNING.value),
+        )
+        if cursor.rowcount == 0:
+            return None
+        row = conn.execute(
+            "SELECT cancel_requested FROM chat_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return bool(row["cancel_requested"])
+
+    def finish(
+        self,
+        job_id: str,
+        owner: str,
+        status: ChatJobStatus,
+        result: Optional[ChatResponse] = None,
+        error: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Record the outcome of a job still leased by ``owner``."""
+        conn = self._transaction()
+        try:
+            cursor = conn.execute(
+                "UPDATE chat_jobs SET status = ?, result_json = ?, error = ?, "
+                "finished_at = ?, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE job_id = ? AND lease_owner = ? AND status = ?",
+                (
+                    status.value,
+                    result.model_dump_json() if result is not None else None,
+                    error,
+                    time.time(),
+                    job_id,
+                    owner,
+                    ChatJobStatus.RUNNING.value,
+                ),
+            )
+            if cursor.rowcount:
+                self._add_event(conn, job_id, status.value, data or {})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return bool(cursor.rowcount)
+
+    def release(self, job_id: str, owner: str) -> None:
+        """Put a job leased by ``owner`` back on the queue, e.g. at shutdown."""
+        conn = self._transaction()
+        try:
+            cursor = conn.execute(
+                "UPDATE chat_jobs SET status = ?, lease_owner = NULL, "
+                "lease_expires_at = NULL WHERE job_id = ? AND lease_owner = ? "
+                "AND status = ?",
+                (
+                    ChatJobStatus.QUEUED.value,
+                    job_id,
+                    owner,
+                    ChatJobStatus.RUNNING.value,
+                ),
+            )
+            if cursor.rowcount:
+                self._add_event(conn, job_id, "requeued", {})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def request_cancel(
+        self, job_id: str, user: Optional[str] = None
+    ) -> Optional[ChatJob]:
+        """
+        Cancel a job. Queued jobs are cancelled at once; running jobs are
+        flagged and stopped by the worker holding them.
+        """
+        if self.get(job_id, user) is None:
+            return None
+        now = time.time()
+        conn = self._transaction()
+        try:
+            cursor = conn.execute(
+                "UPDATE chat_jobs SET status = ?, cancel_requested = 1, "
+                "finished_at = ? WHERE job_id = ? AND status = ?",
+                (
+                    ChatJobStatus.CANCELLED.value,
+                    now,
+                    job_id,
+                    ChatJobStatus.QUEUED.value,
+                ),
+            )
+            if cursor.rowcount:
+                self._add_event(conn, job_id, ChatJobStatus.CANCELLED.value, {})
+            else:
+                conn.execute(
+                    "UPDATE chat_jobs SET cancel_requested = 1 "
+                    "WHERE job_id = ? AND status = ?",
+                    (job_id, ChatJobStatus.RUNNING.value),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(job_id)
+
+    def add_event(self, job_id: str, event: str, data: Dict[str, Any]) -> int:
+        return self._add_event(self._db.connection(), job_id, event, data)
+
+    def events(
+        self, job_id: str, after_event_id: int = 0, limit: int = 100
+    ) -> List[ChatJobEvent]:
+        rows = (
+            self._db.connection()
+            .execute(
+                "SELECT event_id, job_id, event, data_json, created_at "
+                "FROM chat_job_events WHERE job_id = ? AND event_id > ? "
+                "ORDER BY event_id LIMIT ?",
+                (job_id, after_event_id, limit),
+            )
+            .fetchall()
+        )
+        return [
+            ChatJobEvent(
+                event_id=row["event_id"],
+                job_id=row["job_id"],
+                event=row["event"],
+                created_at=row["created_at"],
+                data=serialization.loads(row["data_json"]),
+            )
+            for row in rows
+        ]
+
+    def purge(self, retention_seconds: float) -> int:
+        """Delete finished jobs, and their events, older than the retention period."""
+        cutoff = time.time() - retention_seconds
+        finished = tuple(status.value for status in ChatJobStatus if status.is_finished)
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "DELETE FROM chat_job_events WHERE job_id IN ("
+                "SELECT job_id FROM chat_jobs WHERE finished_at < ? "
+                "AND status IN (?, ?, ?))",
+                (cutoff, *finished),
+            )
+            cursor = conn.execute(
+                "DELETE FROM chat_jobs WHERE finished_at < ? AND status IN (?, ?, ?)",
+                (cutoff, *finished),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return int(cursor.rowcount)
+
+
+class ChatJobService:
+    """
+    Job queue API and the worker pool that runs jobs in this process.
+
+    Args:
+        settings: Queue location, worker count, lease and retention
+    """
+
+    # How often finished jobs past their retention are deleted
+    PURGE_INTERVAL_SECONDS = 300.0
+
+    def __init__(self, settings: ChatJobSettings) -> None:
+        self.settings = settings
+        self.store = ChatJobStore(settings.database_path)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._create_service: Optional[Callable[[str], ChatService]] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._running: Dict[str, "asyncio.Task[Any]"] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    async def submit(self, user: Optional[str], chat_request: ChatRequest) -> ChatJob:
+        job = await asyncio.to_thread(self.store.submit, user, chat_request)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        logger.info(
+            "Chat job queued",
+            job_id=job.job_id,
+            conversation_flow=chat_request.conversation_flow,
+        )
+        return job
+
+    async def get(self, job_id: str, user: Optional[str] = None) -> Optional[ChatJob]:
+        return await asyncio.to_thread(self.store.get, job_id, user)
+
+    async def cancel(
+        self, job_id: str, user: Optional[str] = None
+    ) -> Optional[ChatJob]:
+        job = await asyncio.to_thread(self.store.request_cancel, job_id, user)
+        task = self._running.get(job_id)
+        if task is not None:
+            # Held by this process: stop it now rather than at the next renewal
+            task.cancel()
+        return job
+
+    async def events(self, job_id: str, after_event_id: int = 0) -> List[ChatJobEvent]:
+        return await asyncio.to_thread(self.store.events, job_id, after_event_id)
+
+    async def emit(self, job_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Record a progress event for a running job."""
+        await asyncio.to_thread(self.store.add_event, job_id, event, data)
+
+    async def start(self, create_service: Callable[[str], ChatService]) -> None:
+        """Start the worker pool. ``create_service`` builds a service per flow."""
+        if self.started:
+            return
+        self._create_service = create_service
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(i))
+            for i in range(self.settings.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._purge_loop()))
+        logger.info(
+            "Chat job workers started", workers=self.settings.workers, owner=self.owner
+        )
+
+    async def stop(self) -> None:
+        """Stop the workers, returning jobs in progress to the queue."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Chat job workers stopped", owner=self.owner)
+
+    async def _worker_loop(self, index: int) -> None:
+        settings = self.settings
+        assert self._wakeup is not None
+        while True:
+            try:
+                claimed = await asyncio.to_thread(
+                    self.store.claim,
+                    self.owner,
+                    settings.lease_seconds,
+                    settings.max_attempts,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Chat job claim failed", worker=index, error=str(e))
+                claimed = None
+
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), settings.poll_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run_job(*claimed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "Chat job worker failed",
+                    worker=index,
+                    job_id=claimed[0],
+                    error=str(e),
+                    exc_info=e,
+                )
+
+    async def _run_job(
+        self, job_id: str, chat_request: ChatRequest, attempt: int
+    ) -> None:
+        settings = self.settings
+        assert self._create_service is not None
+        logger.info("Chat job started", job_id=job_id, attempt=attempt)
+
+        async def run() -> ChatResponse:
+            assert self._create_service is not None
+            if not chat_request.user_id:
+                chat_request.user_id = "unspecified_user"
+            chat_service = self._create_service(chat_request.conversation_flow)
+            return await chat_service.get_chat_response(chat_request)
+
+        stream = AgentEventStream(chat_request.thread_id)
+        task = stream.run(run())
+        forward = asyncio.create_task(self._record_agent_events(job_id, stream))
+        self._running[job_id] = task
+        renew_every = settings.lease_seconds / 3
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=renew_every)
+                if task.done():
+                    break
+                try:
+                    cancel_requested = await asyncio.to_thread(
+                        self.store.renew, job_id, self.owner, settings.lease_seconds
+                    )
+                except Exception as e:
+                    # Stop rather than run on without a lease another worker
+                    # may take over
+                    logger.error(
+                        "Chat job lease renewal failed", job_id=job_id, error=str(e)
+                    )
+                    task.cancel()
+                    await asyncio.gather(task, forward, return_exceptions=True)
+                    await self._release(job_id)
+                    return
+                if cancel_requested is None:
+                    # Another worker took over after our lease lapsed
+                    logger.warning("Chat job lease lost", job_id=job_id)
+                    task.cancel()
+                    await asyncio.gather(task, forward, return_exceptions=True)
+                    return
+                if cancel_requested:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+        except asyncio.CancelledError:
+            # Shutting down: let another worker or the next start pick it up
+            task.cancel()
+            forward.cancel()
+            await asyncio.gather(task, forward, return_exceptions=True)
+            await asyncio.shield(
+                asyncio.to_thread(self.store.release, job_id, self.owner)
+            )
+            raise
+        finally:
+            self._running.pop(job_id, None)
+
+        # The stream ends with the flow; record its last events before the outcome
+        await asyncio.gather(forward, return_exceptions=True)
+
+        try:
+            await self._record_outcome(job_id, task)
+        except Exception as e:
+            logger.error("Chat job outcome not recorded", job_id=job_id, error=str(e))
+            await self._release(job_id)
+
+    async def _record_outcome(
+        self, job_id: str, task: "asyncio.Task[ChatResponse]"
+    ) -> None:
+        """Finish a job with the outcome of its completed flow task."""
+        if task.cancelled():
+            await asyncio.to_thread(
+                self.store.finish, job_id, self.owner, ChatJobStatus.CANCELLED
+            )
+            logger.info("Chat job cancelled", job_id=job_id)
+            return
+
+        error = task.exception()
+        if error is not None:
+            if not isinstance(error, Exception):
+                raise error
+            status_code, message = chat_error_status(error)
+            logger.error(
+                "Chat job failed",
+                job_id=job_id,
+                status_code=status_code,
+                error=message,
+                exc_info=error if status_code == 500 else None,
+            )
+            await asyncio.to_thread(
+                self.store.finish,
+                job_id,
+                self.owner,
+                ChatJobStatus.FAILED,
+                None,
+                message,
+                {"status_code": status_code, "error": message},
+            )
+            return
+
+        result = task.result()
+        await asyncio.to_thread(
+            self.store.finish,
+            job_id,
+            self.owner,
+            ChatJobStatus.SUCCEEDED,
+            result,
+            None,
+            {"result": result.model_dump(mode="json")},
+        )
+        logger.info("Chat job succeeded", job_id=job_id)
+
+    async def _release(self, job_id: str) -> None:
+        """Put a job back on the queue after a store error, if the store allows."""
+        try:
+            await asyncio.to_thread(self.store.release, job_id, self.owner)
+        except Exception as e:
+            logger.warning(
+                "Chat job not requeued; it runs again when its lease lapses",
+                job_id=job_id,
+                error=str(e),
+            )
+
+    async def _record_agent_events(self, job_id: str, stream: AgentEventStream) -> None:
+        """Record the agent events of a job's flow until the flow finishes."""
+        async for chunk in stream:
+            try:
+                await self.emit(
+                    job_id,
+                    chunk.chunk_type,
+                    chunk.model_dump(
+                        mode="json",
+                        exclude_none=True,
+                        exclude={"thread_id", "message_id", "chunk_type", "is_final"},
+                    ),
+                )
+            except Exception as e:
+                logger.warning(
+                    "Chat job event not recorded", job_id=job_id, error=str(e)
+                )
+
+    async def _purge_loop(self) -> None:
+        while True:
+            try:
+                purged = await asyncio.to_thread(
+                    self.store.purge, self.settings.retention_seconds
+                )
+                if purged:
+                    logger.info("Purged finished chat jobs", jobs=purged)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Chat job purge failed", error=str(e))
+            await asyncio.sleep(self.PURGE_INTERVAL_SECONDS)
+
+
+_chat_job_service: Optional[ChatJobService] = None
+
+
+def get_chat_job_service(settings: Optional[ChatJobSettings] = None) -> ChatJobService:
+    """Get the process-wide chat job service, creating it on first use."""
+    global _chat_job_service
+    if _chat_job_service is None:
+        _chat_job_service = ChatJobService(
+            settings if settings is not None else ChatJobSettings()
+        )
+    return _chat_job_service
+
+
+async def stop_chat_job_service() -> None:
+    """Stop the process-wide chat job workers, if they were ever created."""
+    if _chat_job_service is not None:
+        await _chat_job_service.stop()
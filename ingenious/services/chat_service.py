@@ -1,7 +1,9 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Union
+from typing import Any, AsyncIterator, Dict, Union
 
 from ingenious.config.main_settings import IngeniousSettings
+from ingenious.core import metrics
 from ingenious.core.error_handling import operation_context
 from ingenious.core.structured_logging import get_logger
 from ingenious.db.chat_history_repository import ChatHistoryRepository
@@ -10,11 +12,101 @@ from ingenious.errors import (
 )
 from ingenious.models.chat import ChatRequest, ChatResponse, ChatResponseChunk
 from ingenious.models.config import Config
+from ingenious.services.flow_registry import get_flow_registry
 from ingenious.utils.imports import import_class_with_fallback
+from ingenious.utils.namespace_utils import normalize_workflow_name
 
 logger = get_logger(__name__)
 
 
+# Chat service classes keyed by lower-cased service type
+_service_classes: Dict[str, Any] = {}
+
+
+def _load_service_class(chat_service_type: str, conversation_flow: str) -> Any:
+    """Import and validate the chat service class for a service type."""
+    class_name = f"{chat_service_type.lower()}_chat_service"
+
+    with operation_context(
+        "chat_service_initialization",
+        "services.chat",
+        error_class=ChatServiceError,
+        service_type=chat_service_type,
+        conversation_flow=conversation_flow,
+    ) as ctx:
+        try:
+            module_name = f"services.chat_services.{chat_service_type.lower()}.service"
+            service_class = import_class_with_fallback(
+                module_name, class_name, expected_methods=["get_chat_response"]
+            )
+
+            ctx.add_metadata(
+                module_name=module_name, class_name=class_name, successful=True
+            )
+
+            logger.info(
+                "Chat service class loaded successfully",
+                service_type=chat_service_type,
+                module_name=module_name,
+                class_name=class_name,
+            )
+
+        except ImportError as e:
+            raise ChatServiceError(
+                "Failed to import chat service module",
+                context={
+                    "service_type": chat_service_type,
+                    "module_name": module_name,
+                    "attempted_modules": [
+                        module_name,
+                        f"ingenious.services.chat_services.{chat_service_type.lower()}.service",
+                    ],
+                },
+                cause=e,
+                recoverable=False,
+                recovery_suggestion="Check if the chat service module exists and is properly installed",
+            ) from e
+
+        except AttributeError as e:
+            raise ChatServiceError(
+                "Chat service class not found in module",
+                context={
+                    "service_type": chat_service_type,
+                    "module_name": module_name,
+                    "expected_class": class_name,
+                },
+                cause=e,
+                recoverable=False,
+                recovery_suggestion="Ensure the class name matches the service type",
+            ) from e
+
+        except Exception as e:
+            raise ChatServiceError(
+                "Unexpected error during chat service initialization",
+                context={
+                    "service_type": chat_service_type,
+                    "module_name": module_name,
+                    "class_name": class_name,
+                },
+                cause=e,
+                recovery_suggestion="Check chat service configuration and dependencies",
+            ) from e
+
+    return service_class
+
+
+def _flow_label(conversation_flow: str) -> str:
+    """Registered flow name, or "unknown" so client input never becomes a label."""
+    if conversation_flow in get_flow_registry():
+        return normalize_workflow_name(conversation_flow)
+    return "unknown"
+
+
+def clear_chat_service_classes() -> None:
+    """Forget resolved chat service classes so the next request re-imports them."""
+    _service_classes.clear()
+
+
 class IChatService(ABC):
     service_class: Any = None
 
@@ -40,76 +132,15 @@ class ChatService(IChatService):
         config: Union[Config, IngeniousSettings],
         revision: str = "dfe19b62-07f1-4cb5-ae9a-561a253e4b04",
     ):
-        class_name = f"{chat_service_type.lower()}_chat_service"
         self.config = config
         self.revision = revision
 
-        with operation_context(
-            "chat_service_initialization",
-            "services.chat",
-            error_class=ChatServiceError,
-            service_type=chat_service_type,
-            conversation_flow=conversation_flow,
-        ) as ctx:
-            try:
-                module_name = (
-                    f"services.chat_services.{chat_service_type.lower()}.service"
-                )
-                service_class = import_class_with_fallback(
-                    module_name, class_name, expected_methods=["get_chat_response"]
-                )
-
-                ctx.add_metadata(
-                    module_name=module_name, class_name=class_name, successful=True
-                )
-
-                logger.info(
-                    "Chat service class loaded successfully",
-                    service_type=chat_service_type,
-                    module_name=module_name,
-                    class_name=class_name,
-                )
-
-            except ImportError as e:
-                raise ChatServiceError(
-                    "Failed to import chat service module",
-                    context={
-                        "service_type": chat_service_type,
-                        "module_name": module_name,
-                        "attempted_modules": [
-                            module_name,
-                            f"ingenious.services.chat_services.{chat_service_type.lower()}.service",
-                        ],
-                    },
-                    cause=e,
-                    recoverable=False,
-                    recovery_suggestion="Check if the chat service module exists and is properly installed",
-                ) from e
-
-            except AttributeError as e:
-                raise ChatServiceError(
-                    "Chat service class not found in module",
-                    context={
-                        "service_type": chat_service_type,
-                        "module_name": module_name,
-                        "expected_class": class_name,
-                    },
-                    cause=e,
-                    recoverable=False,
-                    recovery_suggestion="Ensure the class name matches the service type",
-                ) from e
-
-            except Exception as e:
-                raise ChatServiceError(
-                    "Unexpected error during chat service initialization",
-                    context={
-                        "service_type": chat_service_type,
-                        "module_name": module_name,
-                        "class_name": class_name,
-                    },
-                    cause=e,
-                    recovery_suggestion="Check chat service configuration and dependencies",
-                ) from e
+        # Service classes are resolved once per type and reused across requests
+        service_type = chat_service_type.lower()
+        service_class = _service_classes.get(service_type)
+        if service_class is None:
+            service_class = _load_service_class(chat_service_type, conversation_flow)
+            _service_classes[service_type] = service_class
 
         self.service_class = service_class(
             config=config,
@@ -120,7 +151,19 @@ class ChatService(IChatService):
     async def get_chat_response(self, chat_request: ChatRequest) -> ChatResponse:
         if not chat_request.conversation_flow:
             raise ValueError(f"conversation_flow not set {chat_request}")
-        return await self.service_class.get_chat_response(chat_request)  # type: ignore
+        start = time.perf_counter()
+        success = False
+        try:
+            response = await self.service_class.get_chat_response(chat_request)
+            success = True
+            return response  # type: ignore
+        finally:
+            metrics.record_flow(
+                _flow_label(chat_request.conversation_flow),
+                "chat",
+                success,
+                time.perf_counter() - start,
+            )
 
     async def get_streaming_chat_response(
         self, chat_request: ChatRequest
@@ -128,6 +171,33 @@ class ChatService(IChatService):
         if not chat_request.conversation_flow:
             raise ValueError(f"conversation_flow not set {chat_request}")
 
+        start = time.perf_counter()
+
+        def record(success: bool) -> None:
+            metrics.record_flow(
+                _flow_label(chat_request.conversation_flow),
+                "stream",
+                success,
+                time.perf_counter() - start,
+            )
+
+        # A client disconnecting mid-stream closes the generator with
+        # GeneratorExit, which is neither a success nor a flow error
+        success = True
+        try:
+            async for chunk in self._stream_chunks(chat_request):
+                # Flows report failures as error chunks rather than raising
+                if chunk.chunk_type == "error":
+                    success = False
+                yield chunk
+        except Exception:
+            record(False)
+            raise
+        record(success)
+
+    async def _stream_chunks(
+        self, chat_request: ChatRequest
+    ) -> AsyncIterator[ChatResponseChunk]:
         # Check if the service class supports streaming
         if hasattr(self.service_class, "get_streaming_chat_response"):
             async for chunk in self.service_class.get_streaming_chat_response(
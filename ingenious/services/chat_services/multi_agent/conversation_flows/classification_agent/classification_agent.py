@@ -1,13 +1,13 @@
-import logging
 import uuid
 
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import TextMessage
-from autogen_core import EVENT_LOGGER_NAME, CancellationToken
+from autogen_core import CancellationToken
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
 import ingenious.config.config as config
-from ingenious.models.agent import LLMUsageTracker
+from ingenious.core import tracing
+from ingenious.models.agent import LLMUsageTracker, track_llm_usage
 from ingenious.models.chat import ChatRequest
 
 
@@ -36,9 +36,6 @@ class ConversationFlow:
         model_config = _config.models[0]
 
         # Initialize LLM usage tracking
-        logger = logging.getLogger(EVENT_LOGGER_NAME)
-        logger.setLevel(logging.INFO)
-
         llm_logger = LLMUsageTracker(
             agents=["classification_agent"],  # Track classification agent
             config=_config,
@@ -48,7 +45,7 @@ class ConversationFlow:
             event_type="classification",
         )
 
-        logger.handlers = [llm_logger]
+        track_llm_usage(llm_logger)
 
         # Use provided thread memory context
         memory_context = ""
@@ -76,7 +73,11 @@ class ConversationFlow:
         }
 
         # Create the model client
-        model_client = AzureOpenAIChatCompletionClient(**azure_config)
+        model_client = tracing.instrument_model_client(
+            AzureOpenAIChatCompletionClient(**azure_config),
+            model=azure_config["model"],
+            agent_name="classification_agent",
+        )
 
         # Create classification system prompt with memory context
         classification_system_prompt = f"""
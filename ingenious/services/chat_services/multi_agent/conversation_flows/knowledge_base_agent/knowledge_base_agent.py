@@ -1,14 +1,15 @@
-import logging
 import os
 import uuid
 from typing import AsyncIterator
 
 from autogen_agentchat.agents import AssistantAgent
-from autogen_core import EVENT_LOGGER_NAME, CancellationToken
+from autogen_core import CancellationToken
 from autogen_core.tools import FunctionTool
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
-from ingenious.models.agent import LLMUsageTracker
+from ingenious.core import timing, tracing
+from ingenious.core.structured_logging import get_logger
+from ingenious.models.agent import LLMUsageTracker, track_llm_usage
 from ingenious.models.chat import ChatRequest, ChatResponse, ChatResponseChunk
 from ingenious.services.chat_services.multi_agent.service import IConversationFlow
 
@@ -20,6 +21,8 @@ try:
 except ImportError:
     AZURE_SEARCH_AVAILABLE = False
 
+logger = get_logger(__name__)
+
 
 class ConversationFlow(IConversationFlow):
     async def get_conversation_response(
@@ -29,9 +32,6 @@ class ConversationFlow(IConversationFlow):
         model_config = self._config.models[0]
 
         # Initialize LLM usage tracking
-        logger = logging.getLogger(EVENT_LOGGER_NAME)
-        logger.setLevel(logging.INFO)
-
         llm_logger = LLMUsageTracker(
             agents=[],  # Simple agent, no complex agent list needed
             config=self._config,
@@ -43,7 +43,7 @@ class ConversationFlow(IConversationFlow):
             event_type="knowledge_base",
         )
 
-        logger.handlers = [llm_logger]
+        track_llm_usage(llm_logger)
 
         # Retrieve thread memory for context
         memory_context = ""
@@ -78,7 +78,11 @@ class ConversationFlow(IConversationFlow):
         }
 
         # Create the model client
-        model_client = AzureOpenAIChatCompletionClient(**azure_config)
+        model_client = tracing.instrument_model_client(
+            AzureOpenAIChatCompletionClient(**azure_config),
+            model=azure_config["model"],
+            agent_name="knowledge_base_agent",
+        )
 
         # Check if Azure Search is configured
         use_azure_search = (
@@ -102,6 +106,10 @@ class ConversationFlow(IConversationFlow):
             context = f"Knowledge base search assistant using {search_backend} for finding information."
 
         # Create search tool function supporting both Azure Search and ChromaDB
+        @tracing.traced(
+            "tool.search_tool", **{"ingenious.search.backend": search_backend}
+        )
+        @timing.timed("retrieval", "search_tool")
         async def search_tool(search_query: str, topic: str = "general") -> str:
             f"""Search for information using {search_backend}"""
             try:
@@ -328,9 +336,6 @@ TERMINATE your response when the task is complete.
             model_config = self._config.models[0]
 
             # Initialize LLM usage tracking
-            logger = logging.getLogger(EVENT_LOGGER_NAME)
-            logger.setLevel(logging.INFO)
-
             llm_logger = LLMUsageTracker(
                 agents=[],  # Simple agent, no complex agent list needed
                 config=self._config,
@@ -342,7 +347,7 @@ TERMINATE your response when the task is complete.
                 event_type="knowledge_base_streaming",
             )
 
-            logger.handlers = [llm_logger]
+            track_llm_usage(llm_logger)
 
             # Retrieve thread memory for context (same as non-streaming)
             memory_context = ""
@@ -379,7 +384,11 @@ TERMINATE your response when the task is complete.
             }
 
             # Create the model client
-            model_client = AzureOpenAIChatCompletionClient(**azure_config)
+            model_client = tracing.instrument_model_client(
+                AzureOpenAIChatCompletionClient(**azure_config),
+                model=azure_config["model"],
+                agent_name="knowledge_base_agent",
+            )
 
             # Send initial chunk indicating start of processing
             yield ChatResponseChunk(
@@ -408,6 +417,10 @@ TERMINATE your response when the task is complete.
                 search_backend = "local ChromaDB"
 
             # Create search tool (abbreviated for brevity - would use same implementation)
+            @tracing.traced(
+                "tool.search_tool", **{"ingenious.search.backend": search_backend}
+            )
+            @timing.timed("retrieval", "search_tool")
             def search_tool(search_query: str) -> str:
                 """Search the knowledge base for information."""
                 try:
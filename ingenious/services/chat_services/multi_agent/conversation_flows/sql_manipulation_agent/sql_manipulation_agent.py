@@ -1,14 +1,15 @@
-import logging
 import os
 import sqlite3
 import uuid
 
 from autogen_agentchat.agents import AssistantAgent
-from autogen_core import EVENT_LOGGER_NAME, CancellationToken
+from autogen_core import CancellationToken
 from autogen_core.tools import FunctionTool
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
-from ingenious.models.agent import LLMUsageTracker
+from ingenious.core import timing, tracing
+from ingenious.core.structured_logging import get_logger
+from ingenious.models.agent import LLMUsageTracker, track_llm_usage
 from ingenious.models.chat import ChatRequest, ChatResponse
 from ingenious.services.chat_services.multi_agent.service import IConversationFlow
 
@@ -19,6 +20,8 @@ try:
 except ImportError:
     PYODBC_AVAILABLE = False
 
+logger = get_logger(__name__)
+
 
 class ConversationFlow(IConversationFlow):
     async def get_conversation_response(
@@ -28,9 +31,6 @@ class ConversationFlow(IConversationFlow):
         model_config = self._config.models[0]
 
         # Initialize LLM usage tracking
-        logger = logging.getLogger(EVENT_LOGGER_NAME)
-        logger.setLevel(logging.INFO)
-
         llm_logger = LLMUsageTracker(
             agents=[],  # Simple agent, no complex agent list needed
             config=self._config,
@@ -42,7 +42,7 @@ class ConversationFlow(IConversationFlow):
             event_type="sql_manipulation",
         )
 
-        logger.handlers = [llm_logger]
+        track_llm_usage(llm_logger)
 
         # Retrieve thread memory for context
         memory_context = ""
@@ -77,7 +77,11 @@ class ConversationFlow(IConversationFlow):
         }
 
         # Create the model client
-        model_client = AzureOpenAIChatCompletionClient(**azure_config)
+        model_client = tracing.instrument_model_client(
+            AzureOpenAIChatCompletionClient(**azure_config),
+            model=azure_config["model"],
+            agent_name="sql_manipulation_agent",
+        )
 
         # Set up context for conversation
         context = "SQL Expert Assistant for analyzing data."
@@ -161,6 +165,11 @@ class ConversationFlow(IConversationFlow):
                     """)
 
         # Create SQL tool as function
+        @tracing.traced(
+            "tool.execute_sql_tool",
+            **{"db.system": "mssql" if use_azure_sql else "sqlite"},
+        )
+        @timing.timed("tool", "execute_sql_tool")
         async def execute_sql_tool(query: str) -> str:
             """Execute SQL query on configured database (Azure SQL or SQLite)"""
             try:
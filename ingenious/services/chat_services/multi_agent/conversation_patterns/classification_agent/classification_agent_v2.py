@@ -5,6 +5,7 @@ from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
 from ingenious.config import get_config
+from ingenious.core import tracing
 from ingenious.core.structured_logging import get_logger
 from ingenious.models.config import Config
 
@@ -28,19 +29,24 @@ class ConversationPattern:
         self.context = ""
 
         # Create Azure OpenAI model client from config
-        self.model_client = AzureOpenAIChatCompletionClient(
-            model=str(
-                default_llm_config.get(
-                    "azure_deployment", default_llm_config.get("model", "gpt-4.1-nano")
-                )
-            ),
-            api_key=str(default_llm_config.get("api_key", "mock-openai-key")),
-            azure_endpoint=str(
-                default_llm_config.get("azure_endpoint", "http://127.0.0.1:3001")
-            ),
-            api_version=str(
-                default_llm_config.get("api_version", "2024-08-01-preview")
+        model = str(
+            default_llm_config.get(
+                "azure_deployment", default_llm_config.get("model", "gpt-4.1-nano")
+            )
+        )
+        self.model_client = tracing.instrument_model_client(
+            AzureOpenAIChatCompletionClient(
+                model=model,
+                api_key=str(default_llm_config.get("api_key", "mock-openai-key")),
+                azure_endpoint=str(
+                    default_llm_config.get("azure_endpoint", "http://127.0.0.1:3001")
+                ),
+                api_version=str(
+                    default_llm_config.get("api_version", "2024-08-01-preview")
+                ),
             ),
+            model=model,
+            agent_name="classification_agent",
         )
 
         # Initialize memory manager for cloud storage support
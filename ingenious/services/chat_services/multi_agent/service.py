@@ -3,22 +3,25 @@ import uuid as uuid_module
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
-from jinja2 import Environment
 from openai.types.chat import ChatCompletionMessageParam
 
 import ingenious.config.config as ig_config
 
 if TYPE_CHECKING:
     from ingenious.models.config import Config
+from ingenious.core import timing, tracing
+from ingenious.core.agent_events import AgentEventStream
 from ingenious.core.structured_logging import get_logger
 from ingenious.db.chat_history_repository import ChatHistoryRepository
 from ingenious.errors.content_filter_error import ContentFilterError
 from ingenious.files.files_repository import FileStorage
 from ingenious.models.chat import ChatResponseChunk, IChatRequest, IChatResponse
-from ingenious.utils.namespace_utils import (
-    import_class_with_fallback,
-    normalize_workflow_name,
+from ingenious.services.flow_registry import (
+    FlowCallingConvention,
+    get_flow_registry,
 )
+from ingenious.services.template_registry import get_template_registry
+from ingenious.utils.namespace_utils import normalize_workflow_name
 
 logger = get_logger(__name__)
 
@@ -119,85 +122,43 @@ class multi_agent_chat_service:
             if not self.conversation_flow:
                 raise ValueError(f"conversation_flow4 not set {chat_request}")
 
-            # Normalize workflow name to support both hyphenated and underscored formats
-            normalized_flow = normalize_workflow_name(self.conversation_flow)
-            module_name = f"services.chat_services.multi_agent.conversation_flows.{normalized_flow}.{normalized_flow}"
-            class_name = "ConversationFlow"
+            # Flows are imported and classified once by the registry, so
+            # dispatch is a lookup rather than an import plus signature probe
+            with timing.stage("flow_resolution"):
+                registration = get_flow_registry().get(self.conversation_flow)
+            conversation_flow_service_class = registration.flow_class
             logger.debug(
-                "Loading conversation flow module",
-                module_name=module_name,
-                class_name=class_name,
-                original_workflow=self.conversation_flow,
-                normalized_workflow=normalized_flow,
-                operation="module_loading",
-            )
-
-            conversation_flow_service_class = import_class_with_fallback(
-                module_name, class_name
-            )
-            logger.info(
-                "Successfully loaded conversation flow class",
-                class_type=str(type(conversation_flow_service_class)),
+                "Resolved conversation flow",
                 conversation_flow=self.conversation_flow,
-                operation="class_loading_success",
+                module_name=registration.module_name,
+                convention=registration.convention.value,
+                operation="flow_resolution",
             )
 
-            # Try to instantiate with new pattern first (IConversationFlow)
-            try:
-                # Check if it's the new pattern by trying to instantiate with parent service
+            if registration.convention is FlowCallingConvention.INSTANCE:
                 conversation_flow_service_class_instance = (
                     conversation_flow_service_class(
                         parent_multi_agent_chat_service=self
                     )
                 )
-
-                response_task = (
-                    conversation_flow_service_class_instance.get_conversation_response(
+                with tracing.span(
+                    "flow.dispatch",
+                    **{
+                        "ingenious.flow": self.conversation_flow,
+                        "ingenious.flow.module": registration.module_name,
+                    },
+                ):
+                    agent_response = await conversation_flow_service_class_instance.get_conversation_response(
                         chat_request=chat_request
                     )
-                )
-
-                agent_response = await response_task
-
-            except TypeError as te:
-                # Fall back to old pattern (static methods)
-                logger.info(
-                    "Using static method pattern for conversation flow",
-                    conversation_flow=self.conversation_flow,
-                    type_error=str(te),
-                    operation="fallback_static_method",
-                )
-
-                # Try different static method signatures
-                import inspect
-
-                sig = inspect.signature(
-                    conversation_flow_service_class.get_conversation_response
-                )
-                params = list(sig.parameters.keys())
-                logger.debug(
-                    "Analyzing method signature",
-                    parameters=params,
-                    param_count=len(params),
-                    operation="method_signature_analysis",
-                )
-
-                if len(params) == 1 and params[0] not in ["self", "cls"]:
-                    # Single parameter - likely ChatRequest
-                    logger.debug(
-                        "Using single ChatRequest parameter",
-                        operation="single_param_call",
-                    )
+            else:
+                if registration.convention is FlowCallingConvention.STATIC_CHAT_REQUEST:
                     response_task = (
                         conversation_flow_service_class.get_conversation_response(
                             chat_request
                         )
                     )
                 else:
-                    # Multiple parameters - individual arguments
-                    logger.debug(
-                        "Using individual parameters", operation="multi_param_call"
-                    )
                     response_task = (
                         conversation_flow_service_class.get_conversation_response(
                             message=chat_request.user_prompt,
@@ -214,10 +175,14 @@ class multi_agent_chat_service:
                         )
                     )
 
-                logger.debug(
-                    "Awaiting conversation flow response", operation="response_await"
-                )
-                agent_response_tuple = await response_task
+                with tracing.span(
+                    "flow.dispatch",
+                    **{
+                        "ingenious.flow": self.conversation_flow,
+                        "ingenious.flow.module": registration.module_name,
+                    },
+                ):
+                    agent_response_tuple = await response_task
                 logger.debug(
                     "Received conversation flow response",
                     response_type=str(type(agent_response_tuple)),
@@ -365,26 +330,18 @@ class multi_agent_chat_service:
         )
 
         normalized_flow = normalize_workflow_name(chat_request.conversation_flow)
+        # Streams are not wrapped in their own span: the generator can resume in
+        # another context, so the flow is recorded on the request span instead
+        tracing.set_attributes(**{"ingenious.flow": normalized_flow})
 
         try:
-            # Import the conversation flow class dynamically
-            conversation_flow_service_class = import_class_with_fallback(
-                f"services.chat_services.multi_agent.conversation_flows.{normalized_flow}.{normalized_flow}",
-                "ConversationFlow",
-            )
+            with timing.stage("flow_resolution"):
+                registration = get_flow_registry().get(normalized_flow)
+            conversation_flow_service_class = registration.flow_class
 
             # Check if the conversation flow supports streaming
-            if hasattr(
-                conversation_flow_service_class, "get_streaming_conversation_response"
-            ):
-                # New streaming pattern - instantiate and call streaming method
-                if (
-                    hasattr(conversation_flow_service_class, "__init__")
-                    and len(
-                        conversation_flow_service_class.__init__.__code__.co_varnames
-                    )
-                    > 1
-                ):
+            if registration.supports_streaming:
+                if registration.convention is FlowCallingConvention.INSTANCE:
                     conversation_flow_service_class_instance = (
                         conversation_flow_service_class(
                             parent_multi_agent_chat_service=self
@@ -406,14 +363,22 @@ class multi_agent_chat_service:
                     ):
                         yield chunk
             else:
-                # Fallback: convert regular response to streaming chunks
+                # Fallback: stream the events of the flow's agents while it
+                # runs, then convert the regular response to streaming chunks
                 logger.info(
-                    "Conversation flow does not support streaming, falling back to chunked response",
+                    "Conversation flow does not support streaming, streaming agent events and chunked response",
                     conversation_flow=chat_request.conversation_flow,
                 )
 
-                # Get regular response and convert to chunks
-                response = await self.get_chat_response(chat_request)
+                events = AgentEventStream(chat_request.thread_id)
+                task = events.run(self.get_chat_response(chat_request))
+                try:
+                    async for event in events:
+                        yield event
+                    response = await task
+                finally:
+                    # Stops the flow when the client goes away
+                    task.cancel()
 
                 if response.agent_response:
                     chunk_size = 100  # Default chunk size
@@ -519,9 +484,10 @@ class IConversationPattern(ABC):
         """
         from ingenious.services.memory_manager import run_async_memory_operation
 
-        return run_async_memory_operation(  # type: ignore
-            self._memory_manager.maintain_memory(new_content, max_words)
-        )
+        with timing.stage("memory"):
+            return run_async_memory_operation(  # type: ignore
+                self._memory_manager.maintain_memory(new_content, max_words)
+            )
 
     async def write_llm_responses_to_file(
         self, response_array: List[Dict[str, Any]], event_type: str, output_path: str
@@ -554,6 +520,7 @@ class IConversationFlow(ABC):
     _logger: logging.Logger
     _chat_service: multi_agent_chat_service
     _memory_manager: Any
+    _template_storage: Optional[FileStorage] = None
 
     def __init__(
         self, parent_multi_agent_chat_service: multi_agent_chat_service
@@ -577,20 +544,12 @@ class IConversationFlow(ABC):
     async def Get_Template(
         self, revision_id: Optional[str] = None, file_name: str = "user_prompt.md"
     ) -> str:
-        fs = FileStorage(self._config)
-        template_path = await fs.get_prompt_template_path(revision_id or "")
-        content = await fs.read_file(file_name=file_name, file_path=template_path)
-        if content is None:
-            logger.warning(
-                "Prompt template file not found",
-                file_name=file_name,
-                template_path=template_path,
-                operation="template_file_lookup",
+        if self._template_storage is None:
+            self._template_storage = FileStorage(self._config)
+        with timing.stage("template_load", file_name):
+            return await get_template_registry().render(
+                self._template_storage, file_name=file_name, revision_id=revision_id
             )
-            return ""
-        env = Environment()
-        template = env.from_string(content)
-        return template.render()  # type: ignore
 
     def Get_Models(self) -> Any:
         return self._config.models
@@ -607,9 +566,10 @@ class IConversationFlow(ABC):
         """
         from ingenious.services.memory_manager import run_async_memory_operation
 
-        return run_async_memory_operation(  # type: ignore
-            self._memory_manager.maintain_memory(new_content, max_words)
-        )
+        with timing.stage("memory"):
+            return run_async_memory_operation(  # type: ignore
+                self._memory_manager.maintain_memory(new_content, max_words)
+            )
 
     @abstractmethod
     async def get_conversation_response(
@@ -622,15 +582,24 @@ class IConversationFlow(ABC):
     ) -> AsyncIterator[ChatResponseChunk]:
         """Optional streaming method. Override in subclasses to support streaming.
 
-        Default implementation falls back to chunking the regular response.
+        Default implementation streams the events the flow's routed agents
+        publish while it runs (see ``ingenious.core.agent_events``), then
+        falls back to chunking the regular response.
         """
         logger.debug(
-            "Streaming not implemented, falling back to chunked response",
+            "Streaming not implemented, streaming agent events and chunked response",
             conversation_flow=self.__class__.__name__,
         )
 
-        # Get regular response and convert to chunks
-        response = await self.get_conversation_response(chat_request)
+        events = AgentEventStream(chat_request.thread_id)
+        task = events.run(self.get_conversation_response(chat_request))
+        try:
+            async for event in events:
+                yield event
+            response = await task
+        finally:
+            # Stops the flow when the client goes away
+            task.cancel()
 
         if response.agent_response:
             chunk_size = 100  # Default chunk size
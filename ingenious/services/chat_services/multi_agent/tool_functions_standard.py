@@ -1,40 +1,104 @@
+"""
+Standard tool functions for conversation flows: Azure Search, memory, charts and SQL.
+
+Nothing heavy happens at import time. pandas, matplotlib, the Azure Search SDK
+and pyodbc are imported by the functions that use them, settings are read when
+a tool runs, and the local SQLite sample database or the shared Azure SQL
+connection is set up by the first query that needs it.
+"""
+
 import json
 import tempfile
+import threading
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
-from typing import Dict
-
-import matplotlib.pyplot as plt  # type: ignore
-import pandas as pd
-from azure.core.credentials import AzureKeyCredential
-from azure.search.documents import SearchClient
+from typing import Any, Dict, Optional
 
 import ingenious.config.config as ingen_config
+from ingenious.core import timing, tracing
 from ingenious.core.structured_logging import get_logger
-from ingenious.utils.load_sample_data import sqlite_sample_db
 
 logger = get_logger(__name__)
 
-_config = ingen_config.get_config()
+# Set up on first use by _sample_db(), _load_pyodbc() and _azure_cursor()
+test_db: Any = None
+conn: Any = None
+cursor: Any = None
+pyodbc: Any = None
+_azure_connect_attempted = False
+_init_lock = threading.Lock()
 
-# Initialize pyodbc as None first
-pyodbc = None
 
-# Only import pyodbc if we're using Azure SQL
-if _config.azure_sql_services and _config.azure_sql_services.database_name != "skip":
-    try:
-        import pyodbc  # type: ignore
-    except ImportError as e:
-        logger.warning(
-            "pyodbc not available for Azure SQL connections",
-            error=str(e),
-            operation="pyodbc_import",
-        )
-        pyodbc = None
+def _sample_db() -> Any:
+    """The local SQLite sample database, created and loaded on first use."""
+    global test_db
+    if test_db is None:
+        with _init_lock:
+            if test_db is None:
+                from ingenious.utils.load_sample_data import sqlite_sample_db
+
+                logger.info(
+                    "Initializing SQLite sample database",
+                    operation="sqlite_db_init",
+                )
+                test_db = sqlite_sample_db()
+    return test_db
+
+
+def _load_pyodbc() -> Any:
+    """Import pyodbc on first use; None when it is not installed."""
+    global pyodbc
+    if pyodbc is None:
+        try:
+            import pyodbc as module  # type: ignore
+        except ImportError as e:
+            logger.warning(
+                "pyodbc not available for Azure SQL connections",
+                error=str(e),
+                operation="pyodbc_import",
+            )
+            return None
+        pyodbc = module
+    return pyodbc
+
+
+def _azure_cursor() -> Optional[Any]:
+    """The shared Azure SQL cursor, connecting once on first use; None if unavailable."""
+    global conn, cursor, _azure_connect_attempted
+    if cursor is None and not _azure_connect_attempted:
+        with _init_lock:
+            if not _azure_connect_attempted:
+                _azure_connect_attempted = True
+                config = ingen_config.get_config()
+                if _load_pyodbc() is None:
+                    logger.warning(
+                        "Azure SQL configured but pyodbc not available",
+                        operation="azure_sql_missing_pyodbc",
+                    )
+                elif config.azure_sql_services:
+                    try:
+                        conn, cursor = get_conn(config)
+                        logger.info(
+                            "Azure SQL connection established",
+                            operation="azure_sql_connection_success",
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            "Failed to connect to Azure SQL",
+                            error=str(e),
+                            operation="azure_sql_connection",
+                        )
+    return cursor
 
 
 class ToolFunctions:
     @staticmethod
+    @tracing.traced("tool.aisearch")
+    @timing.timed("retrieval", "aisearch")
     def aisearch(search_query: str, index_name: str) -> str:
+        from azure.core.credentials import AzureKeyCredential
+        from azure.search.documents import SearchClient
+
+        _config = ingen_config.get_config()
         credential = AzureKeyCredential(_config.azure_search_services[0].key)
         client = SearchClient(
             endpoint=_config.azure_search_services[0].endpoint,
@@ -65,6 +129,7 @@ class ToolFunctions:
         """
         Update memory using the MemoryManager for cloud storage support.
         """
+        _config = ingen_config.get_config()
         try:
             from ingenious.services.memory_manager import (
                 get_memory_manager,
@@ -98,6 +163,9 @@ class PandasExecutor:
         Example:
         plot_bar_chart({"GROUP_A": 518, "GROUP_B": 100})
         """
+        import matplotlib.pyplot as plt  # type: ignore
+        import pandas as pd
+
         # Convert the dictionary to a DataFrame for easier plotting
         df = pd.DataFrame(list(data.items()), columns=["Category", "Value"])
 
@@ -118,6 +186,7 @@ class PandasExecutor:
 
 # SQL Tools TODO: need a better way to wrap these functions
 def get_conn(_config):
+    pyodbc = _load_pyodbc()
     if pyodbc is None:
         raise ImportError(
             "pyodbc is required for Azure SQL connections but is not available"
@@ -134,40 +203,6 @@ def get_conn(_config):
     return conn, cursor
 
 
-# Initialize database connections based on configuration
-test_db = None
-conn = None
-cursor = None
-
-# Check if we should use SQLite (when Azure SQL is disabled)
-if not _config.azure_sql_services or _config.azure_sql_services.database_name == "skip":
-    print("Initializing SQLite database for local SQL operations...")
-    test_db = sqlite_sample_db()  # this is for local sql initialisation
-    print("SQLite database initialized successfully")
-else:
-    # Azure SQL mode
-    if pyodbc is not None and _config.azure_sql_services:
-        try:
-            conn, cursor = get_conn(_config)
-            logger.info(
-                "Azure SQL connection established",
-                operation="azure_sql_connection_success",
-            )
-        except Exception as e:
-            logger.warning(
-                "Failed to connect to Azure SQL",
-                error=str(e),
-                operation="azure_sql_connection",
-            )
-            conn = None
-            cursor = None
-    else:
-        logger.warning(
-            "Azure SQL configured but pyodbc not available",
-            operation="azure_sql_missing_pyodbc",
-        )
-
-
 class SQL_ToolFunctions:
     @staticmethod
     def get_db_attr(_config):
@@ -179,7 +214,9 @@ class SQL_ToolFunctions:
             # Validate table name to prevent SQL injection
             if not table_name.replace("_", "").replace("-", "").isalnum():
                 raise ValueError(f"Invalid table name: {table_name}")
-            result = test_db.execute_sql(f"""SELECT * FROM "{table_name}" LIMIT 1""")
+            result = _sample_db().execute_sql(
+                f"""SELECT * FROM "{table_name}" LIMIT 1"""
+            )
             column_names = [key for key in result[0]]
             return table_name, column_names
         else:
@@ -188,6 +225,7 @@ class SQL_ToolFunctions:
             # Validate table name to prevent SQL injection
             if not table_name.replace("_", "").replace("-", "").isalnum():
                 raise ValueError(f"Invalid table name: {table_name}")
+            cursor = _azure_cursor()
             if cursor is not None:
                 cursor.execute(
                     """
@@ -224,6 +262,7 @@ class SQL_ToolFunctions:
         if not table_name.replace("_", "").replace("-", "").isalnum():
             raise ValueError(f"Invalid table name: {table_name}")
         # Get connection if needed
+        cursor = _azure_cursor()
         if cursor is not None:
             cursor.execute(
                 """
@@ -250,37 +289,30 @@ class SQL_ToolFunctions:
         return database_name, table_name, column_names
 
     @staticmethod
+    @tracing.traced("tool.execute_sql_local", **{"db.system": "sqlite"})
     def execute_sql_local(
         sql: str,
         timeout: int = 10,  # Timeout in seconds
     ) -> str:
-        global test_db
-        # Ensure test_db is initialized
-        if test_db is None:
+        try:
+            db = _sample_db()
+        except Exception as e:
+            error_msg = f"Failed to initialize SQLite database: {e}"
             logger.error(
-                "test_db is None, attempting to re-initialize",
-                operation="sqlite_db_reinit",
+                "Failed to initialize SQLite database",
+                error=str(e),
+                operation="sqlite_db_init",
             )
-            try:
-                test_db = sqlite_sample_db()
-                logger.info(
-                    "Successfully re-initialized test_db",
-                    operation="sqlite_db_reinit_success",
-                )
-            except Exception as e:
-                error_msg = f"Failed to initialize SQLite database: {e}"
-                logger.error(
-                    "Failed to initialize SQLite database",
-                    error=str(e),
-                    operation="sqlite_db_init",
-                )
-                return json.dumps({"error": error_msg, "results": []})
+            return json.dumps({"error": error_msg, "results": []})
 
+        @tracing.traced("sqlite.query")
         def run_query(sql: str):
-            return test_db.execute_sql(sql)
+            return db.execute_sql(sql)
 
         with ThreadPoolExecutor() as executor:
-            future = executor.submit(run_query, sql)  # Pass 'sql' as an argument
+            future = executor.submit(
+                tracing.context_propagating(run_query), sql
+            )  # Pass 'sql' as an argument
             try:
                 # Wait for the query to complete within the specified timeout
                 result = future.result(timeout=timeout)
@@ -303,13 +335,16 @@ class SQL_ToolFunctions:
                 return json.dumps({"error": str(e), "results": []})
 
     @staticmethod
+    @tracing.traced("tool.execute_sql_azure", **{"db.system": "mssql"})
     def execute_sql_azure(
         sql: str,
         timeout: int = 15,  # Timeout in seconds
     ) -> str:
+        @tracing.traced("azure_sql.query")
         def run_query(sql_query):
             try:
-                # Use global cursor if available, otherwise create new connection
+                # Use the shared cursor if available, otherwise create new connection
+                cursor = _azure_cursor()
                 if cursor is not None:
                     cursor.execute(sql_query)
                     r = [
@@ -321,7 +356,7 @@ class SQL_ToolFunctions:
                     ]
                 else:
                     # Create temporary connection
-                    conn_temp, cursor_temp = get_conn(_config)
+                    conn_temp, cursor_temp = get_conn(ingen_config.get_config())
                     cursor_temp.execute(sql_query)
                     r = [
                         dict(
@@ -343,7 +378,7 @@ class SQL_ToolFunctions:
 
         # Run query in a separate thread with a timeout
         with ThreadPoolExecutor() as executor:
-            future = executor.submit(run_query, sql)
+            future = executor.submit(tracing.context_propagating(run_query), sql)
             try:
                 result = future.result(timeout=timeout)
                 return result
@@ -169,7 +169,7 @@ def configure_for_testing() -> Any:
     container.openai_service.override(mock_openai_service)
 
     # Use in-memory SQLite for testing
-    test_config = container.config()
+    test_config = container.config().model_copy(deep=True)
     test_config.chat_history.database_type = "sqlite"
     container.config.override(test_config)
 
@@ -1,8 +1,9 @@
 """FastAPI dependency injection using the DI container."""
 
-import secrets
+import os
 from typing import Any, Optional
 
+import aiofiles  # type: ignore
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import (
     HTTPAuthorizationCredentials,
@@ -12,7 +13,11 @@ from fastapi.security import (
 )
 from typing_extensions import Annotated
 
-from ingenious.auth.jwt import get_username_from_token
+from ingenious.auth.basic import parse_basic_auth_header, verify_basic_credentials
+from ingenious.auth.jwt import (
+    get_username_from_request_token,
+    get_username_from_token,
+)
 from ingenious.config.main_settings import IngeniousSettings
 from ingenious.core.structured_logging import get_logger
 from ingenious.db.chat_history_repository import ChatHistoryRepository
@@ -116,21 +121,12 @@ def get_security_service(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    current_username_bytes = credentials.username.encode("utf8")
-    correct_username_bytes = config.web_configuration.authentication.username.encode(
-        "utf-8"
-    )
-    is_correct_username = secrets.compare_digest(
-        current_username_bytes, correct_username_bytes
-    )
-    current_password_bytes = credentials.password.encode("utf8")
-    correct_password_bytes = config.web_configuration.authentication.password.encode(
-        "utf-8"
-    )
-    is_correct_password = secrets.compare_digest(
-        current_password_bytes, correct_password_bytes
-    )
-    if not (is_correct_username and is_correct_password):
+    if not verify_basic_credentials(
+        credentials.username,
+        credentials.password,
+        config.web_configuration.authentication.username,
+        config.web_configuration.authentication.password,
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -157,21 +153,12 @@ def get_security_service_optional(
             headers={"WWW-Authenticate": "Basic"},
         )
 
-    current_username_bytes = credentials.username.encode("utf8")
-    correct_username_bytes = config.web_configuration.authentication.username.encode(
-        "utf-8"
-    )
-    is_correct_username = secrets.compare_digest(
-        current_username_bytes, correct_username_bytes
-    )
-    current_password_bytes = credentials.password.encode("utf8")
-    correct_password_bytes = config.web_configuration.authentication.password.encode(
-        "utf-8"
-    )
-    is_correct_password = secrets.compare_digest(
-        current_password_bytes, correct_password_bytes
-    )
-    if not (is_correct_username and is_correct_password):
+    if not verify_basic_credentials(
+        credentials.username,
+        credentials.password,
+        config.web_configuration.authentication.username,
+        config.web_configuration.authentication.password,
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -196,18 +183,15 @@ def get_auth_user(
     if auth_header.startswith("Bearer "):
         token = auth_header[7:]
         try:
-            username = get_username_from_token(token)
+            username = get_username_from_request_token(request.scope, token)
             return username
         except HTTPException:
             pass
 
     # Fall back to Basic Auth
     if auth_header.startswith("Basic "):
-        import base64
-
         try:
-            credentials_str = base64.b64decode(auth_header[6:]).decode("utf-8")
-            username, password = credentials_str.split(":", 1)
+            username, password = parse_basic_auth_header(auth_header)
         except (ValueError, UnicodeDecodeError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -216,23 +200,12 @@ def get_auth_user(
             )
 
         # Validate credentials
-        current_username_bytes = username.encode("utf8")
-        correct_username_bytes = (
-            config.web_configuration.authentication.username.encode("utf-8")
-        )
-        is_correct_username = secrets.compare_digest(
-            current_username_bytes, correct_username_bytes
-        )
-
-        current_password_bytes = password.encode("utf8")
-        correct_password_bytes = (
-            config.web_configuration.authentication.password.encode("utf-8")
-        )
-        is_correct_password = secrets.compare_digest(
-            current_password_bytes, correct_password_bytes
-        )
-
-        if not (is_correct_username and is_correct_password):
+        if not verify_basic_credentials(
+            username,
+            password,
+            config.web_configuration.authentication.username,
+            config.web_configuration.authentication.password,
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -256,29 +229,18 @@ def get_conditional_security(
     return get_auth_user(request, config)
 
 
-def sync_templates(config: IngeniousSettings = Depends(get_config)) -> None:
+async def sync_templates(config: IngeniousSettings = Depends(get_config)) -> None:
     """Sync templates from file storage."""
     if config.file_storage.revisions.storage_type == "local":
         return
     else:
-        import asyncio
-        import os
-
         fs = FileStorage(config)
         working_dir = os.getcwd()
         template_path = os.path.join(working_dir, "ingenious", "templates")
 
-        async def sync_files() -> None:
-            template_files = await fs.list_files(file_path=template_path)
-            for file in template_files:
-                file_name = os.path.basename(file)
-                file_contents = await fs.read_file(
-                    file_name=file_name, file_path=template_path
-                )
-                file_path = os.path.join(
-                    working_dir, "ingenious", "templates", file_name
-                )
-                with open(file_path, "w") as f:
-                    f.write(file_contents)
-
-        asyncio.run(sync_files())
+        file_names = [entry.name async for entry in fs.iter_files(template_path)]
+        templates = await fs.read_many(file_names, template_path)
+        for file_name, file_contents in templates.items():
+            file_path = os.path.join(working_dir, "ingenious", "templates", file_name)
+            async with aiofiles.open(file_path, "w") as f:
+                await f.write(file_contents)
@@ -1,9 +1,8 @@
 """FastAPI dependency injection without dependency-injector library."""
 
-from functools import lru_cache
-from typing import Any
+from typing import Any, Callable, Optional
 
-from fastapi import Depends, Request
+from fastapi import Depends, HTTPException, Request
 
 from ingenious.config.config import get_config as _get_config
 from ingenious.config.main_settings import IngeniousSettings
@@ -12,16 +11,23 @@ from ingenious.db.chat_history_repository import ChatHistoryRepository
 from ingenious.external_services.openai_service import OpenAIService
 from ingenious.files.files_repository import FileStorage
 from ingenious.models.database_client import DatabaseClientType
+from ingenious.services.admission_control import (
+    AdmissionController,
+    get_admission_controller,
+)
+from ingenious.services.chat_jobs import ChatJobService, get_chat_job_service
 from ingenious.services.chat_service import ChatService
+from ingenious.services.idempotency import (
+    IdempotencyCoordinator,
+    get_idempotency_coordinator,
+)
 from ingenious.services.message_feedback_service import MessageFeedbackService
 
 logger = get_logger(__name__)
 
 
-# Cache the config to avoid reloading
-@lru_cache
 def get_config() -> IngeniousSettings:
-    """Get the application configuration."""
+    """Get the application's settings snapshot (replaced on reload)."""
     return _get_config()
 
 
@@ -56,14 +62,12 @@ def get_chat_history_repository(
     return ChatHistoryRepository(db_type=db_type, config=config)
 
 
-def get_chat_service(
-    config: IngeniousSettings = Depends(get_config),
-    chat_history_repository: ChatHistoryRepository = Depends(
-        get_chat_history_repository
-    ),
-    openai_service: OpenAIService = Depends(get_openai_service),
+def _create_chat_service(
+    config: IngeniousSettings,
+    chat_history_repository: ChatHistoryRepository,
+    openai_service: OpenAIService,
+    conversation_flow: str = "",
 ) -> ChatService:
-    """Get chat service instance."""
     cs_type = config.chat_service.type
 
     # Create a wrapper that includes the openai_service
@@ -80,11 +84,84 @@ def get_chat_service(
     return ChatService(
         chat_service_type=cs_type,
         chat_history_repository=chat_history_repository,
-        conversation_flow="",  # Will be set per request
+        conversation_flow=conversation_flow,
         config=wrapped_config,  # type: ignore
     )
 
 
+def get_chat_service(
+    config: IngeniousSettings = Depends(get_config),
+    chat_history_repository: ChatHistoryRepository = Depends(
+        get_chat_history_repository
+    ),
+    openai_service: OpenAIService = Depends(get_openai_service),
+) -> ChatService:
+    """Get chat service instance."""
+    # conversation_flow is set per request
+    return _create_chat_service(config, chat_history_repository, openai_service)
+
+
+def get_chat_service_factory(
+    config: IngeniousSettings = Depends(get_config),
+    chat_history_repository: ChatHistoryRepository = Depends(
+        get_chat_history_repository
+    ),
+    openai_service: OpenAIService = Depends(get_openai_service),
+) -> Callable[[str], ChatService]:
+    """Get a factory creating chat services that share this request's dependencies."""
+
+    def create(conversation_flow: str) -> ChatService:
+        return _create_chat_service(
+            config, chat_history_repository, openai_service, conversation_flow
+        )
+
+    return create
+
+
+def create_chat_service_factory(
+    config: IngeniousSettings,
+) -> Callable[[str], ChatService]:
+    """Build a chat service factory outside a request, e.g. for background jobs."""
+    chat_history_repository = get_chat_history_repository(
+        config, get_database_type(config)
+    )
+    openai_service = get_openai_service(config)
+
+    def create(conversation_flow: str) -> ChatService:
+        return _create_chat_service(
+            config, chat_history_repository, openai_service, conversation_flow
+        )
+
+    return create
+
+
+def get_chat_jobs(
+    config: IngeniousSettings = Depends(get_config),
+) -> ChatJobService:
+    """Get the chat job service; 404 when jobs are disabled."""
+    settings = config.web_configuration.jobs
+    if not settings.enable:
+        raise HTTPException(status_code=404, detail="Chat jobs are not enabled")
+    return get_chat_job_service(settings)
+
+
+def get_chat_admission(
+    config: IngeniousSettings = Depends(get_config),
+) -> AdmissionController:
+    """Get the per-worker admission controller for chat endpoints."""
+    return get_admission_controller(config.web_configuration.admission)
+
+
+def get_chat_idempotency(
+    config: IngeniousSettings = Depends(get_config),
+) -> Optional[IdempotencyCoordinator]:
+    """Get the Idempotency-Key coordinator, or None when disabled."""
+    settings = config.web_configuration.idempotency
+    if not settings.enable:
+        return None
+    return get_idempotency_coordinator(settings)
+
+
 def get_message_feedback_service(
     chat_history_repository: ChatHistoryRepository = Depends(
         get_chat_history_repository
@@ -7,6 +7,7 @@ for file storage services and template synchronization.
 
 import os
 
+import aiofiles  # type: ignore
 from dependency_injector.wiring import Provide, inject
 from fastapi import Depends
 
@@ -39,7 +40,7 @@ def get_file_storage_revisions(
     return file_storage
 
 
-def sync_templates(config: IngeniousSettings = Depends(get_config)) -> None:
+async def sync_templates(config: IngeniousSettings = Depends(get_config)) -> None:
     """Sync templates from file storage."""
     if config.file_storage.revisions.storage_type == "local":
         return
@@ -47,19 +48,10 @@ def sync_templates(config: IngeniousSettings = Depends(get_config)) -> None:
         fs = FileStorage(config)
         working_dir = os.getcwd()
         template_path = os.path.join(working_dir, "ingenious", "templates")
-        import asyncio
 
-        async def sync_files() -> None:
-            template_files = await fs.list_files(file_path=template_path)
-            for file in template_files:
-                file_name = os.path.basename(file)
-                file_contents = await fs.read_file(
-                    file_name=file_name, file_path=template_path
-                )
-                file_path = os.path.join(
-                    working_dir, "ingenious", "templates", file_name
-                )
-                with open(file_path, "w") as f:
-                    f.write(file_contents)
-
-        asyncio.run(sync_files())
+        file_names = [entry.name async for entry in fs.iter_files(template_path)]
+        templates = await fs.read_many(file_names, template_path)
+        for file_name, file_contents in templates.items():
+            file_path = os.path.join(working_dir, "ingenious", "templates", file_name)
+            async with aiofiles.open(file_path, "w") as f:
+                await f.write(file_contents)
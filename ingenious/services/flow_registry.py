@@ -0,0 +1,352 @@
+"""
+Registry of conversation flows resolved once at startup.
+
+Every ``ConversationFlow`` class found in the extension namespaces is imported,
+validated and stored together with the calling convention it expects, so chat
+requests dispatch to a flow with a dictionary lookup instead of importing the
+module and probing its constructor on every request.
+
+The same scan produces an immutable ``NamespaceSnapshot`` of the flow packages
+per namespace. Diagnostics read the snapshot instead of walking packages, and it
+is only rebuilt on an explicit reload or when a flows directory changes on disk.
+"""
+
+import importlib
+import inspect
+import os
+import pkgutil
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ingenious.core.structured_logging import get_logger
+from ingenious.utils.imports import clear_import_cache, import_class_with_fallback
+from ingenious.utils.namespace_utils import (
+    clear_workflow_cache,
+    get_dir_roots,
+    get_namespaces,
+    normalize_workflow_name,
+)
+
+logger = get_logger(__name__)
+
+FLOWS_PACKAGE = "services.chat_services.multi_agent.conversation_flows"
+FLOW_CLASS_NAME = "ConversationFlow"
+
+
+class FlowCallingConvention(str, Enum):
+    """How a conversation flow class expects to be invoked."""
+
+    # ConversationFlow(parent_multi_agent_chat_service=...).get_conversation_response(chat_request)
+    INSTANCE = "instance"
+    # ConversationFlow.get_conversation_response(chat_request)
+    STATIC_CHAT_REQUEST = "static_chat_request"
+    # ConversationFlow.get_conversation_response(message=..., topics=..., ...)
+    STATIC_ARGUMENTS = "static_arguments"
+
+
+@dataclass(frozen=True)
+class FlowRegistration:
+    """A resolved conversation flow and how to call it."""
+
+    name: str
+    flow_class: type
+    module_name: str
+    convention: FlowCallingConvention
+    supports_streaming: bool
+
+
+@dataclass(frozen=True)
+class NamespaceSnapshot:
+    """Flow packages found in each namespace when the registry was built."""
+
+    # (namespace, flow module names) in namespace priority order
+    namespaces: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    workflows: Tuple[str, ...]
+    # (flows directory, mtime_ns or -1 when missing) used to detect changes
+    fingerprint: Tuple[Tuple[str, int], ...]
+    created_at: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "namespaces": {
+                namespace: list(modules) for namespace, modules in self.namespaces
+            },
+            "workflows": list(self.workflows),
+            "watched_paths": [path for path, _ in self.fingerprint],
+            "created_at": self.created_at,
+        }
+
+
+class FlowNotFoundError(ImportError):
+    """Raised when no conversation flow is registered under a name."""
+
+
+def _flows_directories(package_paths: Iterable[str]) -> List[str]:
+    """Directories whose contents decide which flows exist."""
+    relative = Path(*FLOWS_PACKAGE.split("."))
+    candidates = [str(root / relative) for root in get_dir_roots()]
+    return sorted(set(candidates) | set(package_paths))
+
+
+def _fingerprint(directories: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+    """Modification times of the flows directories (-1 if a directory is absent)."""
+    stamps = []
+    for directory in directories:
+        try:
+            stamps.append((directory, os.stat(directory).st_mtime_ns))
+        except OSError:
+            stamps.append((directory, -1))
+    return tuple(stamps)
+
+
+def _accepts_parent_service(flow_class: type) -> bool:
+    init = flow_class.__init__  # type: ignore[misc]
+    if init is object.__init__:
+        return False
+    try:
+        parameters = inspect.signature(init).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        p.name == "parent_multi_agent_chat_service" or p.kind is p.VAR_KEYWORD
+        for p in parameters
+    )
+
+
+def detect_calling_convention(flow_class: type) -> FlowCallingConvention:
+    """
+    Work out how a flow class must be called from its signatures.
+
+    Args:
+        flow_class: The ConversationFlow class
+
+    Returns:
+        The calling convention the chat service should use
+    """
+    if _accepts_parent_service(flow_class):
+        return FlowCallingConvention.INSTANCE
+
+    params = list(inspect.signature(flow_class.get_conversation_response).parameters)  # type: ignore[attr-defined]
+    if len(params) == 1 and params[0] not in ["self", "cls"]:
+        return FlowCallingConvention.STATIC_CHAT_REQUEST
+    return FlowCallingConvention.STATIC_ARGUMENTS
+
+
+def build_registration(name: str, flow_class: type) -> FlowRegistration:
+    """Validate a flow class and record how to dispatch to it."""
+    if not callable(getattr(flow_class, "get_conversation_response", None)):
+        raise TypeError(
+            f"{flow_class.__module__}.{flow_class.__name__} has no get_conversation_response"
+        )
+    return FlowRegistration(
+        name=name,
+        flow_class=flow_class,
+        module_name=flow_class.__module__,
+        convention=detect_calling_convention(flow_class),
+        supports_streaming=hasattr(flow_class, "get_streaming_conversation_response"),
+    )
+
+
+class FlowRegistry:
+    """
+    Conversation flows keyed by normalized workflow name.
+
+    ``load`` scans the namespaces in priority order (project extensions, the
+    bundled extension template, then core ingenious) so the first namespace that
+    defines a flow wins, matching the import fallback order used elsewhere.
+    """
+
+    def __init__(self, check_interval: float = 2.0) -> None:
+        self.check_interval = check_interval
+        self._flows: Dict[str, FlowRegistration] = {}
+        self._errors: Dict[str, str] = {}
+        self._snapshot: Optional[NamespaceSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def _discover(self) -> Tuple[Dict[str, FlowRegistration], NamespaceSnapshot]:
+        flows: Dict[str, FlowRegistration] = {}
+        errors: Dict[str, str] = {}
+        namespaces: List[Tuple[str, Tuple[str, ...]]] = []
+        package_paths: List[str] = []
+
+        for namespace in get_namespaces():
+            package_name = f"{namespace}.{FLOWS_PACKAGE}"
+            try:
+                package = importlib.import_module(package_name)
+            except Exception as e:
+                logger.debug(
+                    "No conversation flows in namespace",
+                    namespace=namespace,
+                    error=str(e),
+                )
+                continue
+
+            paths = list(getattr(package, "__path__", []))
+            package_paths.extend(paths)
+            module_infos = list(pkgutil.iter_modules(paths))
+            namespaces.append(
+                (namespace, tuple(sorted(info.name for info in module_infos)))
+            )
+
+            for module_info in module_infos:
+                name = normalize_workflow_name(module_info.name)
+                if name in flows:
+                    continue
+                module_name = f"{package_name}.{module_info.name}.{module_info.name}"
+                try:
+                    module = importlib.import_module(module_name)
+                    flow_class = getattr(module, FLOW_CLASS_NAME)
+                    flows[name] = build_registration(name, flow_class)
+                    errors.pop(name, None)
+                except Exception as e:
+                    errors[name] = f"{module_name}: {e}"
+                    logger.debug(
+                        "Skipping invalid conversation flow",
+                        module_name=module_name,
+                        error=str(e),
+                    )
+
+        self._errors = errors
+        snapshot = NamespaceSnapshot(
+            namespaces=tuple(namespaces),
+            workflows=tuple(sorted(flows)),
+            fingerprint=_fingerprint(_flows_directories(package_paths)),
+            created_at=time.time(),
+        )
+        return flows, snapshot
+
+    def load(self) -> Dict[str, FlowRegistration]:
+        """Discover, import and validate every conversation flow."""
+        flows, snapshot = self._discover()
+        with self._lock:
+            self._flows = flows
+            self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+            self.loaded = True
+        logger.info(
+            "Conversation flow registry loaded",
+            flows=sorted(flows),
+            failed=sorted(self._errors),
+        )
+        return flows
+
+    def reload(self) -> Dict[str, FlowRegistration]:
+        """
+        Rebuild the registry so newly added extension flows are picked up.
+
+        Import caches are cleared first so modules that failed to import before
+        are retried. Modules that were already imported are not re-executed.
+        """
+        importlib.invalidate_caches()
+        clear_import_cache()
+        clear_workflow_cache()
+
+        from ingenious.services.chat_service import clear_chat_service_classes
+
+        clear_chat_service_classes()
+        return self.load()
+
+    def snapshot(self) -> NamespaceSnapshot:
+        """The namespace snapshot, building the registry on first use."""
+        if self._snapshot is None:
+            self.load()
+        return self._snapshot  # type: ignore[return-value]
+
+    def refresh_if_changed(self) -> NamespaceSnapshot:
+        """
+        Return the snapshot, reloading first if a flows directory changed.
+
+        Directories are stat-ed at most once every ``check_interval`` seconds,
+        so callers on request paths pay a clock read in the common case. A
+        changed directory means a full reload, so async callers should run this
+        in a worker thread.
+        """
+        snapshot = self.snapshot()
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return snapshot
+
+        self._checked_at = now
+        paths = [path for path, _ in snapshot.fingerprint]
+        if _fingerprint(paths) != snapshot.fingerprint:
+            logger.info("Conversation flow directories changed, reloading")
+            self.reload()
+        return self.snapshot()
+
+    def get(self, flow_name: str) -> FlowRegistration:
+        """
+        Look up a flow by name (hyphenated or underscored).
+
+        Flows missing from the startup scan are resolved once through the import
+        fallback and cached, so a registry that was never loaded still works.
+
+        Raises:
+            FlowNotFoundError: If no namespace defines the flow
+        """
+        name = normalize_workflow_name(flow_name)
+        registration = self._flows.get(name)
+        if registration is not None:
+            return registration
+
+        try:
+            flow_class = import_class_with_fallback(
+                f"{FLOWS_PACKAGE}.{name}.{name}", FLOW_CLASS_NAME
+            )
+            registration = build_registration(name, flow_class)
+        except Exception as e:
+            raise FlowNotFoundError(
+                f"Conversation flow not found: {flow_name} ({self._errors.get(name, e)})"
+            ) from e
+
+        with self._lock:
+            self._flows[name] = registration
+        return registration
+
+    def __contains__(self, flow_name: object) -> bool:
+        """Whether a flow with this name has been registered."""
+        return (
+            isinstance(flow_name, str)
+            and normalize_workflow_name(flow_name) in self._flows
+        )
+
+    def names(self) -> List[str]:
+        """Names of all registered flows."""
+        return sorted(self._flows)
+
+    def errors(self) -> Dict[str, str]:
+        """Flows that were found but failed to import or validate."""
+        return dict(self._errors)
+
+    def describe(self) -> Dict[str, Any]:
+        """Summary of the registry for diagnostics."""
+        return {
+            "loaded": self.loaded,
+            "flows": {
+                name: {
+                    "module": registration.module_name,
+                    "convention": registration.convention.value,
+                    "supports_streaming": registration.supports_streaming,
+                }
+                for name, registration in sorted(self._flows.items())
+            },
+            "errors": self.errors(),
+            "snapshot": self._snapshot.as_dict() if self._snapshot else None,
+        }
+
+
+# Global registry instance
+_flow_registry: Optional[FlowRegistry] = None
+
+
+def get_flow_registry() -> FlowRegistry:
+    """Get the process-wide flow registry, creating it if needed."""
+    global _flow_registry
+    if _flow_registry is None:
+        _flow_registry = FlowRegistry()
+    return _flow_registry
@@ -0,0 +1,423 @@
+"""
+Idempotency-Key support for chat submissions.
+
+The first request with a given key runs the flow. Retries with the same key
+either attach to that execution while it is still running or, once it has
+finished, replay the stored response, so a client retrying after a network
+timeout does not trigger new LLM calls or duplicate chat history.
+
+Keys are compared together with a fingerprint of the request body: reusing a
+key for a different request is rejected rather than replayed. Failed
+executions are not stored, so a retry after an error runs the flow again.
+
+Responses are kept in a pluggable ``IdempotencyStore``. The in-memory store is
+per worker; the SQLite store is shared by all workers on a host. Entries
+expire after ``ttl_seconds``.
+
+Within a worker, retries attach to the running call directly. Across workers,
+the first request claims the key in the shared store, and workers that lose
+the claim poll for the stored response instead of running the flow. A claim
+expires after ``pending_ttl_seconds`` so a worker that dies mid-request does
+not block the key for good.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from ingenious.config.models import IdempotencySettings
+from ingenious.core.structured_logging import get_logger
+from ingenious.db.local_sqlite import ThreadLocalSQLite
+
+logger = get_logger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when a key is reused with a different request body."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A completed response kept for replay."""
+
+    fingerprint: str
+    body: str
+    created_at: float
+    expires_at: float
+
+
+class IdempotencyStore(ABC):
+    """Storage for completed responses, keyed by idempotency key."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        """Return the unexpired response stored for ``key``, if any."""
+
+    @abstractmethod
+    async def put(self, key: str, response: StoredResponse) -> None:
+        """Store ``response`` for ``key``, replacing any previous entry."""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+
+    async def claim(
+        self, key: str, fingerprint: str, ttl_seconds: float
+    ) -> Optional[str]:
+        """
+        Mark ``key`` as being executed by the caller for up to ``ttl_seconds``.
+
+        Stores shared between processes override this; a per-process store
+        has no other process to coordinate with.
+
+        Returns:
+            None if the caller holds the claim, otherwise the fingerprint of
+            the request that does
+        """
+        return None
+
+    async def release(self, key: str) -> None:
+        """Drop the caller's claim on ``key``."""
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Per-process store bounded to ``max_entries`` (oldest dropped first)."""
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return entry
+
+    async def put(self, key: str, response: StoredResponse) -> None:
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [k for k, v in self._entries.items() if v.expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+        return len(expired)
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """SQLite-backed store shared by every worker using the same file."""
+
+    # Purge expired rows at most this often
+    PURGE_INTERVAL_SECONDS = 300.0
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._db = ThreadLocalSQLite(db_path)
+        self._last_purge = 0.0
+        self._connection().execute(
+            """
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                body TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection().execute(
+            """
+            CREATE TABLE IF NOT EXISTS idempotency_claims (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._db.connection()
+
+    def _get(self, key: str) -> Optional[StoredResponse]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT fingerprint, body, created_at, expires_at "
+                "FROM idempotency_keys WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return StoredResponse(row[0], row[1], row[2], row[3])
+
+    def _put(self, key: str, response: StoredResponse) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO idempotency_keys "
+            "(key, fingerprint, body, created_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                key,
+                response.fingerprint,
+                response.body,
+                response.created_at,
+                response.expires_at,
+            ),
+        )
+
+    def _claim(self, key: str, fingerprint: str, ttl_seconds: float) -> Optional[str]:
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM idempotency_claims WHERE key = ? AND expires_at <= ?",
+                (key, now),
+            )
+            cursor = conn.execute(
+                "INSERT INTO idempotency_claims (key, fingerprint, expires_at) "
+                "VALUES (?, ?, ?) ON CONFLICT (key) DO NOTHING",
+                (key, fingerprint, now + ttl_seconds),
+            )
+            holder = None
+            if cursor.rowcount == 0:
+                row = conn.execute(
+                    "SELECT fingerprint FROM idempotency_claims WHERE key = ?", (key,)
+                ).fetchone()
+                holder = row[0]
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return holder
+
+    def _release(self, key: str) -> None:
+        self._connection().execute(
+            "DELETE FROM idempotency_claims WHERE key = ?", (key,)
+        )
+
+    def _purge_expired(self) -> int:
+        now = time.time()
+        conn = self._connection()
+        conn.execute("DELETE FROM idempotency_claims WHERE expires_at <= ?", (now,))
+        cursor = conn.execute(
+            "DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,)
+        )
+        return int(cursor.rowcount)
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, response: StoredResponse) -> None:
+        await asyncio.to_thread(self._put, key, response)
+        if time.monotonic() - self._last_purge > self.PURGE_INTERVAL_SECONDS:
+            self._last_purge = time.monotonic()
+            await self.purge_expired()
+
+    async def claim(
+        self, key: str, fingerprint: str, ttl_seconds: float
+    ) -> Optional[str]:
+        return await asyncio.to_thread(self._claim, key, fingerprint, ttl_seconds)
+
+    async def release(self, key: str) -> None:
+        await asyncio.to_thread(self._release, key)
+
+    async def purge_expired(self) -> int:
+        return await asyncio.to_thread(self._purge_expired)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def request_fingerprint(*parts: str) -> str:
+    """Hash the parts of a request that must match for a replay."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IdempotencyCoordinator:
+    """
+    Run each idempotency key at most once, sharing the result with retries.
+
+    Args:
+        store: Where completed responses are kept
+        ttl_seconds: How long a completed response can be replayed
+        pending_ttl_seconds: How long a request in progress holds its key
+            against other workers
+        poll_interval_seconds: How often a worker waiting on another worker's
+            request checks for its response
+    """
+
+    def __init__(
+        self,
+        store: IdempotencyStore,
+        ttl_seconds: int = 86400,
+        pending_ttl_seconds: float = 600,
+        poll_interval_seconds: float = 0.5,
+    ) -> None:
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.pending_ttl_seconds = pending_ttl_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._in_flight: Dict[str, Tuple[str, "asyncio.Future[str]"]] = {}
+
+    @staticmethod
+    def validate_key(key: str) -> None:
+        """
+        Raises:
+            ValueError: If the key is empty or longer than ``MAX_KEY_LENGTH``
+        """
+        if not key.strip() or len(key) > MAX_KEY_LENGTH:
+            raise ValueError(
+                f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} non-blank characters"
+            )
+
+    async def execute(
+        self,
+        key: str,
+        fingerprint: str,
+        model_type: Type[ModelT],
+        func: Callable[[], Awaitable[ModelT]],
+    ) -> Tuple[ModelT, bool]:
+        """
+        Run ``func`` once for ``key`` and return ``(response, replayed)``.
+
+        ``replayed`` is True when the response came from an earlier or
+        concurrent execution rather than this call.
+
+        Raises:
+            IdempotencyConflictError: If ``key`` was used with another fingerprint
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._check_fingerprint(key, in_flight[0], fingerprint)
+            logger.info("Attaching to in-flight idempotent request", key=key)
+            try:
+                body = await asyncio.shield(in_flight[1])
+            except asyncio.CancelledError:
+                if not in_flight[1].cancelled():
+                    raise
+                # The original call was cancelled, so run the request here
+                return await self.execute(key, fingerprint, model_type, func)
+            return model_type.model_validate_json(body), True
+
+        # Registered before any await so concurrent retries attach to this call
+        future: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = (fingerprint, future)
+        claimed = False
+        try:
+            stored = await self._claim_or_wait(key, fingerprint)
+            if stored is not None:
+                self._check_fingerprint(key, stored.fingerprint, fingerprint)
+                future.set_result(stored.body)
+                logger.info("Replaying stored idempotent response", key=key)
+                return model_type.model_validate_json(stored.body), True
+            claimed = True
+
+            response = await func()
+            body = response.model_dump_json()
+            now = time.time()
+            await self.store.put(
+                key, StoredResponse(fingerprint, body, now, now + self.ttl_seconds)
+            )
+            future.set_result(body)
+            return response, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so an unattended failure is not reported again
+                future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+            if claimed:
+                await asyncio.shield(self.store.release(key))
+
+    async def _claim_or_wait(
+        self, key: str, fingerprint: str
+    ) -> Optional[StoredResponse]:
+        """
+        Claim ``key`` for this worker, waiting while another worker holds it.
+
+        Returns:
+            The stored response to replay, or None once this worker holds the claim
+        """
+        waiting = False
+        while True:
+            stored = await self.store.get(key)
+            if stored is not None:
+                return stored
+            holder = await self.store.claim(key, fingerprint, self.pending_ttl_seconds)
+            if holder is None:
+                # The previous holder may have stored its response and released
+                # the key since the lookup above
+                stored = await self.store.get(key)
+                if stored is not None:
+                    await self.store.release(key)
+                return stored
+            self._check_fingerprint(key, holder, fingerprint)
+            if not waiting:
+                waiting = True
+                logger.info("Waiting for idempotent request on another worker", key=key)
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    @staticmethod
+    def _check_fingerprint(key: str, expected: str, actual: str) -> None:
+        if expected != actual:
+            logger.warning("Idempotency-Key reused with a different request", key=key)
+            raise IdempotencyConflictError(
+                "Idempotency-Key has already been used for a different request"
+            )
+
+
+def create_idempotency_store(settings: IdempotencySettings) -> IdempotencyStore:
+    """Create the store selected by ``settings.store_type``."""
+    if settings.store_type == "sqlite":
+        return SQLiteIdempotencyStore(settings.database_path)
+    return InMemoryIdempotencyStore(settings.max_entries)
+
+
+_idempotency_coordinator: Optional[IdempotencyCoordinator] = None
+
+
+def get_idempotency_coordinator(
+    settings: Optional[IdempotencySettings] = None,
+) -> IdempotencyCoordinator:
+    """Get the worker's idempotency coordinator, creating it on first use."""
+    global _idempotency_coordinator
+    if _idempotency_coordinator is None:
+        settings = settings if settings is not None else IdempotencySettings()
+        _idempotency_coordinator = IdempotencyCoordinator(
+            create_idempotency_store(settings),
+            settings.ttl_seconds,
+            settings.pending_ttl_seconds,
+            settings.poll_interval_seconds,
+        )
+    return _idempotency_coordinator
@@ -7,6 +7,7 @@ import asyncio
 import os
 from typing import Any, Optional
 
+from ingenious.core import tracing
 from ingenious.core.structured_logging import get_logger
 from ingenious.files.files_repository import FileStorage
 from ingenious.models.config import Config
@@ -356,7 +357,7 @@ def run_async_memory_operation(coro: Any) -> Any:
             import concurrent.futures
 
             with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, coro)
+                future = executor.submit(tracing.context_propagating(asyncio.run), coro)
                 return future.result()
         else:
             return loop.run_until_complete(coro)
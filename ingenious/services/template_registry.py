@@ -0,0 +1,295 @@
+"""
+Process-wide registry of compiled prompt templates.
+
+Conversation flows render their agent prompts from jinja templates held in the
+revisions file storage. Reading and parsing those templates on every request is
+wasted work, so the registry keeps the compiled ``jinja2.Template`` for each
+(revision, name) pair and only reloads it when the underlying file changes
+(local mtime/size or blob ETag) or when it is explicitly invalidated, e.g. after
+a write through the ``/prompts/update`` route.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from jinja2 import Environment, Template
+
+from ingenious.config.main_settings import IngeniousSettings
+from ingenious.config.snapshot import on_settings_change
+from ingenious.core import metrics
+from ingenious.core.structured_logging import get_logger
+from ingenious.files.files_repository import FileStorage
+
+logger = get_logger(__name__)
+
+TEMPLATE_EXTENSIONS = (".jinja", ".md")
+
+# (storage scope, revision id, file name)
+TemplateKey = Tuple[Tuple[str, ...], str, str]
+
+
+@dataclass
+class CachedTemplate:
+    """A compiled template together with the storage version it was built from."""
+
+    template: Template
+    version: Optional[str]
+    checked_at: float
+
+
+def _storage_scope(fs: FileStorage) -> Tuple[str, ...]:
+    """Identify the storage location so different configs never share entries."""
+    fs_config = fs.repository.fs_config
+    return (
+        str(getattr(fs_config, "storage_type", "")),
+        str(getattr(fs_config, "url", "")),
+        str(getattr(fs_config, "container_name", "")),
+        str(getattr(fs_config, "path", "")),
+    )
+
+
+class TemplateRegistry:
+    """
+    Cache of compiled jinja templates keyed by (revision, name).
+
+    Cached entries are revalidated against the storage version token at most once
+    every ``revalidate_interval`` seconds, so a hot template costs a dictionary
+    lookup on most requests and a cheap stat/HEAD call otherwise.
+    """
+
+    def __init__(self, revalidate_interval: float = 1.0) -> None:
+        self.revalidate_interval = revalidate_interval
+        self._environment = Environment()
+        self._templates: Dict[TemplateKey, CachedTemplate] = {}
+        self._resolved_revisions: Dict[Tuple[Tuple[str, ...], str], str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _key(
+        self, fs: FileStorage, revision_id: Optional[str], file_name: str
+    ) -> TemplateKey:
+        return (_storage_scope(fs), revision_id or "", file_name)
+
+    async def _load(
+        self, fs: FileStorage, revision_id: Optional[str], file_name: str
+    ) -> CachedTemplate:
+        template_path = await fs.get_prompt_template_path(revision_id or "")
+        version = await fs.get_file_version(file_name, template_path)
+        content = await fs.read_file(file_name=file_name, file_path=template_path)
+        if not content:
+            logger.warning(
+                "Prompt template file not found",
+                file_name=file_name,
+                template_path=template_path,
+                operation="template_file_lookup",
+            )
+            content = ""
+        return CachedTemplate(
+            template=self._environment.from_string(content),
+            version=version,
+            checked_at=time.monotonic(),
+        )
+
+    async def get_template(
+        self, fs: FileStorage, file_name: str, revision_id: Optional[str] = None
+    ) -> Template:
+        """
+        Return the compiled template, loading or reloading it only when needed.
+
+        Args:
+            fs: Revisions file storage holding the prompt templates
+            file_name: Template file name within the revision folder
+            revision_id: Revision folder, or None for the root prompts folder
+
+        Returns:
+            The compiled jinja2 template
+        """
+        key = self._key(fs, revision_id, file_name)
+        cached = self._templates.get(key)
+
+        if cached is not None:
+            now = time.monotonic()
+            if now - cached.checked_at < self.revalidate_interval:
+                self.hits += 1
+                metrics.record_cache("prompt_templates", hit=True)
+                return cached.template
+
+            template_path = await fs.get_prompt_template_path(revision_id or "")
+            version = await fs.get_file_version(file_name, template_path)
+            if version is not None and version == cached.version:
+                cached.checked_at = now
+                self.hits += 1
+                metrics.record_cache("prompt_templates", hit=True)
+                return cached.template
+            self.reloads += 1
+        else:
+            self.misses += 1
+        metrics.record_cache("prompt_templates", hit=False)
+
+        entry = await self._load(fs, revision_id, file_name)
+        with self._lock:
+            self._templates[key] = entry
+        return entry.template
+
+    async def render(
+        self,
+        fs: FileStorage,
+        file_name: str,
+        revision_id: Optional[str] = None,
+        **context: object,
+    ) -> str:
+        """Render a cached template with the given context."""
+        template = await self.get_template(fs, file_name, revision_id)
+        return template.render(**context)
+
+    async def resolve_revision(
+        self, fs: FileStorage, revision_id: str
+    ) -> Optional[str]:
+        """
+        Find the template folder that actually exists for a revision.
+
+        Revisions may be stored with underscored or hyphenated names, so the
+        original, normalized and hyphenated spellings are probed in that order.
+        The first one containing templates is cached until invalidated.
+
+        Returns:
+            The revision folder name, or None if no variant has templates
+        """
+        key = (_storage_scope(fs), revision_id)
+        resolved = self._resolved_revisions.get(key)
+        if resolved is not None:
+            return resolved
+
+        from ingenious.utils.namespace_utils import normalize_workflow_name
+
+        candidates = [
+            revision_id,
+            normalize_workflow_name(revision_id),
+            revision_id.replace("_", "-"),
+        ]
+        for candidate in dict.fromkeys(candidates):
+            template_path = await fs.get_prompt_template_path(candidate)
+            try:
+                async for entry in fs.iter_files(template_path):
+                    if entry.name.endswith(TEMPLATE_EXTENSIONS):
+                        self._resolved_revisions[key] = candidate
+                        return candidate
+            except Exception as e:
+                logger.debug(
+                    "Failed to list prompts for revision",
+                    revision_id=candidate,
+                    error=str(e),
+                )
+        return None
+
+    async def precompile(
+        self, fs: FileStorage, revision_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        Compile every template in a revision folder ahead of the first request.
+
+        Returns:
+            Names of the templates that were compiled
+        """
+        template_path = await fs.get_prompt_template_path(revision_id or "")
+        names: List[str] = []
+        try:
+            async for entry in fs.iter_files(template_path):
+                if entry.name.endswith(TEMPLATE_EXTENSIONS):
+                    names.append(entry.name)
+        except Exception as e:
+            logger.debug(
+                "Unable to list prompt templates",
+                revision_id=revision_id,
+                error=str(e),
+            )
+            return []
+
+        for name in names:
+            await self.get_template(fs, name, revision_id)
+        return names
+
+    async def precompile_revisions(
+        self, fs: FileStorage, revision_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Precompile several revisions, defaulting to the root prompts folder plus
+        one folder per discovered workflow.
+
+        Returns:
+            Mapping of revision id to the number of templates compiled
+        """
+        if revision_ids is None:
+            from ingenious.utils.namespace_utils import discover_workflows
+
+            revision_ids = ["", *discover_workflows()]
+
+        compiled: Dict[str, int] = {}
+        for revision_id in dict.fromkeys(revision_ids):
+            names = await self.precompile(fs, revision_id)
+            if names:
+                compiled[revision_id] = len(names)
+        return compiled
+
+    def invalidate(
+        self, revision_id: Optional[str] = None, file_name: Optional[str] = None
+    ) -> int:
+        """
+        Drop cached templates.
+
+        Args:
+            revision_id: Only drop entries for this revision (None for all revisions)
+            file_name: Only drop entries with this file name (None for all files)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._resolved_revisions = {
+                key: resolved
+                for key, resolved in self._resolved_revisions.items()
+                if revision_id is not None and revision_id not in (key[1], resolved)
+            }
+            keys = [
+                key
+                for key in self._templates
+                if (revision_id is None or key[1] == revision_id)
+                and (file_name is None or key[2] == file_name)
+            ]
+            for key in keys:
+                del self._templates[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters for diagnostics."""
+        return {
+            "entries": len(self._templates),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
+
+
+# Global registry instance
+_template_registry: TemplateRegistry | None = None
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Get the process-wide template registry, creating it if needed."""
+    global _template_registry
+    if _template_registry is None:
+        _template_registry = TemplateRegistry()
+    return _template_registry
+
+
+@on_settings_change
+def _invalidate_on_settings_change(
+    old: IngeniousSettings, new: IngeniousSettings
+) -> None:
+    # Entries are keyed by storage location, so those from the old one are dead
+    if _template_registry is not None and old.file_storage != new.file_storage:
+        _template_registry.invalidate()
@@ -0,0 +1,260 @@
+"""
+Startup warm-up of caches, clients and indexes.
+
+The lifespan already loads the flow registry and compiles prompt templates
+before the app serves. Warm-up then loads what the first chat requests would
+otherwise pay for on the request path:
+
+- ``tokenizers``: the tiktoken encoding of each configured model
+- ``chat_history``: the chat history schema and connection pool
+- ``llm_clients``: the shared model client for each configured model
+- ``retrieval``: the Azure AI Search SDK, or the local Chroma collection
+
+With ``synthetic_requests`` enabled it finally sends one chat request through
+each flow, which calls the model.
+
+The outcome is kept in ``WarmupState``, which ``/api/v1/health/ready``
+reports: a worker is ready once warm-up has finished. Failed steps do not
+hold readiness back, since the request path still does the same work lazily;
+they are logged and listed in the readiness response.
+"""
+
+import asyncio
+import functools
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from ingenious.core.structured_logging import get_logger
+
+if TYPE_CHECKING:
+    from ingenious.config import IngeniousSettings
+
+logger = get_logger(__name__)
+
+WARMUP_USER_ID = "ingenious-warmup"
+
+
+@dataclass
+class WarmupStepResult:
+    """Outcome of one warm-up step."""
+
+    name: str
+    status: str  # "ok", "failed" or "skipped"
+    duration_ms: float
+    detail: Optional[str] = None
+
+
+class WarmupState:
+    """Progress of this worker's warm-up, read by the readiness probe."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.status = "pending"  # "pending", "running" or "done"
+        self.steps: List[WarmupStepResult] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "done"
+
+    def start(self) -> None:
+        self.reset()
+        self.status = "running"
+        self.started_at = time.time()
+
+    def finish(self) -> None:
+        self.status = "done"
+        self.finished_at = time.time()
+
+    def as_dict(self, details: bool = True) -> Dict[str, Any]:
+        """Summary of the warm-up; ``details=False`` leaves out error messages."""
+        duration = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration = round((self.finished_at - self.started_at) * 1000, 1)
+        steps = [asdict(step) for step in self.steps]
+        if not details:
+            for step in steps:
+                step.pop("detail")
+        return {"status": self.status, "duration_ms": duration, "steps": steps}
+
+
+class Warmup:
+    """Runs the configured warm-up steps for one worker."""
+
+    def __init__(self, config: "IngeniousSettings", state: WarmupState) -> None:
+        self.config = config
+        self.settings = config.web_configuration.warmup
+        self.state = state
+        self._steps: Dict[str, Callable[[], Awaitable[Optional[str]]]] = {
+            "tokenizers": self._warm_tokenizers,
+            "chat_history": self._warm_chat_history,
+            "llm_clients": self._warm_llm_clients,
+            "retrieval": self._warm_retrieval,
+        }
+
+    async def run(self) -> WarmupState:
+        """Run every step in order, then mark the worker ready."""
+        self.state.start()
+        try:
+            for name in self.settings.steps:
+                await self._run_step(name, self._steps[name])
+            if self.settings.synthetic_requests:
+                for flow in self._synthetic_flows():
+                    await self._run_step(
+                        f"flow:{flow}", functools.partial(self._send_synthetic, flow)
+                    )
+        finally:
+            self.state.finish()
+        logger.info("Warm-up complete", **self.state.as_dict())
+        return self.state
+
+    async def _run_step(
+        self, name: str, step: Callable[[], Awaitable[Optional[str]]]
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(
+                step(), timeout=self.settings.step_timeout_seconds
+            )
+            status = "skipped" if detail is None else "ok"
+        except asyncio.TimeoutError:
+            status, detail = "failed", "timed out"
+        except Exception as e:
+            status, detail = "failed", f"{type(e).__name__}: {e}"
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        if status == "failed":
+            logger.warning("Warm-up step failed", step=name, error=detail)
+        self.state.steps.append(WarmupStepResult(name, status, duration_ms, detail))
+
+    # Each step returns a short description of what it warmed, or None when
+    # there was nothing to do with this configuration.
+
+    async def _warm_tokenizers(self) -> Optional[str]:
+        """Load and cache the tiktoken encoding of each model."""
+
+        def load() -> List[str]:
+            import tiktoken
+
+            encodings = set()
+            for model in self.config.models:
+                try:
+                    encoding = tiktoken.encoding_for_model(model.model)
+                except KeyError:
+                    encoding = tiktoken.get_encoding("cl100k_base")
+                encodings.add(encoding.name)
+            return sorted(encodings)
+
+        return ", ".join(await asyncio.to_thread(load)) or None
+
+    async def _warm_chat_history(self) -> Optional[str]:
+        """Create the chat history tables and open the repository's pool."""
+        from ingenious.services.fastapi_dependencies import (
+            get_chat_history_repository,
+            get_database_type,
+        )
+
+        db_type = get_database_type(self.config)
+        repository = await asyncio.to_thread(
+            get_chat_history_repository, self.config, db_type
+        )
+        # One round trip proves the database answers before traffic arrives
+        await repository.get_thread_messages(str(uuid.uuid4()))
+        return db_type.value
+
+    async def _warm_llm_clients(self) -> Optional[str]:
+        """
+        Build the shared model client of each model and resolve its endpoint's host.
+
+        Warm-up runs on the server's event loop, so agents reuse these clients.
+        """
+        from ingenious.models.ag_agents import get_model_client
+
+        models = []
+        for model in self.config.models:
+            get_model_client(model)
+            await _resolve(model.base_url)
+            models.append(model.model)
+        return ", ".join(models) or None
+
+    async def _warm_retrieval(self) -> Optional[str]:
+        """Load the search backend the knowledge base flow will use."""
+        search = self.config.azure_search_services
+        if search and search[0].endpoint and search[0].key:
+            await asyncio.to_thread(__import__, "azure.search.documents")
+            await _resolve(search[0].endpoint)
+            return "azure_search"
+
+        chroma_path = os.path.join(self.config.chat_history.memory_path, "chroma_db")
+        if not os.path.isdir(chroma_path):
+            return None
+
+        def open_collection() -> str:
+            try:
+                import chromadb
+            except ImportError:
+                return "chromadb not installed"
+            # Chroma keeps one system per path for the process, so the index
+            # opened here is the one the flow's client gets
+            client = chromadb.PersistentClient(path=chroma_path)
+            collection = client.get_collection(name="knowledge_base")
+            # Querying loads the embedding model
+            collection.query(query_texts=["warm-up"], n_results=1)
+            return f"chroma ({collection.count()} documents)"
+
+        return await asyncio.to_thread(open_collection)
+
+    def _synthetic_flows(self) -> List[str]:
+        if self.settings.synthetic_flows:
+            return list(self.settings.synthetic_flows)
+        from ingenious.services.flow_registry import get_flow_registry
+
+        return get_flow_registry().names()
+
+    async def _send_synthetic(self, flow: str) -> Optional[str]:
+        """Send one chat request through ``flow``."""
+        from ingenious.models.chat import ChatRequest
+        from ingenious.services.fastapi_dependencies import (
+            create_chat_service_factory,
+        )
+
+        service = create_chat_service_factory(self.config)(flow)
+        response = await service.get_chat_response(
+            ChatRequest(
+                user_prompt=self.settings.synthetic_prompt,
+                conversation_flow=flow,
+                user_id=WARMUP_USER_ID,
+                thread_id=str(uuid.uuid4()),
+            )
+        )
+        return f"{response.token_count} tokens"
+
+
+async def _resolve(url: str) -> None:
+    """Look up the host of ``url``, so a wrong endpoint shows up at startup."""
+    host = urlparse(url).hostname
+    if not host:
+        return
+    try:
+        await asyncio.get_running_loop().getaddrinfo(host, 443)
+    except OSError as e:
+        raise ConnectionError(f"Cannot resolve {host}: {e}") from e
+
+
+_warmup_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    """Get this worker's warm-up state."""
+    return _warmup_state
+
+
+async def run_warmup(config: "IngeniousSettings") -> WarmupState:
+    """Warm up this worker with the configured steps."""
+    return await Warmup(config, _warmup_state).run()
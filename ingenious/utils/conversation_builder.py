@@ -74,9 +74,9 @@ async def Sync_Prompt_Templates(_config: IngeniousSettings, revision: str) -> No
         # Define the file path in Azure storage
         jinja_files: List[str] = sorted(
             [
-                f
-                for f in await fs.list_files(file_path=azure_template_dir)
-                if f.endswith(".jinja")
+                entry.name
+                async for entry in fs.iter_files(azure_template_dir)
+                if entry.name.endswith(".jinja")
             ]
         )
 
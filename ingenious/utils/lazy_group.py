@@ -26,6 +26,11 @@ class LazyGroup(TyperGroup):
             "dataprep",
             "dataprep",
         ),
+        "loadtest": (
+            "ingenious.loadtest.cli",
+            "loadtest_app",
+            "loadtest",
+        ),
     }
 
     def list_commands(self, ctx: Context) -> List[str]:
@@ -2,10 +2,10 @@ import os
 import sqlite3
 from typing import Any, Dict, List, Optional
 
-import pandas as pd  # Import pandas for CSV handling
-
 from ingenious.config.config import get_config
 
+# pandas is slow to import, so the CSV loaders import it when they run
+
 
 class sqlite_sample_db:
     def __init__(self) -> None:
@@ -53,6 +53,8 @@ class sqlite_sample_db:
         # Dynamic table creation based on CSV structure
         csv_path: str = self._config.local_sql_db.sample_csv_path
         if os.path.exists(csv_path):
+            import pandas as pd
+
             df: pd.DataFrame = pd.read_csv(csv_path)
             # Infer SQL types from pandas dtypes
             column_definitions: List[str] = []
@@ -96,6 +98,8 @@ class sqlite_sample_db:
         # Load CSV file into a DataFrame
         csv_path: str = self._config.local_sql_db.sample_csv_path
         if os.path.exists(csv_path):
+            import pandas as pd
+
             df: pd.DataFrame = pd.read_csv(csv_path)
             table_name: str = self._config.local_sql_db.sample_database_name
             # Load data into the table
@@ -0,0 +1,92 @@
+"""
+Fast JSON serialization for API responses and agent transcripts.
+
+Uses orjson when it is installed (the ``performance`` extra) and the standard
+library otherwise. Both paths write the same compact JSON.
+
+``dumps`` also replaces ``jsonpickle.encode(value, unpicklable=False)`` for agent
+responses. Objects are flattened the same way jsonpickle does it: a pydantic
+model becomes its ``__getstate__`` dict (``__dict__``, ``__pydantic_extra__``,
+``__pydantic_fields_set__``, ``__pydantic_private__``), and other objects
+become their ``__dict__``. Clients that parse the old output keep working.
+"""
+
+import enum
+import json
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Type
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _flatten(obj: Any) -> Any:
+    """Turn an object orjson/json cannot serialize into plain JSON data."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if type(obj).__getstate__ is not object.__getstate__:
+        return obj.__getstate__()
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    return str(obj)
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 encoded JSON."""
+        return orjson.dumps(obj, default=_flatten, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        """Serialize ``obj`` to a JSON string."""
+        return orjson.dumps(obj, default=_flatten, option=_ORJSON_OPTIONS).decode()
+
+    def loads(data: str | bytes) -> Any:
+        """Parse a JSON document."""
+        return orjson.loads(data)
+
+    JSON_RESPONSE_CLASS: Type[JSONResponse] = ORJSONResponse
+
+else:
+
+    def dumps(obj: Any) -> str:
+        """Serialize ``obj`` to a JSON string."""
+        return json.dumps(
+            obj, default=_flatten, ensure_ascii=False, separators=(",", ":")
+        )
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 encoded JSON."""
+        return dumps(obj).encode("utf-8")
+
+    def loads(data: str | bytes) -> Any:
+        """Parse a JSON document."""
+        return json.loads(data)
+
+    JSON_RESPONSE_CLASS = JSONResponse
+
+
+__all__ = [
+    "ORJSON_AVAILABLE",
+    "JSON_RESPONSE_CLASS",
+    "dumps",
+    "dumps_bytes",
+    "loads",
+]
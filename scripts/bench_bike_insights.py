@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark bike-insights latency with sequential and parallel agent fan-out
+
+Runs the bike-insights template flow in-process against the mock LLM server, with
+the settings and payload of the bundled bike-insights load test scenario. Each
+request is run once with ``max_parallel_agents=1``, which makes the sentiment and
+fiscal analysis agents take turns, and once with the configured parallelism. Also
+checks that the agent responses come back in the same order on every request.
+
+Usage:
+    python scripts/bench_bike_insights.py [--requests 20] [--concurrency 2] [--parallel 4] [--latency 0.5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import uvicorn
+
+import ingenious
+from ingenious.loadtest.mock_llm import MockLLMSettings, create_mock_llm_app
+from ingenious.loadtest.scenarios import load_scenario_file
+
+TEMPLATES = (
+    Path(ingenious.__file__).parent
+    / "ingenious_extensions_template"
+    / "templates"
+    / "prompts"
+)
+
+
+def start_mock_llm(settings: MockLLMSettings) -> Tuple[uvicorn.Server, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_mock_llm_app(settings),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+        )
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def prepare_workdir(workdir: Path, revision_id: str, base_url: str) -> None:
+    """Copy the prompt templates and point the settings at the mock."""
+    prompts = workdir / "templates" / "prompts" / revision_id
+    prompts.mkdir(parents=True)
+    for template in TEMPLATES.glob("*.jinja"):
+        shutil.copy(template, prompts)
+    os.environ.update(
+        {
+            "INGENIOUS_WORKING_DIR": str(workdir),
+            "INGENIOUS_MODELS__0__MODEL": "gpt-4.1-nano",
+            "INGENIOUS_MODELS__0__API_KEY": "mock",
+            "INGENIOUS_MODELS__0__BASE_URL": base_url,
+            "INGENIOUS_MODELS__0__API_VERSION": "2024-12-01-preview",
+            "INGENIOUS_MODELS__0__DEPLOYMENT": "gpt-4.1-nano",
+            "INGENIOUS_CHAT_HISTORY__DATABASE_PATH": str(workdir / "chat_history.db"),
+            "INGENIOUS_CHAT_HISTORY__MEMORY_PATH": str(workdir),
+        }
+    )
+    os.chdir(workdir)
+
+
+async def run_requests(
+    config: Any, prompt: str, requests: int, concurrency: int
+) -> Tuple[List[float], float, List[List[str]]]:
+    """Send the requests; return latencies, wall time and each agent order."""
+    from ingenious.models.chat import ChatRequest
+    from ingenious.services.fastapi_dependencies import create_chat_service_factory
+
+    create = create_chat_service_factory(config)
+    gate = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    orders: List[List[str]] = []
+
+    async def one() -> None:
+        async with gate:
+            service = create("bike-insights")
+            start = time.perf_counter()
+            response = await service.get_chat_response(
+                ChatRequest(
+                    user_prompt=prompt,
+                    conversation_flow="bike-insights",
+                    user_id="bench",
+                    thread_id=str(uuid.uuid4()),
+                )
+            )
+            latencies.append(time.perf_counter() - start)
+            chats = json.loads(response.agent_response)
+            orders.append([chat["__dict__"]["chat_name"] for chat in chats])
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    return latencies, time.perf_counter() - start, orders
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--parallel", type=int, default=4)
+    parser.add_argument(
+        "--latency", type=float, default=None, help="Mock time to first token"
+    )
+    args = parser.parse_args()
+
+    scenario_file = load_scenario_file("bike-insights")
+    mock_settings = scenario_file.mock_llm
+    if args.latency is not None:
+        mock_settings = mock_settings.model_copy(
+            update={"latency_seconds": args.latency}
+        )
+    prompt = scenario_file.scenarios[0].prompts[0]
+    revision_id = json.loads(prompt)["revision_id"]
+
+    server, base_url = start_mock_llm(mock_settings)
+    with tempfile.TemporaryDirectory() as tmp:
+        prepare_workdir(Path(tmp), revision_id, base_url)
+        from ingenious.config import get_config
+
+        print(
+            f"{args.requests} bike-insights requests, {args.concurrency} at a time, "
+            f"mock latency {mock_settings.latency_seconds}s"
+        )
+        print(f"{'max_parallel_agents':<22}{'p50':>9}{'p95':>9}{'req/s':>9}")
+        all_orders: List[List[str]] = []
+        for parallel in (1, args.parallel):
+            config = get_config().model_copy(deep=True)
+            config.chat_service.max_parallel_agents = parallel
+            latencies, wall, orders = asyncio.run(
+                run_requests(config, prompt, args.requests, args.concurrency)
+            )
+            all_orders.extend(orders)
+            print(
+                f"{parallel:<22}"
+                f"{statistics.median(latencies):>8.2f}s"
+                f"{percentile(latencies, 0.95):>8.2f}s"
+                f"{args.requests / wall:>9.2f}"
+            )
+        distinct = {tuple(order) for order in all_orders}
+        print(
+            f"Agent order: {' > '.join(all_orders[0])}"
+            f" ({'same' if len(distinct) == 1 else 'DIFFERS'} on every request)"
+        )
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression: CPU cost against bytes saved
+
+Compresses payloads shaped like the API's larger responses with every encoder
+available here (gzip always; Brotli and zstd when their packages are
+installed):
+
+- a conversation history from /conversations/{thread_id}
+- a bike-insights agent_response transcript
+- a /chat/stream SSE stream, flushed after every frame as the middleware does
+
+Usage:
+    python scripts/bench_compression.py [--messages 200] [--frames 500] [--repeat 20]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from ingenious.config.models import CompressionSettings
+from ingenious.main.compression import available_encoders
+
+VOCABULARY = (
+    "store NSW VIC QLD sold road mountain e-bike bikes units April May June "
+    "revenue margin stock reorder review rating praised gearing brakes frame "
+    "customers reported delivery delay analyst summary trend quarter increase "
+    "decrease compared forecast inventory the a of and in with for on"
+).split()
+_rng = random.Random(0)
+
+
+def text(words: int) -> str:
+    """Text that compresses roughly like real agent output, not a repeated line."""
+    return " ".join(_rng.choice(VOCABULARY) for _ in range(words)) + "."
+
+
+def conversation_payload(messages: int) -> bytes:
+    return json.dumps(
+        [
+            {
+                "id": f"msg-{i}",
+                "thread_id": "thread-456",
+                "user_id": "user-789",
+                "role": "assistant" if i % 2 else "user",
+                "content": text(80 + 10 * (i % 16)),
+                "name": None,
+                "positive_feedback": None,
+                "content_filter_results": None,
+                "tool_calls": [],
+                "created_at": "2025-07-04T12:00:00Z",
+            }
+            for i in range(messages)
+        ]
+    ).encode()
+
+
+def transcript_payload(agents: int) -> bytes:
+    chats = [
+        {
+            "__dict__": {
+                "chat_name": f"agent_{i}",
+                "user_message": text(300),
+                "system_prompt": "You are a bike sales analyst. " + text(100),
+                "chat_response": {"chat_message": {"content": text(1200)}},
+                "prompt_tokens": 900,
+                "completion_tokens": 400,
+            },
+            "__pydantic_fields_set__": ["chat_name", "user_message"],
+        }
+        for i in range(agents)
+    ]
+    return json.dumps({"agent_response": json.dumps(chats)}).encode()
+
+
+def sse_frames(frames: int) -> List[bytes]:
+    return [
+        (
+            'data: {"event_type":"content","content":"'
+            + text(3 + i % 6)
+            + '","chunk_index":'
+            + str(i)
+            + "}\n\n"
+        ).encode()
+        for i in range(frames)
+    ]
+
+
+def run(make_encoder: Callable, chunks: List[bytes], repeat: int) -> Tuple[float, int]:
+    """Median milliseconds and compressed size for one response."""
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoder = make_encoder()
+        size = 0
+        for chunk in chunks[:-1]:
+            size += len(encoder.compress(chunk, flush=True))
+        size += len(encoder.compress(chunks[-1], flush=False))
+        size += len(encoder.finish())
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads: Dict[str, List[bytes]] = {
+        "conversation": [conversation_payload(args.messages)],
+        "agent_response": [transcript_payload(args.agents)],
+        "sse (per-frame flush)": sse_frames(args.frames),
+        "sse (single buffer)": [b"".join(sse_frames(args.frames))],
+    }
+    configs = [
+        CompressionSettings(gzip_level=1, brotli_quality=1, zstd_level=1),
+        CompressionSettings(),
+        CompressionSettings(gzip_level=9, brotli_quality=9, zstd_level=12),
+    ]
+
+    print(
+        f"{'payload':<22} {'encoding':<9} {'level':>5} {'raw':>8} {'sent':>8} "
+        f"{'saved':>6} {'cpu':>8} {'MB/s':>7}"
+    )
+    for name, chunks in payloads.items():
+        raw = sum(len(chunk) for chunk in chunks)
+        for settings in configs:
+            for encoding, make_encoder in available_encoders(settings).items():
+                level = {
+                    "gzip": settings.gzip_level,
+                    "br": settings.brotli_quality,
+                    "zstd": settings.zstd_level,
+                }[encoding]
+                ms, size = run(make_encoder, chunks, args.repeat)
+                print(
+                    f"{name:<22} {encoding:<9} {level:>5} {raw // 1024:>6}KB "
+                    f"{size // 1024:>6}KB {1 - size / raw:>6.1%} {ms:>6.2f}ms "
+                    f"{raw / 1e6 / (ms / 1000):>7.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark log-heavy request throughput across logging pipeline settings
+
+Each simulated request emits the kind of lines the chat path does: a handful
+of info lines with request context and a few dozen debug lines, some carrying
+a large value. Output goes to /dev/null so only the logging cost is measured.
+
+Pipelines compared:
+
+- legacy: every line queries psutil, formats synchronously and writes
+  in the caller (the previous add_performance_metrics behaviour)
+- sampled metrics: metrics come from the background sampler snapshot
+- + async sink: lines are written from the queue listener thread
+- + event sampling: the noisiest info event is kept 10% of the time
+
+Usage:
+    python scripts/bench_logging.py [--requests 2000] [--level INFO]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import structlog
+
+from ingenious.core import structured_logging
+from ingenious.core.structured_logging import (
+    get_logger,
+    lazy,
+    set_request_context,
+    setup_structured_logging,
+    shutdown_structured_logging,
+)
+
+TRANSCRIPT = [{"role": "assistant", "content": "Bike sales rose. " * 50}] * 10
+
+
+def legacy_performance_metrics(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """The per-line psutil lookup this pipeline replaces."""
+    import psutil
+
+    process = psutil.Process()
+    event_dict["memory_mb"] = round(process.memory_info().rss / 1024 / 1024, 2)
+    event_dict["cpu_percent"] = process.cpu_percent()
+    return event_dict
+
+
+def simulate_request(index: int) -> None:
+    logger = get_logger("bench.chat")
+    set_request_context(user_id="bench-user")
+    logger.info("Request started", path="/api/v1/chat", method="POST")
+    for step in range(30):
+        logger.debug("Agent step", step=step, transcript=lazy(str, TRANSCRIPT))
+    for agent in range(4):
+        logger.info("Agent message received", agent=f"agent_{agent}", index=index)
+    logger.info("Request completed", status_code=200)
+
+
+def run(configure: Callable[[], None], requests: int) -> float:
+    configure()
+    start = time.perf_counter()
+    for i in range(requests):
+        simulate_request(i)
+    shutdown_structured_logging()
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--level", default="INFO")
+    args = parser.parse_args()
+
+    level = args.level
+
+    def legacy() -> None:
+        setup_structured_logging(log_level=level, metrics_interval=0)
+        config = structlog.get_config()
+        processors: List[Any] = list(config["processors"])
+        processors.insert(-4, legacy_performance_metrics)
+        structlog.configure(processors=processors)
+
+    pipelines: Dict[str, Callable[[], None]] = {
+        "legacy (per-line psutil)": legacy,
+        "sampled metrics": lambda: setup_structured_logging(log_level=level),
+        "+ async sink": lambda: setup_structured_logging(
+            log_level=level, async_sink=True
+        ),
+        "+ event sampling": lambda: setup_structured_logging(
+            log_level=level,
+            async_sink=True,
+            sample_rates={"Agent message received": 0.1},
+        ),
+    }
+
+    # Route both the stdlib handler and anything else printing to /dev/null
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        results = {name: run(setup, args.requests) for name, setup in pipelines.items()}
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+        logging.getLogger().handlers.clear()
+        if structured_logging._metrics_sampler is not None:
+            structured_logging._metrics_sampler.stop()
+
+    baseline = results["legacy (per-line psutil)"]
+    print(f"level={level} requests={args.requests} (36 log calls per request)")
+    for name, rate in results.items():
+        print(f"{name:<26} {rate:>9.0f} req/s {rate / baseline:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
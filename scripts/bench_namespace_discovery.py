@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request namespace discovery cost on cold and warm workers
+
+The "before" path is what the chat routes and workflow-status diagnostic did on
+every request: walk the conversation_flows packages (print_namespace_modules)
+and call discover_workflows. "Cold" clears the import and discovery caches
+before each request, as on a freshly started worker; "warm" keeps them. The
+"after" path reads the FlowRegistry namespace snapshot built at startup.
+
+Usage:
+    python scripts/bench_namespace_discovery.py [--requests 200]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import time
+from typing import Callable, List
+
+from ingenious.services.flow_registry import FlowRegistry
+from ingenious.utils import namespace_utils as ns_utils
+from ingenious.utils.imports import clear_import_cache
+
+FLOWS_PACKAGE = "ingenious.services.chat_services.multi_agent.conversation_flows"
+
+
+def per_request_discovery() -> List[str]:
+    """Namespace work previously done on each chat/workflow-status request."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        ns_utils.print_namespace_modules(FLOWS_PACKAGE)
+    return ns_utils.discover_workflows()
+
+
+def cold_discovery() -> List[str]:
+    clear_import_cache()
+    ns_utils._importer.clear_cache()
+    ns_utils.clear_workflow_cache()
+    return per_request_discovery()
+
+
+def snapshot_lookup(registry: FlowRegistry) -> Callable[[], List[str]]:
+    def run() -> List[str]:
+        return list(registry.refresh_if_changed().workflows)
+
+    return run
+
+
+def measure(label: str, request: Callable[[], List[str]], requests: int) -> float:
+    request()
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        request()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p50 = statistics.median(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<10} p50={p50:8.3f} ms  p95={p95:8.3f} ms  per request")
+    return p50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    registry = FlowRegistry()
+    registry.load()
+
+    cold = measure("cold", cold_discovery, args.requests)
+    warm = measure("warm", per_request_discovery, args.requests)
+    after = measure("snapshot", snapshot_lookup(registry), args.requests)
+    print(f"saved      cold {cold - after:.3f} ms, warm {warm - after:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request prompt template cost with and without the template registry
+
+Simulates the bike-insights agent setup, which loads one prompt template per agent
+on every request. The "before" path rebuilds FileStorage and a jinja Environment and
+re-reads every template; the "after" path goes through the process-wide
+TemplateRegistry.
+
+Usage:
+    python scripts/bench_prompt_templates.py [--requests 500] [--templates 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, List
+
+from jinja2 import Environment
+
+from ingenious.config.models import FileStorageContainerSettings
+from ingenious.files.files_repository import FileStorage
+from ingenious.services.template_registry import TemplateRegistry
+
+REVISION_ID = "bench"
+TEMPLATE_BODY = (
+    """
+You are the {{ agent_name | default('agent') }}.
+{% for rule in ['be concise', 'cite data', 'use markdown'] %}
+- {{ rule }}
+{% endfor %}
+"""
+    * 20
+)
+
+
+def make_config(base_path: Path) -> Any:
+    return SimpleNamespace(
+        file_storage=SimpleNamespace(
+            revisions=FileStorageContainerSettings(
+                storage_type="local", path=str(base_path)
+            )
+        )
+    )
+
+
+async def uncached_request(config: Any, names: List[str]) -> None:
+    """Template loading as done before the registry existed."""
+    for name in names:
+        fs = FileStorage(config)
+        template_path = await fs.get_prompt_template_path(REVISION_ID)
+        content = await fs.read_file(file_name=name, file_path=template_path)
+        Environment().from_string(content).render()
+
+
+def cached_request(
+    registry: TemplateRegistry, fs: FileStorage
+) -> Callable[[Any, List[str]], Awaitable[None]]:
+    async def run(config: Any, names: List[str]) -> None:
+        for name in names:
+            await registry.render(fs, name, REVISION_ID)
+
+    return run
+
+
+async def measure(
+    label: str,
+    request: Callable[[Any, List[str]], Awaitable[None]],
+    config: Any,
+    names: List[str],
+    requests: int,
+) -> float:
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await request(config, names)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p50 = statistics.median(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<10} p50={p50:8.3f} ms  p95={p95:8.3f} ms  per request")
+    return p50
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--templates", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        revision_dir = base / "templates" / "prompts" / REVISION_ID
+        revision_dir.mkdir(parents=True)
+        names = [f"agent_{i}_prompt.jinja" for i in range(args.templates)]
+        for name in names:
+            (revision_dir / name).write_text(TEMPLATE_BODY)
+
+        config = make_config(base)
+        registry = TemplateRegistry()
+        fs = FileStorage(config)
+        await registry.precompile(fs, REVISION_ID)
+
+        before = await measure(
+            "uncached", uncached_request, config, names, args.requests
+        )
+        after = await measure(
+            "registry", cached_request(registry, fs), config, names, args.requests
+        )
+        print(f"speedup    {before / after:.1f}x  ({registry.stats()})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
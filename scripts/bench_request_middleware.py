@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark RequestContextMiddleware throughput against the BaseHTTPMiddleware version
+
+Runs the same FastAPI app behind the previous BaseHTTPMiddleware-based request
+context middleware and the pure ASGI one, issuing concurrent JSON requests and
+streaming requests (many small chunks, as /chat/stream sends) in process
+through httpx's ASGI transport. Log output is filtered out so the numbers
+reflect middleware overhead rather than console I/O.
+
+Usage:
+    python scripts/bench_request_middleware.py [--requests 2000] [--concurrency 50] [--chunks 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import httpx
+import structlog
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from ingenious.core.structured_logging import (
+    clear_request_context,
+    get_logger,
+    set_request_context,
+)
+from ingenious.main.middleware import RequestContextMiddleware
+
+logger = get_logger(__name__)
+
+
+class LegacyRequestContextMiddleware(BaseHTTPMiddleware):
+    """The request-context middleware as it was before the pure ASGI rewrite."""
+
+    async def dispatch(
+        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        start_time = time.time()
+        session_id = request.headers.get("X-Session-ID") or request.cookies.get(
+            "session_id"
+        )
+        request_id = set_request_context(user_id="anonymous", session_id=session_id)
+        logger.info("Request started", request_id=request_id, url=str(request.url))
+        try:
+            response = await call_next(request)
+            processing_time = time.time() - start_time
+            logger.info("Request completed", request_id=request_id)
+            response.headers["X-Request-ID"] = request_id
+            response.headers["X-Processing-Time"] = f"{processing_time:.3f}s"
+            return response
+        finally:
+            clear_request_context()
+
+
+def build_app(middleware: Any, chunks: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/json")
+    async def json_endpoint() -> dict:
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream_endpoint() -> StreamingResponse:
+        async def body() -> AsyncIterator[str]:
+            for i in range(chunks):
+                yield f'data: {{"chunk": {i}}}\n\n'
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await one()
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--chunks", type=int, default=200)
+    args = parser.parse_args()
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    for path, requests in [("/json", args.requests), ("/stream", args.requests // 4)]:
+        legacy = await run(
+            build_app(LegacyRequestContextMiddleware, args.chunks),
+            path,
+            requests,
+            args.concurrency,
+        )
+        asgi = await run(
+            build_app(RequestContextMiddleware, args.chunks),
+            path,
+            requests,
+            args.concurrency,
+        )
+        print(
+            f"{path:<8} BaseHTTPMiddleware {legacy:8.0f} req/s   "
+            f"pure ASGI {asgi:8.0f} req/s   ({asgi / legacy:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of agent transcripts and chat responses
+
+Builds multi-agent transcripts like the ones bike-insights returns (one
+AgentChat per agent, each carrying the agent's prompt and response) and times
+the old and new encoders at several sizes:
+
+- agent_response: jsonpickle.encode(unpicklable=False) vs serialization.dumps
+- API response: JSONResponse vs the app's default response class
+
+Usage:
+    python scripts/bench_serialization.py [--agents 4 16 64] [--response-kb 2 8] [--repeat 50]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any, Callable, List
+
+import jsonpickle
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import TextMessage
+from autogen_core.models import RequestUsage
+from fastapi.responses import JSONResponse
+
+from ingenious.models.agent import AgentChat
+from ingenious.models.chat import ChatResponse
+from ingenious.utils import serialization
+
+SENTENCE = "Store NSW sold 12 road bikes in April; reviews praise the gearing. "
+
+
+def build_transcript(agents: int, response_kb: int) -> List[AgentChat]:
+    text = SENTENCE * (response_kb * 1024 // len(SENTENCE))
+    return [
+        AgentChat(
+            chat_name=f"agent_{i}",
+            target_agent_name=f"agent_{i}",
+            source_agent_name="user_proxy",
+            user_message=text[: len(text) // 4],
+            system_prompt="You are a bike sales analyst. " * 20,
+            identifier="thread-1",
+            chat_response=Response(
+                chat_message=TextMessage(
+                    content=text,
+                    source=f"agent_{i}",
+                    models_usage=RequestUsage(prompt_tokens=900, completion_tokens=400),
+                )
+            ),
+            prompt_tokens=900,
+            completion_tokens=400,
+            start_time=1751630400.0 + i,
+            end_time=1751630403.5 + i,
+        )
+        for i in range(agents)
+    ]
+
+
+def time_it(func: Callable[[], Any], repeat: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--response-kb", type=int, nargs="+", default=[2, 8])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    response_class = serialization.JSON_RESPONSE_CLASS
+    print(f"orjson available: {serialization.ORJSON_AVAILABLE}")
+    print(
+        f"{'agents':>6} {'kb/agent':>8} {'payload':>9} "
+        f"{'jsonpickle':>11} {'dumps':>8} {'x':>6} "
+        f"{'JSONResponse':>13} {response_class.__name__:>14} {'x':>6}"
+    )
+    for agents in args.agents:
+        for response_kb in args.response_kb:
+            transcript = build_transcript(agents, response_kb)
+            old_encode = time_it(
+                lambda: jsonpickle.encode(unpicklable=False, value=transcript),
+                args.repeat,
+            )
+            new_encode = time_it(lambda: serialization.dumps(transcript), args.repeat)
+
+            agent_response = serialization.dumps(transcript)
+            body = ChatResponse(
+                thread_id="thread-1",
+                message_id="message-1",
+                agent_response=agent_response,
+                token_count=1300 * agents,
+                max_token_count=0,
+            ).model_dump(mode="json")
+            old_render = time_it(lambda: JSONResponse(body), args.repeat)
+            new_render = time_it(lambda: response_class(body), args.repeat)
+
+            print(
+                f"{agents:>6} {response_kb:>8} {len(agent_response) // 1024:>7}KB "
+                f"{old_encode:>9.2f}ms {new_encode:>6.2f}ms "
+                f"{old_encode / new_encode:>5.1f}x "
+                f"{old_render:>11.3f}ms {new_render:>12.3f}ms "
+                f"{old_render / new_render:>5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark settings access: rebuilding IngeniousSettings vs the shared snapshot
+
+Times get_config() the way it worked before the snapshot (construct
+IngeniousSettings from the environment and .env, then validate) against the
+snapshot returned now, and how long a reload takes. A chat request reads the
+settings several times (route dependencies, the flow, memory operations,
+tools), so the per-call difference is paid once per access.
+
+Usage:
+    python scripts/bench_settings.py [--calls 2000] [--env-file .env]
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Callable
+
+from ingenious.config import IngeniousSettings, get_config, reload_settings
+
+ENV = {
+    "INGENIOUS_MODELS__0__MODEL": "gpt-4o",
+    "INGENIOUS_MODELS__0__API_KEY": "bench-key",
+    "INGENIOUS_MODELS__0__BASE_URL": "https://bench.openai.azure.com/",
+    "INGENIOUS_MODELS__0__DEPLOYMENT": "gpt-4o",
+}
+
+
+def rebuild() -> IngeniousSettings:
+    """What get_config() did on every call before the snapshot."""
+    settings = IngeniousSettings()
+    settings.validate_configuration()
+    return settings
+
+
+def measure(name: str, func: Callable[[], Any], calls: int) -> float:
+    """Microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    per_call = (time.perf_counter() - start) / calls * 1e6
+    print(f"{name:<10} {per_call:>10.2f} us/call")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument(
+        "--env-file", help="Run from this .env instead of sample model settings"
+    )
+    args = parser.parse_args()
+
+    if args.env_file:
+        os.chdir(os.path.dirname(os.path.abspath(args.env_file)))
+    else:
+        for key, value in ENV.items():
+            os.environ.setdefault(key, value)
+
+    rebuilt = measure("rebuild", rebuild, max(1, args.calls // 10))
+    get_config()
+    snapshot = measure("snapshot", get_config, args.calls)
+    measure("reload", reload_settings, max(1, args.calls // 10))
+    print(f"speedup    {rebuilt / snapshot:,.0f}x per access")
+
+
+if __name__ == "__main__":
+    main()
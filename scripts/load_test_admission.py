@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Load test chat admission control against a mock LLM
+
+Drives the real /chat route in process through httpx's ASGI transport, with the
+chat service replaced by a mock LLM whose latency grows with the number of
+requests it is serving at once (as a rate-limited model deployment does). The
+same burst is sent with admission control disabled and enabled, and the status
+code mix and latency percentiles of each run are printed. With admission
+control the excess is shed with 429/503 and admitted requests finish sooner
+than when every request is let through to the overloaded model.
+
+Usage:
+    python scripts/load_test_admission.py [--requests 400] [--clients 200] [--users 20]
+        [--capacity 16] [--base-latency 0.05] [--max-concurrent 16] [--max-queue 32]
+        [--adaptive]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import httpx
+import structlog
+from fastapi import FastAPI
+
+from ingenious.api.routes import chat as chat_routes
+from ingenious.config.models import ChatAdmissionSettings
+from ingenious.models.chat import ChatRequest, ChatResponse
+from ingenious.services.admission_control import AdmissionController
+from ingenious.services.fastapi_dependencies import (
+    get_chat_admission,
+    get_chat_idempotency,
+    get_chat_service,
+    get_conditional_security,
+)
+
+
+class MockLLMChatService:
+    """Chat service whose latency degrades once more than ``capacity`` calls overlap."""
+
+    def __init__(self, capacity: int, base_latency: float) -> None:
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self.active = 0
+
+    async def get_chat_response(self, chat_request: ChatRequest) -> ChatResponse:
+        self.active += 1
+        try:
+            overload = max(1.0, self.active / self.capacity)
+            await asyncio.sleep(self.base_latency * overload)
+            return ChatResponse(
+                thread_id=chat_request.thread_id or "thread",
+                message_id="message",
+                agent_response="ok",
+                token_count=1,
+                max_token_count=1,
+            )
+        finally:
+            self.active -= 1
+
+
+def build_app(service: MockLLMChatService, settings: ChatAdmissionSettings) -> FastAPI:
+    app = FastAPI()
+    app.include_router(chat_routes.router, prefix="/api/v1")
+    controller = AdmissionController(settings)
+    app.dependency_overrides[get_chat_service] = lambda: service
+    app.dependency_overrides[get_conditional_security] = lambda: "anonymous"
+    app.dependency_overrides[get_chat_admission] = lambda: controller
+    app.dependency_overrides[get_chat_idempotency] = lambda: None
+    return app
+
+
+async def run(
+    app: FastAPI, requests: int, clients: int, users: int
+) -> Tuple[Counter, Dict[int, List[float]], float]:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(clients)
+    statuses: Counter = Counter()
+    latencies: Dict[int, List[float]] = {}
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://load", timeout=None
+    ) as client:
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/chat",
+                    json={
+                        "user_prompt": "hello",
+                        "conversation_flow": "mock_flow",
+                        "user_id": f"user-{i % users}",
+                    },
+                )
+                elapsed = time.perf_counter() - start
+                statuses[response.status_code] += 1
+                latencies.setdefault(response.status_code, []).append(elapsed)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        return statuses, latencies, time.perf_counter() - start
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def report(
+    label: str, statuses: Counter, latencies: Dict[int, List[float]], wall: float
+) -> None:
+    print(f"{label}  ({wall:.2f}s wall)")
+    for status_code in sorted(statuses):
+        values = latencies[status_code]
+        print(
+            f"  {status_code}: {statuses[status_code]:5d} requests   "
+            f"p50 {percentile(values, 50) * 1000:8.1f} ms   "
+            f"p95 {percentile(values, 95) * 1000:8.1f} ms   "
+            f"p99 {percentile(values, 99) * 1000:8.1f} ms"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--capacity", type=int, default=16)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--max-concurrent", type=int, default=16)
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--adaptive", action="store_true")
+    args = parser.parse_args()
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR)
+    )
+
+    admission = ChatAdmissionSettings(
+        max_concurrent=args.max_concurrent,
+        max_queue=args.max_queue,
+        queue_timeout_seconds=2.0,
+        per_user_limit=8,
+        adaptive=args.adaptive,
+        target_latency_seconds=args.base_latency * 2,
+        min_concurrent=min(4, args.max_concurrent),
+    )
+    for label, settings in [
+        ("admission disabled", admission.model_copy(update={"enable": False})),
+        ("admission enabled", admission),
+    ]:
+        service = MockLLMChatService(args.capacity, args.base_latency)
+        result = await run(
+            build_app(service, settings), args.requests, args.clients, args.users
+        )
+        report(label, *result)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,6 +6,16 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def fresh_settings():
+    """Load settings from each test's own environment, not an earlier test's."""
+    from ingenious.config.snapshot import reset_settings
+
+    reset_settings()
+    yield
+    reset_settings()
+
+
 @pytest.fixture
 def mock_env():
     """Mock environment variables for testing"""
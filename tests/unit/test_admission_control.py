@@ -0,0 +1,249 @@
+"""
+Unit tests for chat admission control and load shedding.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.api.routes import chat as chat_routes
+from ingenious.config.models import ChatAdmissionSettings
+from ingenious.models.chat import ChatResponse
+from ingenious.services.admission_control import (
+    AdmissionController,
+    AdmissionRejectedError,
+)
+from ingenious.services.fastapi_dependencies import (
+    get_chat_admission,
+    get_chat_idempotency,
+    get_chat_service,
+    get_conditional_security,
+)
+
+
+def _controller(**overrides) -> AdmissionController:
+    settings = {"max_concurrent": 2, "max_queue": 2, "queue_timeout_seconds": 1.0}
+    settings.update(overrides)
+    return AdmissionController(ChatAdmissionSettings(**settings))
+
+
+class TestAdmissionController:
+    """Test cases for AdmissionController"""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_limit_then_queues(self):
+        """Test requests over the limit wait and are admitted in FIFO order"""
+        controller = _controller()
+        first = await controller.acquire()
+        await controller.acquire()
+
+        order = []
+
+        async def waiter(name):
+            ticket = await controller.acquire()
+            order.append(name)
+            return ticket
+
+        tasks = [asyncio.create_task(waiter(n)) for n in ("a", "b")]
+        await asyncio.sleep(0)
+        assert controller.queued == 2
+
+        first.release()
+        await asyncio.sleep(0.01)
+        assert order == ["a"]
+        assert controller.in_flight == 2
+
+        (await tasks[0]).release()
+        await tasks[1]
+        assert order == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_queue_full_rejected_with_503(self):
+        """Test requests beyond the queue bound are shed immediately"""
+        controller = _controller(max_concurrent=1, max_queue=1)
+        await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire()
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+        queued.cancel()
+
+    @pytest.mark.asyncio
+    async def test_queue_deadline(self):
+        """Test waiting requests are rejected once the deadline passes"""
+        controller = _controller(max_concurrent=1, queue_timeout_seconds=0.01)
+        await controller.acquire()
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire()
+
+        assert exc_info.value.status_code == 503
+        assert controller.queued == 0
+        assert controller.counters["rejected_timeout"] == 1
+
+    @pytest.mark.asyncio
+    async def test_per_user_limit_returns_429(self):
+        """Test one user cannot hold more than its share of slots"""
+        controller = _controller(max_concurrent=10, per_user_limit=1)
+        ticket = await controller.acquire(user="alice")
+        await controller.acquire(user="bob")
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire(user="alice")
+        assert exc_info.value.status_code == 429
+
+        ticket.release()
+        await controller.acquire(user="alice")
+
+    @pytest.mark.asyncio
+    async def test_per_flow_limit(self):
+        """Test a busy flow is shed without affecting other flows"""
+        controller = _controller(max_concurrent=10, per_flow_limit=1)
+        await controller.acquire(flow="slow_flow")
+
+        with pytest.raises(AdmissionRejectedError):
+            await controller.acquire(flow="slow_flow")
+        await controller.acquire(flow="other_flow")
+
+    @pytest.mark.asyncio
+    async def test_flow_spellings_share_limit(self):
+        """Test spellings the flow registry treats as one flow share its limit"""
+        controller = _controller(max_concurrent=10, per_flow_limit=1)
+        ticket = await controller.acquire(flow="bike-insights")
+
+        for spelling in ("bike_insights", "Bike-Insights"):
+            with pytest.raises(AdmissionRejectedError):
+                await controller.acquire(flow=spelling)
+        ticket.release()
+        await controller.acquire(flow="BIKE_INSIGHTS")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test a client that disconnects while queued does not leak a slot"""
+        controller = _controller(max_concurrent=1)
+        ticket = await controller.acquire(user="alice")
+        waiting = asyncio.create_task(controller.acquire(user="bob"))
+        await asyncio.sleep(0)
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        ticket.release()
+
+        assert controller.in_flight == 0
+        assert controller.queued == 0
+        assert controller.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_release_is_idempotent(self):
+        """Test releasing a ticket twice frees only one slot"""
+        controller = _controller()
+        ticket = await controller.acquire()
+        await controller.acquire()
+
+        ticket.release()
+        ticket.release()
+
+        assert controller.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_admits_everything(self):
+        """Test no limits apply when admission control is disabled"""
+        controller = _controller(enable=False, max_concurrent=1)
+        for _ in range(5):
+            await controller.acquire(user="alice")
+
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_adaptive_limit_follows_latency(self):
+        """Test the limit shrinks under slow responses and recovers when fast"""
+        controller = _controller(
+            max_concurrent=10,
+            adaptive=True,
+            target_latency_seconds=1.0,
+            min_concurrent=2,
+        )
+
+        for _ in range(40):
+            controller._record_latency(5.0)
+        assert controller.limit < 10
+        assert controller.limit >= 2
+
+        shrunk = controller.limit
+        for _ in range(200):
+            controller._record_latency(0.1)
+        assert controller.limit > shrunk
+        assert controller.limit <= 10
+
+
+class TestChatRouteAdmission:
+    """Test the chat route maps shed requests to HTTP responses"""
+
+    def _client(
+        self, controller: AdmissionController, username: str = "anonymous"
+    ) -> TestClient:
+        app = FastAPI()
+        app.include_router(chat_routes.router)
+        service = Mock()
+        service.get_chat_response = AsyncMock(
+            return_value=ChatResponse(
+                thread_id="t",
+                message_id="m",
+                agent_response="ok",
+                token_count=1,
+                max_token_count=1,
+            )
+        )
+        app.dependency_overrides[get_chat_service] = lambda: service
+        app.dependency_overrides[get_conditional_security] = lambda: username
+        app.dependency_overrides[get_chat_admission] = lambda: controller
+        app.dependency_overrides[get_chat_idempotency] = lambda: None
+        return TestClient(app)
+
+    def test_admitted_request_releases_slot(self):
+        """Test a successful chat request frees its slot"""
+        controller = _controller(max_concurrent=1)
+        client = self._client(controller)
+
+        response = client.post(
+            "/chat", json={"user_prompt": "hi", "conversation_flow": "flow"}
+        )
+
+        assert response.status_code == 200
+        assert controller.in_flight == 0
+
+    def test_rejection_has_retry_after(self):
+        """Test shed requests return 429 with a Retry-After header"""
+        controller = _controller(per_user_limit=1)
+        controller._per_user["alice"] = 1
+        client = self._client(controller)
+
+        response = client.post(
+            "/chat",
+            json={"user_prompt": "hi", "conversation_flow": "flow", "user_id": "alice"},
+        )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    @pytest.mark.parametrize("path", ["/chat", "/chat/stream"])
+    def test_authenticated_user_cannot_pick_user_id(self, path):
+        """Test per-user limits apply to the username, whatever user_id is sent"""
+        controller = _controller(per_user_limit=1)
+        controller._per_user["alice"] = 1
+        client = self._client(controller, username="alice")
+
+        response = client.post(
+            path,
+            json={"user_prompt": "hi", "conversation_flow": "flow", "user_id": "bob"},
+        )
+
+        assert response.status_code == 429
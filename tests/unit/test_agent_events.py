@@ -0,0 +1,253 @@
+"""
+Unit tests for streaming agent events from multi-agent flows.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from autogen_core import SingleThreadedAgentRuntime, TopicId, TypeSubscription
+from autogen_core.logging import LLMStreamEndEvent
+from autogen_core.models import CreateResult, RequestUsage
+
+from ingenious.core import agent_events
+from ingenious.core.agent_events import AgentEventStream
+from ingenious.models.ag_agents import RoutedAssistantAgent, RoutedResponseOutputAgent
+from ingenious.models.agent import Agent, AgentMessage, LLMUsageTracker
+from ingenious.models.chat import ChatRequest, ChatResponse
+from ingenious.services.chat_services.multi_agent.service import (
+    multi_agent_chat_service,
+)
+from ingenious.services.flow_registry import FlowRegistry, build_registration
+
+MODEL = SimpleNamespace(
+    model="gpt-4o",
+    api_key="test-key",
+    base_url="https://test.openai.azure.com/",
+    deployment="gpt-4o",
+    api_version="2024-10-21",
+)
+
+
+class StreamingModelClient:
+    """Model client that answers in three tokens, streamed or not."""
+
+    model_info = {
+        "vision": False,
+        "function_calling": True,
+        "json_output": False,
+        "family": "unknown",
+        "structured_output": False,
+    }
+
+    def __init__(self) -> None:
+        self.stream_kwargs: List[dict] = []
+
+    def _result(self) -> CreateResult:
+        return CreateResult(
+            finish_reason="stop",
+            content="Sales are up",
+            usage=RequestUsage(prompt_tokens=5, completion_tokens=3),
+            cached=False,
+        )
+
+    async def create(self, messages, **kwargs):
+        return self._result()
+
+    async def create_stream(self, messages, **kwargs):
+        self.stream_kwargs.append(kwargs)
+        for token in ("Sales", " are", " up"):
+            await asyncio.sleep(0)
+            yield token
+        yield self._result()
+
+
+def _agent(name: str) -> Agent:
+    agent = Agent(
+        agent_name=name,
+        agent_model_name="gpt-4o",
+        agent_display_name=name,
+        agent_description=name,
+        agent_type="researcher",
+        system_prompt="You analyse bike sales.",
+    )
+    agent.model = MODEL
+    return agent
+
+
+async def _run_agent(agent_class: type, client: StreamingModelClient) -> None:
+    """Send one message to an agent of ``agent_class`` in a fresh runtime."""
+    runtime = SingleThreadedAgentRuntime()
+    agent = _agent("analyst")
+    registered = await agent_class.register(
+        runtime,
+        "analyst",
+        lambda: agent_class(agent=agent, data_identifier="test", model_client=client),
+    )
+    await runtime.add_subscription(
+        TypeSubscription(topic_type="analyst", agent_type=registered.type)
+    )
+    runtime.start()
+    await runtime.publish_message(
+        AgentMessage(content="data"), TopicId("analyst", source="default")
+    )
+    await runtime.stop_when_idle()
+
+
+async def _collect(coro) -> List:
+    stream = AgentEventStream("thread-1")
+    task = stream.run(coro)
+    events = [event async for event in stream]
+    await task
+    return events
+
+
+class TestAgentEventStream:
+    """Test events reach the stream of the request that published them"""
+
+    @pytest.mark.asyncio
+    async def test_events_from_nested_tasks(self):
+        async def flow() -> str:
+            async def agent(name: str) -> None:
+                agent_events.publish(agent_events.AGENT_START, name)
+
+            await asyncio.gather(agent("first"), agent("second"))
+            return "done"
+
+        stream = AgentEventStream("thread-1")
+        task = stream.run(flow())
+        events = [event async for event in stream]
+
+        assert await task == "done"
+        assert [(e.chunk_type, e.agent_name) for e in events] == [
+            ("agent_start", "first"),
+            ("agent_start", "second"),
+        ]
+        assert events[0].thread_id == "thread-1"
+
+    def test_publish_without_stream_is_ignored(self):
+        """Test agents outside a streaming request publish nothing"""
+        assert not agent_events.streaming()
+        agent_events.publish(agent_events.AGENT_START, "analyst")
+
+
+class TestRoutedAgentEvents:
+    """Test the routed agents publish their progress when streamed"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "agent_class", [RoutedAssistantAgent, RoutedResponseOutputAgent]
+    )
+    async def test_agent_streams_tokens(self, agent_class):
+        client = StreamingModelClient()
+
+        events = await _collect(_run_agent(agent_class, client))
+
+        assert [e.chunk_type for e in events] == [
+            "agent_start",
+            "agent_delta",
+            "agent_delta",
+            "agent_delta",
+            "agent_complete",
+        ]
+        deltas = "".join(e.content for e in events[1:-1])
+        assert deltas == events[-1].content == "Sales are up"
+        assert {e.agent_name for e in events} == {"analyst"}
+        # Usage is asked for so streamed calls still count tokens
+        assert client.stream_kwargs[0]["extra_create_args"] == {
+            "stream_options": {"include_usage": True}
+        }
+
+    @pytest.mark.asyncio
+    async def test_agent_not_streamed_outside_stream(self):
+        """Test agents make ordinary model calls for non-streaming requests"""
+        client = StreamingModelClient()
+
+        await _run_agent(RoutedAssistantAgent, client)
+
+        assert client.stream_kwargs == []
+
+
+class TestStreamedUsage:
+    """Test the usage tracker records streamed model calls"""
+
+    def test_stream_end_event_updates_chat(self):
+        agent = _agent("analyst")
+        agent.add_agent_chat(content="data", identifier="test", source="default")
+        agents = Mock()
+        agents.get_agent_by_name.return_value = agent
+        tracker = LLMUsageTracker(
+            agents=agents,
+            config=Mock(),
+            chat_history_repository=Mock(),
+            revision_id="test",
+            identifier="test",
+            event_type="test",
+        )
+        event = LLMStreamEndEvent(
+            response={"content": "Sales are up"}, prompt_tokens=5, completion_tokens=3
+        )
+        event.kwargs["agent_id"] = "analyst/default"
+
+        tracker.emit(Mock(msg=event))
+
+        assert tracker.tokens == 8
+        assert tracker._queue[0].chat_response.chat_message.content == "Sales are up"
+
+
+class EventFlow:
+    """Flow whose agents publish events before it returns."""
+
+    def __init__(self, parent_multi_agent_chat_service):
+        pass
+
+    async def get_conversation_response(self, chat_request):
+        agent_events.publish(agent_events.AGENT_START, "analyst")
+        agent_events.publish(agent_events.AGENT_COMPLETE, "analyst", content="ok")
+        return ChatResponse(
+            thread_id=chat_request.thread_id,
+            message_id="m1",
+            agent_response="ok",
+            token_count=8,
+            max_token_count=0,
+        )
+
+
+class TestServiceStreaming:
+    """Test /chat/stream's fallback path streams agent events"""
+
+    @pytest.mark.asyncio
+    async def test_agent_events_precede_response(self):
+        registry = FlowRegistry()
+        registry._flows["event_flow"] = build_registration("event_flow", EventFlow)
+        repository = Mock()
+        repository.get_thread_messages = AsyncMock(return_value=[])
+        repository.add_message = AsyncMock(return_value="id")
+        config = Mock()
+        config.web.streaming_chunk_size = 100
+        service = multi_agent_chat_service(
+            config=config,
+            chat_history_repository=repository,
+            conversation_flow="event_flow",
+        )
+        request = ChatRequest(
+            user_prompt="hi", conversation_flow="event_flow", thread_id="t1"
+        )
+
+        with patch(
+            "ingenious.services.chat_services.multi_agent.service.get_flow_registry",
+            return_value=registry,
+        ):
+            chunks = [
+                chunk async for chunk in service.get_streaming_chat_response(request)
+            ]
+
+        assert [c.chunk_type for c in chunks] == [
+            "agent_start",
+            "agent_complete",
+            "content",
+            "final",
+        ]
+        assert chunks[-1].token_count == 8
@@ -0,0 +1,322 @@
+"""
+Unit tests for concurrent agent fan-out, shared model clients and LLM usage routing.
+"""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+from typing import Dict, List
+from unittest.mock import Mock
+
+import pytest
+from autogen_core import (
+    EVENT_LOGGER_NAME,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+)
+from autogen_core.models import CreateResult, RequestUsage
+
+from ingenious.models import ag_agents
+from ingenious.models.ag_agents import RelayAgent, RoutedAssistantAgent
+from ingenious.models.agent import (
+    Agent,
+    AgentMessage,
+    Agents,
+    LLMUsageTracker,
+    track_llm_usage,
+)
+
+MODEL = SimpleNamespace(
+    model="gpt-4o",
+    api_key="test-key",
+    base_url="https://test.openai.azure.com/",
+    deployment="gpt-4o",
+    api_version="2024-08-01-preview",
+)
+
+
+class FakeModelClient:
+    """Model client that answers after a delay set per system prompt."""
+
+    model_info = {
+        "vision": False,
+        "function_calling": True,
+        "json_output": False,
+        "family": "unknown",
+        "structured_output": False,
+    }
+
+    def __init__(self, delays: Dict[str, float]) -> None:
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+
+    async def create(self, messages, cancellation_token=None, **kwargs):
+        name = messages[0].content
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays[name])
+        finally:
+            self.active -= 1
+        return CreateResult(
+            finish_reason="stop",
+            content=f"{name} answer",
+            usage=RequestUsage(prompt_tokens=1, completion_tokens=1),
+            cached=False,
+        )
+
+    def create_stream(self, messages, **kwargs):
+        raise NotImplementedError
+
+
+class ClosingModelClient:
+    """Model client that records the loop it was closed on."""
+
+    def __init__(self) -> None:
+        self.closed_on = None
+
+    async def close(self) -> None:
+        self.closed_on = asyncio.get_running_loop()
+
+
+class Collector(RoutedAgent):
+    def __init__(self, received: List[str]) -> None:
+        super().__init__("collector")
+        self._received = received
+
+    @message_handler
+    async def handle(self, message: AgentMessage, ctx: MessageContext) -> None:
+        self._received.append(message.content)
+
+
+def _agent(name: str) -> Agent:
+    agent = Agent(
+        agent_name=name,
+        agent_model_name="gpt-4o",
+        agent_display_name=name.replace("_", " ").title(),
+        agent_description=name,
+        agent_type="researcher",
+        system_prompt=name,
+    )
+    agent.model = MODEL
+    return agent
+
+
+async def _fan_out(
+    client: FakeModelClient,
+    semaphore: asyncio.Semaphore,
+    timeout: float = 5,
+) -> str:
+    """Send one message each to two analysts whose answers a relay joins."""
+    runtime = SingleThreadedAgentRuntime()
+    received: List[str] = []
+
+    for name in ("customer_sentiment_agent", "fiscal_analysis_agent"):
+        agent = _agent(name)
+        registered = await RoutedAssistantAgent.register(
+            runtime,
+            name,
+            lambda agent=agent: RoutedAssistantAgent(
+                agent=agent,
+                data_identifier="test",
+                next_agent_topic="user_proxy",
+                model_client=client,
+                timeout=timeout,
+                semaphore=semaphore,
+            ),
+        )
+        await runtime.add_subscription(
+            TypeSubscription(topic_type=name, agent_type=registered.type)
+        )
+
+    relay = await RelayAgent.register(
+        runtime,
+        "user_proxy",
+        lambda: RelayAgent(
+            _agent("user_proxy"),
+            data_identifier="test",
+            next_agent_topic="summary",
+            number_of_messages_before_next_agent=2,
+            message_order=["customer_sentiment_agent", "fiscal_analysis_agent"],
+        ),
+    )
+    await runtime.add_subscription(
+        TypeSubscription(topic_type="user_proxy", agent_type=relay.type)
+    )
+    collector = await Collector.register(
+        runtime, "summary", lambda: Collector(received)
+    )
+    await runtime.add_subscription(
+        TypeSubscription(topic_type="summary", agent_type=collector.type)
+    )
+
+    runtime.start()
+    await asyncio.gather(
+        *[
+            runtime.publish_message(
+                AgentMessage(content="data"), TopicId(name, source="default")
+            )
+            for name in ("customer_sentiment_agent", "fiscal_analysis_agent")
+        ]
+    )
+    await runtime.stop_when_idle()
+    assert len(received) == 1
+    return received[0]
+
+
+class TestFanOut:
+    """Test independent agents run concurrently and are joined in order"""
+
+    @pytest.mark.asyncio
+    async def test_agents_run_concurrently_in_fixed_order(self):
+        """Test the faster agent does not jump ahead in the relayed message"""
+        client = FakeModelClient(
+            {"customer_sentiment_agent": 0.2, "fiscal_analysis_agent": 0.01}
+        )
+
+        content = await _fan_out(client, asyncio.Semaphore(4))
+
+        assert client.max_active == 2
+        assert content.index("## customer_sentiment_agent") < content.index(
+            "## fiscal_analysis_agent"
+        )
+
+    @pytest.mark.asyncio
+    async def test_semaphore_caps_parallel_calls(self):
+        """Test no more model calls run at once than the semaphore allows"""
+        client = FakeModelClient(
+            {"customer_sentiment_agent": 0.05, "fiscal_analysis_agent": 0.05}
+        )
+
+        await _fan_out(client, asyncio.Semaphore(1))
+
+        assert client.max_active == 1
+
+    @pytest.mark.asyncio
+    async def test_timed_out_agent_is_skipped(self):
+        """Test a slow agent passes on a note so the relay still publishes"""
+        client = FakeModelClient(
+            {"customer_sentiment_agent": 1.0, "fiscal_analysis_agent": 0.01}
+        )
+
+        content = await _fan_out(client, asyncio.Semaphore(4), timeout=0.1)
+
+        assert "Customer Sentiment Agent did not respond within 0.1 seconds" in content
+        assert "fiscal_analysis_agent answer" in content
+
+
+class TestModelClientPool:
+    """Test model clients are shared per event loop"""
+
+    def test_shared_within_loop(self, monkeypatch):
+        monkeypatch.setattr(
+            ag_agents, "_model_clients", type(ag_agents._model_clients)()
+        )
+
+        async def two_clients():
+            return ag_agents.get_model_client(MODEL), ag_agents.get_model_client(MODEL)
+
+        first, second = asyncio.run(two_clients())
+        other_loop, _ = asyncio.run(two_clients())
+
+        assert first is second
+        assert other_loop is not first
+        assert ag_agents.get_model_client(MODEL) is not first
+
+    @pytest.mark.asyncio
+    async def test_dropped_clients_closed_on_their_loop(self, monkeypatch):
+        """Test a settings reload closes the old clients on the loop that owns them"""
+        monkeypatch.setattr(
+            ag_agents, "_model_clients", type(ag_agents._model_clients)()
+        )
+        client = ClosingModelClient()
+        ag_agents._model_clients[asyncio.get_running_loop()] = {("key",): client}
+        old = SimpleNamespace(models=[MODEL])
+        new = SimpleNamespace(
+            models=[], chat_service=SimpleNamespace(agent_timeout_seconds=0)
+        )
+
+        # Reloads run in a worker thread
+        await asyncio.to_thread(ag_agents._drop_model_clients, old, new)
+        while ag_agents._closing_tasks:
+            await asyncio.sleep(0.01)
+
+        assert client.closed_on is asyncio.get_running_loop()
+        assert len(ag_agents._model_clients) == 0
+
+    @pytest.mark.asyncio
+    async def test_close_model_clients(self, monkeypatch):
+        """Test shutdown closes the clients shared on the running loop"""
+        monkeypatch.setattr(
+            ag_agents, "_model_clients", type(ag_agents._model_clients)()
+        )
+        client = ClosingModelClient()
+        ag_agents._model_clients[asyncio.get_running_loop()] = {("key",): client}
+
+        await ag_agents.close_model_clients()
+
+        assert client.closed_on is asyncio.get_running_loop()
+        assert asyncio.get_running_loop() not in ag_agents._model_clients
+
+    def test_agents_instrumented_separately(self):
+        """Test each agent wraps the shared client without patching it"""
+        shared = FakeModelClient({})
+        create = shared.create
+
+        first = ag_agents._agent_model_client(_agent("first"), shared)
+        second = ag_agents._agent_model_client(_agent("second"), shared)
+
+        assert first.create is not second.create
+        assert shared.create == create
+        assert first.model_info is shared.model_info
+
+
+class TestLLMUsageRouting:
+    """Test LLM events reach the tracker of the request that made the call"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_keep_their_events(self):
+        event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+        trackers = [Mock(), Mock()]
+
+        async def request(tracker: Mock, message: str) -> None:
+            track_llm_usage(tracker)
+            await asyncio.sleep(0.01)
+            event_logger.info(message)
+
+        await asyncio.gather(
+            asyncio.create_task(request(trackers[0], "first")),
+            asyncio.create_task(request(trackers[1], "second")),
+        )
+
+        assert [c.args[0].msg for c in trackers[0].emit.call_args_list] == ["first"]
+        assert [c.args[0].msg for c in trackers[1].emit.call_args_list] == ["second"]
+
+    def test_agent_chats_in_agent_order(self):
+        """Test chats come back in agent order, not the order calls finished"""
+        agents = Agents(
+            [_agent("customer_sentiment_agent"), _agent("fiscal_analysis_agent")],
+            SimpleNamespace(models=[MODEL]),
+        )
+        tracker = LLMUsageTracker(
+            agents=agents,
+            config=Mock(),
+            chat_history_repository=Mock(),
+            revision_id="test",
+            identifier="test",
+            event_type="test",
+        )
+        fiscal, sentiment = (
+            agents.get_agent_by_name(name).add_agent_chat(
+                name, "test", source="default"
+            )
+            for name in ("fiscal_analysis_agent", "customer_sentiment_agent")
+        )
+        tracker._queue.extend([fiscal, sentiment])
+
+        assert tracker.get_agent_chats() == [sentiment, fiscal]
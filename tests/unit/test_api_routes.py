@@ -114,3 +114,108 @@ class TestPromptsRoutes:
         from ingenious.api.routes.prompts import UpdatePromptRequest
 
         assert UpdatePromptRequest is not None
+
+    @pytest.fixture
+    def prompt_storage(self, tmp_path):
+        from types import SimpleNamespace
+
+        from ingenious.config.models import FileStorageContainerSettings
+        from ingenious.files.files_repository import FileStorage
+
+        revision_dir = tmp_path / "templates" / "prompts" / "bike-insights"
+        revision_dir.mkdir(parents=True)
+        (revision_dir / "summary_prompt.jinja").write_text("Summarise")
+        (revision_dir / "fiscal_prompt.jinja").write_text("Fiscal")
+        config = SimpleNamespace(
+            file_storage=SimpleNamespace(
+                revisions=FileStorageContainerSettings(
+                    storage_type="local", path=str(tmp_path)
+                )
+            )
+        )
+        return FileStorage(config)
+
+    @pytest.fixture
+    def registry(self):
+        from ingenious.services.template_registry import TemplateRegistry
+
+        registry = TemplateRegistry()
+        with patch(
+            "ingenious.api.routes.prompts.get_template_registry",
+            return_value=registry,
+        ):
+            yield registry
+
+    @pytest.mark.asyncio
+    async def test_list_prompts_resolves_hyphenated_revision(
+        self, prompt_storage, registry
+    ):
+        """Test the underscored revision id resolves to the hyphenated folder."""
+        from ingenious.api.routes.prompts import list_prompts_enhanced
+
+        result = await list_prompts_enhanced(
+            "bike_insights", Mock(), "user", prompt_storage
+        )
+
+        assert result["actual_revision_used"] == "bike-insights"
+        assert result["files"] == ["fiscal_prompt.jinja", "summary_prompt.jinja"]
+        assert await registry.resolve_revision(prompt_storage, "bike_insights") == (
+            "bike-insights"
+        )
+
+    @pytest.mark.asyncio
+    async def test_view_and_update_round_trip(self, prompt_storage, registry):
+        """Test update replaces the template and invalidates the cached copy."""
+        from ingenious.api.routes.prompts import UpdatePromptRequest, update, view
+
+        assert (
+            await registry.render(
+                prompt_storage, "summary_prompt.jinja", "bike-insights"
+            )
+            == "Summarise"
+        )
+
+        result = await update(
+            "bike_insights",
+            "summary_prompt.jinja",
+            Mock(),
+            UpdatePromptRequest(content="Summarise {{ 1 + 1 }}"),
+            "user",
+            prompt_storage,
+        )
+        content = await view(
+            "bike_insights", "summary_prompt.jinja", Mock(), "user", prompt_storage
+        )
+
+        assert result == {"message": "File updated successfully"}
+        assert content == "Summarise {{ 1 + 1 }}"
+        assert (
+            await registry.render(
+                prompt_storage, "summary_prompt.jinja", "bike-insights"
+            )
+            == "Summarise 2"
+        )
+
+    @pytest.mark.asyncio
+    async def test_update_failure_returns_500(self, prompt_storage, registry):
+        """Test a failed write surfaces as an HTTP 500."""
+        from fastapi import HTTPException
+
+        from ingenious.api.routes.prompts import UpdatePromptRequest, update
+
+        with patch.object(
+            prompt_storage.repository,
+            "write_file_atomic",
+            side_effect=OSError("disk full"),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await update(
+                    "bike-insights",
+                    "summary_prompt.jinja",
+                    Mock(),
+                    UpdatePromptRequest(content="x"),
+                    "user",
+                    prompt_storage,
+                )
+
+        assert exc_info.value.status_code == 500
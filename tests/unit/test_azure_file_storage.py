@@ -0,0 +1,373 @@
+"""
+Unit tests for the async Azure Blob file storage backend.
+
+By default the tests run against an in-memory fake of the ``azure.storage.blob.aio``
+client surface used by the backend. Set ``INGENIOUS_TEST_AZURITE_CONNECTION_STRING``
+to run the same tests against a local Azurite instance instead.
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+import pytest
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.identity.aio import ManagedIdentityCredential
+
+from ingenious.config.models import FileStorageContainerSettings
+from ingenious.files.azure import (
+    _shared_clients,
+    azure_FileStorageRepository,
+    close_shared_clients,
+)
+
+AZURITE_CONNECTION_STRING = os.getenv("INGENIOUS_TEST_AZURITE_CONNECTION_STRING")
+CHUNK_SIZE = 1024
+
+
+class FakeBlobStore:
+    """In-memory stand-in for an Azurite account."""
+
+    def __init__(self) -> None:
+        self.containers: Set[str] = set()
+        self.blobs: Dict[Tuple[str, str], bytes] = {}
+        self.active_downloads = 0
+        self.peak_downloads = 0
+        self.streamed_uploads = 0
+
+
+class FakeDownloader:
+    def __init__(
+        self, store: FakeBlobStore, data: bytes, encoding: Optional[str]
+    ) -> None:
+        self._store = store
+        self._data = data
+        self._encoding = encoding
+
+    async def readall(self) -> Any:
+        self._store.active_downloads += 1
+        self._store.peak_downloads = max(
+            self._store.peak_downloads, self._store.active_downloads
+        )
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self._store.active_downloads -= 1
+        if self._encoding:
+            return self._data.decode(self._encoding)
+        return self._data
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        for i in range(0, len(self._data), CHUNK_SIZE):
+            yield self._data[i : i + CHUNK_SIZE]
+
+
+def _blob_item(name: str, data: bytes) -> SimpleNamespace:
+    return SimpleNamespace(
+        name=name,
+        size=len(data),
+        last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        etag=f'"{hashlib.md5(data).hexdigest()}"',
+    )
+
+
+class FakeBlobClient:
+    def __init__(self, store: FakeBlobStore, container: str, blob: str) -> None:
+        self._store = store
+        self._key = (container, blob)
+
+    async def download_blob(
+        self, max_concurrency: int = 1, encoding: Optional[str] = None
+    ) -> FakeDownloader:
+        if self._key not in self._store.blobs:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return FakeDownloader(self._store, self._store.blobs[self._key], encoding)
+
+    async def delete_blob(self) -> None:
+        if self._key not in self._store.blobs:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        del self._store.blobs[self._key]
+
+    async def exists(self) -> bool:
+        return self._key in self._store.blobs
+
+    async def get_blob_properties(self) -> SimpleNamespace:
+        if self._key not in self._store.blobs:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return _blob_item(self._key[1], self._store.blobs[self._key])
+
+
+class FakeContainerClient:
+    def __init__(self, store: FakeBlobStore, name: str) -> None:
+        self._store = store
+        self._name = name
+
+    async def create_container(self) -> None:
+        if self._name in self._store.containers:
+            raise ResourceExistsError("The specified container already exists.")
+        self._store.containers.add(self._name)
+
+    async def upload_blob(
+        self, name: str, data: Any, length: Optional[int] = None, **kwargs: Any
+    ) -> None:
+        if self._name not in self._store.containers:
+            raise ResourceNotFoundError("The specified container does not exist.")
+        if isinstance(data, bytes):
+            payload = data
+        else:
+            self._store.streamed_uploads += 1
+            payload = b"".join([chunk async for chunk in data])
+        self._store.blobs[(self._name, name)] = payload
+
+    async def list_blobs(
+        self, name_starts_with: Optional[str] = None
+    ) -> AsyncIterator[SimpleNamespace]:
+        for container, blob in sorted(self._store.blobs):
+            if container == self._name and blob.startswith(name_starts_with or ""):
+                yield _blob_item(blob, self._store.blobs[(container, blob)])
+
+    async def walk_blobs(
+        self, name_starts_with: Optional[str] = None, delimiter: str = "/"
+    ) -> AsyncIterator[SimpleNamespace]:
+        prefix = name_starts_with or ""
+        seen_prefixes = set()
+        async for blob in self.list_blobs(name_starts_with=prefix):
+            rest = blob.name[len(prefix) :]
+            if delimiter in rest:
+                virtual_dir = prefix + rest.split(delimiter, 1)[0] + delimiter
+                if virtual_dir not in seen_prefixes:
+                    seen_prefixes.add(virtual_dir)
+                    yield SimpleNamespace(name=virtual_dir, prefix=virtual_dir)
+            else:
+                yield blob
+
+
+class FakeBlobServiceClient:
+    def __init__(self, store: FakeBlobStore) -> None:
+        self._store = store
+        self.closed = False
+
+    def get_container_client(self, container: str) -> FakeContainerClient:
+        return FakeContainerClient(self._store, container)
+
+    def get_blob_client(self, container: str, blob: str) -> FakeBlobClient:
+        return FakeBlobClient(self._store, container, blob)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def blob_store() -> FakeBlobStore:
+    return FakeBlobStore()
+
+
+@pytest.fixture
+def fs_config() -> FileStorageContainerSettings:
+    return FileStorageContainerSettings(
+        storage_type="azure",
+        container_name=f"ingenious-tests-{uuid.uuid4().hex[:8]}",
+        path="prefix",
+        url="http://127.0.0.1:10000/devstoreaccount1",
+        token=AZURITE_CONNECTION_STRING or "fake-sas-token",
+        authentication_method="token",
+        max_single_get_size=CHUNK_SIZE,
+        max_chunk_get_size=CHUNK_SIZE,
+        max_block_size=CHUNK_SIZE,
+        max_single_put_size=CHUNK_SIZE,
+        bulk_concurrency=2,
+    )
+
+
+@pytest.fixture
+def storage(
+    fs_config: FileStorageContainerSettings,
+    blob_store: FakeBlobStore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> azure_FileStorageRepository:
+    if not AZURITE_CONNECTION_STRING:
+        monkeypatch.setattr(
+            azure_FileStorageRepository,
+            "_create_blob_service_client",
+            lambda self: FakeBlobServiceClient(blob_store),
+        )
+    return azure_FileStorageRepository(config=None, fs_config=fs_config)  # type: ignore[arg-type]
+
+
+async def _close_clients() -> None:
+    await close_shared_clients()
+
+
+class TestAzureFileStorageRepository:
+    """Test cases for the async Azure Blob backend."""
+
+    @pytest.mark.asyncio
+    async def test_write_creates_container_and_reads_back(self, storage):
+        path = await storage.write_file("hello world", "greeting.md", "templates")
+
+        assert path == "prefix/templates/greeting.md"
+        assert await storage.read_file("greeting.md", "templates") == "hello world"
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_read_does_not_print(self, storage, capsys):
+        await storage.write_file("content", "quiet.md", "templates")
+        await storage.read_file("quiet.md", "templates")
+
+        assert capsys.readouterr().out == ""
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_list_files_returns_prefixed_names(self, storage):
+        await storage.write_file("a", "one.jinja", "templates/prompts/rev1")
+        await storage.write_file("b", "two.jinja", "templates/prompts/rev1")
+        await storage.write_file("c", "other.jinja", "templates/prompts/rev2")
+
+        listing = await storage.list_files("templates/prompts/rev1")
+
+        assert listing.split("\n") == [
+            "prefix/templates/prompts/rev1/one.jinja",
+            "prefix/templates/prompts/rev1/two.jinja",
+        ]
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_iter_files_returns_metadata(self, storage):
+        await storage.write_file("a", "one.jinja", "templates/prompts/rev1")
+        await storage.write_file("bb", "two.jinja", "templates/prompts/rev1/nested")
+        await storage.write_file("c", "other.jinja", "templates/prompts/rev10")
+
+        entries = await storage.list_file_entries("templates/prompts/rev1")
+        recursive = await storage.list_file_entries(
+            "templates/prompts/rev1", recursive=True
+        )
+
+        assert [entry.name for entry in entries] == ["one.jinja"]
+        assert entries[0].path == "prefix/templates/prompts/rev1/one.jinja"
+        assert entries[0].size == 1
+        assert entries[0].modified is not None
+        assert entries[0].etag == await storage.get_file_version(
+            "one.jinja", "templates/prompts/rev1"
+        )
+        assert sorted(entry.name for entry in recursive) == [
+            "nested/two.jinja",
+            "one.jinja",
+        ]
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_get_file_version_missing_blob(self, storage):
+        await storage.write_file("x", "present.md", "scratch")
+        assert await storage.get_file_version("absent.md", "scratch") is None
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_exists_and_delete(self, storage):
+        await storage.write_file("x", "temp.md", "scratch")
+        assert await storage.check_if_file_exists("scratch", "temp.md") is True
+
+        await storage.delete_file("temp.md", "scratch")
+        assert await storage.check_if_file_exists("scratch", "temp.md") is False
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_read_missing_blob_raises(self, storage):
+        await storage.write_file("x", "present.md", "scratch")
+        with pytest.raises(ResourceNotFoundError):
+            await storage.read_file("missing.md", "scratch")
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_read_file_stream_yields_chunks(self, storage):
+        payload = os.urandom(CHUNK_SIZE * 3 + 17)
+        body = payload.hex()
+        await storage.write_file(body, "big.txt", "streams")
+
+        chunks = [
+            chunk async for chunk in storage.read_file_stream("big.txt", "streams")
+        ]
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= CHUNK_SIZE for chunk in chunks)
+        assert b"".join(chunks).decode("utf-8") == body
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_write_file_stream_uploads_async_iterable(self, storage, blob_store):
+        async def produce() -> AsyncIterator[bytes]:
+            for i in range(5):
+                yield f"line {i}\n".encode("utf-8")
+
+        path = await storage.write_file_stream(produce(), "lines.txt", "streams")
+
+        assert path == "prefix/streams/lines.txt"
+        expected = "".join(f"line {i}\n" for i in range(5))
+        assert await storage.read_file("lines.txt", "streams") == expected
+        if not AZURITE_CONNECTION_STRING:
+            assert blob_store.streamed_uploads == 1
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_write_many_and_read_many(self, storage, blob_store):
+        files = {f"agent_{i}_prompt.jinja": f"prompt {i}" for i in range(6)}
+
+        written = await storage.write_many(files, "templates/prompts/rev1")
+        contents = await storage.read_many(list(files), "templates/prompts/rev1")
+
+        assert set(written) == set(files)
+        assert contents == files
+        if not AZURITE_CONNECTION_STRING:
+            # bulk_concurrency=2 in the fixture
+            assert blob_store.peak_downloads == 2
+        await _close_clients()
+
+    @pytest.mark.asyncio
+    async def test_repositories_share_client_per_loop(self, storage, fs_config):
+        other = azure_FileStorageRepository(config=None, fs_config=fs_config)  # type: ignore[arg-type]
+
+        assert storage.blob_service_client is other.blob_service_client
+        client = storage.blob_service_client
+
+        await close_shared_clients()
+
+        assert asyncio.get_running_loop() not in _shared_clients
+        if not AZURITE_CONNECTION_STRING:
+            assert client.closed is True
+
+    @pytest.mark.asyncio
+    async def test_close_shared_clients_closes_credentials(
+        self, fs_config, monkeypatch
+    ):
+        closed = []
+
+        async def close(credential: ManagedIdentityCredential) -> None:
+            closed.append(credential)
+
+        monkeypatch.setattr(ManagedIdentityCredential, "close", close)
+        fs_config.token = ""
+        fs_config.url = "https://account.blob.core.windows.net"
+        fs_config.authentication_method = "msi"
+        repository = azure_FileStorageRepository(config=None, fs_config=fs_config)  # type: ignore[arg-type]
+        credential = repository.blob_service_client.credential
+
+        await close_shared_clients()
+
+        assert closed == [credential]
+
+    def test_invalid_authentication_method_raises(self, fs_config):
+        fs_config.token = ""
+        fs_config.authentication_method = "unsupported"
+
+        with pytest.raises(ValueError, match="Invalid authentication configuration"):
+            azure_FileStorageRepository(config=None, fs_config=fs_config)  # type: ignore[arg-type]
+
+    def test_transfer_settings_from_config(self, fs_config):
+        fs_config.max_concurrency = 6
+        repository = azure_FileStorageRepository(config=None, fs_config=fs_config)  # type: ignore[arg-type]
+
+        assert repository.max_concurrency == 6
+        assert repository.transfer_settings["max_chunk_get_size"] == CHUNK_SIZE
@@ -0,0 +1,222 @@
+"""
+Unit tests for the batch chat endpoint and its bounded executor.
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.api.routes import chat as chat_routes
+from ingenious.config.main_settings import IngeniousSettings
+from ingenious.config.models import ChatAdmissionSettings, ChatBatchSettings
+from ingenious.models.chat import ChatBatchItemResult, ChatBatchSummary, ChatResponse
+from ingenious.services.admission_control import AdmissionController
+from ingenious.services.chat_batch import (
+    BatchTooLargeError,
+    parse_chat_batch,
+    run_chat_batch,
+)
+from ingenious.services.fastapi_dependencies import (
+    get_chat_admission,
+    get_chat_service_factory,
+    get_conditional_security,
+    get_config,
+)
+
+
+def _request(prompt: str = "hi", flow: str = "flow") -> dict:
+    return {"user_prompt": prompt, "conversation_flow": flow}
+
+
+class FakeChatService:
+    """Chat service recording concurrency and echoing the prompt."""
+
+    active = 0
+    peak = 0
+
+    def __init__(self, conversation_flow: str) -> None:
+        self.conversation_flow = conversation_flow
+
+    async def get_chat_response(self, chat_request) -> ChatResponse:
+        cls = type(self)
+        cls.active += 1
+        cls.peak = max(cls.peak, cls.active)
+        try:
+            await asyncio.sleep(0.01)
+            if chat_request.user_prompt == "fail":
+                raise ValueError("bad prompt")
+            return ChatResponse(
+                thread_id="t",
+                message_id="m",
+                agent_response=f"{self.conversation_flow}:{chat_request.user_prompt}",
+                token_count=10,
+                max_token_count=100,
+            )
+        finally:
+            cls.active -= 1
+
+
+@pytest.fixture
+def fake_service():
+    FakeChatService.active = 0
+    FakeChatService.peak = 0
+    return FakeChatService
+
+
+class TestParseChatBatch:
+    """Test cases for parse_chat_batch"""
+
+    def test_json_array(self):
+        """Test a JSON array body is parsed into chat requests"""
+        items = parse_chat_batch(
+            json.dumps([_request("a"), _request("b")]).encode(), "application/json", 10
+        )
+
+        assert [item.user_prompt for item in items] == ["a", "b"]
+
+    def test_ndjson_with_invalid_lines(self):
+        """Test invalid NDJSON lines become error items at their index"""
+        body = "\n".join(
+            [json.dumps(_request("a")), "{not json", json.dumps({"user_prompt": "x"})]
+        ).encode()
+
+        items = parse_chat_batch(body, "application/x-ndjson; charset=utf-8", 10)
+
+        assert items[0].user_prompt == "a"
+        assert isinstance(items[1], ChatBatchItemResult) and items[1].index == 1
+        assert isinstance(items[2], ChatBatchItemResult) and items[2].status_code == 422
+
+    @pytest.mark.parametrize("body", [b"{}", b"[]", b"not json"])
+    def test_invalid_bodies(self, body):
+        """Test bodies that are not a non-empty array are rejected"""
+        with pytest.raises(ValueError):
+            parse_chat_batch(body, "application/json", 10)
+
+    def test_too_many_items(self):
+        """Test batches over max_items are rejected"""
+        with pytest.raises(BatchTooLargeError):
+            parse_chat_batch(
+                json.dumps([_request()] * 3).encode(), "application/json", 2
+            )
+
+
+class TestRunChatBatch:
+    """Test cases for run_chat_batch"""
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_totals(self, fake_service):
+        """Test items never exceed the concurrency limit and totals add up"""
+        items = parse_chat_batch(
+            json.dumps([_request(str(i)) for i in range(10)]).encode(),
+            "application/json",
+            100,
+        )
+
+        results = [r async for r in run_chat_batch(items, fake_service, 3)]
+
+        assert fake_service.peak == 3
+        summary = results[-1]
+        assert isinstance(summary, ChatBatchSummary)
+        assert summary.succeeded == 10
+        assert summary.total_token_count == 100
+        assert sorted(r.index for r in results[:-1]) == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_item_errors_do_not_stop_batch(self, fake_service):
+        """Test a failing item is reported and the others still run"""
+        items = parse_chat_batch(
+            json.dumps([_request("ok"), _request("fail"), _request("ok")]).encode(),
+            "application/json",
+            100,
+        )
+
+        results = [r async for r in run_chat_batch(items, fake_service, 2)]
+
+        errors = [r for r in results[:-1] if r.status == "error"]
+        assert [(e.index, e.status_code) for e in errors] == [(1, 400)]
+        assert results[-1].succeeded == 2
+        assert results[-1].failed == 1
+
+    @pytest.mark.asyncio
+    async def test_service_created_per_flow(self, fake_service):
+        """Test each item runs on a service for its own conversation flow"""
+        items = parse_chat_batch(
+            json.dumps([_request("a", "flow_a"), _request("b", "flow_b")]).encode(),
+            "application/json",
+            100,
+        )
+
+        results = [r async for r in run_chat_batch(items, fake_service, 2)]
+
+        answers = {r.index: r.response.agent_response for r in results[:-1]}
+        assert answers == {0: "flow_a:a", 1: "flow_b:b"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("user,status_code", [("alice", 429), (None, 200)])
+    async def test_items_admitted_as_caller(self, fake_service, user, status_code):
+        """Test items count against the caller's per-user limit, not user_id"""
+        admission = AdmissionController(ChatAdmissionSettings(per_user_limit=1))
+        admission._per_user["alice"] = 1
+        items = parse_chat_batch(
+            json.dumps([{**_request(), "user_id": "bob"}]).encode(),
+            "application/json",
+            100,
+        )
+
+        results = [
+            r
+            async for r in run_chat_batch(
+                items, fake_service, 1, admission=admission, user=user
+            )
+        ]
+
+        assert results[0].status_code == status_code
+
+
+class TestChatBatchRoute:
+    """Test the /chat/batch route"""
+
+    def _client(self, fake_service, max_concurrency: int = 4) -> TestClient:
+        app = FastAPI()
+        app.include_router(chat_routes.router)
+        config = Mock(spec=IngeniousSettings)
+        config.web_configuration = Mock()
+        config.web_configuration.batch = ChatBatchSettings(
+            max_items=5, max_concurrency=max_concurrency
+        )
+        app.dependency_overrides[get_config] = lambda: config
+        app.dependency_overrides[get_chat_service_factory] = lambda: fake_service
+        app.dependency_overrides[get_conditional_security] = lambda: "anonymous"
+        app.dependency_overrides[get_chat_admission] = lambda: None
+        return TestClient(app)
+
+    def test_streams_ndjson_results(self, fake_service):
+        """Test NDJSON uploads stream one line per item plus a summary"""
+        client = self._client(fake_service)
+        body = "\n".join(json.dumps(_request(str(i))) for i in range(5))
+
+        response = client.post(
+            "/chat/batch?concurrency=8",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 6
+        assert lines[-1]["items"] == 5
+        # The requested concurrency is capped by the configured maximum
+        assert lines[-1]["concurrency"] == 4
+
+    def test_too_many_items_rejected(self, fake_service):
+        """Test oversize batches are rejected with 413"""
+        client = self._client(fake_service)
+
+        response = client.post("/chat/batch", json=[_request()] * 6)
+
+        assert response.status_code == 413
@@ -0,0 +1,388 @@
+"""
+Unit tests for the SQLite-backed chat job queue, its workers and routes.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.api.routes import chat_jobs as chat_jobs_routes
+from ingenious.config.models import ChatJobSettings
+from ingenious.core import agent_events
+from ingenious.models.chat import ChatRequest, ChatResponse
+from ingenious.models.chat_job import ChatJobStatus
+from ingenious.services.chat_jobs import ChatJobService, ChatJobStore
+from ingenious.services.fastapi_dependencies import (
+    get_chat_jobs,
+    get_conditional_security,
+)
+
+
+def _chat_request(prompt: str = "hi") -> ChatRequest:
+    return ChatRequest(user_prompt=prompt, conversation_flow="flow")
+
+
+def _response(text: str) -> ChatResponse:
+    return ChatResponse(
+        thread_id="t",
+        message_id="m",
+        agent_response=text,
+        token_count=1,
+        max_token_count=1,
+    )
+
+
+class FakeChatService:
+    """Chat service that answers after a delay, or never for 'hang'."""
+
+    def __init__(self, conversation_flow: str) -> None:
+        self.conversation_flow = conversation_flow
+
+    async def get_chat_response(self, chat_request: ChatRequest) -> ChatResponse:
+        if chat_request.user_prompt == "hang":
+            await asyncio.Event().wait()
+        if chat_request.user_prompt == "fail":
+            raise ValueError("bad prompt")
+        if chat_request.user_prompt == "slow":
+            await asyncio.sleep(0.3)
+        agent_events.publish(agent_events.AGENT_START, "analyst")
+        await asyncio.sleep(0.01)
+        return _response(f"echo {chat_request.user_prompt}")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChatJobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return ChatJobSettings(
+        database_path=str(tmp_path / "jobs.db"),
+        workers=2,
+        poll_interval_seconds=0.01,
+        lease_seconds=0.3,
+    )
+
+
+async def _wait_for(service: ChatJobService, job_id: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await service.get(job_id)
+        if job is not None and job.status.is_finished:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _fail_once(monkeypatch, obj, name: str) -> None:
+    """Make ``obj.name`` raise a locked-database error the first time it is called."""
+    original = getattr(obj, name)
+    calls = []
+
+    def failing(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(obj, name, failing)
+
+
+async def _drain(body):
+    return [chunk async for chunk in body]
+
+
+class TestChatJobStore:
+    """Test cases for ChatJobStore"""
+
+    def test_submit_and_claim(self, store):
+        """Test a submitted job is claimed once and records events"""
+        job = store.submit("alice", _chat_request())
+
+        claimed = store.claim("worker-1", lease_seconds=60, max_attempts=3)
+        assert claimed is not None
+        assert claimed[0] == job.job_id and claimed[2] == 1
+        assert store.claim("worker-2", lease_seconds=60, max_attempts=3) is None
+
+        store.finish(job.job_id, "worker-1", ChatJobStatus.SUCCEEDED, _response("done"))
+        finished = store.get(job.job_id)
+        assert finished.status is ChatJobStatus.SUCCEEDED
+        assert finished.result.agent_response == "done"
+        assert [e.event for e in store.events(job.job_id)] == [
+            "queued",
+            "started",
+            "succeeded",
+        ]
+
+    def test_jobs_scoped_to_user(self, store):
+        """Test a user cannot see another user's job"""
+        job = store.submit("alice", _chat_request())
+
+        assert store.get(job.job_id, "alice") is not None
+        assert store.get(job.job_id, "bob") is None
+
+    def test_lapsed_lease_is_retried_then_failed(self, store):
+        """Test jobs of a dead worker are retried up to max_attempts"""
+        job = store.submit("alice", _chat_request())
+        assert store.claim("dead-1", lease_seconds=-1, max_attempts=2)[2] == 1
+
+        retried = store.claim("worker-2", lease_seconds=-1, max_attempts=2)
+        assert retried is not None and retried[2] == 2
+
+        assert store.claim("worker-3", lease_seconds=60, max_attempts=2) is None
+        assert store.get(job.job_id).status is ChatJobStatus.FAILED
+
+    def test_finish_requires_lease(self, store):
+        """Test a worker that lost its lease cannot record a result"""
+        job = store.submit("alice", _chat_request())
+        store.claim("old", lease_seconds=-1, max_attempts=3)
+        store.claim("new", lease_seconds=60, max_attempts=3)
+
+        assert not store.finish(job.job_id, "old", ChatJobStatus.SUCCEEDED)
+        assert store.renew(job.job_id, "old", 60) is None
+        assert store.renew(job.job_id, "new", 60) is False
+
+    def test_cancel_queued_job(self, store):
+        """Test a queued job is cancelled immediately and never claimed"""
+        job = store.submit("alice", _chat_request())
+
+        cancelled = store.request_cancel(job.job_id, "alice")
+
+        assert cancelled.status is ChatJobStatus.CANCELLED
+        assert store.claim("worker", lease_seconds=60, max_attempts=3) is None
+
+    def test_purge_finished_jobs(self, store):
+        """Test finished jobs past retention are deleted with their events"""
+        done = store.submit("alice", _chat_request())
+        store.request_cancel(done.job_id)
+        queued = store.submit("alice", _chat_request())
+
+        assert store.purge(retention_seconds=-1) == 1
+        assert store.get(done.job_id) is None
+        assert store.events(done.job_id) == []
+        assert store.get(queued.job_id) is not None
+
+    def test_queue_survives_restart(self, tmp_path):
+        """Test queued jobs are still there when the store is reopened"""
+        path = str(tmp_path / "restart.db")
+        first = ChatJobStore(path)
+        job = first.submit("alice", _chat_request())
+        first.close()
+
+        second = ChatJobStore(path)
+        assert second.claim("worker", 60, 3)[0] == job.job_id
+        second.close()
+
+
+class TestChatJobService:
+    """Test cases for the ChatJobService worker pool"""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs(self, settings):
+        """Test submitted jobs run in the background and store results"""
+        service = ChatJobService(settings)
+        await service.start(FakeChatService)
+        try:
+            jobs = [
+                await service.submit("alice", _chat_request(str(i))) for i in range(4)
+            ]
+            results = [await _wait_for(service, job.job_id) for job in jobs]
+        finally:
+            await service.stop()
+
+        assert [r.result.agent_response for r in results] == [
+            f"echo {i}" for i in range(4)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_records_agent_events(self, settings):
+        """Test events published by the flow's agents are recorded in order"""
+        service = ChatJobService(settings)
+        await service.start(FakeChatService)
+        try:
+            job = await service.submit("alice", _chat_request())
+            await _wait_for(service, job.job_id)
+        finally:
+            await service.stop()
+
+        events = await service.events(job.job_id)
+        assert [e.event for e in events] == [
+            "queued",
+            "started",
+            "agent_start",
+            "succeeded",
+        ]
+        assert events[2].data == {"agent_name": "analyst"}
+
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self, settings):
+        """Test flow errors are recorded with the /chat status code"""
+        service = ChatJobService(settings)
+        await service.start(FakeChatService)
+        try:
+            job = await service.submit("alice", _chat_request("fail"))
+            finished = await _wait_for(service, job.job_id)
+        finally:
+            await service.stop()
+
+        assert finished.status is ChatJobStatus.FAILED
+        assert finished.error == "bad prompt"
+        events = await service.events(job.job_id)
+        assert events[-1].data["status_code"] == 400
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_job(self, settings):
+        """Test cancelling a running job stops the flow"""
+        service = ChatJobService(settings)
+        await service.start(FakeChatService)
+        try:
+            job = await service.submit("alice", _chat_request("hang"))
+            while (await service.get(job.job_id)).status is ChatJobStatus.QUEUED:
+                await asyncio.sleep(0.01)
+            await service.cancel(job.job_id, "alice")
+            finished = await _wait_for(service, job.job_id)
+        finally:
+            await service.stop()
+
+        assert finished.status is ChatJobStatus.CANCELLED
+
+    @pytest.mark.asyncio
+    async def test_stop_requeues_running_jobs(self, settings):
+        """Test shutting down returns running jobs to the queue"""
+        service = ChatJobService(settings)
+        await service.start(FakeChatService)
+        job = await service.submit("alice", _chat_request("hang"))
+        while (await service.get(job.job_id)).status is ChatJobStatus.QUEUED:
+            await asyncio.sleep(0.01)
+
+        await service.stop()
+
+        requeued = await service.get(job.job_id)
+        assert requeued.status is ChatJobStatus.QUEUED
+        assert (await service.events(job.job_id))[-1].event == "requeued"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "method, prompt, first_attempt",
+        [
+            ("renew", "slow", ["started"]),
+            ("finish", "hi", ["started", "agent_start"]),
+        ],
+    )
+    async def test_store_error_requeues_job(
+        self, settings, monkeypatch, method, prompt, first_attempt
+    ):
+        """Test a failed lease renewal or outcome stops the job and requeues it"""
+        settings.workers = 1
+        settings.lease_seconds = 0.15
+        service = ChatJobService(settings)
+        _fail_once(monkeypatch, service.store, method)
+        await service.start(FakeChatService)
+        try:
+            job = await service.submit("alice", _chat_request(prompt))
+            finished = await _wait_for(service, job.job_id)
+        finally:
+            await service.stop()
+
+        # The only worker survived to run the job again
+        assert finished.status is ChatJobStatus.SUCCEEDED
+        events = await service.events(job.job_id)
+        assert [e.event for e in events] == [
+            "queued",
+            *first_attempt,
+            "requeued",
+            "started",
+            "agent_start",
+            "succeeded",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_job_errors(self, settings, monkeypatch):
+        """Test an error escaping a job does not stop its worker"""
+        settings.workers = 1
+        service = ChatJobService(settings)
+        _fail_once(monkeypatch, service, "_run_job")
+        await service.start(FakeChatService)
+        try:
+            # The first job's lease lapses and it is retried after the second
+            first = await service.submit("alice", _chat_request("1"))
+            second = await service.submit("alice", _chat_request("2"))
+            results = [await _wait_for(service, job.job_id) for job in (first, second)]
+        finally:
+            await service.stop()
+
+        assert [r.status for r in results] == [ChatJobStatus.SUCCEEDED] * 2
+
+
+class TestChatJobRoutes:
+    """Test the /chat/jobs routes"""
+
+    @pytest.fixture
+    def client(self, settings):
+        service = ChatJobService(settings)
+        app = FastAPI()
+        app.include_router(chat_jobs_routes.router)
+        app.dependency_overrides[get_chat_jobs] = lambda: service
+        app.dependency_overrides[get_conditional_security] = lambda: "anonymous"
+        with TestClient(app) as client:
+            client.portal.call(service.start, FakeChatService)
+            yield client
+            client.portal.call(service.stop)
+
+    def test_submit_poll_and_stream(self, client):
+        """Test a job can be submitted, polled and followed over SSE"""
+        response = client.post(
+            "/chat/jobs", json={"user_prompt": "hi", "conversation_flow": "flow"}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        with client.stream("GET", f"/chat/jobs/{job_id}/stream") as stream:
+            events = [
+                json.loads(line[len("data: ") :])
+                for line in stream.iter_lines()
+                if line.startswith("data: ")
+            ]
+
+        assert [e["event"] for e in events] == [
+            "queued",
+            "started",
+            "agent_start",
+            "succeeded",
+        ]
+        assert events[-1]["data"]["result"]["agent_response"] == "echo hi"
+        job = client.get(f"/chat/jobs/{job_id}").json()
+        assert job["status"] == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_stream_ends_when_job_deleted(self, settings):
+        """Test following a job that is deleted mid-stream closes the stream"""
+        service = ChatJobService(settings)
+        job = await service.submit("anonymous", _chat_request())
+        response = await chat_jobs_routes.stream_chat_job_events(
+            job.job_id, service, "anonymous"
+        )
+        body = response.body_iterator
+
+        assert (await anext(body)).startswith("id: 1\nevent: queued")
+        await asyncio.to_thread(
+            service.store._db.connection().execute,
+            "DELETE FROM chat_jobs WHERE job_id = ?",
+            (job.job_id,),
+        )
+        remaining = await asyncio.wait_for(_drain(body), 5)
+
+        assert remaining == []
+
+    def test_unknown_job(self, client):
+        """Test unknown job ids return 404"""
+        assert client.get("/chat/jobs/missing").status_code == 404
+        assert client.delete("/chat/jobs/missing").status_code == 404
@@ -0,0 +1,197 @@
+"""
+Unit tests for the response compression middleware.
+"""
+
+import asyncio
+import zlib
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from ingenious.config.models import CompressionSettings
+from ingenious.main import compression
+from ingenious.main.compression import CompressionMiddleware, select_encoding
+
+LARGE = {"agent_response": "bike sales in NSW rose " * 200}
+FRAMES = [f"data: {{'chunk': {i}}}\n\n".encode() for i in range(3)]
+
+
+def _app(**settings: Any) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large() -> JSONResponse:
+        return JSONResponse(LARGE)
+
+    @app.get("/small")
+    async def small() -> JSONResponse:
+        return JSONResponse({"ok": True})
+
+    @app.get("/image")
+    async def image() -> Response:
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def frames():
+            for frame in FRAMES:
+                yield frame
+
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, settings=CompressionSettings(**settings))
+    return app
+
+
+async def _call(app: Any, path: str, accept_encoding: str) -> List[Dict[str, Any]]:
+    """Run one request through the ASGI app and collect the sent messages."""
+    messages: List[Dict[str, Any]] = []
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "http_version": "1.1",
+        "scheme": "http",
+        "server": ("test", 80),
+        "client": ("test", 1234),
+        "root_path": "",
+    }
+
+    requested = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal requested
+        if requested:
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+class TestSelectEncoding:
+    """Test Accept-Encoding negotiation"""
+
+    def test_server_preference_wins_on_equal_quality(self):
+        """Test the configured order breaks ties"""
+        assert select_encoding("gzip, br", ["br", "gzip"]) == "br"
+
+    def test_quality_values(self):
+        """Test q-values outrank preference and q=0 refuses a coding"""
+        assert select_encoding("br;q=0.5, gzip", ["br", "gzip"]) == "gzip"
+        assert select_encoding("gzip;q=0", ["gzip"]) is None
+
+    def test_wildcard(self):
+        """Test * accepts codings that are not listed"""
+        assert select_encoding("*", ["zstd", "gzip"]) == "zstd"
+        assert select_encoding("identity", ["gzip"]) is None
+        assert select_encoding("", ["gzip"]) is None
+
+
+class TestCompressionMiddleware:
+    """Test cases for CompressionMiddleware"""
+
+    def test_compresses_large_json(self):
+        """Test responses over the threshold are gzip encoded"""
+        client = TestClient(_app(encodings=["gzip"]))
+
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert int(response.headers["content-length"]) < len(str(LARGE))
+        assert response.json() == LARGE
+
+    def test_skips_small_and_binary_bodies(self):
+        """Test small bodies and non-text types are sent unchanged"""
+        client = TestClient(_app(encodings=["gzip"]))
+
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in image.headers
+        # Whether JSON is compressed still depends on Accept-Encoding
+        assert small.headers["vary"] == "Accept-Encoding"
+        assert "vary" not in image.headers
+
+    def test_uncompressed_without_accept_encoding(self):
+        """Test clients that do not accept gzip get plain bodies"""
+        client = TestClient(_app(encodings=["gzip"]))
+
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == LARGE
+
+    @pytest.mark.asyncio
+    async def test_stream_frames_are_flushed(self):
+        """Test every SSE frame can be decoded as soon as it is sent"""
+        messages = await _call(_app(encodings=["gzip"]), "/stream", "gzip")
+
+        start = messages[0]
+        headers = dict(start["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        decoder = zlib.decompressobj(31)
+        chunks = [m for m in messages[1:] if m.get("more_body")]
+        assert len(chunks) == len(FRAMES)
+        for chunk, frame in zip(chunks, FRAMES):
+            assert decoder.decompress(chunk["body"]) == frame
+        decoder.decompress(messages[-1]["body"])
+        assert decoder.eof
+
+    @pytest.mark.asyncio
+    async def test_streams_can_be_left_uncompressed(self):
+        """Test compress_streams=False passes streaming bodies through"""
+        messages = await _call(
+            _app(encodings=["gzip"], compress_streams=False), "/stream", "gzip"
+        )
+
+        assert b"content-encoding" not in dict(messages[0]["headers"])
+        assert b"".join(m.get("body", b"") for m in messages[1:]) == b"".join(FRAMES)
+
+    def test_unavailable_encodings_are_skipped(self, monkeypatch):
+        """Test br and zstd are only offered when their packages are installed"""
+        monkeypatch.setattr(compression, "BROTLI_AVAILABLE", False)
+        monkeypatch.setattr(compression, "ZSTD_AVAILABLE", False)
+        client = TestClient(_app())
+
+        response = client.get("/large", headers={"Accept-Encoding": "zstd, br, gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+
+    @pytest.mark.skipif(not compression.BROTLI_AVAILABLE, reason="brotli not installed")
+    def test_brotli(self):
+        """Test Brotli is negotiated when installed"""
+        client = TestClient(_app(encodings=["br", "gzip"]))
+
+        response = client.get("/large", headers={"Accept-Encoding": "br, gzip"})
+
+        assert response.headers["content-encoding"] == "br"
+
+    @pytest.mark.skipif(
+        not compression.ZSTD_AVAILABLE, reason="zstandard not installed"
+    )
+    @pytest.mark.asyncio
+    async def test_zstd_stream(self):
+        """Test zstd streams decode frame by frame"""
+        import zstandard
+
+        messages = await _call(_app(encodings=["zstd"]), "/stream", "zstd")
+
+        decoder = zstandard.ZstdDecompressor().decompressobj()
+        chunks = [m for m in messages[1:] if m.get("more_body")]
+        for chunk, frame in zip(chunks, FRAMES):
+            assert decoder.decompress(chunk["body"]) == frame
@@ -0,0 +1,218 @@
+"""
+Unit tests for the typed listing and batch read APIs of IFileStorage.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict
+
+import pytest
+
+from ingenious.config.models import FileStorageContainerSettings
+from ingenious.files.files_repository import (
+    FileEntry,
+    FileStorage,
+    IFileStorage,
+    _parse_file_listing,
+)
+from ingenious.files.local import local_FileStorageRepository
+
+
+@pytest.fixture
+def fs_config(tmp_path):
+    root = tmp_path / "templates" / "prompts"
+    (root / "rev1" / "nested").mkdir(parents=True)
+    (root / "rev1" / "a.jinja").write_text("aaa")
+    (root / "rev1" / "b.md").write_text("b")
+    (root / "rev1" / "nested" / "c.jinja").write_text("cc")
+    return FileStorageContainerSettings(storage_type="local", path=str(tmp_path))
+
+
+@pytest.fixture
+def local_storage(fs_config):
+    return local_FileStorageRepository(config=None, fs_config=fs_config)  # type: ignore[arg-type]
+
+
+class InMemoryStorage(IFileStorage):
+    """Backend implementing only the abstract methods, for the default fallbacks."""
+
+    def __init__(self, files: Dict[str, str]):
+        super().__init__(config=None, fs_config=None)  # type: ignore[arg-type]
+        self.files = files
+
+    async def write_file(self, contents: str, file_name: str, file_path: str) -> str:
+        self.files[file_name] = contents
+        return file_name
+
+    async def read_file(self, file_name: str, file_path: str) -> str:
+        return self.files[file_name]
+
+    async def delete_file(self, file_name: str, file_path: str) -> str:
+        del self.files[file_name]
+        return file_name
+
+    async def list_files(self, file_path: str) -> str:
+        return "\n".join(f"{file_path}/{name}" for name in self.files)
+
+    async def check_if_file_exists(self, file_path: str, file_name: str) -> bool:
+        return file_name in self.files
+
+    async def get_base_path(self) -> str:
+        return ""
+
+
+class TestLocalListing:
+    """Test cases for local_FileStorageRepository.iter_files"""
+
+    @pytest.mark.asyncio
+    async def test_lists_files_with_metadata(self, local_storage):
+        """Test entries carry name, size, mtime and a version token"""
+        entries = await local_storage.list_file_entries("templates/prompts/rev1")
+
+        by_name = {entry.name: entry for entry in entries}
+        assert sorted(by_name) == ["a.jinja", "b.md"]
+        assert by_name["a.jinja"].size == 3
+        assert by_name["a.jinja"].modified is not None
+        assert by_name["a.jinja"].etag == await local_storage.get_file_version(
+            "a.jinja", "templates/prompts/rev1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_recursive_listing_uses_relative_names(self, local_storage):
+        """Test recursive listings name nested files relative to the listed path"""
+        entries = await local_storage.list_file_entries(
+            "templates/prompts", recursive=True
+        )
+
+        assert sorted(entry.name for entry in entries) == [
+            "rev1/a.jinja",
+            "rev1/b.md",
+            "rev1/nested/c.jinja",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_directory_yields_nothing(self, local_storage):
+        """Test listing a missing directory is empty rather than an error"""
+        assert await local_storage.list_file_entries("templates/missing") == []
+
+    @pytest.mark.asyncio
+    async def test_streams_in_batches(self, local_storage, tmp_path, monkeypatch):
+        """Test large directories are streamed across several scan batches"""
+        import ingenious.files.local as local_module
+
+        big = tmp_path / "big"
+        big.mkdir()
+        for i in range(25):
+            (big / f"f{i}.txt").write_text("x")
+        monkeypatch.setattr(local_module, "SCAN_BATCH_SIZE", 10)
+
+        names = [entry.name async for entry in local_storage.iter_files("big")]
+
+        assert len(names) == 25
+
+    @pytest.mark.asyncio
+    async def test_version_changes_with_content(self, local_storage, tmp_path):
+        """Test the version token changes when the file size changes"""
+        before = await local_storage.get_file_version("b.md", "templates/prompts/rev1")
+        (tmp_path / "templates/prompts/rev1/b.md").write_text("longer content")
+        after = await local_storage.get_file_version("b.md", "templates/prompts/rev1")
+
+        assert before != after
+        assert await local_storage.get_file_version("x.md", "nowhere") is None
+
+    @pytest.mark.asyncio
+    async def test_file_storage_wrapper_delegates(self, fs_config):
+        """Test the FileStorage facade exposes listing and batch reads"""
+        config = SimpleNamespace(file_storage=SimpleNamespace(revisions=fs_config))
+        fs = FileStorage(config)  # type: ignore[arg-type]
+
+        names = [entry.name async for entry in fs.iter_files("templates/prompts/rev1")]
+        contents = await fs.read_many(["a.jinja", "b.md"], "templates/prompts/rev1")
+
+        assert sorted(names) == ["a.jinja", "b.md"]
+        assert contents == {"a.jinja": "aaa", "b.md": "b"}
+
+
+class TestDefaultImplementations:
+    """Test cases for the IFileStorage fallbacks used by custom backends"""
+
+    @pytest.mark.asyncio
+    async def test_iter_files_falls_back_to_list_files(self):
+        """Test backends without iter_files still produce FileEntry objects"""
+        storage = InMemoryStorage({"x.jinja": "1", "y.md": "2"})
+
+        entries = await storage.list_file_entries("prompts")
+
+        assert [entry.name for entry in entries] == ["x.jinja", "y.md"]
+        assert all(isinstance(entry, FileEntry) for entry in entries)
+        assert entries[0].etag is None
+
+    @pytest.mark.asyncio
+    async def test_iter_files_fallback_honours_recursive(self):
+        """Test files in subdirectories are listed only when recursive"""
+        storage = InMemoryStorage({"x.jinja": "1", "rev1/y.md": "2"})
+
+        top = await storage.list_file_entries("prompts")
+        everything = await storage.list_file_entries("prompts", recursive=True)
+
+        assert [entry.name for entry in top] == ["x.jinja"]
+        assert [entry.name for entry in everything] == ["x.jinja", "rev1/y.md"]
+        assert everything[1].path == str(Path("prompts") / "rev1" / "y.md")
+
+    @pytest.mark.asyncio
+    async def test_read_many_and_write_many(self):
+        """Test the batch helpers round-trip through the single-file methods"""
+        storage = InMemoryStorage({})
+
+        await storage.write_many({"a": "1", "b": "2"}, "p", max_concurrency=1)
+        contents = await storage.read_many(["a", "b", "a"], "p")
+
+        assert contents == {"a": "1", "b": "2"}
+
+    def test_parse_file_listing_formats(self):
+        """Test both local and blob listing formats are understood"""
+        assert _parse_file_listing("['a.jinja', 'b.md']") == ["a.jinja", "b.md"]
+        assert _parse_file_listing("p/a.jinja\np/x.md") == ["p/a.jinja", "p/x.md"]
+        assert _parse_file_listing("Failed to list files in x: boom") == []
+        assert _parse_file_listing("") == []
+
+
+class TestAtomicWrites:
+    """Test cases for write_file_atomic"""
+
+    @pytest.mark.asyncio
+    async def test_local_atomic_write_replaces_file(self, local_storage, tmp_path):
+        """Test the file is replaced in one step and no temp files remain"""
+        target = tmp_path / "templates/prompts/rev1/a.jinja"
+        target.chmod(0o640)
+
+        await local_storage.write_file_atomic(
+            "new", "a.jinja", "templates/prompts/rev1"
+        )
+
+        assert target.read_text() == "new"
+        assert target.stat().st_mode & 0o777 == 0o640
+        assert sorted(p.name for p in target.parent.iterdir() if p.is_file()) == [
+            "a.jinja",
+            "b.md",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_local_atomic_write_creates_directories(
+        self, local_storage, tmp_path
+    ):
+        """Test writing into a new revision folder creates it"""
+        await local_storage.write_file_atomic(
+            "x", "new.jinja", "templates/prompts/rev2"
+        )
+
+        assert (tmp_path / "templates/prompts/rev2/new.jinja").read_text() == "x"
+
+    @pytest.mark.asyncio
+    async def test_default_atomic_write_uses_write_file(self):
+        """Test backends with atomic writes natively fall back to write_file"""
+        storage = InMemoryStorage({})
+
+        await storage.write_file_atomic("1", "a", "p")
+
+        assert storage.files == {"a": "1"}
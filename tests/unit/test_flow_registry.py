@@ -0,0 +1,308 @@
+"""
+Unit tests for the conversation flow registry.
+"""
+
+import threading
+from dataclasses import replace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.api.routes import diagnostic
+from ingenious.models.chat import ChatRequest, ChatResponse
+from ingenious.services.chat_services.multi_agent.service import (
+    multi_agent_chat_service,
+)
+from ingenious.services.flow_registry import (
+    FlowCallingConvention,
+    FlowNotFoundError,
+    FlowRegistry,
+    build_registration,
+    detect_calling_convention,
+    get_flow_registry,
+)
+
+
+class InstanceFlow:
+    def __init__(self, parent_multi_agent_chat_service):
+        self.parent = parent_multi_agent_chat_service
+
+    async def get_conversation_response(self, chat_request):
+        return ChatResponse(
+            thread_id=chat_request.thread_id,
+            message_id="m1",
+            agent_response=f"instance:{chat_request.user_prompt}",
+            token_count=0,
+            max_token_count=0,
+        )
+
+    async def get_streaming_conversation_response(self, chat_request):
+        yield "chunk"
+
+
+class StaticRequestFlow:
+    @staticmethod
+    async def get_conversation_response(chatrequest):
+        return f"static:{chatrequest.user_prompt}", "summary"
+
+
+class StaticArgumentsFlow:
+    @staticmethod
+    async def get_conversation_response(
+        message, topics, thread_memory, memory_record_switch, thread_chat_history
+    ):
+        return f"args:{message}"
+
+
+class TestCallingConvention:
+    """Test cases for calling convention detection"""
+
+    def test_instance_flow(self):
+        """Test flows taking the parent service are called as instances"""
+        assert detect_calling_convention(InstanceFlow) is FlowCallingConvention.INSTANCE
+
+    def test_static_chat_request_flow(self):
+        """Test a single-parameter static method receives the chat request"""
+        assert (
+            detect_calling_convention(StaticRequestFlow)
+            is FlowCallingConvention.STATIC_CHAT_REQUEST
+        )
+
+    def test_static_arguments_flow(self):
+        """Test a multi-parameter static method receives individual arguments"""
+        assert (
+            detect_calling_convention(StaticArgumentsFlow)
+            is FlowCallingConvention.STATIC_ARGUMENTS
+        )
+
+    def test_registration_requires_conversation_method(self):
+        """Test classes without get_conversation_response are rejected"""
+        with pytest.raises(TypeError):
+            build_registration("broken", type("Broken", (), {}))
+
+
+class TestFlowRegistry:
+    """Test cases for FlowRegistry"""
+
+    def test_load_discovers_builtin_flows(self):
+        """Test startup discovery finds core and template flows"""
+        registry = FlowRegistry()
+
+        flows = registry.load()
+
+        assert registry.loaded
+        assert "classification_agent" in flows
+        assert "bike_insights" in flows
+        assert flows["bike_insights"].convention is FlowCallingConvention.INSTANCE
+
+    def test_get_accepts_hyphenated_names(self):
+        """Test lookups normalize hyphenated flow names"""
+        registry = FlowRegistry()
+        registry._flows["bike_insights"] = build_registration(
+            "bike_insights", InstanceFlow
+        )
+
+        assert registry.get("bike-insights").flow_class is InstanceFlow
+
+    def test_get_resolves_unknown_flow_once(self):
+        """Test a flow missing from the scan is imported once then cached"""
+        registry = FlowRegistry()
+        with patch(
+            "ingenious.services.flow_registry.import_class_with_fallback",
+            return_value=StaticRequestFlow,
+        ) as mock_import:
+            first = registry.get("late_flow")
+            second = registry.get("late_flow")
+
+        assert first is second
+        assert mock_import.call_count == 1
+
+    def test_get_unknown_flow_raises(self):
+        """Test a flow that no namespace defines raises FlowNotFoundError"""
+        registry = FlowRegistry()
+
+        with pytest.raises(FlowNotFoundError):
+            registry.get("does_not_exist")
+
+    def test_reload_replaces_flows(self):
+        """Test reload rebuilds the registry and clears import caches"""
+        registry = FlowRegistry()
+        registry._flows["stale"] = build_registration("stale", StaticRequestFlow)
+
+        with (
+            patch("ingenious.services.flow_registry.clear_import_cache") as clear_cache,
+            patch(
+                "ingenious.services.chat_service.clear_chat_service_classes"
+            ) as clear_services,
+        ):
+            flows = registry.reload()
+
+        assert "stale" not in flows
+        clear_cache.assert_called_once()
+        clear_services.assert_called_once()
+
+    def test_describe(self):
+        """Test the diagnostic summary lists convention and streaming support"""
+        registry = FlowRegistry()
+        registry._flows["bike_insights"] = build_registration(
+            "bike_insights", InstanceFlow
+        )
+
+        summary = registry.describe()
+
+        assert summary["flows"]["bike_insights"]["convention"] == "instance"
+        assert summary["flows"]["bike_insights"]["supports_streaming"] is True
+
+    def test_global_registry_is_singleton(self):
+        """Test the process-wide registry is reused"""
+        assert get_flow_registry() is get_flow_registry()
+
+
+class TestNamespaceSnapshot:
+    """Test cases for the startup namespace snapshot"""
+
+    def test_load_builds_snapshot(self):
+        """Test loading records flow modules per namespace"""
+        registry = FlowRegistry()
+        registry.load()
+
+        snapshot = registry.snapshot()
+        namespaces = dict(snapshot.namespaces)
+
+        assert "classification_agent" in namespaces["ingenious"]
+        assert "bike_insights" in snapshot.workflows
+        assert snapshot.as_dict()["workflows"] == list(snapshot.workflows)
+
+    def test_unchanged_directories_do_not_reload(self):
+        """Test refresh keeps the snapshot when nothing changed on disk"""
+        registry = FlowRegistry(check_interval=0)
+        snapshot = registry.snapshot()
+
+        with patch.object(registry, "reload") as reload:
+            assert registry.refresh_if_changed() is snapshot
+
+        reload.assert_not_called()
+
+    def test_changed_directory_triggers_reload(self):
+        """Test a changed flows directory rebuilds the registry"""
+        registry = FlowRegistry(check_interval=0)
+        snapshot = registry.snapshot()
+        path, _ = snapshot.fingerprint[0]
+        registry._snapshot = replace(snapshot, fingerprint=((path, 0),))
+
+        with patch.object(registry, "reload") as reload:
+            registry.refresh_if_changed()
+
+        reload.assert_called_once()
+
+    def test_directories_checked_at_most_once_per_interval(self):
+        """Test refresh skips the stat calls inside the check interval"""
+        registry = FlowRegistry(check_interval=60)
+        registry.snapshot()
+
+        with patch("ingenious.services.flow_registry._fingerprint") as fingerprint:
+            registry.refresh_if_changed()
+
+        fingerprint.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_namespaces_route_refreshes_off_event_loop(self):
+        """Test the route reloads changed flows in a worker thread"""
+        registry = FlowRegistry(check_interval=0)
+        snapshot = registry.snapshot()
+        threads = []
+
+        def refresh_if_changed():
+            threads.append(threading.current_thread())
+            return snapshot
+
+        registry.refresh_if_changed = refresh_if_changed
+        with patch.object(diagnostic, "get_flow_registry", return_value=registry):
+            result = await diagnostic.namespace_snapshot(Mock(), "anonymous")
+
+        assert result == snapshot.as_dict()
+        assert threads and threads[0] is not threading.current_thread()
+
+
+class TestFlowDispatch:
+    """Test cases for multi_agent_chat_service dispatching through the registry"""
+
+    def _service(self, flow_class):
+        registry = FlowRegistry()
+        registry._flows["test_flow"] = build_registration("test_flow", flow_class)
+        repository = Mock()
+        repository.get_thread_messages = AsyncMock(return_value=[])
+        repository.add_message = AsyncMock(return_value="id")
+        repository.add_memory = AsyncMock(return_value="id")
+        service = multi_agent_chat_service(
+            config=Mock(),
+            chat_history_repository=repository,
+            conversation_flow="test_flow",
+        )
+        return service, registry
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "flow_class,expected",
+        [
+            (InstanceFlow, "instance:hi"),
+            (StaticRequestFlow, "static:hi"),
+            (StaticArgumentsFlow, "args:hi"),
+        ],
+    )
+    async def test_dispatch_by_convention(self, flow_class, expected):
+        """Test each calling convention produces a ChatResponse"""
+        service, registry = self._service(flow_class)
+        request = ChatRequest(user_prompt="hi", conversation_flow="test_flow")
+
+        with patch(
+            "ingenious.services.chat_services.multi_agent.service.get_flow_registry",
+            return_value=registry,
+        ):
+            response = await service.get_chat_response(request)
+
+        assert response.agent_response == expected
+
+    @pytest.mark.asyncio
+    async def test_streaming_unknown_flow_yields_error_chunk(self):
+        """Test streaming an unregistered flow reports it as not found"""
+        service, registry = self._service(InstanceFlow)
+        request = ChatRequest(user_prompt="hi", conversation_flow="missing_flow")
+
+        with patch(
+            "ingenious.services.chat_services.multi_agent.service.get_flow_registry",
+            return_value=registry,
+        ):
+            chunks = [
+                chunk async for chunk in service.get_streaming_chat_response(request)
+            ]
+
+        assert chunks[-1].chunk_type == "error"
+        assert "not found" in chunks[-1].content
+
+
+class TestReloadRoute:
+    """Test POST /flows/reload is limited to admin users"""
+
+    @pytest.mark.parametrize("user,status_code", [("admin", 200), ("alice", 403)])
+    def test_only_admin_users_reload(self, user, status_code):
+        import ingenious.dependencies as igen_deps
+
+        app = FastAPI()
+        app.include_router(diagnostic.router)
+        app.dependency_overrides[igen_deps.get_auth_user] = lambda: user
+        config = Mock()
+        config.web_configuration.authentication.admin_users = ["admin"]
+        registry = Mock()
+        registry.describe.return_value = {"flows": []}
+
+        with (
+            patch.object(igen_deps, "get_config", return_value=config),
+            patch.object(diagnostic, "get_flow_registry", return_value=registry),
+        ):
+            response = TestClient(app).post("/flows/reload")
+
+        assert response.status_code == status_code
+        assert registry.reload.called is (status_code == 200)
@@ -0,0 +1,307 @@
+"""
+Unit tests for Idempotency-Key handling on chat submissions.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.api.routes import chat as chat_routes
+from ingenious.config.models import ChatAdmissionSettings
+from ingenious.models.chat import ChatResponse
+from ingenious.services.admission_control import AdmissionController
+from ingenious.services.fastapi_dependencies import (
+    get_chat_admission,
+    get_chat_idempotency,
+    get_chat_service,
+    get_conditional_security,
+)
+from ingenious.services.idempotency import (
+    IdempotencyConflictError,
+    IdempotencyCoordinator,
+    InMemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+    StoredResponse,
+)
+
+
+def _response(text: str = "ok") -> ChatResponse:
+    return ChatResponse(
+        thread_id="t",
+        message_id="m",
+        agent_response=text,
+        token_count=1,
+        max_token_count=1,
+    )
+
+
+def _stored(body: str = "{}", ttl: float = 60) -> StoredResponse:
+    now = time.time()
+    return StoredResponse("fp", body, now, now + ttl)
+
+
+class TestIdempotencyStores:
+    """Test cases for the in-memory and SQLite stores"""
+
+    @pytest.fixture(params=["memory", "sqlite"])
+    def store(self, request, tmp_path):
+        if request.param == "memory":
+            yield InMemoryIdempotencyStore()
+            return
+        store = SQLiteIdempotencyStore(str(tmp_path / "idempotency.db"))
+        yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_put_and_get(self, store):
+        """Test a stored response is returned by key"""
+        await store.put("k", _stored('{"a": 1}'))
+
+        stored = await store.get("k")
+        assert stored is not None
+        assert stored.body == '{"a": 1}'
+        assert await store.get("other") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_not_returned(self, store):
+        """Test entries past their TTL are neither returned nor kept"""
+        await store.put("old", _stored(ttl=-1))
+        await store.put("new", _stored())
+
+        assert await store.get("old") is None
+        await store.purge_expired()
+        assert await store.get("new") is not None
+
+    @pytest.mark.asyncio
+    async def test_sqlite_store_shared_between_instances(self, tmp_path):
+        """Test a response stored by one worker is visible to another"""
+        path = str(tmp_path / "shared.db")
+        first = SQLiteIdempotencyStore(path)
+        second = SQLiteIdempotencyStore(path)
+        await first.put("k", _stored("body"))
+
+        stored = await second.get("k")
+        assert stored is not None and stored.body == "body"
+        first.close()
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_claim_held_until_released_or_expired(self, tmp_path):
+        """Test only one worker at a time holds a key's claim"""
+        path = str(tmp_path / "shared.db")
+        first = SQLiteIdempotencyStore(path)
+        second = SQLiteIdempotencyStore(path)
+
+        assert await first.claim("k", "fp", 60) is None
+        assert await second.claim("k", "other", 60) == "fp"
+        await first.release("k")
+        assert await second.claim("k", "other", -1) is None
+        # An expired claim is taken over
+        assert await first.claim("k", "fp", 60) is None
+        first.close()
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_memory_store_bounded(self):
+        """Test the in-memory store drops the oldest entries past max_entries"""
+        store = InMemoryIdempotencyStore(max_entries=2)
+        for key in ("a", "b", "c"):
+            await store.put(key, _stored())
+
+        assert await store.get("a") is None
+        assert await store.get("c") is not None
+
+
+class TestIdempotencyCoordinator:
+    """Test cases for IdempotencyCoordinator"""
+
+    @pytest.mark.asyncio
+    async def test_completed_response_replayed(self):
+        """Test a retry after completion replays without running again"""
+        coordinator = IdempotencyCoordinator(InMemoryIdempotencyStore())
+        func = AsyncMock(return_value=_response())
+
+        first, first_replayed = await coordinator.execute("k", "fp", ChatResponse, func)
+        second, second_replayed = await coordinator.execute(
+            "k", "fp", ChatResponse, func
+        )
+
+        assert func.await_count == 1
+        assert (first_replayed, second_replayed) == (False, True)
+        assert second == first
+
+    @pytest.mark.asyncio
+    async def test_concurrent_retries_attach(self):
+        """Test retries during execution share the in-flight result"""
+        coordinator = IdempotencyCoordinator(InMemoryIdempotencyStore())
+        calls = 0
+        release = asyncio.Event()
+
+        async def slow_chat() -> ChatResponse:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return _response()
+
+        tasks = [
+            asyncio.create_task(coordinator.execute("k", "fp", ChatResponse, slow_chat))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert sorted(replayed for _, replayed in results) == [False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_retries_across_workers(self, tmp_path):
+        """Test a retry on another worker waits for the first worker's response"""
+        path = str(tmp_path / "shared.db")
+        stores = [SQLiteIdempotencyStore(path), SQLiteIdempotencyStore(path)]
+        workers = [
+            IdempotencyCoordinator(store, poll_interval_seconds=0.01)
+            for store in stores
+        ]
+        calls = 0
+        release = asyncio.Event()
+
+        async def slow_chat() -> ChatResponse:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return _response()
+
+        first = asyncio.create_task(
+            workers[0].execute("k", "fp", ChatResponse, slow_chat)
+        )
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(
+            workers[1].execute("k", "fp", ChatResponse, slow_chat)
+        )
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(first, second)
+
+        assert calls == 1
+        assert [replayed for _, replayed in results] == [False, True]
+        with pytest.raises(IdempotencyConflictError):
+            await workers[1].execute(
+                "k", "other", ChatResponse, AsyncMock(return_value=_response())
+            )
+        for store in stores:
+            store.close()
+
+    @pytest.mark.asyncio
+    async def test_lapsed_claim_runs_again(self, tmp_path):
+        """Test a key claimed by a worker that died is run by the next retry"""
+        store = SQLiteIdempotencyStore(str(tmp_path / "shared.db"))
+        await store.claim("k", "fp", -1)
+        coordinator = IdempotencyCoordinator(store, poll_interval_seconds=0.01)
+        func = AsyncMock(return_value=_response())
+
+        _, replayed = await asyncio.wait_for(
+            coordinator.execute("k", "fp", ChatResponse, func), 5
+        )
+
+        assert replayed is False
+        assert func.await_count == 1
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_failure_not_stored(self):
+        """Test a retry after an error runs the request again"""
+        coordinator = IdempotencyCoordinator(InMemoryIdempotencyStore())
+        func = AsyncMock(side_effect=[RuntimeError("llm down"), _response()])
+
+        with pytest.raises(RuntimeError):
+            await coordinator.execute("k", "fp", ChatResponse, func)
+        response, replayed = await coordinator.execute("k", "fp", ChatResponse, func)
+
+        assert response.agent_response == "ok"
+        assert replayed is False
+
+    @pytest.mark.asyncio
+    async def test_key_reuse_with_different_request(self):
+        """Test a key cannot replay a response for another request body"""
+        coordinator = IdempotencyCoordinator(InMemoryIdempotencyStore())
+        await coordinator.execute(
+            "k", "fp", ChatResponse, AsyncMock(return_value=_response())
+        )
+
+        with pytest.raises(IdempotencyConflictError):
+            await coordinator.execute(
+                "k", "other", ChatResponse, AsyncMock(return_value=_response())
+            )
+
+    def test_validate_key(self):
+        """Test blank and overlong keys are rejected"""
+        IdempotencyCoordinator.validate_key("abc-123")
+        for key in ("", "   ", "x" * 256):
+            with pytest.raises(ValueError):
+                IdempotencyCoordinator.validate_key(key)
+
+
+class TestChatRouteIdempotency:
+    """Test Idempotency-Key handling on /chat"""
+
+    @pytest.fixture
+    def client_and_service(self):
+        app = FastAPI()
+        app.include_router(chat_routes.router)
+        service = Mock()
+        service.get_chat_response = AsyncMock(return_value=_response())
+        coordinator = IdempotencyCoordinator(InMemoryIdempotencyStore())
+        admission = AdmissionController(ChatAdmissionSettings())
+        app.dependency_overrides[get_chat_service] = lambda: service
+        app.dependency_overrides[get_conditional_security] = lambda: "anonymous"
+        app.dependency_overrides[get_chat_admission] = lambda: admission
+        app.dependency_overrides[get_chat_idempotency] = lambda: coordinator
+        return TestClient(app), service
+
+    def test_retry_replays_stored_response(self, client_and_service):
+        """Test a retried submission does not run the flow again"""
+        client, service = client_and_service
+        body = {"user_prompt": "hi", "conversation_flow": "flow"}
+        headers = {"Idempotency-Key": "retry-1"}
+
+        first = client.post("/chat", json=body, headers=headers)
+        second = client.post("/chat", json=body, headers=headers)
+
+        assert first.status_code == second.status_code == 200
+        assert second.json() == first.json()
+        assert "Idempotent-Replayed" not in first.headers
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert service.get_chat_response.await_count == 1
+
+    def test_key_reused_for_other_body(self, client_and_service):
+        """Test reusing a key with a different prompt returns 422"""
+        client, _ = client_and_service
+        headers = {"Idempotency-Key": "retry-2"}
+        client.post(
+            "/chat",
+            json={"user_prompt": "hi", "conversation_flow": "flow"},
+            headers=headers,
+        )
+
+        response = client.post(
+            "/chat",
+            json={"user_prompt": "something else", "conversation_flow": "flow"},
+            headers=headers,
+        )
+
+        assert response.status_code == 422
+
+    def test_without_key_runs_every_time(self, client_and_service):
+        """Test requests without a key are not deduplicated"""
+        client, service = client_and_service
+        body = {"user_prompt": "hi", "conversation_flow": "flow"}
+
+        client.post("/chat", json=body)
+        client.post("/chat", json=body)
+
+        assert service.get_chat_response.await_count == 2
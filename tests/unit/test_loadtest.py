@@ -0,0 +1,276 @@
+"""
+Unit tests for the offline load-testing harness.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator
+
+import httpx
+import openai
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.api.routes import chat as chat_routes
+from ingenious.config.models import ChatAdmissionSettings
+from ingenious.loadtest import (
+    LoadTestReport,
+    MockLLMSettings,
+    Scenario,
+    compare,
+    create_mock_llm_app,
+    load_scenario_file,
+    run_scenarios,
+    summarize,
+)
+from ingenious.loadtest.runner import RequestSample, ScenarioResult
+from ingenious.models.chat import ChatRequest, ChatResponse, ChatResponseChunk
+from ingenious.services.admission_control import AdmissionController
+from ingenious.services.fastapi_dependencies import (
+    get_chat_admission,
+    get_chat_idempotency,
+    get_chat_service,
+    get_conditional_security,
+)
+
+FAST = {"latency_seconds": 0, "tokens_per_second": 1e6}
+COMPLETIONS = "/openai/deployments/gpt-4o/chat/completions?api-version=2024-08-01"
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "execute_sql_tool",
+            "parameters": {
+                "type": "object",
+                "properties": {"sql": {"type": "string"}, "limit": {"type": "integer"}},
+                "required": ["sql", "limit"],
+            },
+        },
+    }
+]
+
+
+def _mock(**settings: Any) -> TestClient:
+    return TestClient(create_mock_llm_app(MockLLMSettings(**{**FAST, **settings})))
+
+
+class TestMockLLM:
+    """Test the OpenAI-compatible mock server"""
+
+    def test_completion_shape_and_usage(self):
+        """Test a text completion with usage on the Azure path"""
+        response = _mock(completion_tokens=12).post(
+            COMPLETIONS, json={"messages": [{"role": "user", "content": "hi"}]}
+        )
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["model"] == "gpt-4o"
+        assert len(body["choices"][0]["message"]["content"].split()) == 12
+        assert body["usage"]["completion_tokens"] == 12
+
+    def test_deterministic_for_seed(self):
+        """Test the same seed gives the same sequence of responses"""
+        request = {"messages": [{"role": "user", "content": "hi"}]}
+
+        def contents(seed: int) -> list:
+            client = _mock(seed=seed)
+            return [
+                client.post("/v1/chat/completions", json=request).json()["choices"]
+                for _ in range(3)
+            ]
+
+        assert contents(7) == contents(7)
+        assert contents(7) != contents(8)
+
+    def test_rate_limit_injection(self):
+        """Test 429s carry Retry-After and are counted"""
+        client = _mock(rate_limit_rate=1.0, retry_after_seconds=2)
+
+        response = client.post(COMPLETIONS, json={"messages": []})
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2.0"
+        assert client.get("/stats").json()["rate_limited"] == 1
+
+    def test_tool_call_then_text(self):
+        """Test tools get a call with typed required arguments, then text"""
+        client = _mock(tool_call_rate=1.0)
+        messages = [{"role": "user", "content": "how many rows?"}]
+
+        first = client.post(COMPLETIONS, json={"messages": messages, "tools": TOOLS})
+        choice = first.json()["choices"][0]
+        call = choice["message"]["tool_calls"][0]
+        assert choice["finish_reason"] == "tool_calls"
+        assert json.loads(call["function"]["arguments"]) == {"sql": "mock", "limit": 1}
+
+        messages += [
+            {"role": "assistant", "tool_calls": [call]},
+            {"role": "tool", "tool_call_id": call["id"], "content": "3"},
+        ]
+        second = client.post(COMPLETIONS, json={"messages": messages, "tools": TOOLS})
+        assert second.json()["choices"][0]["finish_reason"] == "stop"
+
+    @pytest.mark.asyncio
+    async def test_openai_sdk_compatibility(self):
+        """Test the openai SDK can call and stream from the mock"""
+        app = create_mock_llm_app(
+            MockLLMSettings(**FAST, completion_tokens=10, stream_chunk_tokens=3)
+        )
+        client = openai.AsyncAzureOpenAI(
+            azure_endpoint="http://mock",
+            api_key="mock",
+            api_version="2024-08-01-preview",
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=app)),
+        )
+        messages = [{"role": "user", "content": "hi"}]
+
+        completion = await client.chat.completions.create(
+            model="gpt-4o", messages=messages
+        )
+        stream = await client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        chunks = [chunk async for chunk in stream]
+
+        assert completion.usage.completion_tokens == 10
+        text = "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+        assert len(text.split()) == 10
+        assert chunks[-1].usage.completion_tokens == 10
+
+
+class FakeChatService:
+    """Chat service standing in for a flow, with a fixed delay."""
+
+    async def get_chat_response(self, chat_request: ChatRequest) -> ChatResponse:
+        await asyncio.sleep(0.001)
+        return ChatResponse(
+            thread_id="thread",
+            message_id="message",
+            agent_response="ok",
+            token_count=1,
+            max_token_count=1,
+        )
+
+    async def get_streaming_chat_response(
+        self, chat_request: ChatRequest
+    ) -> AsyncIterator[ChatResponseChunk]:
+        await asyncio.sleep(0.001)
+        for text in ("o", "k"):
+            yield ChatResponseChunk(
+                thread_id="thread",
+                message_id="message",
+                chunk_type="content",
+                content=text,
+            )
+
+
+def _api() -> FastAPI:
+    app = FastAPI()
+    app.include_router(chat_routes.router, prefix="/api/v1")
+    controller = AdmissionController(ChatAdmissionSettings(enable=False))
+    app.dependency_overrides[get_chat_service] = lambda: FakeChatService()
+    app.dependency_overrides[get_conditional_security] = lambda: "anonymous"
+    app.dependency_overrides[get_chat_admission] = lambda: controller
+    app.dependency_overrides[get_chat_idempotency] = lambda: None
+    return app
+
+
+class TestRunner:
+    """Test running scenarios against the chat routes"""
+
+    @pytest.mark.asyncio
+    async def test_chat_and_stream_scenarios(self):
+        """Test both endpoints are driven and TTFT is recorded for streams"""
+        scenarios = [
+            Scenario(
+                name="chat",
+                conversation_flow="classification-agent",
+                prompts=["hi"],
+                requests=12,
+                concurrency=4,
+            ),
+            Scenario(
+                name="stream",
+                endpoint="stream",
+                conversation_flow="classification-agent",
+                prompts=["hi"],
+                requests=6,
+                concurrency=3,
+            ),
+        ]
+
+        results = await run_scenarios(
+            "http://load", scenarios, transport=httpx.ASGITransport(app=_api())
+        )
+        chat, stream = (summarize(result) for result in results)
+
+        assert chat.requests == 12 and chat.errors == 0
+        assert chat.status_counts == {"200": 12}
+        assert chat.latency is not None and chat.ttft is None
+        assert stream.requests == 6 and stream.errors == 0
+        assert stream.ttft is not None
+        assert stream.ttft.p50_ms <= stream.latency.p50_ms
+
+    @pytest.mark.asyncio
+    async def test_http_errors_are_counted(self):
+        """Test non-200 responses count as errors and not in latency"""
+        scenario = Scenario(
+            name="missing-flow", conversation_flow="", prompts=["hi"], requests=3
+        )
+        app = _api()
+        app.dependency_overrides[get_chat_service] = lambda: None
+
+        (result,) = await run_scenarios(
+            "http://load", [scenario], transport=httpx.ASGITransport(app=app)
+        )
+        report = summarize(result)
+
+        assert report.errors == 3
+        assert report.error_rate == 1.0
+        assert report.latency is None
+
+
+def _report(p95_ms: float, throughput: float, errors: int = 0) -> LoadTestReport:
+    scenario = Scenario(name="s", conversation_flow="f", prompts=["p"])
+    samples = [RequestSample(200, p95_ms / 1000) for _ in range(20)]
+    samples += [RequestSample(503, 0.001, error="busy") for _ in range(errors)]
+    result = ScenarioResult(scenario, samples, wall_seconds=20 / throughput)
+    return LoadTestReport(scenarios=[summarize(result)])
+
+
+class TestReport:
+    """Test report summaries and baseline comparison"""
+
+    def test_within_tolerance(self):
+        """Test small changes are not regressions"""
+        assert compare(_report(100, 10), _report(105, 9.5), tolerance=0.1) == []
+
+    def test_latency_throughput_and_errors(self):
+        """Test slower, lower-throughput, error-prone runs are flagged"""
+        regressions = compare(_report(150, 5, errors=5), _report(100, 10))
+
+        metrics = {regression.metric for regression in regressions}
+        assert {"latency.p95_ms", "throughput_rps", "error_rate"} <= metrics
+        latency = next(r for r in regressions if r.metric == "latency.p95_ms")
+        assert latency.change == pytest.approx(0.5)
+
+    def test_round_trip(self, tmp_path):
+        """Test reports saved with --output load back as baselines"""
+        path = tmp_path / "baseline.json"
+        _report(100, 10).save(path)
+
+        assert compare(_report(100, 10), LoadTestReport.load(path)) == []
+
+    def test_bundled_scenarios_load(self):
+        """Test the bundled scenario files validate"""
+        builtin = load_scenario_file("builtin-flows")
+
+        assert {s.endpoint for s in builtin.scenarios} == {"chat", "stream"}
+        assert load_scenario_file("bike-insights").select(["bike-insights-chat"])
+        with pytest.raises(ValueError):
+            builtin.select(["nope"])
@@ -0,0 +1,270 @@
+"""
+Unit tests for Prometheus metrics.
+"""
+
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.config.models import MetricsSettings
+from ingenious.core import metrics, tracing
+
+pytestmark = pytest.mark.skipif(
+    not metrics.METRICS_AVAILABLE, reason="prometheus-client not installed"
+)
+
+
+@pytest.fixture(autouse=True)
+def enabled():
+    """Record metrics for the duration of a test."""
+    metrics.configure_metrics(MetricsSettings(enable=True))
+    yield
+    metrics.configure_metrics(MetricsSettings(enable=True))
+
+
+def _value(name: str, **labels: str) -> float:
+    from prometheus_client import REGISTRY
+
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class FakeModelClient:
+    """Stands in for an autogen model client."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.result = SimpleNamespace(
+            content="ok",
+            finish_reason="stop",
+            usage=SimpleNamespace(prompt_tokens=12, completion_tokens=5),
+        )
+
+    async def create(self, messages: List[Any], **kwargs: Any) -> Any:
+        if self.fail:
+            raise RuntimeError("rate limited")
+        return self.result
+
+    async def create_stream(
+        self, messages: List[Any], **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        yield "ok"
+        yield self.result
+
+
+class TestRecording:
+    """Test the record helpers against the default registry"""
+
+    def test_record_request(self):
+        """Test requests are counted and timed per route template"""
+        labels: Dict[str, str] = {
+            "method": "GET",
+            "route": "/test/record/{id}",
+        }
+        before = _value("ingenious_http_requests_total", status="200", **labels)
+
+        metrics.record_request("GET", "/test/record/{id}", 200, 0.02)
+
+        after = _value("ingenious_http_requests_total", status="200", **labels)
+        assert after - before == 1
+        assert _value("ingenious_http_request_duration_seconds_count", **labels) >= 1
+
+    def test_record_flow_outcomes(self):
+        """Test flow runs are split by outcome"""
+        metrics.record_flow("test_flow", "chat", True, 1.5)
+        metrics.record_flow("test_flow", "chat", False, 0.5)
+
+        for outcome in ("success", "error"):
+            assert (
+                _value(
+                    "ingenious_flow_requests_total",
+                    flow="test_flow",
+                    mode="chat",
+                    outcome=outcome,
+                )
+                >= 1
+            )
+
+    def test_record_cache(self):
+        """Test cache lookups are counted as hits and misses"""
+        before = _value("ingenious_cache_requests_total", cache="test", result="hit")
+
+        metrics.record_cache("test", hit=True)
+        metrics.record_cache("test", hit=False)
+
+        after = _value("ingenious_cache_requests_total", cache="test", result="hit")
+        assert after - before == 1
+        assert _value("ingenious_cache_requests_total", cache="test", result="miss")
+
+    def test_streams_and_pool_gauges(self):
+        """Test gauges go up and back down"""
+        metrics.stream_opened("test_stream")
+        assert _value("ingenious_active_streams", endpoint="test_stream") == 1
+        metrics.stream_closed("test_stream")
+        assert _value("ingenious_active_streams", endpoint="test_stream") == 0
+
+        metrics.set_pool_size("test_pool", 5)
+        metrics.pool_checkout("test_pool", 1)
+        assert _value("ingenious_db_pool_size", pool="test_pool") == 5
+        assert _value("ingenious_db_pool_connections_in_use", pool="test_pool") == 1
+        metrics.pool_checkout("test_pool", -1)
+
+    def test_count_extraction(self):
+        """Test extraction passes elements through and counts them"""
+        before = _value("ingenious_extraction_elements_total", engine="test_engine")
+
+        elements = list(metrics.count_extraction("test_engine", iter([1, 2, 3])))
+
+        assert elements == [1, 2, 3]
+        after = _value("ingenious_extraction_elements_total", engine="test_engine")
+        assert after - before == 3
+        assert _value("ingenious_extraction_documents_total", engine="test_engine")
+
+    def test_disabled_records_nothing(self):
+        """Test the helpers are no-ops while metrics are off"""
+        assert not metrics.configure_metrics(MetricsSettings(enable=False))
+        assert not metrics.is_enabled()
+
+        metrics.record_cache("test_disabled", hit=True)
+        elements = list(metrics.count_extraction("test_disabled", iter([1])))
+
+        assert elements == [1]
+        assert not _value(
+            "ingenious_cache_requests_total", cache="test_disabled", result="hit"
+        )
+        assert not _value(
+            "ingenious_extraction_documents_total", engine="test_disabled"
+        )
+
+
+class TestModelCallMetrics:
+    """Test metrics recorded by instrumented model clients"""
+
+    @pytest.mark.asyncio
+    async def test_create_counts_tokens(self):
+        """Test create() records latency and tokens without tracing"""
+        tracing.disable_tracing()
+        client = tracing.instrument_model_client(
+            FakeModelClient(), model="test-gpt-create"
+        )
+
+        await client.create(messages=[])
+
+        assert (
+            _value(
+                "ingenious_llm_requests_total",
+                model="test-gpt-create",
+                outcome="success",
+            )
+            == 1
+        )
+        assert (
+            _value("ingenious_llm_tokens_total", model="test-gpt-create", type="input")
+            == 12
+        )
+        assert (
+            _value("ingenious_llm_tokens_total", model="test-gpt-create", type="output")
+            == 5
+        )
+
+    @pytest.mark.asyncio
+    async def test_stream_and_errors(self):
+        """Test streamed calls count once and failures count as errors"""
+        client = tracing.instrument_model_client(
+            FakeModelClient(), model="test-gpt-stream"
+        )
+        failing = tracing.instrument_model_client(
+            FakeModelClient(fail=True), model="test-gpt-stream"
+        )
+
+        [chunk async for chunk in client.create_stream(messages=[])]
+        with pytest.raises(RuntimeError):
+            await failing.create(messages=[])
+
+        for outcome in ("success", "error"):
+            assert (
+                _value(
+                    "ingenious_llm_requests_total",
+                    model="test-gpt-stream",
+                    outcome=outcome,
+                )
+                == 1
+            )
+        assert (
+            _value("ingenious_llm_tokens_total", model="test-gpt-stream", type="output")
+            == 5
+        )
+
+
+class TestEndpoint:
+    """Test the /metrics endpoint and request middleware"""
+
+    def _app(self, path: Optional[str] = None) -> FastAPI:
+        from ingenious.api.routes import metrics as metrics_route
+        from ingenious.main.middleware import RequestContextMiddleware
+
+        app = FastAPI()
+
+        @app.get("/api/v1/things/{thing_id}")
+        async def thing(thing_id: str) -> dict:
+            return {"id": thing_id}
+
+        app.include_router(metrics_route.router, prefix=path or "/metrics")
+        app.add_middleware(RequestContextMiddleware)
+        return app
+
+    def test_requests_labelled_by_route_template(self):
+        """Test /metrics exposes request counts keyed by the route template"""
+        client = TestClient(self._app())
+        client.get("/api/v1/things/1")
+        client.get("/api/v1/things/2")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'ingenious_http_requests_total{method="GET",'
+            'route="/api/v1/things/{thing_id}",status="200"}'
+        ) in response.text
+        assert "/api/v1/things/1" not in response.text
+
+    def test_route_registered_only_when_enabled(self):
+        """Test RouteManager skips the endpoint when metrics are off"""
+        from ingenious.main.routing import RouteManager
+
+        config = SimpleNamespace(
+            web_configuration=SimpleNamespace(metrics=MetricsSettings(path="/prom/"))
+        )
+        app = FastAPI()
+        RouteManager.register_metrics_route(app, config)  # type: ignore[arg-type]
+        assert TestClient(app).get("/prom").status_code == 200
+
+        metrics.configure_metrics(MetricsSettings(enable=False))
+        app = FastAPI()
+        RouteManager.register_metrics_route(app, config)  # type: ignore[arg-type]
+        assert TestClient(app).get("/prom").status_code == 404
+
+    def test_multiprocess_render(self, tmp_path, monkeypatch):
+        """Test a multiprocess directory is aggregated on render"""
+        monkeypatch.setenv(metrics.MULTIPROC_DIR_ENV, str(tmp_path))
+        (tmp_path / "stale.db").write_bytes(b"")
+
+        assert metrics.prepare_multiprocess_dir() == str(tmp_path)
+        assert not list(tmp_path.iterdir())
+        body, content_type = metrics.render_latest()
+
+        assert content_type.startswith("text/plain")
+        assert b"process_cpu_seconds_total" not in body
+
+
+class TestFlowLabels:
+    """Test flow labels stay within the registered set"""
+
+    def test_unknown_flow(self):
+        """Test unregistered flow names are not used as labels"""
+        from ingenious.services.chat_service import _flow_label
+
+        assert _flow_label("../../etc/passwd") == "unknown"
@@ -0,0 +1,99 @@
+"""
+Unit tests for the pure ASGI request-context middleware.
+"""
+
+from unittest.mock import patch
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from ingenious.auth.jwt import create_access_token, get_username_from_request_token
+from ingenious.core.structured_logging import request_id_ctx
+from ingenious.main.middleware import RequestContextMiddleware
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/ping")
+    async def ping(request: Request):
+        return {"request_id": request_id_ctx.get()}
+
+    @app.get("/whoami")
+    async def whoami(request: Request):
+        token = request.headers["Authorization"][7:]
+        return {"user": get_username_from_request_token(request.scope, token)}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+class TestRequestContextMiddleware:
+    """Test cases for RequestContextMiddleware"""
+
+    def test_adds_tracing_headers(self):
+        """Test responses carry the request ID used for the logging context"""
+        client = TestClient(_app())
+
+        response = client.get("/ping")
+
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == response.json()["request_id"]
+        assert response.headers["X-Processing-Time"].endswith("s")
+
+    def test_streams_all_chunks(self):
+        """Test streamed bodies pass through unchanged"""
+        client = TestClient(_app())
+
+        response = client.get("/stream")
+
+        assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+        assert "X-Request-ID" in response.headers
+
+    def test_bearer_token_decoded_once(self):
+        """Test the auth layer reuses the identity the middleware verified"""
+        client = TestClient(_app())
+        token = create_access_token({"sub": "alice"})
+
+        with patch(
+            "ingenious.auth.jwt.get_username_from_token", return_value="alice"
+        ) as decode:
+            response = client.get(
+                "/whoami", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        assert response.json() == {"user": "alice"}
+        assert decode.call_count == 1
+
+    def test_logs_completion_after_final_chunk(self):
+        """Test completion is logged once the last body chunk has been sent"""
+        client = TestClient(_app())
+
+        with patch("ingenious.main.middleware.logger") as mock_logger:
+            client.get("/stream")
+
+        events = [call.args[0] for call in mock_logger.info.call_args_list]
+        assert events == ["Request started", "Request completed"]
+        completed = mock_logger.info.call_args_list[1].kwargs
+        assert completed["status_code"] == 200
+        assert (
+            completed["processing_time_seconds"] >= completed["response_start_seconds"]
+        )
+
+    def test_context_cleared_after_request(self):
+        """Test the logging context is cleared once the request finishes"""
+        client = TestClient(_app())
+
+        with patch("ingenious.main.middleware.clear_request_context") as clear:
+            client.get("/stream")
+
+        clear.assert_called_once()
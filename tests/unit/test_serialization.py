@@ -0,0 +1,127 @@
+"""
+Unit tests for the JSON serialization helpers.
+"""
+
+import importlib
+import json
+import sys
+from datetime import datetime
+from enum import Enum
+from unittest.mock import patch
+
+import jsonpickle
+import pytest
+
+from ingenious.models.agent import AgentChat
+from ingenious.models.chat import ChatResponse
+from ingenious.utils import serialization
+
+
+class Colour(Enum):
+    RED = "red"
+
+
+class Plain:
+    def __init__(self) -> None:
+        self.name = "plain"
+        self.tags = {"a"}
+        self.when = datetime(2025, 7, 4, 12, 0, 0)
+
+
+def _agent_chat(index: int) -> AgentChat:
+    return AgentChat(
+        chat_name=f"chat-{index}",
+        target_agent_name="summary",
+        source_agent_name="fiscal_analysis_agent",
+        user_message="Analyse the bike sales ✓",
+        system_prompt="You are a helpful analyst",
+        identifier="thread-1",
+        prompt_tokens=10,
+        start_time=1.5,
+    )
+
+
+def _normalise(value):
+    """Sort fields sets, whose order jsonpickle does not fix."""
+    if isinstance(value, dict):
+        return {
+            k: sorted(v) if k == "__pydantic_fields_set__" else _normalise(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_normalise(v) for v in value]
+    return value
+
+
+@pytest.fixture
+def stdlib_serialization():
+    """The serialization module as loaded without orjson installed."""
+    with patch.dict(sys.modules, {"orjson": None}):
+        module = importlib.reload(serialization)
+    yield module
+    importlib.reload(serialization)
+
+
+class TestDumps:
+    """Test cases for serialization.dumps"""
+
+    def test_matches_jsonpickle_agent_response(self):
+        """Test agent transcripts keep the jsonpickle unpicklable=False shape"""
+        transcript = [_agent_chat(i) for i in range(3)]
+
+        expected = json.loads(jsonpickle.encode(unpicklable=False, value=transcript))
+        actual = json.loads(serialization.dumps(transcript))
+
+        assert _normalise(actual) == _normalise(expected)
+
+    def test_plain_objects_and_scalars(self):
+        """Test objects, sets, enums and datetimes are flattened"""
+        data = {"obj": Plain(), "colour": Colour.RED, 1: "non-str key"}
+
+        assert json.loads(serialization.dumps(data)) == {
+            "obj": {"name": "plain", "tags": ["a"], "when": "2025-07-04T12:00:00"},
+            "colour": "red",
+            "1": "non-str key",
+        }
+
+    def test_round_trip(self):
+        """Test loads reads what dumps writes, including non-ASCII text"""
+        data = {"text": "héllo", "items": [1, 2.5, None, True]}
+
+        assert serialization.loads(serialization.dumps(data)) == data
+        assert serialization.loads(serialization.dumps_bytes(data)) == data
+        assert "héllo" in serialization.dumps(data)
+
+    def test_stdlib_fallback_writes_same_json(self, stdlib_serialization):
+        """Test both backends write identical JSON"""
+        assert not stdlib_serialization.ORJSON_AVAILABLE
+        response = ChatResponse(
+            thread_id="t",
+            message_id="m",
+            agent_response="é",
+            token_count=1,
+            max_token_count=0,
+        )
+        data = {"obj": Plain(), "colour": Colour.RED, "response": response.model_dump()}
+
+        fallback = stdlib_serialization.dumps(data)
+        importlib.reload(serialization)
+
+        assert fallback == serialization.dumps(data)
+
+
+class TestResponseClass:
+    """Test the default API response class"""
+
+    def test_uses_orjson_when_available(self):
+        """Test ORJSONResponse is the default when orjson is installed"""
+        from fastapi.responses import ORJSONResponse
+
+        assert serialization.ORJSON_AVAILABLE
+        assert serialization.JSON_RESPONSE_CLASS is ORJSONResponse
+
+    def test_falls_back_to_json_response(self, stdlib_serialization):
+        """Test the standard JSONResponse is used without orjson"""
+        from fastapi.responses import JSONResponse
+
+        assert stdlib_serialization.JSON_RESPONSE_CLASS is JSONResponse
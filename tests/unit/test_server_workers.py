@@ -0,0 +1,115 @@
+"""
+Unit tests for multi-process serving.
+"""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ingenious.config.models import (
+    IdempotencySettings,
+    MetricsSettings,
+    ServerProcessSettings,
+)
+from ingenious.main import workers
+
+STORE_ENV = "INGENIOUS_WEB_CONFIGURATION__IDEMPOTENCY__STORE_TYPE"
+
+
+def _config(workers_count: int = 4, **idempotency) -> Mock:
+    config = Mock()
+    config.web_configuration.server = ServerProcessSettings(
+        workers=workers_count, max_requests=1000, graceful_shutdown_seconds=5
+    )
+    config.web_configuration.idempotency = IdempotencySettings(**idempotency)
+    config.web_configuration.metrics = MetricsSettings(enable=False)
+    return config
+
+
+@pytest.fixture(autouse=True)
+def clean_env():
+    with patch.dict(os.environ):
+        os.environ.pop(STORE_ENV, None)
+        yield
+
+
+class TestPrepareWorkerEnvironment:
+    """Test cache coherence overrides for worker processes"""
+
+    def test_memory_idempotency_store_moves_to_sqlite(self):
+        """Test the per-process idempotency store is replaced by SQLite"""
+        changes = workers.prepare_worker_environment(_config())
+
+        assert changes == {STORE_ENV: "sqlite"}
+        assert os.environ[STORE_ENV] == "sqlite"
+
+    def test_explicit_store_type_is_kept(self):
+        """Test an explicitly configured store type is not overridden"""
+        os.environ[STORE_ENV] = "memory"
+
+        assert workers.prepare_worker_environment(_config()) == {}
+        assert os.environ[STORE_ENV] == "memory"
+
+    def test_disabled_idempotency_is_untouched(self):
+        """Test nothing changes when idempotency is disabled"""
+        assert workers.prepare_worker_environment(_config(enable=False)) == {}
+        assert STORE_ENV not in os.environ
+
+
+class TestRunWorkers:
+    """Test the uvicorn multi-worker launch"""
+
+    def test_preloads_then_starts_workers(self):
+        """Test flows are preloaded and uvicorn gets the worker factory"""
+        calls = []
+        with (
+            patch.object(
+                workers, "preload", side_effect=lambda c: calls.append("preload") or 3
+            ),
+            patch.object(
+                workers.uvicorn, "run", side_effect=lambda *a, **k: calls.append("run")
+            ) as run,
+        ):
+            workers.run_workers(_config(), host="127.0.0.1", port=8000)
+
+        assert calls == ["preload", "run"]
+        args, kwargs = run.call_args
+        assert args == (workers.WORKER_APP_FACTORY,)
+        assert kwargs["factory"] is True
+        assert kwargs["workers"] == 4
+        assert kwargs["limit_max_requests"] == 1000
+        assert kwargs["timeout_graceful_shutdown"] == 5
+
+    def test_metrics_directory_is_shared_with_workers(self, tmp_path):
+        """Test workers inherit a cleaned multiprocess metrics directory"""
+        pytest.importorskip("prometheus_client")
+        config = _config()
+        config.web_configuration.metrics = MetricsSettings()
+        (tmp_path / "counter_123.db").write_bytes(b"stale")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(tmp_path)
+
+        with (
+            patch.object(workers, "preload", return_value=0),
+            patch.object(workers.uvicorn, "run"),
+        ):
+            workers.run_workers(config, host="127.0.0.1", port=8000)
+
+        assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == str(tmp_path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_worker_factory_is_importable(self):
+        """Test the factory string resolves to the worker app builder"""
+        module_name, attr = workers.WORKER_APP_FACTORY.split(":")
+        module = __import__(module_name, fromlist=[attr])
+
+        assert getattr(module, attr) is workers.create_worker_app
+
+
+class TestServerProcessSettings:
+    """Test server process settings validation"""
+
+    def test_rejects_zero_workers(self):
+        """Test at least one worker is required"""
+        with pytest.raises(ValueError):
+            ServerProcessSettings(workers=0)
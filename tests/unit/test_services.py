@@ -11,7 +11,7 @@ from ingenious.models.chat import ChatRequest, ChatResponse
 from ingenious.models.message_feedback import (
     MessageFeedbackRequest,
 )
-from ingenious.services.chat_service import ChatService
+from ingenious.services.chat_service import ChatService, clear_chat_service_classes
 from ingenious.services.memory_manager import (
     LegacyMemoryManager,
     MemoryManager,
@@ -23,6 +23,25 @@ from ingenious.services.message_feedback_service import MessageFeedbackService
 class TestChatService:
     """Test cases for ChatService class."""
 
+    @pytest.fixture(autouse=True)
+    def reset_service_classes(self):
+        """Each test resolves its own (mocked) service class."""
+        clear_chat_service_classes()
+        yield
+        clear_chat_service_classes()
+
+    def test_service_class_resolved_once(self):
+        """Test the service class is imported once and reused across requests."""
+        with patch(
+            "ingenious.services.chat_service.import_class_with_fallback"
+        ) as mock_import:
+            mock_import.return_value = Mock()
+
+            for _ in range(3):
+                ChatService("test_workflow", Mock(), "test_flow", Mock())
+
+            assert mock_import.call_count == 1
+
     def test_init_with_valid_workflow(self):
         """Test ChatService initialization with valid workflow."""
         with patch(
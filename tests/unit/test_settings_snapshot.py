@@ -0,0 +1,182 @@
+"""
+Unit tests for the process-wide settings snapshot and reloads.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.config import (
+    IngeniousSettings,
+    changed_sections,
+    get_config,
+    get_settings,
+    on_settings_change,
+    reload_settings,
+    remove_settings_listener,
+)
+from ingenious.services import admission_control
+
+ENV = {
+    "INGENIOUS_MODELS__0__MODEL": "gpt-4o",
+    "INGENIOUS_MODELS__0__API_KEY": "test-key",
+    "INGENIOUS_MODELS__0__BASE_URL": "https://test.openai.azure.com/",
+    "INGENIOUS_MODELS__0__DEPLOYMENT": "gpt-4o",
+}
+
+
+@pytest.fixture
+def env():
+    with patch.dict(os.environ, ENV):
+        yield os.environ
+
+
+@pytest.fixture
+def listener():
+    calls = []
+
+    def record(old: IngeniousSettings, new: IngeniousSettings) -> None:
+        calls.append((old, new))
+
+    on_settings_change(record)
+    yield calls
+    remove_settings_listener(record)
+
+
+class TestSnapshot:
+    """Test settings are loaded once and shared"""
+
+    def test_loaded_and_validated_once(self, env):
+        """Test repeated access returns the same validated object"""
+        with patch.object(IngeniousSettings, "validate_configuration") as validate:
+            first = get_config()
+            assert get_settings() is first
+            assert get_config() is first
+
+        validate.assert_called_once()
+
+    def test_failed_load_is_retried(self):
+        """Test an invalid environment is not cached"""
+        with patch.dict(os.environ, {}, clear=True):
+            with pytest.raises(ValueError):
+                get_settings()
+
+        with patch.dict(os.environ, ENV):
+            assert get_settings().models[0].model == "gpt-4o"
+
+
+class TestReload:
+    """Test reloading swaps the snapshot and notifies listeners"""
+
+    def test_reload_notifies_changed_sections(self, env, listener):
+        """Test listeners get the old and new settings after a change"""
+        old = get_settings()
+        env["INGENIOUS_WEB_CONFIGURATION__PORT"] = "9090"
+
+        new = reload_settings()
+
+        assert get_settings() is new and new is not old
+        assert new.web_configuration.port == 9090
+        assert listener == [(old, new)]
+        assert changed_sections(old, new) == ["web_configuration"]
+
+    def test_unchanged_reload_is_quiet(self, env, listener):
+        """Test listeners are not called when nothing changed"""
+        get_settings()
+        reload_settings()
+
+        assert listener == []
+
+    def test_invalid_reload_keeps_snapshot(self, env, listener):
+        """Test a reload that fails validation leaves the current settings"""
+        current = get_settings()
+        with patch.dict(os.environ, {"INGENIOUS_WEB_CONFIGURATION__PORT": "x"}):
+            with pytest.raises(ValueError):
+                reload_settings()
+
+        assert get_settings() is current
+        assert listener == []
+
+    def test_failing_listener_does_not_block_others(self, env, listener):
+        """Test one listener raising still lets later listeners run"""
+
+        def broken(old: IngeniousSettings, new: IngeniousSettings) -> None:
+            raise RuntimeError("boom")
+
+        on_settings_change(broken)
+        try:
+            get_settings()
+            env["INGENIOUS_WEB_CONFIGURATION__PORT"] = "9091"
+            reload_settings()
+        finally:
+            remove_settings_listener(broken)
+
+        assert len(listener) == 1
+
+    def test_admission_controller_rebuilt_on_change(self, env, monkeypatch):
+        """Test changed admission limits replace the worker's controller"""
+        monkeypatch.setattr(admission_control, "_admission_controller", None)
+        get_settings()
+        controller = admission_control.get_admission_controller()
+
+        env["INGENIOUS_WEB_CONFIGURATION__ADMISSION__MAX_CONCURRENT"] = "3"
+        new = reload_settings()
+
+        rebuilt = admission_control.get_admission_controller(
+            new.web_configuration.admission
+        )
+        assert rebuilt is not controller
+        assert rebuilt.settings.max_concurrent == 3
+
+
+class TestReloadEndpoint:
+    """Test the admin-only reload route"""
+
+    @pytest.fixture
+    def env(self, env):
+        env["INGENIOUS_WEB_CONFIGURATION__AUTHENTICATION__ADMIN_USERS"] = '["admin"]'
+        return env
+
+    def _client(self, user: str = "admin") -> TestClient:
+        import ingenious.dependencies as igen_deps
+        from ingenious.api.routes import diagnostic
+
+        app = FastAPI()
+        app.include_router(diagnostic.router, prefix="/api/v1")
+        app.dependency_overrides[igen_deps.get_auth_user] = lambda: user
+        return TestClient(app)
+
+    def test_requires_admin_user(self, env):
+        """Test users outside admin_users cannot reload settings"""
+        current = get_settings()
+        env["INGENIOUS_CHAT_HISTORY__MEMORY_PATH"] = "./other_memory"
+
+        response = self._client("alice").post("/api/v1/config/reload")
+
+        assert response.status_code == 403
+        assert get_settings() is current
+
+    def test_reports_changed_sections(self, env):
+        """Test the route returns the sections that changed"""
+        get_settings()
+        env["INGENIOUS_CHAT_HISTORY__MEMORY_PATH"] = "./other_memory"
+
+        response = self._client().post("/api/v1/config/reload")
+
+        assert response.status_code == 200
+        assert response.json() == {"changed_sections": ["chat_history"]}
+
+    def test_invalid_settings_hide_details(self, env):
+        """Test validation errors are not echoed to the caller"""
+        current = get_settings()
+        env["INGENIOUS_MODELS__0__API_KEY"] = ""
+        env["INGENIOUS_WEB_CONFIGURATION__PORT"] = "not-a-port"
+
+        response = self._client().post("/api/v1/config/reload")
+
+        assert response.status_code == 422
+        assert "not-a-port" not in response.text
+        assert get_settings() is current
@@ -0,0 +1,145 @@
+"""
+Unit tests for startup profiling and deferred heavy imports.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from typer.testing import CliRunner
+
+from ingenious.core import startup_profile
+from ingenious.core.startup_profile import ImportProfile, parse_importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:       600 |        600 |   fastapi.routing
+import time:       300 |        900 | fastapi
+import time:      2000 |       2500 | openai
+import time:       500 |        500 |   openai.types
+"""
+
+# Generous ceiling on a cold import of the API, for slow CI machines
+IMPORT_BUDGET_SECONDS = float(
+    os.environ.get("INGENIOUS_TEST_IMPORT_BUDGET_SECONDS", "10")
+)
+
+# Packages that only some flows, tools or backends need
+HEAVY = (
+    "pandas",
+    "matplotlib",
+    "chromadb",
+    "autogen_agentchat",
+    "azure.identity",
+    "azure.keyvault",
+    "azure.search.documents",
+    "dependency_injector",
+    "pyodbc",
+)
+
+
+def _imported(code: str) -> str:
+    """Run ``code`` in a fresh interpreter and return the last line it printed."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    lines = result.stdout.splitlines()
+    return lines[-1].strip() if lines else ""
+
+
+class TestParseImporttime:
+    """Test parsing ``-X importtime`` output"""
+
+    def test_parses_lines_and_depth(self):
+        """Test self, cumulative and nesting are read from each line"""
+        timings = parse_importtime(SAMPLE)
+
+        assert [t.module for t in timings] == [
+            "_io",
+            "fastapi.routing",
+            "fastapi",
+            "openai",
+            "openai.types",
+        ]
+        routing = timings[1]
+        assert (routing.self_us, routing.cumulative_us, routing.depth) == (600, 600, 1)
+        assert timings[2].depth == 0
+
+    def test_by_package_and_slowest(self):
+        """Test self time is summed per top-level package"""
+        profile = ImportProfile("ingenious.main", 0.01, parse_importtime(SAMPLE))
+
+        assert profile.by_package() == {"openai": 2500, "fastapi": 900, "_io": 120}
+        assert [t.module for t in profile.slowest_modules(2)] == ["openai", "fastapi"]
+        assert profile.imported("fastapi")
+        assert not profile.imported("fast")
+
+
+class TestColdImports:
+    """Test importing the CLI and app leaves heavy packages unloaded"""
+
+    def test_profile_imports(self):
+        """Test a module's imports are profiled in a fresh interpreter"""
+        profile = startup_profile.profile_imports("json")
+
+        assert profile.imported("json.decoder")
+        assert 0 < profile.total_seconds < 5
+
+    def test_profile_imports_failure(self):
+        """Test a failing import is reported"""
+        with pytest.raises(RuntimeError, match="not_a_module"):
+            startup_profile.profile_imports("not_a_module")
+
+    @pytest.mark.parametrize("module", ["ingenious.cli.main", "ingenious.main"])
+    def test_heavy_packages_deferred(self, module):
+        """Test the CLI and API import without optional heavy packages"""
+        loaded = _imported(
+            f"import sys, {module}\n"
+            f"print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+        )
+
+        assert loaded == ""
+
+    def test_api_import_within_budget(self):
+        """Test the API imports cold within the configured budget"""
+        profile = startup_profile.profile_imports("ingenious.main")
+
+        assert profile.total_seconds < IMPORT_BUDGET_SECONDS, (
+            f"ingenious.main took {profile.total_seconds:.2f}s to import; slowest: "
+            + ", ".join(t.module for t in profile.slowest_modules(5))
+        )
+
+    def test_tool_functions_import_has_no_side_effects(self):
+        """Test importing the SQL tools does not build or connect to a database"""
+        output = _imported(
+            "import sys\n"
+            "from ingenious.services.chat_services.multi_agent import "
+            "tool_functions_standard as tools\n"
+            "print(tools.test_db, tools.cursor, 'pandas' in sys.modules)"
+        )
+
+        assert output == "None None False"
+
+
+class TestProfileCommand:
+    """Test the ``ingen profile-startup`` command"""
+
+    def test_budget_exceeded(self, monkeypatch):
+        """Test the command fails when the import is over budget"""
+        from ingenious.cli.main import app
+
+        monkeypatch.setattr(
+            startup_profile,
+            "profile_imports",
+            lambda module: ImportProfile(module, 3.0, parse_importtime(SAMPLE)),
+        )
+
+        result = CliRunner().invoke(
+            app, ["profile-startup", "--imports-only", "--budget", "2"]
+        )
+
+        assert result.exit_code == 1
+        assert "openai" in result.output
+        assert "over the 2.00s budget" in result.output
@@ -1,24 +1,41 @@
+import json
 import time
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
+import structlog
 
+from ingenious.core import structured_logging
 from ingenious.core.structured_logging import (
+    EventSampler,
     PerformanceLogger,
+    ProcessMetricsSampler,
     add_correlation_id,
     add_performance_metrics,
     add_timestamp,
     clear_request_context,
     get_logger,
     get_request_id,
+    lazy,
     log_agent_action,
     log_api_call,
     log_database_operation,
     set_request_context,
     setup_structured_logging,
+    shutdown_structured_logging,
 )
 
 
+@pytest.fixture
+def fresh_metrics_sampler():
+    """Make the next log line create a new metrics sampler."""
+    structured_logging._metrics_sampler = None
+    yield
+    if structured_logging._metrics_sampler is not None:
+        structured_logging._metrics_sampler.stop()
+    structured_logging._metrics_sampler = None
+
+
 class TestStructuredLoggingSetup:
     """Test structured logging configuration."""
 
@@ -107,6 +124,7 @@ class TestLogProcessors:
         assert "T" in timestamp
         assert timestamp.endswith("Z")
 
+    @pytest.mark.usefixtures("fresh_metrics_sampler")
     @patch("psutil.Process")
     def test_add_performance_metrics_processor(self, mock_process):
         """Test that performance metrics are added when psutil is available."""
@@ -123,6 +141,7 @@ class TestLogProcessors:
         assert result["memory_mb"] == 100.0
         assert result["cpu_percent"] == 15.5
 
+    @pytest.mark.usefixtures("fresh_metrics_sampler")
     def test_add_performance_metrics_processor_no_psutil(self):
         """Test that performance metrics processor works when psutil is not available."""
         with patch.dict("sys.modules", {"psutil": None}):
@@ -134,6 +153,66 @@ class TestLogProcessors:
             assert "cpu_percent" not in result
 
 
+class TestLoggingPipeline:
+    """Test sampled metrics, lazy values, event sampling and the async sink."""
+
+    @patch("psutil.Process")
+    def test_metrics_come_from_cached_snapshot(self, mock_process):
+        """Test psutil is queried per sample, not per log line."""
+        mock_process.return_value.memory_info.return_value.rss = 1024 * 1024
+        mock_process.return_value.cpu_percent.return_value = 1.0
+        sampler = ProcessMetricsSampler(interval=60).start()
+        try:
+            with patch.object(
+                structured_logging, "get_metrics_sampler", return_value=sampler
+            ):
+                for _ in range(100):
+                    result = add_performance_metrics(None, "info", {})
+        finally:
+            sampler.stop()
+
+        assert result == {"memory_mb": 1.0, "cpu_percent": 1.0}
+        assert mock_process.return_value.memory_info.call_count == 1
+
+    def test_lazy_values_render_only_when_emitted(self, capsys):
+        """Test lazy values are skipped for filtered-out levels"""
+        setup_structured_logging(log_level="INFO", metrics_interval=0)
+        logger = get_logger("test.lazy")
+        expensive = Mock(return_value="rendered")
+
+        logger.debug("Dropped", value=lazy(expensive))
+        expensive.assert_not_called()
+        logger.info("Kept", value=lazy(expensive))
+
+        expensive.assert_called_once()
+        assert json.loads(capsys.readouterr().out.splitlines()[-1])["value"] == (
+            "rendered"
+        )
+
+    def test_event_sampler_drops_sampled_events(self):
+        """Test sampled info events are dropped but warnings are kept"""
+        sampler = EventSampler({"Noisy event": 0.0, "Half event": 0.5})
+
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "Noisy event"})
+        assert sampler(None, "warning", {"event": "Noisy event"})
+        assert sampler(None, "info", {"event": "Other"}) == {"event": "Other"}
+        sampler._random = lambda: 0.1
+        assert sampler(None, "info", {"event": "Half event"})["sample_rate"] == 0.5
+
+    def test_async_sink_writes_from_listener(self, capsys):
+        """Test the queue sink delivers every line once flushed"""
+        setup_structured_logging(async_sink=True, metrics_interval=0)
+        logger = get_logger("test.async")
+
+        for i in range(50):
+            logger.info("Queued line", index=i)
+        shutdown_structured_logging()
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line["index"] for line in lines] == list(range(50))
+
+
 class TestPerformanceLogger:
     """Test performance logging context manager."""
 
@@ -0,0 +1,136 @@
+"""
+Unit tests for the compiled prompt-template registry.
+"""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ingenious.config.models import FileStorageContainerSettings
+from ingenious.files.files_repository import FileStorage
+from ingenious.services.template_registry import (
+    TemplateRegistry,
+    get_template_registry,
+)
+
+
+@pytest.fixture
+def revisions_dir(tmp_path):
+    prompts = tmp_path / "templates" / "prompts"
+    (prompts / "rev1").mkdir(parents=True)
+    (prompts / "rev1" / "agent_a_prompt.jinja").write_text("Hello {{ name }}")
+    (prompts / "rev1" / "agent_b_prompt.jinja").write_text("Static B")
+    (prompts / "rev1" / "notes.txt").write_text("ignored")
+    (prompts / "user_prompt.md").write_text("Root prompt")
+    return tmp_path
+
+
+@pytest.fixture
+def fs(revisions_dir):
+    config = SimpleNamespace(
+        file_storage=SimpleNamespace(
+            revisions=FileStorageContainerSettings(
+                storage_type="local", path=str(revisions_dir)
+            )
+        )
+    )
+    return FileStorage(config)  # type: ignore[arg-type]
+
+
+def _touch(path, content):
+    """Rewrite a file and move its mtime forward so the change is detectable."""
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestTemplateRegistry:
+    """Test cases for TemplateRegistry"""
+
+    @pytest.mark.asyncio
+    async def test_compiles_once_and_caches(self, fs):
+        """Test repeated lookups reuse the compiled template"""
+        registry = TemplateRegistry(revalidate_interval=60)
+        fs.repository.read_file = AsyncMock(wraps=fs.repository.read_file)
+
+        first = await registry.get_template(fs, "agent_a_prompt.jinja", "rev1")
+        second = await registry.get_template(fs, "agent_a_prompt.jinja", "rev1")
+
+        assert first is second
+        assert first.render(name="World") == "Hello World"
+        assert fs.repository.read_file.await_count == 1
+        assert registry.stats() == {"entries": 1, "hits": 1, "misses": 1, "reloads": 0}
+
+    @pytest.mark.asyncio
+    async def test_reloads_when_file_changes(self, fs, revisions_dir):
+        """Test a changed mtime triggers a reload on revalidation"""
+        registry = TemplateRegistry(revalidate_interval=0)
+        path = revisions_dir / "templates" / "prompts" / "rev1" / "agent_b_prompt.jinja"
+
+        assert await registry.render(fs, "agent_b_prompt.jinja", "rev1") == "Static B"
+        _touch(path, "Updated B")
+
+        assert await registry.render(fs, "agent_b_prompt.jinja", "rev1") == "Updated B"
+        assert registry.reloads == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_file_is_not_reread(self, fs):
+        """Test revalidation only stats the file when it has not changed"""
+        registry = TemplateRegistry(revalidate_interval=0)
+        await registry.get_template(fs, "agent_b_prompt.jinja", "rev1")
+        fs.repository.read_file = AsyncMock(wraps=fs.repository.read_file)
+
+        await registry.get_template(fs, "agent_b_prompt.jinja", "rev1")
+
+        fs.repository.read_file.assert_not_awaited()
+        assert registry.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_entries(self, fs, revisions_dir):
+        """Test explicit invalidation forces the next lookup to reload"""
+        registry = TemplateRegistry(revalidate_interval=60)
+        await registry.precompile(fs, "rev1")
+        await registry.get_template(fs, "user_prompt.md")
+
+        removed = registry.invalidate(
+            revision_id="rev1", file_name="agent_b_prompt.jinja"
+        )
+        (revisions_dir / "templates/prompts/rev1/agent_b_prompt.jinja").write_text(
+            "New"
+        )
+
+        assert removed == 1
+        assert await registry.render(fs, "agent_b_prompt.jinja", "rev1") == "New"
+        assert registry.invalidate() == 3
+
+    @pytest.mark.asyncio
+    async def test_precompile_revision(self, fs):
+        """Test precompile compiles only template files of the revision"""
+        registry = TemplateRegistry()
+
+        names = await registry.precompile(fs, "rev1")
+
+        assert sorted(names) == ["agent_a_prompt.jinja", "agent_b_prompt.jinja"]
+        assert registry.stats()["entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_precompile_revisions_skips_missing(self, fs):
+        """Test precompiling several revisions reports only those with templates"""
+        registry = TemplateRegistry()
+
+        compiled = await registry.precompile_revisions(fs, ["", "rev1", "missing"])
+
+        assert compiled == {"": 1, "rev1": 2}
+
+    @pytest.mark.asyncio
+    async def test_missing_template_renders_empty(self, fs):
+        """Test a missing template renders as an empty prompt"""
+        registry = TemplateRegistry()
+
+        assert await registry.render(fs, "absent.jinja", "rev1") == ""
+
+    def test_global_registry_is_singleton(self):
+        """Test the process-wide registry is reused"""
+        assert get_template_registry() is get_template_registry()
@@ -0,0 +1,208 @@
+"""
+Unit tests for per-stage request timing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.api.routes import chat as chat_routes
+from ingenious.config.models import ChatAdmissionSettings, StageTimingSettings
+from ingenious.core import timing, tracing
+from ingenious.main.middleware import RequestContextMiddleware
+from ingenious.models.chat import ChatRequest, ChatResponse, ChatResponseChunk
+from ingenious.services.admission_control import AdmissionController
+from ingenious.services.fastapi_dependencies import (
+    get_chat_admission,
+    get_chat_idempotency,
+    get_chat_service,
+    get_config,
+)
+
+
+@pytest.fixture(autouse=True)
+def enabled():
+    """Time stages for the duration of a test, with no response field."""
+    timing.configure_timing(StageTimingSettings())
+    yield
+    timing.configure_timing(StageTimingSettings())
+
+
+class TestRequestTimings:
+    """Test collecting stages within a request"""
+
+    def test_stages_outside_a_request_are_not_kept(self):
+        """Test stages run outside a request only go to the histogram"""
+        with timing.stage("memory"):
+            pass
+
+        assert timing.current() is None
+
+    def test_entries_and_server_timing(self):
+        """Test entries are in start order and aggregated per stage"""
+        token = timing.start_request()
+        try:
+            with timing.stage("auth"):
+                pass
+            timing.record("llm", 0, 0, "gpt-4o")
+            timing.record("llm", 0, 0, "gpt-4o")
+            timings = timing.current()
+        finally:
+            timing.end_request(token)
+
+        entries = timings.as_list()
+        assert [entry.stage for entry in entries] == ["llm", "llm", "auth"]
+        assert entries[0].detail == "gpt-4o"
+        header = timings.server_timing(0.25)
+        assert header.startswith("auth;dur=")
+        assert 'llm;dur=0.0;desc="2 calls"' in header
+        assert header.endswith("total;dur=250.0")
+        assert timing.current() is None
+
+    @pytest.mark.asyncio
+    async def test_timed_sync_and_async(self):
+        """Test the decorator times both functions and coroutines"""
+
+        @timing.timed("history_load")
+        async def load() -> str:
+            await asyncio.sleep(0)
+            return "messages"
+
+        @timing.timed("tool", "execute_sql_tool")
+        def run_tool() -> int:
+            return 3
+
+        token = timing.start_request()
+        try:
+            assert await load() == "messages"
+            assert await asyncio.to_thread(run_tool) == 3
+            entries = timing.current().as_list()
+        finally:
+            timing.end_request(token)
+
+        assert [(e.stage, e.detail) for e in entries] == [
+            ("history_load", None),
+            ("tool", "execute_sql_tool"),
+        ]
+        assert load.__name__ == "load"
+
+    def test_disabled_is_a_shared_noop(self):
+        """Test nothing is collected while timing is off"""
+        timing.configure_timing(StageTimingSettings(enable=False))
+
+        assert timing.start_request() is None
+        assert timing.stage("auth") is timing.stage("llm")
+        timing.record("llm", 0, 1)
+        assert timing.current() is None
+
+    @pytest.mark.asyncio
+    async def test_model_client_records_llm_stage(self):
+        """Test instrumented model clients record an llm stage per call"""
+        result = SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1)
+        )
+
+        class Client:
+            async def create(self, messages: List[Any], **kwargs: Any) -> Any:
+                return result
+
+            async def create_stream(
+                self, messages: List[Any], **kwargs: Any
+            ) -> AsyncIterator[Any]:
+                yield result
+
+        client = tracing.instrument_model_client(Client(), model="gpt-4o")
+        token = timing.start_request()
+        try:
+            await client.create([])
+            _ = [item async for item in client.create_stream([])]
+            entries = timing.current().as_list()
+        finally:
+            timing.end_request(token)
+
+        assert [(e.stage, e.detail) for e in entries] == [
+            ("llm", "gpt-4o"),
+            ("llm", "gpt-4o"),
+        ]
+
+
+class FakeChatService:
+    """Chat service that records a retrieval stage."""
+
+    async def get_chat_response(self, chat_request: ChatRequest) -> ChatResponse:
+        with timing.stage("retrieval", "search_tool"):
+            pass
+        return ChatResponse(
+            thread_id="thread",
+            message_id="message",
+            agent_response="ok",
+            token_count=1,
+            max_token_count=1,
+        )
+
+    async def get_streaming_chat_response(
+        self, chat_request: ChatRequest
+    ) -> AsyncIterator[ChatResponseChunk]:
+        with timing.stage("retrieval", "search_tool"):
+            pass
+        yield ChatResponseChunk(
+            thread_id="thread", message_id="message", chunk_type="content", content="ok"
+        )
+
+
+def _client(server_timing: bool = False) -> TestClient:
+    app = FastAPI()
+    app.include_router(chat_routes.router, prefix="/api/v1")
+    app.add_middleware(RequestContextMiddleware, server_timing=server_timing)
+    controller = AdmissionController(ChatAdmissionSettings(enable=False))
+    app.dependency_overrides[get_chat_service] = lambda: FakeChatService()
+    # The real security dependency runs, with authentication off
+    app.dependency_overrides[get_config] = lambda: SimpleNamespace(
+        web_configuration=SimpleNamespace(authentication=SimpleNamespace(enable=False))
+    )
+    app.dependency_overrides[get_chat_admission] = lambda: controller
+    app.dependency_overrides[get_chat_idempotency] = lambda: None
+    return TestClient(app)
+
+
+REQUEST = {"user_prompt": "hi", "conversation_flow": "classification-agent"}
+
+
+class TestChatRoutes:
+    """Test timings returned by the chat endpoints"""
+
+    def test_off_by_default(self):
+        """Test neither the header nor the field is sent by default"""
+        response = _client().post("/api/v1/chat", json=REQUEST)
+
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+        assert response.json()["timings"] is None
+
+    def test_server_timing_header(self):
+        """Test the middleware sends the stages as Server-Timing"""
+        response = _client(server_timing=True).post("/api/v1/chat", json=REQUEST)
+
+        header = response.headers["server-timing"]
+        assert "retrieval;dur=" in header
+        assert "total;dur=" in header
+
+    def test_response_field(self):
+        """Test the chat response and stream done event carry the timings"""
+        timing.configure_timing(StageTimingSettings(response_field=True))
+        client = _client()
+
+        timings = client.post("/api/v1/chat", json=REQUEST).json()["timings"]
+        stages = {entry["stage"]: entry for entry in timings}
+        # Timed once, where the middleware verifies the caller
+        assert [entry["stage"] for entry in timings].count("auth") == 1
+        assert stages["retrieval"]["detail"] == "search_tool"
+        assert stages["auth"]["start_ms"] <= stages["retrieval"]["start_ms"]
+
+        stream = client.post("/api/v1/chat/stream", json=REQUEST).text
+        done = [line for line in stream.splitlines() if '"event":"done"' in line]
+        assert done and '"stage":"retrieval"' in done[0]
@@ -0,0 +1,274 @@
+"""
+Unit tests for cached JWT verification, JWKS rotation and constant-time basic auth.
+
+All signing keys are generated locally for each test run.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from ingenious.auth.basic import parse_basic_auth_header, verify_basic_credentials
+from ingenious.auth.token_verifier import TokenVerifier, VerifiedTokenCache
+
+SECRET = "unit-test-secret"
+
+
+def _private_pem(key) -> bytes:
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def _public_jwk(key, alg: str, kid: str) -> dict:
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    entry = jwk.construct(public_pem, alg).to_dict()
+    entry.update({"kid": kid, "alg": alg, "use": "sig"})
+    return entry
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope="module")
+def ec_key():
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+def _write_jwks(path, *entries):
+    path.write_text(json.dumps({"keys": list(entries)}))
+    # Make sure the change is visible even on coarse mtime filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _claims(**extra):
+    claims = {"sub": "alice", "exp": datetime.utcnow() + timedelta(minutes=5)}
+    claims.update(extra)
+    return claims
+
+
+class TestVerifiedTokenCache:
+    """Test cases for VerifiedTokenCache"""
+
+    def test_hit_after_put(self):
+        """Test verified claims are returned by token"""
+        cache = VerifiedTokenCache()
+        cache.put("token", {"sub": "alice", "exp": time.time() + 60})
+
+        assert cache.get("token")["sub"] == "alice"
+        assert cache.stats()["hits"] == 1
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries are not served past the token expiry"""
+        cache = VerifiedTokenCache()
+        cache.put("token", {"sub": "alice", "exp": time.time() - 1})
+
+        assert cache.get("token") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_bounded_size_evicts_least_recently_used(self):
+        """Test the cache never grows past max_entries"""
+        cache = VerifiedTokenCache(max_entries=2)
+        exp = time.time() + 60
+        cache.put("a", {"exp": exp})
+        cache.put("b", {"exp": exp})
+        cache.get("a")
+        cache.put("c", {"exp": exp})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["entries"] == 2
+
+
+class TestTokenVerifier:
+    """Test cases for TokenVerifier"""
+
+    def test_hs256_token_verified_once(self):
+        """Test repeated verification of a token skips the signature check"""
+        verifier = TokenVerifier(secret_key=SECRET)
+        token = jwt.encode(_claims(type="access"), SECRET, algorithm="HS256")
+
+        with patch(
+            "ingenious.auth.token_verifier.jwt.decode", wraps=jwt.decode
+        ) as decode:
+            for _ in range(3):
+                assert verifier.verify(token)["sub"] == "alice"
+
+        assert decode.call_count == 1
+
+    def test_cached_token_type_still_checked(self):
+        """Test a cached access token is not accepted as a refresh token"""
+        verifier = TokenVerifier(secret_key=SECRET)
+        token = jwt.encode(_claims(type="access"), SECRET, algorithm="HS256")
+        verifier.verify(token)
+
+        with pytest.raises(HTTPException, match="Invalid token type"):
+            verifier.verify(token, "refresh")
+
+    def test_rs256_and_es256_tokens(self, tmp_path, rsa_key, ec_key):
+        """Test tokens signed with JWKS keys are accepted"""
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(
+            jwks_path,
+            _public_jwk(rsa_key, "RS256", "rsa-1"),
+            _public_jwk(ec_key, "ES256", "ec-1"),
+        )
+        verifier = TokenVerifier(secret_key=SECRET, jwks_path=str(jwks_path))
+
+        rs_token = jwt.encode(
+            _claims(),
+            _private_pem(rsa_key),
+            algorithm="RS256",
+            headers={"kid": "rsa-1"},
+        )
+        es_token = jwt.encode(
+            _claims(), _private_pem(ec_key), algorithm="ES256", headers={"kid": "ec-1"}
+        )
+
+        assert verifier.verify(rs_token)["sub"] == "alice"
+        assert verifier.verify(es_token)["type"] == "access"
+
+    def test_asymmetric_tokens_rejected_without_jwks(self, rsa_key):
+        """Test RS256 tokens fail when no JWKS file is configured"""
+        verifier = TokenVerifier(secret_key=SECRET)
+        token = jwt.encode(
+            _claims(), _private_pem(rsa_key), algorithm="RS256", headers={"kid": "k"}
+        )
+
+        with pytest.raises(HTTPException, match="Could not validate credentials"):
+            verifier.verify(token)
+
+    def test_algorithm_must_match_key(self, tmp_path, rsa_key, ec_key):
+        """Test a kid registered for ES256 cannot verify an RS256 token"""
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(jwks_path, _public_jwk(ec_key, "ES256", "shared-kid"))
+        verifier = TokenVerifier(secret_key=SECRET, jwks_path=str(jwks_path))
+        token = jwt.encode(
+            _claims(),
+            _private_pem(rsa_key),
+            algorithm="RS256",
+            headers={"kid": "shared-kid"},
+        )
+
+        with pytest.raises(HTTPException):
+            verifier.verify(token)
+
+    def test_key_rotation(self, tmp_path, rsa_key, ec_key):
+        """Test replacing the JWKS file retires old keys and adds new ones"""
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(jwks_path, _public_jwk(rsa_key, "RS256", "old"))
+        verifier = TokenVerifier(secret_key=SECRET, jwks_path=str(jwks_path))
+        old_token = jwt.encode(
+            _claims(), _private_pem(rsa_key), algorithm="RS256", headers={"kid": "old"}
+        )
+        verifier.verify(old_token)
+
+        _write_jwks(jwks_path, _public_jwk(ec_key, "ES256", "new"))
+        new_token = jwt.encode(
+            _claims(), _private_pem(ec_key), algorithm="ES256", headers={"kid": "new"}
+        )
+
+        # Unknown kid forces a reload of the rotated file
+        assert verifier.verify(new_token)["sub"] == "alice"
+        with pytest.raises(HTTPException):
+            verifier.verify(old_token)
+
+    @pytest.mark.parametrize("content", ['{"keys": [', "[]", '{"keys": ["x"]}'])
+    def test_malformed_jwks_keeps_current_keys(self, tmp_path, rsa_key, content):
+        """Test a broken JWKS file leaves the loaded keys in place"""
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(jwks_path, _public_jwk(rsa_key, "RS256", "current"))
+        verifier = TokenVerifier(secret_key=SECRET, jwks_path=str(jwks_path))
+        verifier.cache.max_entries = 0
+        token = jwt.encode(
+            _claims(),
+            _private_pem(rsa_key),
+            algorithm="RS256",
+            headers={"kid": "current"},
+        )
+        verifier.verify(token)
+
+        jwks_path.write_text(content)
+        stat = jwks_path.stat()
+        os.utime(jwks_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        unknown = jwt.encode(
+            _claims(),
+            _private_pem(rsa_key),
+            algorithm="RS256",
+            headers={"kid": "unknown"},
+        )
+
+        # The unknown kid forces a reload of the broken file
+        with pytest.raises(HTTPException) as exc_info:
+            verifier.verify(unknown)
+        assert exc_info.value.status_code == 401
+        assert verifier.verify(token)["sub"] == "alice"
+
+    def test_audience_and_issuer_enforced(self, tmp_path, rsa_key):
+        """Test configured issuer and audience are required on IdP tokens"""
+        jwks_path = tmp_path / "jwks.json"
+        _write_jwks(jwks_path, _public_jwk(rsa_key, "RS256", "k"))
+        verifier = TokenVerifier(
+            secret_key=SECRET,
+            jwks_path=str(jwks_path),
+            issuer="https://idp.example",
+            audience="ingenious",
+        )
+        pem = _private_pem(rsa_key)
+        good = jwt.encode(
+            _claims(iss="https://idp.example", aud="ingenious"),
+            pem,
+            algorithm="RS256",
+            headers={"kid": "k"},
+        )
+        wrong_aud = jwt.encode(
+            _claims(iss="https://idp.example", aud="other"),
+            pem,
+            algorithm="RS256",
+            headers={"kid": "k"},
+        )
+
+        assert verifier.verify(good)["sub"] == "alice"
+        with pytest.raises(HTTPException):
+            verifier.verify(wrong_aud)
+
+
+class TestBasicCredentials:
+    """Test cases for constant-time basic auth"""
+
+    def test_valid_credentials(self):
+        """Test matching credentials are accepted"""
+        assert verify_basic_credentials("admin", "pw", "admin", "pw")
+
+    @pytest.mark.parametrize(
+        "username,password",
+        [("admin", "wrong"), ("other", "pw"), ("", ""), ("admin", "pw" * 100)],
+    )
+    def test_invalid_credentials(self, username, password):
+        """Test any mismatch, including length differences, is rejected"""
+        assert not verify_basic_credentials(username, password, "admin", "pw")
+
+    def test_parse_header(self):
+        """Test Basic headers split on the first colon"""
+        assert parse_basic_auth_header("Basic YWRtaW46cDpw") == ("admin", "p:p")
+
+    def test_parse_invalid_header(self):
+        """Test malformed headers raise ValueError"""
+        with pytest.raises(ValueError):
+            parse_basic_auth_header("Basic not-base64!")
@@ -0,0 +1,289 @@
+"""
+Unit tests for OpenTelemetry tracing.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, List
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ingenious.config.models import TracingSettings
+from ingenious.core import tracing
+
+pytestmark = pytest.mark.skipif(
+    not tracing.TRACING_AVAILABLE, reason="opentelemetry-sdk not installed"
+)
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def spans():
+    """Record spans in memory for the duration of a test."""
+    exporter = tracing.enable_in_memory_tracing()
+    yield exporter
+    tracing.disable_tracing()
+
+
+def _by_name(exporter: Any) -> dict:
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+class FakeModelClient:
+    """Stands in for an autogen model client."""
+
+    def __init__(self) -> None:
+        self.result = SimpleNamespace(
+            content="ok",
+            finish_reason="stop",
+            usage=SimpleNamespace(prompt_tokens=12, completion_tokens=5),
+        )
+
+    async def create(self, messages: List[Any], **kwargs: Any) -> Any:
+        return self.result
+
+    async def create_stream(
+        self, messages: List[Any], **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        yield "o"
+        yield "k"
+        yield self.result
+
+
+class TestDisabledTracing:
+    """Test the no-op path used when tracing is off"""
+
+    def test_span_is_shared_noop(self):
+        """Test span() returns the same null context without allocating spans"""
+        tracing.disable_tracing()
+
+        assert tracing.span("a") is tracing.span("b", key="value")
+        with tracing.span("a") as current:
+            assert current is None
+        assert not tracing.is_enabled()
+
+    @pytest.mark.asyncio
+    async def test_traced_calls_through(self):
+        """Test decorated functions run unchanged"""
+        tracing.disable_tracing()
+
+        @tracing.traced("tool.double")
+        async def double(value: int) -> int:
+            return value * 2
+
+        assert await double(4) == 8
+        assert double.__name__ == "double"
+
+    def test_setup_tracing_disabled(self):
+        """Test the default settings leave tracing off"""
+        assert tracing.setup_tracing(TracingSettings()) is False
+        assert tracing.runtime_tracer_provider() is None
+
+
+class TestSpans:
+    """Test span recording with the in-memory exporter"""
+
+    def test_setup_tracing_memory_exporter(self):
+        """Test enabled settings install a provider"""
+        try:
+            enabled = tracing.setup_tracing(
+                TracingSettings(enable=True, exporter="memory", service_name="svc")
+            )
+            assert enabled
+            assert tracing.runtime_tracer_provider() is not None
+        finally:
+            tracing.disable_tracing()
+
+    def test_nested_spans_and_attributes(self, spans):
+        """Test child spans are parented and None attributes dropped"""
+        with tracing.span("flow.dispatch", **{"ingenious.flow": "bike_insights"}):
+            with tracing.span("tool.search_tool", missing=None):
+                tracing.set_attributes(results=3)
+
+        recorded = _by_name(spans)
+        parent = recorded["flow.dispatch"]
+        child = recorded["tool.search_tool"]
+        assert child.parent.span_id == parent.context.span_id
+        assert parent.attributes["ingenious.flow"] == "bike_insights"
+        assert dict(child.attributes) == {"results": 3}
+
+    @pytest.mark.asyncio
+    async def test_traced_records_errors(self, spans):
+        """Test exceptions are recorded on the span and re-raised"""
+
+        @tracing.traced("tool.execute_sql_tool")
+        async def failing() -> None:
+            raise ValueError("bad query")
+
+        with pytest.raises(ValueError):
+            await failing()
+
+        span = _by_name(spans)["tool.execute_sql_tool"]
+        assert not span.status.is_ok
+        assert span.events[0].name == "exception"
+
+    def test_context_propagates_into_thread_pool(self, spans):
+        """Test context_propagating keeps worker spans in the caller's trace"""
+
+        @tracing.traced("sqlite.query")
+        def run_query() -> int:
+            return 1
+
+        with tracing.span("tool.execute_sql_local"):
+            with ThreadPoolExecutor() as executor:
+                assert executor.submit(tracing.context_propagating(run_query)).result()
+                executor.submit(run_query).result()
+
+        recorded = spans.get_finished_spans()
+        tool = next(s for s in recorded if s.name == "tool.execute_sql_local")
+        queries = [s for s in recorded if s.name == "sqlite.query"]
+        assert queries[0].parent.span_id == tool.context.span_id
+        # Without the wrapper the worker starts a new trace
+        assert queries[1].parent is None
+
+
+class TestModelClientSpans:
+    """Test spans around model calls"""
+
+    @pytest.mark.asyncio
+    async def test_create_records_token_usage(self, spans):
+        """Test create() spans carry GenAI attributes and token counts"""
+        client = tracing.instrument_model_client(
+            FakeModelClient(), model="gpt-4o", agent_name="summary"
+        )
+
+        result = await client.create(messages=[])
+
+        assert result.content == "ok"
+        span = _by_name(spans)["chat gpt-4o"]
+        assert span.attributes["gen_ai.request.model"] == "gpt-4o"
+        assert span.attributes["gen_ai.agent.name"] == "summary"
+        assert span.attributes["gen_ai.usage.input_tokens"] == 12
+        assert span.attributes["gen_ai.usage.output_tokens"] == 5
+
+    @pytest.mark.asyncio
+    async def test_create_stream_span_ends_after_stream(self, spans):
+        """Test streamed calls are one span, closed with the final usage"""
+        client = tracing.instrument_model_client(FakeModelClient(), model="gpt-4o")
+
+        chunks = [chunk async for chunk in client.create_stream(messages=[])]
+
+        assert chunks[:2] == ["o", "k"]
+        span = _by_name(spans)["chat gpt-4o"]
+        assert span.attributes["gen_ai.usage.output_tokens"] == 5
+
+
+class TestAgentRuntimeSpans:
+    """Test context propagation through the autogen runtime"""
+
+    @pytest.mark.asyncio
+    async def test_handler_spans_join_the_flow_trace(self, spans):
+        """Test spans inside message handlers share the dispatching trace"""
+        from autogen_core import (
+            MessageContext,
+            RoutedAgent,
+            SingleThreadedAgentRuntime,
+            TopicId,
+            TypeSubscription,
+            message_handler,
+        )
+
+        @dataclass
+        class Ping:
+            content: str
+
+        class Handler(RoutedAgent):
+            def __init__(self) -> None:
+                super().__init__("handler")
+
+            @message_handler
+            async def handle(self, message: Ping, ctx: MessageContext) -> None:
+                with tracing.span("agent.work"):
+                    await asyncio.sleep(0)
+
+        with tracing.span("flow.dispatch"):
+            runtime = SingleThreadedAgentRuntime(
+                tracer_provider=tracing.runtime_tracer_provider()
+            )
+            await Handler.register(runtime, "handler", lambda: Handler())
+            await runtime.add_subscription(
+                TypeSubscription(topic_type="ping", agent_type="handler")
+            )
+            runtime.start()
+            await runtime.publish_message(Ping("hi"), topic_id=TopicId("ping", "s"))
+            await runtime.stop_when_idle()
+
+        recorded = _by_name(spans)
+        flow = recorded["flow.dispatch"]
+        work = recorded["agent.work"]
+        assert work.context.trace_id == flow.context.trace_id
+        assert work.parent is not None
+
+
+class TestInstrumentedComponents:
+    """Test spans emitted by the app's own components"""
+
+    def test_request_span_continues_traceparent(self, spans):
+        """Test the request span joins the caller's trace and records status"""
+        from ingenious.main.middleware import RequestContextMiddleware
+
+        app = FastAPI()
+
+        @app.get("/api/v1/health")
+        async def health() -> dict:
+            with tracing.span("handler"):
+                return {"ok": True}
+
+        app.add_middleware(RequestContextMiddleware)
+        response = TestClient(app).get(
+            "/api/v1/health", headers={"traceparent": TRACEPARENT}
+        )
+
+        assert response.status_code == 200
+        recorded = _by_name(spans)
+        request = recorded["GET /api/v1/health"]
+        assert format(request.context.trace_id, "032x") == TRACEPARENT[3:35]
+        assert request.attributes["http.response.status_code"] == 200
+        assert recorded["handler"].parent.span_id == request.context.span_id
+
+    @pytest.mark.asyncio
+    async def test_agent_tool_call_span(self, spans):
+        """Test Agent.execute_tool_call records one span per tool call"""
+        from autogen_core import CancellationToken, FunctionCall
+        from autogen_core.tools import FunctionTool
+
+        from ingenious.models.agent import Agent
+
+        async def get_bike_price(ticker: str) -> float:
+            return 42.0
+
+        tool = FunctionTool(get_bike_price, description="price")
+        call = FunctionCall(
+            id="call-1", name="get_bike_price", arguments='{"ticker": "X"}'
+        )
+
+        result = await Agent.execute_tool_call(
+            Mock(), call, CancellationToken(), tools=[tool]
+        )
+
+        assert not result.is_error
+        span = _by_name(spans)["execute_tool get_bike_price"]
+        assert span.attributes["gen_ai.tool.call.id"] == "call-1"
+
+    @pytest.mark.asyncio
+    async def test_file_storage_spans(self, spans):
+        """Test FileStorage operations are traced"""
+        from ingenious.files.files_repository import FileStorage
+
+        storage = FileStorage.__new__(FileStorage)
+        storage.repository = Mock()
+        storage.repository.read_file = Mock(return_value=asyncio.sleep(0, "text"))
+
+        assert await storage.read_file("a.md", "templates") == "text"
+        assert "file_storage.read_file" in _by_name(spans)
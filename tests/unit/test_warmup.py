@@ -0,0 +1,207 @@
+"""
+Unit tests for the startup warm-up and readiness probes.
+"""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from ingenious.api.routes import diagnostic
+from ingenious.config import WarmupSettings, get_config
+from ingenious.db import base_sql
+from ingenious.services import warmup
+from ingenious.services.warmup import Warmup, WarmupState
+
+ENV = {
+    "INGENIOUS_MODELS__0__MODEL": "gpt-4o",
+    "INGENIOUS_MODELS__0__API_KEY": "test-key",
+    "INGENIOUS_MODELS__0__BASE_URL": "https://test.openai.azure.com/",
+    "INGENIOUS_MODELS__0__DEPLOYMENT": "gpt-4o",
+}
+
+
+@pytest.fixture
+def config(tmp_path):
+    env = {
+        **ENV,
+        "INGENIOUS_CHAT_HISTORY__DATABASE_PATH": str(tmp_path / "chat_history.db"),
+        "INGENIOUS_CHAT_HISTORY__MEMORY_PATH": str(tmp_path),
+    }
+    with patch.dict(os.environ, env):
+        yield get_config().model_copy(deep=True)
+
+
+@pytest.fixture
+def state():
+    return WarmupState()
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(diagnostic.router, prefix="/api/v1")
+    return TestClient(app)
+
+
+class TestWarmup:
+    """Test running the warm-up steps"""
+
+    @pytest.mark.asyncio
+    async def test_steps_run_in_order(self, config, state):
+        """Test each step is recorded and the worker ends up ready"""
+        config.web_configuration.warmup.steps = ["chat_history", "retrieval"]
+
+        await Warmup(config, state).run()
+
+        assert state.ready
+        assert [(s.name, s.status) for s in state.steps] == [
+            ("chat_history", "ok"),
+            ("retrieval", "skipped"),
+        ]
+        assert state.steps[0].detail == "sqlite"
+
+    @pytest.mark.asyncio
+    async def test_failed_step_does_not_block_readiness(self, config, state):
+        """Test a failing or slow step is reported and later steps still run"""
+        config.web_configuration.warmup.step_timeout_seconds = 0.05
+        runner = Warmup(config, state)
+
+        async def broken() -> str:
+            raise RuntimeError("no database")
+
+        async def slow() -> str:
+            await asyncio.sleep(1)
+            return "late"
+
+        async def fine() -> str:
+            return "warm"
+
+        runner._steps.update(tokenizers=broken, chat_history=slow, llm_clients=fine)
+        config.web_configuration.warmup.steps = [
+            "tokenizers",
+            "chat_history",
+            "llm_clients",
+        ]
+
+        await runner.run()
+
+        assert state.ready
+        assert [(s.status, s.detail) for s in state.steps] == [
+            ("failed", "RuntimeError: no database"),
+            ("failed", "timed out"),
+            ("ok", "warm"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_synthetic_requests(self, config, state):
+        """Test one request is sent through each configured flow"""
+        config.web_configuration.warmup.steps = []
+        config.web_configuration.warmup.synthetic_requests = True
+        config.web_configuration.warmup.synthetic_flows = ["classification-agent"]
+        runner = Warmup(config, state)
+        sent = []
+
+        async def send(flow: str) -> str:
+            sent.append(flow)
+            return "12 tokens"
+
+        with patch.object(runner, "_send_synthetic", send):
+            await runner.run()
+
+        assert sent == ["classification-agent"]
+        assert state.steps[0].name == "flow:classification-agent"
+
+    @pytest.mark.asyncio
+    async def test_llm_clients_shared_with_agents(self, config, state, monkeypatch):
+        """Test the warmed model clients are the ones agents get"""
+        from ingenious.models import ag_agents
+
+        monkeypatch.setattr(
+            ag_agents, "_model_clients", type(ag_agents._model_clients)()
+        )
+        monkeypatch.setattr(warmup, "_resolve", AsyncMock())
+        loop = asyncio.get_running_loop()
+
+        assert await Warmup(config, state)._warm_llm_clients() == "gpt-4o"
+
+        warmed = list(ag_agents._model_clients[loop].values())
+        assert warmed == [ag_agents.get_model_client(config.models[0])]
+        await ag_agents.close_model_clients()
+
+    def test_unknown_step_rejected(self):
+        """Test misspelt step names fail validation"""
+        with pytest.raises(ValidationError):
+            WarmupSettings(steps=["tokenisers"])
+
+
+class TestSchemaCreation:
+    """Test chat history tables are created once per database"""
+
+    def test_second_repository_skips_ddl(self, config):
+        from ingenious.db.sqlite import sqlite_ChatHistoryRepository
+
+        first = sqlite_ChatHistoryRepository(config)
+        assert first._schema_key() in base_sql._created_schemas
+
+        with patch.object(sqlite_ChatHistoryRepository, "_execute_sql") as execute:
+            sqlite_ChatHistoryRepository(config)
+
+        execute.assert_not_called()
+
+
+class TestProbes:
+    """Test liveness and readiness are reported separately"""
+
+    def test_not_ready_until_warm(self, monkeypatch, state):
+        """Test readiness is 503 while liveness is 200 during warm-up"""
+        monkeypatch.setattr(warmup, "_warmup_state", state)
+        state.start()
+        client = _client()
+
+        assert client.get("/api/v1/health/live").json() == {"status": "alive"}
+        response = client.get("/api/v1/health/ready")
+        assert response.status_code == 503
+        assert response.json()["detail"]["status"] == "warming_up"
+
+        state.finish()
+        response = client.get("/api/v1/health/ready")
+        assert response.status_code == 200
+        assert response.json()["warmup"]["status"] == "done"
+
+    def test_lifespan_marks_ready(self, config, monkeypatch, tmp_path, state):
+        """Test an app started with warm-up disabled is ready at once"""
+        from ingenious.main.app_factory import FastAgentAPI
+
+        monkeypatch.setattr(warmup, "_warmup_state", state)
+        monkeypatch.setenv("INGENIOUS_WORKING_DIR", str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        config.web_configuration.warmup.enable = False
+        config.web_configuration.jobs.enable = False
+
+        with TestClient(FastAgentAPI(config).app) as client:
+            assert client.get("/api/v1/health/ready").status_code == 200
+
+    def test_lifespan_closes_shared_clients(self, config, monkeypatch, tmp_path):
+        """Test shutting down closes the blob and model clients shared on the loop"""
+        from ingenious.files import azure as azure_files
+        from ingenious.main.app_factory import FastAgentAPI
+        from ingenious.models import ag_agents
+
+        monkeypatch.setenv("INGENIOUS_WORKING_DIR", str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        config.web_configuration.warmup.enable = False
+        config.web_configuration.jobs.enable = False
+        close_blob_clients = AsyncMock()
+        close_model_clients = AsyncMock()
+        monkeypatch.setattr(azure_files, "close_shared_clients", close_blob_clients)
+        monkeypatch.setattr(ag_agents, "close_model_clients", close_model_clients)
+
+        with TestClient(FastAgentAPI(config).app):
+            close_blob_clients.assert_not_awaited()
+
+        close_blob_clients.assert_awaited_once()
+        close_model_clients.assert_awaited_once()